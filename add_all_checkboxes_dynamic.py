@@ -6,6 +6,7 @@ HTMLから実際のライン名・キャラクター名を抽出して検索列
 """
 import re
 from utils.common import generate_search_link_html
+from utils.html_tabs import TabDocument
 
 print("🔄 全ブランドにチェックボックスを追加中（動的抽出版）...")
 print("=" * 60)
@@ -17,35 +18,6 @@ with open('index.html', 'r', encoding='utf-8') as f:
 print(f"✓ 読み込み完了: {len(html):,}文字")
 
 
-def find_tab_position(html, brand_name):
-    """タブ位置をネストカウントで特定"""
-    tab_start_tag = f'<div id="{brand_name}" class="tab-content">'
-    tab_start = html.find(tab_start_tag)
-
-    if tab_start == -1:
-        raise ValueError(f"{brand_name}タブが見つかりません")
-
-    # ネストカウント
-    div_count = 1
-    search_pos = tab_start + len(tab_start_tag)
-
-    while div_count > 0 and search_pos < len(html):
-        next_open = html.find('<div', search_pos)
-        next_close = html.find('</div>', search_pos)
-
-        if next_close == -1:
-            raise ValueError(f"{brand_name}タブの閉じタグが見つかりません")
-
-        if next_open != -1 and next_open < next_close:
-            div_count += 1
-            search_pos = next_open + 4
-        else:
-            div_count -= 1
-            if div_count == 0:
-                return (tab_start, next_close + 6)
-            search_pos = next_close + 6
-
-
 def extract_lines_from_html(brand_html):
     """HTMLからライン名を抽出"""
     line_section_start = brand_html.find('ライン別詳細分析')
@@ -80,15 +52,14 @@ def extract_characters_from_html(brand_html):
     return characters
 
 
-def add_checkboxes_to_brand(html, brand_name, brand_color_class):
-    """ブランドにチェックボックスを追加"""
+def add_checkboxes_to_brand(doc, brand_name, brand_color_class):
+    """ブランドにチェックボックスを追加（置換はdocに記録し、最後にまとめて適用）"""
     print(f"\n{'=' * 60}")
     print(f"🔵 {brand_name}タブを処理中...")
     print(f"{'=' * 60}")
 
     # タブを抽出
-    start_pos, end_pos = find_tab_position(html, brand_name)
-    brand_html = html[start_pos:end_pos]
+    brand_html = doc.tab_html(brand_name)
     print(f"✓ タブ抽出完了: {len(brand_html):,}文字")
 
     # 1. Top30セクション: チェックボックス追加
@@ -184,8 +155,7 @@ def add_checkboxes_to_brand(html, brand_name, brand_color_class):
         print(f"✓ {added_count}/{len(characters)}個のキャラクターに検索列追加完了")
 
     # タブを置換
-    html = html[:start_pos] + brand_html + html[end_pos:]
-    return html
+    doc.replace_tab(brand_name, brand_html)
 
 
 # 全ブランドに適用
@@ -197,8 +167,10 @@ brands = [
     ('RADO', 'rado-accent')
 ]
 
+doc = TabDocument(html)
 for brand_name, brand_color_class in brands:
-    html = add_checkboxes_to_brand(html, brand_name, brand_color_class)
+    add_checkboxes_to_brand(doc, brand_name, brand_color_class)
+html = doc.render()
 
 # 保存
 print("\n" + "=" * 60)
@@ -5,10 +5,10 @@
 2. 価格帯分布のタイトルに「完品のみ」を明記
 """
 
-import pandas as pd
+from utils.data_loader import load_watch_data
 
 # CSVデータ読み込み
-df = pd.read_csv('/Users/naokijodan/Desktop/時計データ_分類済み.csv')
+df = load_watch_data()
 df_complete = df[df['商品状態'] == '完品'].copy()
 
 # 完品データの統計
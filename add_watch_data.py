@@ -3,6 +3,11 @@
 """
 時計データ追加統合パイプライン
 前回のTissot追加の反省を踏まえ、全工程を自動化
+
+使用方法:
+    python3 add_watch_data.py <new_csv_path>                  # 全件マージ
+    python3 add_watch_data.py <new_csv_path> --incremental    # 差分追加（新規行のみ処理）
+    python3 add_watch_data.py <new_csv_path> --stream         # 新規CSVをチャンクごとに処理（大きなCSV向け）
 """
 
 import pandas as pd
@@ -12,7 +17,15 @@ import subprocess
 import shutil
 from datetime import datetime
 from typing import Dict, Tuple
-from generate_attributes import WatchAttributeGenerator
+from generate_attributes import STREAM_CHUNKSIZE, WatchAttributeGenerator, attributes_csv_path
+from build_tabs import affected_targets, run_build
+from rebuild_template_brand_tabs import load_configs
+from utils.brand_tab_renderer import classify_lines, rebuild_brand_tabs
+from utils.chart_bundle import CHART_DIR_NAME
+from utils.data_loader import append_rows, load_watch_data
+from utils.dedup_index import DedupIndex
+from utils.incremental_store import IncrementalStore
+from utils.month_partitions import MonthPartitionStore
 
 class WatchDataPipeline:
     """時計データ追加の統合パイプライン"""
@@ -32,13 +45,26 @@ class WatchDataPipeline:
         '歩留まり率_最小': 20.0,  # 完品データが20%以上あればOK
     }
 
-    def __init__(self, new_csv_path: str):
+    def __init__(self, new_csv_path: str, incremental: bool = False, stream: bool = False,
+                 chunksize: int = STREAM_CHUNKSIZE):
         """
         Args:
             new_csv_path: 追加する新規CSVのパス
+            incremental: Trueなら差分追加（既存CSVを読み直さず、新規行だけを追記・集計）
+            stream: Trueなら新規CSVをチャンクごとに読み込み、属性生成済みCSV（*_with_attributes.csv）に
+                    書き出してから処理する（新規CSV全体をメモリに載せない）
+            chunksize: streamで一度に読み込む行数
         """
         self.new_csv_path = new_csv_path
+        self.incremental = incremental
+        self.stream = stream
+        self.chunksize = chunksize
+        self.attributes_csv = attributes_csv_path(new_csv_path) if stream else None
         self.report = []  # 診断レポート
+        self.df_new_with_attrs = None  # ステップ1で属性を生成した新規データ
+        self.df_new_rows = None  # 重複を除いた新規行
+        self.dedup_index = None  # 既存データのキーインデックス
+        self.affected_tab_targets = []  # 差分追加で新規行が入力に含まれる駆動方式・パーツタブ
 
     def log(self, message: str):
         """ログ出力"""
@@ -56,21 +82,35 @@ class WatchDataPipeline:
         self.log("ステップ1: Dry Run（新規データの抽出率チェック）")
         self.log("="*80)
 
-        # 新規CSVを読み込み
-        try:
-            df_new = pd.read_csv(self.new_csv_path)
-            self.log(f"✓ 新規CSV読み込み: {len(df_new)}件")
-        except Exception as e:
-            self.log(f"❌ エラー: CSVの読み込みに失敗しました")
-            self.log(f"   {e}")
-            return False
+        if self.stream:
+            # チャンクごとに属性を生成して書き出し、抽出率の件数だけを集計
+            self.log(f"\n🔧 属性生成テスト中（{self.chunksize:,}件ずつ）...")
+            try:
+                counter = WatchAttributeGenerator.generate_attributes_streaming(
+                    self.new_csv_path, self.attributes_csv, chunksize=self.chunksize)
+            except Exception as e:
+                self.log(f"❌ エラー: CSVの読み込みに失敗しました")
+                self.log(f"   {e}")
+                return False
+            self.log(f"✓ 新規CSV: {counter.total}件 → {self.attributes_csv}")
+            rates = counter.rates()
+        else:
+            # 新規CSVを読み込み
+            try:
+                df_new = pd.read_csv(self.new_csv_path)
+                self.log(f"✓ 新規CSV読み込み: {len(df_new)}件")
+            except Exception as e:
+                self.log(f"❌ エラー: CSVの読み込みに失敗しました")
+                self.log(f"   {e}")
+                return False
 
-        # 属性を生成（テスト）
-        self.log("\n🔧 属性生成テスト中...")
-        df_with_attrs = WatchAttributeGenerator.generate_all_attributes(df_new)
+            # 属性を生成（テスト）
+            self.log("\n🔧 属性生成テスト中...")
+            df_with_attrs = WatchAttributeGenerator.generate_all_attributes(df_new)
+            self.df_new_with_attrs = df_with_attrs
 
-        # 抽出率を計算
-        rates = WatchAttributeGenerator.calculate_extraction_rates(df_with_attrs)
+            # 抽出率を計算
+            rates = WatchAttributeGenerator.calculate_extraction_rates(df_with_attrs)
 
         self.log("\n📊 抽出率:")
         for attr, rate in rates.items():
@@ -108,6 +148,9 @@ class WatchDataPipeline:
         """
         ステップ2: CSVマージ（重複チェック）
 
+        既存CSVは読み込まず、キーインデックス（タイトル + 販売日のハッシュ）で
+        新規データの重複をまとめて判定し、既存CSVのコピーに新規行だけを追記する
+
         Returns:
             (success, new_count, duplicate_count)
         """
@@ -115,36 +158,68 @@ class WatchDataPipeline:
         self.log("ステップ2: CSVマージ（重複チェック）")
         self.log("="*80)
 
-        # 既存CSVを読み込み
-        df_existing = pd.read_csv(self.EXISTING_CSV)
-        self.log(f"✓ 既存CSV: {len(df_existing)}件")
+        # 既存データのキーインデックス（CSVが変わっていなければ保存済みのものを使う）
+        self.dedup_index = DedupIndex.for_csv(self.EXISTING_CSV)
+        self.log(f"✓ 既存CSV: {self.dedup_index.rows}件（キー{len(self.dedup_index)}件）")
 
-        # 新規CSVを読み込み
-        df_new = pd.read_csv(self.new_csv_path)
-        self.log(f"✓ 新規CSV: {len(df_new)}件")
+        if self.stream:
+            return self._merge_csv_chunks()
 
-        # 属性生成
-        self.log("\n🔧 新規データに属性を生成中...")
-        df_new_with_attrs = WatchAttributeGenerator.generate_all_attributes(df_new)
+        # 新規データ（ステップ1で属性生成済みならそれを使う）
+        if self.df_new_with_attrs is None:
+            df_new = pd.read_csv(self.new_csv_path)
+            self.log("\n🔧 新規データに属性を生成中...")
+            self.df_new_with_attrs = WatchAttributeGenerator.generate_all_attributes(df_new)
+        self.log(f"✓ 新規CSV: {len(self.df_new_with_attrs)}件")
 
         # 重複チェック（タイトル + 販売日で判定）
         self.log("\n🔍 重複チェック中...")
-        df_merged = pd.concat([df_existing, df_new_with_attrs], ignore_index=True)
+        self.df_new_rows, duplicate_existing, duplicate_batch = self.dedup_index.split(self.df_new_with_attrs)
+        duplicate_count = duplicate_existing + duplicate_batch
+        new_count = len(self.df_new_rows)
+
+        self.log(f"  重複除外: {duplicate_count}件"
+                 f"（既存データと重複: {duplicate_existing}件、新規データ内で重複: {duplicate_batch}件）")
+        self.log(f"  新規追加: {new_count}件")
+        self.log(f"  最終データ件数: {self.dedup_index.rows + new_count}件")
 
-        # 重複を削除（タイトル + 販売日が同じものを削除）
-        before_count = len(df_merged)
-        df_merged = df_merged.drop_duplicates(subset=['タイトル', '販売日'], keep='first')
-        after_count = len(df_merged)
+        # 一時ファイルに保存（既存CSVのコピーに新規行を追記）
+        shutil.copyfile(self.EXISTING_CSV, self.TEMP_CSV)
+        if new_count:
+            append_rows(self.TEMP_CSV, self.df_new_rows)
+        self.log(f"\n✓ 一時ファイルに保存: {self.TEMP_CSV}")
 
-        duplicate_count = before_count - after_count
-        new_count = after_count - len(df_existing)
+        return True, new_count, duplicate_count
 
-        self.log(f"  重複除外: {duplicate_count}件")
-        self.log(f"  新規追加: {new_count}件")
-        self.log(f"  最終データ件数: {after_count}件")
+    def _merge_csv_chunks(self) -> Tuple[bool, int, int]:
+        """
+        ステップ2（stream）: 属性生成済みCSVをチャンクごとに重複チェックし、新規行を一時ファイルに追記
 
-        # 一時ファイルに保存
-        df_merged.to_csv(self.TEMP_CSV, index=False)
+        新規行はキー列だけを保持する（ステップ4でキーインデックスに登録する）
+        """
+        shutil.copyfile(self.EXISTING_CSV, self.TEMP_CSV)
+
+        self.log(f"\n🔍 重複チェック中（{self.chunksize:,}件ずつ）...")
+        total = new_count = duplicate_existing = duplicate_batch = 0
+        new_keys = []
+        chunks = pd.read_csv(self.attributes_csv, chunksize=self.chunksize)
+        for fresh, dup_existing, dup_batch in self.dedup_index.split_chunks(chunks):
+            total += len(fresh) + dup_existing + dup_batch
+            duplicate_existing += dup_existing
+            duplicate_batch += dup_batch
+            if len(fresh):
+                append_rows(self.TEMP_CSV, fresh)
+                new_keys.append(fresh[self.dedup_index.columns])
+                new_count += len(fresh)
+        duplicate_count = duplicate_existing + duplicate_batch
+        self.df_new_rows = (pd.concat(new_keys) if new_keys
+                            else pd.DataFrame(columns=self.dedup_index.columns))
+
+        self.log(f"✓ 新規CSV: {total}件")
+        self.log(f"  重複除外: {duplicate_count}件"
+                 f"（既存データと重複: {duplicate_existing}件、新規データ内で重複: {duplicate_batch}件）")
+        self.log(f"  新規追加: {new_count}件")
+        self.log(f"  最終データ件数: {self.dedup_index.rows + new_count}件")
         self.log(f"\n✓ 一時ファイルに保存: {self.TEMP_CSV}")
 
         return True, new_count, duplicate_count
@@ -164,9 +239,13 @@ class WatchDataPipeline:
 
         # 完品データ件数
         完品_count = (df['商品状態'] == '完品').sum()
-        歩留まり率 = 完品_count / len(df) * 100
+        return self._check_yield_rate(len(df), 完品_count)
 
-        self.log(f"  総データ件数: {len(df)}件")
+    def _check_yield_rate(self, total: int, 完品_count: int) -> bool:
+        """歩留まり率を計算して閾値と比較（ステップ3の共通部分）"""
+        歩留まり率 = 完品_count / total * 100
+
+        self.log(f"  総データ件数: {total}件")
         self.log(f"  完品データ: {完品_count}件")
         self.log(f"  歩留まり率: {歩留まり率:.1f}%")
 
@@ -193,33 +272,24 @@ class WatchDataPipeline:
         shutil.copy(self.TEMP_CSV, self.EXISTING_CSV)
         self.log(f"✓ CSVを更新: {self.EXISTING_CSV}")
 
+        # キーインデックスに新規行を登録（次回のマージでCSVを読み直さない）
+        if self.dedup_index is not None:
+            self.dedup_index.add(self.df_new_rows).save_for_csv(self.EXISTING_CSV)
+
         os.chdir(self.PROJECT_DIR)
 
-        # 駆動方式タブ再生成
-        self.log("\n🔧 駆動方式タブ再生成中...")
-        result = subprocess.run(
-            ['python3', 'build_movement_tabs.py'],
-            capture_output=True,
-            text=True
-        )
-        if result.returncode != 0:
-            self.log(f"❌ 駆動方式タブの再生成に失敗しました")
-            self.log(result.stderr)
-            return False
-        self.log("✓ 駆動方式タブ完了")
-
-        # パーツタブ再生成
-        self.log("\n🔧 パーツタブ再生成中...")
-        result = subprocess.run(
-            ['python3', 'build_parts_tabs.py'],
-            capture_output=True,
-            text=True
-        )
-        if result.returncode != 0:
-            self.log(f"❌ パーツタブの再生成に失敗しました")
-            self.log(result.stderr)
+        # 駆動方式・パーツタブを1プロセスで再生成（変更のあったタブのみ）
+        self.log("\n🔧 駆動方式・パーツタブ再生成中...")
+        try:
+            rebuilt = run_build(
+                csv_path=self.EXISTING_CSV,
+                index_path=os.path.join(self.PROJECT_DIR, 'index.html')
+            )
+        except Exception as e:
+            self.log(f"❌ タブの再生成に失敗しました")
+            self.log(f"   {e}")
             return False
-        self.log("✓ パーツタブ完了")
+        self.log(f"✓ 再生成: {', '.join(rebuilt) if rebuilt else 'なし（入力データに変更なし）'}")
 
         self.log("\n✅ タブ再生成完了")
         return True
@@ -240,9 +310,12 @@ class WatchDataPipeline:
 
         os.chdir(self.PROJECT_DIR)
 
-        # git add
-        subprocess.run(['git', 'add', 'index.html'], check=True)
-        self.log("✓ git add index.html")
+        # git add（グラフデータは index.html の隣の charts/ に書き出しているため一緒に追加。削除したJSONも反映される）
+        paths = ['index.html']
+        if os.path.isdir(CHART_DIR_NAME):
+            paths.append(CHART_DIR_NAME)
+        subprocess.run(['git', 'add', '--'] + paths, check=True)
+        self.log(f"✓ git add {' '.join(paths)}")
 
         # commit message
         date_str = datetime.now().strftime('%Y-%m-%d')
@@ -297,6 +370,194 @@ Co-Authored-By: Claude Sonnet 4.5 <noreply@anthropic.com>
         self.log(f"  2. 公開URL: https://naokijodan.github.io/watch-market-analysis/")
         self.log(f"  3. 更新を確認してください")
 
+    def open_incremental_store(self) -> IncrementalStore:
+        """差分追加用のストアを開く（ライン・型番はテンプレート形式のブランド設定で分類、新規行は販売月パーティションにも追加）"""
+        configs = load_configs()
+        store = IncrementalStore(self.EXISTING_CSV, annotate=lambda df: classify_lines(df, configs),
+                                 partitions=MonthPartitionStore(self.EXISTING_CSV))
+        return store.open()
+
+    def step2_append_incremental(self, store: IncrementalStore):
+        """
+        ステップ2（差分追加）: キーインデックスで重複を除き、新規行だけを既存CSVに追記
+
+        Args:
+            store: 差分集計ストア
+
+        Returns:
+            AppendResult
+        """
+        self.log("\n" + "="*80)
+        self.log("ステップ2: 差分追加（キーインデックスで重複チェック）")
+        self.log("="*80)
+
+        self.log(f"✓ 既存データ: {store.rows}件（キー{len(store.index)}件）")
+        if self.df_new_with_attrs is None:
+            # stream: ステップ1で書き出した属性生成済みCSVをチャンクごとに追記・集計（取り消しは全チャンク分まとめて）
+            self.log(f"✓ 新規CSV: {self.attributes_csv}（{self.chunksize:,}件ずつ）")
+            targets = set()
+            result = store.append_chunks(pd.read_csv(self.attributes_csv, chunksize=self.chunksize),
+                                         on_rows=lambda rows: targets.update(affected_targets(rows)))
+            self.affected_tab_targets = sorted(targets)
+        else:
+            self.log(f"✓ 新規CSV: {len(self.df_new_with_attrs)}件")
+            result = store.append(self.df_new_with_attrs)
+            self.affected_tab_targets = affected_targets(result.new_rows) if result.new_count else []
+
+        self.log(f"  重複除外: {result.duplicate_count}件"
+                 f"（既存データと重複: {result.duplicate_existing}件、新規データ内で重複: {result.duplicate_batch}件）")
+        self.log(f"  新規追加: {result.new_count}件")
+        self.log(f"  最終データ件数: {store.rows}件")
+        if result.new_count:
+            self.log(f"\n✓ 既存CSVに追記: {self.EXISTING_CSV}")
+            self.log(f"✓ 販売月パーティションを更新: {', '.join(result.months)}")
+
+        return result
+
+    def step3_validate_yield_rate_incremental(self, store: IncrementalStore) -> bool:
+        """
+        ステップ3（差分追加）: 差分集計の件数から歩留まり率を検証（CSVは読み直さない）
+
+        Returns:
+            True: 閾値をクリア, False: 閾値未達
+        """
+        self.log("\n" + "="*80)
+        self.log("ステップ3: 歩留まり率検証")
+        self.log("="*80)
+
+        return self._check_yield_rate(store.rows, store.count('condition', '完品'))
+
+    def step4_regenerate_affected_tabs(self, result) -> bool:
+        """
+        ステップ4（差分追加）: 新規行が入力に含まれるタブだけを再生成
+
+        Args:
+            result: step2_append_incremental() の結果
+
+        Returns:
+            True: 成功, False: 失敗
+        """
+        self.log("\n" + "="*80)
+        self.log("ステップ4: タブ再生成（追加データの影響があるタブのみ）")
+        self.log("="*80)
+
+        os.chdir(self.PROJECT_DIR)
+        index_path = os.path.join(self.PROJECT_DIR, 'index.html')
+
+        affected_brands = {brand for brand, condition in result.affected.get('brand_condition', ())
+                           if condition == '完品'}
+        configs = [c for c in load_configs() if c.brand_name in affected_brands]
+        targets = self.affected_tab_targets
+
+        try:
+            # 追記時に型付きキャッシュも追記分だけ更新済みのため、CSV全体の再パースは発生しない
+            # （stream では全チャンクの追記後に1回だけ反映）
+            df = load_watch_data(self.EXISTING_CSV)
+            if configs:
+                self.log(f"\n🔧 ブランドタブ再生成中: {', '.join(c.brand_name for c in configs)}")
+                rebuild_brand_tabs(configs, index_path=index_path, df=df)
+            rebuilt = run_build(csv_path=self.EXISTING_CSV, index_path=index_path,
+                                df=df, only=targets) if targets else []
+        except Exception as e:
+            self.log(f"❌ タブの再生成に失敗しました")
+            self.log(f"   {e}")
+            return False
+        self.log(f"✓ 再生成: {', '.join(rebuilt) if rebuilt else 'なし（駆動方式・パーツタブへの影響なし）'}")
+
+        self.log("\n✅ タブ再生成完了")
+        return True
+
+    def step6_generate_incremental_report(self, store: IncrementalStore, result):
+        """
+        ステップ6（差分追加）: 差分集計から診断レポートを生成（CSVは読み直さない）
+        """
+        self.log("\n" + "="*80)
+        self.log("📋 最終レポート")
+        self.log("="*80)
+
+        self.log(f"\n✅ 成功: 新規データ{result.new_count}件を追加")
+        self.log(f"\n【詳細】")
+        self.log(f"  - 新規追加: {result.new_count}件")
+        self.log(f"  - 重複除外: {result.duplicate_count}件")
+        self.log(f"  - 最終データ件数: {store.rows}件")
+
+        brands = store.summary('brand').sort_values('items', ascending=False, kind='stable')
+        self.log(f"\n【ブランド別Top10】")
+        for brand, row in brands.head(10).iterrows():
+            self.log(f"  - {brand}: {row['items']}件")
+
+        updated = brands[brands.index.isin([key[0] for key in result.affected.get('brand', ())])]
+        lines = result.affected.get('brand_line', ())
+        self.log(f"\n【更新されたブランド（{len(updated)}ブランド、ライン{len(lines)}件）】")
+        for brand, row in updated.head(10).iterrows():
+            self.log(f"  - {brand}: {row['items']}件 / 中央値 ${row['median']:.0f} / CV {row['cv']:.3f}")
+
+        self.log(f"\n【次のステップ】")
+        self.log(f"  1. GitHub Pagesは2-5分で更新されます")
+        self.log(f"  2. 公開URL: https://naokijodan.github.io/watch-market-analysis/")
+        self.log(f"  3. 更新を確認してください")
+
+    def run_incremental(self) -> bool:
+        """
+        差分追加モードのパイプライン実行
+
+        Returns:
+            True: 成功, False: 失敗
+        """
+        store = None
+        appended = False  # Trueの間に失敗したら追記した行を取り消す
+        try:
+            # ステップ1: Dry Run
+            if not self.step1_dry_run():
+                self.log("\n❌ パイプライン中断: Dry Run失敗")
+                return False
+
+            # ステップ2: 差分追加
+            store = self.open_incremental_store()
+            result = self.step2_append_incremental(store)
+            appended = result.new_count > 0
+            if result.new_count == 0:
+                self.log("\n⚠️ 新規データがありません（全て重複）")
+                return True
+
+            # ステップ3: 歩留まり率検証
+            if not self.step3_validate_yield_rate_incremental(store):
+                self.log("\n❌ パイプライン中断: 歩留まり率検証失敗")
+                store.rollback()
+                return False
+
+            # ステップ4: 影響のあるタブのみ再生成
+            if not self.step4_regenerate_affected_tabs(result):
+                self.log("\n❌ パイプライン中断: タブ再生成失敗")
+                store.rollback()
+                return False
+            appended = False
+
+            # ステップ5: Git commit & push
+            if not self.step5_commit_and_push(result.new_count):
+                self.log("\n❌ パイプライン中断: Git操作失敗")
+                return False
+
+            # ステップ6: 診断レポート
+            self.step6_generate_incremental_report(store, result)
+
+            self.log("\n" + "="*80)
+            self.log("✅ パイプライン完了")
+            self.log("="*80)
+
+            return True
+
+        except Exception as e:
+            self.log(f"\n❌ エラー: {e}")
+            import traceback
+            self.log(traceback.format_exc())
+
+            # ロールバック（追記した行を取り消す）
+            if appended:
+                store.rollback()
+
+            return False
+
     def run(self) -> bool:
         """
         パイプライン実行
@@ -304,6 +565,9 @@ Co-Authored-By: Claude Sonnet 4.5 <noreply@anthropic.com>
         Returns:
             True: 成功, False: 失敗
         """
+        if self.incremental:
+            return self.run_incremental()
+
         try:
             # ステップ1: Dry Run
             if not self.step1_dry_run():
@@ -370,18 +634,24 @@ Co-Authored-By: Claude Sonnet 4.5 <noreply@anthropic.com>
 
 
 def main():
-    if len(sys.argv) < 2:
-        print("使用方法: python3 add_watch_data.py <new_csv_path>")
+    args = [arg for arg in sys.argv[1:] if not arg.startswith('--')]
+    incremental = '--incremental' in sys.argv[1:]
+    stream = '--stream' in sys.argv[1:]
+
+    if len(args) < 1:
+        print("使用方法: python3 add_watch_data.py <new_csv_path> [--incremental] [--stream]")
         print("例: python3 add_watch_data.py ~/Desktop/new_seiko_2026_feb.csv")
+        print("    --incremental: 既存CSVを読み直さず、新規行だけを追記・集計してタブを部分再生成")
+        print(f"    --stream: 新規CSVを{STREAM_CHUNKSIZE:,}件ずつ読み込んで属性生成・重複チェック（大きなCSV向け）")
         sys.exit(1)
 
-    new_csv_path = sys.argv[1]
+    new_csv_path = args[0]
 
     if not os.path.exists(new_csv_path):
         print(f"❌ エラー: ファイルが見つかりません: {new_csv_path}")
         sys.exit(1)
 
-    pipeline = WatchDataPipeline(new_csv_path)
+    pipeline = WatchDataPipeline(new_csv_path, incremental=incremental, stream=stream)
     success = pipeline.run()
 
     sys.exit(0 if success else 1)
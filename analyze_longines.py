@@ -1,11 +1,11 @@
 #!/usr/bin/env python3
 """Longinesデータの詳細分析"""
 
-import pandas as pd
 import numpy as np
+from utils.data_loader import load_watch_data
 
 # CSVファイルを読み込み
-df = pd.read_csv('/Users/naokijodan/Desktop/時計データ_分類済み.csv')
+df = load_watch_data()
 
 # Longinesデータを抽出（完品のみ）
 longines = df[(df['ブランド'] == 'Longines') & (df['商品状態'] == '完品')].copy()
@@ -0,0 +1,467 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+サイト再構築パイプラインのベンチマーク
+合成した時計データCSV（1万・10万・100万件）で各ステージを個別に計測し、
+処理速度（件/秒）とピークメモリを表示する。結果はJSONのベースラインに保存して回帰を検出できる
+
+ステージ:
+    1. csv_load        CSV読み込み（load_watch_data、キャッシュなし）
+    2. attributes      属性生成（WatchAttributeGenerator.generate_all_attributes）
+    3. classification  ブランド別ライン・キャラクター・型番の分類
+    4. statistics      ブランド別統計
+    5. html_render     ブランドタブ・駆動方式タブのHTML描画
+    6. splice          index.htmlへの反映（TabDocument）とグラフJSONの書き出し
+
+- 分類キャッシュはステージごとに空の一時キャッシュに差し替える（毎回キャッシュなしの状態から計測）
+- 時間は tracemalloc なしで計測し、ピークメモリは tracemalloc を有効にした2回目の実行で計測
+
+使用方法:
+    python3 benchmark_pipeline.py                          # 1万・10万・100万件
+    python3 benchmark_pipeline.py --sizes 10000 100000     # 件数を指定
+    python3 benchmark_pipeline.py --save-baseline          # 結果をベースラインとして保存
+    python3 benchmark_pipeline.py --compare                # ベースラインと比較（回帰があれば終了コード1）
+    python3 benchmark_pipeline.py --no-memory              # ピークメモリを計測しない
+"""
+import contextlib
+import io
+import json
+import os
+import platform
+import sys
+import tempfile
+import time
+import tracemalloc
+
+import numpy as np
+import pandas as pd
+
+import build_movement_tabs
+from generate_attributes import WatchAttributeGenerator
+from rebuild_template_brand_tabs import load_configs
+from utils.brand_tab_renderer import apply_brand_tabs, classify_brand_frame, compute_brand_stats, render_brand_tab
+from utils.chart_bundle import ChartBundle
+from utils.classification_cache import ClassificationCache, set_cache
+from utils.data_loader import build_typed_frame, load_watch_data
+from utils.html_tabs import TabDocument
+
+
+REPO_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# 合成CSVの保存先（.cache/ は再生成できるものだけを置く）
+SYNTHETIC_DIR = os.path.join(REPO_DIR, '.cache', 'benchmark')
+
+# ベースラインの保存先
+BASELINE_PATH = os.path.join(REPO_DIR, 'benchmark_baseline.json')
+
+# 反映先のindex.html（読むだけで書き換えない）
+INDEX_HTML_PATH = os.path.join(REPO_DIR, 'index.html')
+
+DEFAULT_SIZES = [10_000, 100_000, 1_000_000]
+
+# 合成データの作り方を変えたら上げる（CSVを作り直す）
+GENERATOR_VERSION = 1
+
+# この割合以上遅くなったら回帰とみなす
+DEFAULT_THRESHOLD = 0.20
+
+# 差がこれ未満なら計測誤差とみなす（秒・MB）
+NOISE_FLOOR = {'seconds': 0.05, 'peak_mb': 1.0}
+
+STAGES = ['csv_load', 'attributes', 'classification', 'statistics', 'html_render', 'splice']
+
+# ===== 合成データの分布 =====
+# ブランド: (出現比率, 価格中央値$, 型番の形式, ライン/シリーズのキーワード)
+# 型番の形式は '#' が数字、'A' が英大文字。template_brand_tab形式のブランドはCONFIGのライン定義を使う
+SYNTHETIC_BRANDS = {
+    'SEIKO': (0.17, 180, 'AAAA###', ['PRESAGE', 'PROSPEX', 'ASTRON', 'SEIKO 5', 'KING SEIKO', 'GRAND SEIKO']),
+    'CASIO': (0.12, 70, 'AA-####', ['G-SHOCK', 'BABY-G', 'OCEANUS', 'EDIFICE', 'PRO TREK']),
+    'CITIZEN': (0.08, 120, 'AA####-##A', ['PROMASTER', 'ATTESA', 'EXCEED', 'XC', 'CHRONOMASTER']),
+    'OMEGA': (0.06, 1400, '###.##.##.##.##.###', ['SEAMASTER', 'SPEEDMASTER', 'CONSTELLATION', 'DE VILLE']),
+    'Orient': (0.04, 150, 'AA##AAA#', ['BAMBINO', 'MAKO', 'RAY', 'ORIENT STAR']),
+    'Longines': (0.05, 700, 'L#.###.#.##.#', None),
+    'Tissot': (0.04, 300, 'T###.###.##.###.##', None),
+    'Hamilton': (0.03, 450, 'H########', ['KHAKI', 'JAZZMASTER', 'VENTURA', 'BROADWAY']),
+    'TAG HEUER': (0.03, 1100, 'AAA####', ['CARRERA', 'AQUARACER', 'FORMULA 1', 'MONACO']),
+    'BREITLING': (0.02, 2200, 'A#####', None),
+    'Cartier': (0.02, 2500, 'WAAA####', None),
+    'GUCCI': (0.03, 250, '####L', ['G-TIMELESS', 'SYNC', 'DIVE', 'SHERRY LINE']),
+    'RADO': (0.02, 400, 'R########', ['CAPTAIN COOK', 'INTEGRAL', 'CERAMICA', 'DIASTAR']),
+    'ROLEX': (0.02, 6000, '#####', ['DATEJUST', 'SUBMARINER', 'OYSTER PERPETUAL', 'DAY-DATE']),
+    'Swatch': (0.03, 60, 'AAA###', None),
+    'NIXON': (0.02, 80, 'A###-###', None),
+    'DIOR': (0.015, 500, 'CD####', None),
+    'ISSEY MIYAKE': (0.015, 120, 'AAAA###', None),
+    'SAINT LAURENT': (0.015, 300, '######', None),
+    'Oris': (0.015, 900, '###-####-####', ['AQUIS', 'BIG CROWN', 'DIVERS SIXTY-FIVE']),
+    '(不明)': (0.20, 50, 'A####', ['FASHION', 'VINTAGE STYLE']),
+}
+
+MOVEMENT_WORDS = ['AUTOMATIC', 'QUARTZ', 'SOLAR', 'ECO-DRIVE', 'HAND WINDING', 'DIGITAL', 'SMARTWATCH', '']
+MOVEMENT_WEIGHTS = [0.30, 0.30, 0.10, 0.04, 0.04, 0.04, 0.02, 0.16]
+DEPARTMENT_WORDS = ['MENS', 'WOMENS', 'LADIES', 'UNISEX', 'BOYS', '']
+DEPARTMENT_WEIGHTS = [0.45, 0.10, 0.10, 0.05, 0.02, 0.28]
+CONDITION_WORDS = ['', 'WITH BOX', 'VINTAGE', 'JUNK', 'FOR PARTS', 'BAND ONLY', 'JAPAN', 'PAPERS', 'NEW']
+CONDITION_WEIGHTS = [0.50, 0.12, 0.10, 0.05, 0.04, 0.03, 0.06, 0.04, 0.06]
+TAIL_WORDS = ['WATCH', 'WRISTWATCH', 'Watch', '']
+
+
+def _expand_model_format(fmt, rng, count):
+    """型番の形式から重複のない型番をcount個作る"""
+    digits = np.array(list('0123456789'))
+    letters = np.array(list('ABCDEFGHJKLMNPRSTUVWXYZ'))
+    models = set()
+    attempts = 0
+    while len(models) < count and attempts < count * 5:
+        models.add(''.join(rng.choice(digits) if ch == '#' else rng.choice(letters) if ch == 'A' else ch
+                           for ch in fmt))
+        attempts += 1
+    return sorted(models)
+
+
+def _line_keywords():
+    """ブランドごとのラインキーワード（template_brand_tab形式のブランドはCONFIGから取得）"""
+    config_lines = {config.brand_name: config.lines for config in load_configs()}
+    keywords = {}
+    for brand, (_, _, _, lines) in SYNTHETIC_BRANDS.items():
+        if lines is None:
+            lines = [kws[0] for kws in config_lines.get(brand, {}).values() if kws]
+        keywords[brand] = lines or ['']
+    return keywords
+
+
+def generate_synthetic_data(n_rows, seed=0):
+    """
+    合成した時計データを作成（分類前の元データと同じ列構成）
+
+    ブランド比率・価格帯・型番の人気度（Zipf分布）を実データに近づけている。
+
+    Args:
+        n_rows: 件数
+        seed: 乱数シード
+
+    Returns:
+        タイトル・ブランド・価格・販売数・販売日 列のDataFrame
+    """
+    rng = np.random.default_rng(seed)
+    brands = list(SYNTHETIC_BRANDS)
+    weights = np.array([SYNTHETIC_BRANDS[b][0] for b in brands])
+    brand_idx = rng.choice(len(brands), size=n_rows, p=weights / weights.sum())
+    line_keywords = _line_keywords()
+
+    brand_col = np.empty(n_rows, dtype=object)
+    line_col = np.empty(n_rows, dtype=object)
+    model_col = np.empty(n_rows, dtype=object)
+    price_col = np.empty(n_rows, dtype=float)
+
+    for i, brand in enumerate(brands):
+        rows = np.flatnonzero(brand_idx == i)
+        if len(rows) == 0:
+            continue
+        _, median_price, model_format, _ = SYNTHETIC_BRANDS[brand]
+        brand_col[rows] = brand
+
+        # ライン（25%はライン名なし）
+        lines = np.array(line_keywords[brand] + [''], dtype=object)
+        line_p = np.full(len(lines), 0.75 / (len(lines) - 1)) if len(lines) > 1 else np.ones(1)
+        if len(lines) > 1:
+            line_p[-1] = 0.25
+        line_col[rows] = lines[rng.choice(len(lines), size=len(rows), p=line_p)]
+
+        # 型番（人気度はZipf分布、30%は型番なし）
+        pool = np.array(_expand_model_format(model_format, rng, min(5000, len(rows) // 20 + 20)) + [''],
+                        dtype=object)
+        ranks = np.arange(1, len(pool))
+        model_p = np.append(0.7 * (1 / ranks ** 1.1) / (1 / ranks ** 1.1).sum(), 0.3)
+        model_col[rows] = pool[rng.choice(len(pool), size=len(rows), p=model_p)]
+
+        price_col[rows] = np.round(median_price * rng.lognormal(0, 0.7, size=len(rows)), 2)
+
+    def pick(words, p):
+        return np.array(words, dtype=object)[rng.choice(len(words), size=n_rows, p=p)]
+
+    movement_col = pick(MOVEMENT_WORDS, MOVEMENT_WEIGHTS)
+    dept_col = pick(DEPARTMENT_WORDS, DEPARTMENT_WEIGHTS)
+    condition_col = pick(CONDITION_WORDS, CONDITION_WEIGHTS)
+    tail_col = pick(TAIL_WORDS, [0.6, 0.15, 0.15, 0.1])
+    title_case = rng.random(n_rows) < 0.15
+
+    titles = []
+    for parts in zip(brand_col, line_col, model_col, movement_col, dept_col, condition_col, tail_col, title_case):
+        title = ' '.join(p for p in parts[:7] if p and p != '(不明)')
+        titles.append(title.title() if parts[7] else title)
+
+    sales = rng.choice([1, 2, 3, 4, 5], size=n_rows, p=[0.85, 0.10, 0.03, 0.01, 0.01])
+    start = np.datetime64('2025-01-01')
+    days = rng.integers(0, 540, size=n_rows)
+
+    return pd.DataFrame({
+        'タイトル': titles,
+        'ブランド': brand_col,
+        '価格': price_col,
+        '販売数': sales,
+        '販売日': (start + days.astype('timedelta64[D]')).astype(str),
+    })
+
+
+def synthetic_csv_path(n_rows, seed=0):
+    """
+    合成CSVのパスを返す（なければ作成）
+
+    Args:
+        n_rows: 件数
+        seed: 乱数シード
+
+    Returns:
+        CSVファイルのパス
+    """
+    path = os.path.join(SYNTHETIC_DIR, f'watch_data_v{GENERATOR_VERSION}_{n_rows}_{seed}.csv')
+    if not os.path.exists(path):
+        os.makedirs(SYNTHETIC_DIR, exist_ok=True)
+        print(f"🔧 合成データ作成中: {n_rows:,}件")
+        generate_synthetic_data(n_rows, seed).to_csv(path, index=False)
+    return path
+
+
+# ============================================================
+# ステージ
+# ============================================================
+
+def _stage_csv_load(ctx):
+    return load_watch_data(ctx['csv_path'], categorical=True, use_cache=False)
+
+
+def _stage_attributes(ctx):
+    df = WatchAttributeGenerator.generate_all_attributes(ctx['csv_load'])
+    return build_typed_frame(df)
+
+
+def _stage_classification(ctx):
+    df = ctx['attributes']
+    configs = ctx['configs']
+    df_target = df[(df['商品状態'] == '完品') & df['ブランド'].isin([c.brand_name for c in configs])]
+    groups = {brand: group for brand, group in df_target.groupby('ブランド', sort=False, observed=True)}
+    return {config.brand_name: classify_brand_frame(groups[config.brand_name], config)
+            for config in configs if config.brand_name in groups}
+
+
+def _stage_statistics(ctx):
+    return {config.brand_name: compute_brand_stats(ctx['classification'][config.brand_name], config)
+            for config in ctx['configs'] if config.brand_name in ctx['classification']}
+
+
+def _stage_html_render(ctx):
+    brand_results = [(config, render_brand_tab(ctx['statistics'][config.brand_name], config))
+                     for config in ctx['configs'] if config.brand_name in ctx['statistics']]
+
+    # 駆動方式タブ（統計と描画が1関数にまとまっているため、このステージで計測）
+    df = ctx['attributes']
+    df_complete = df[df['商品状態'] == '完品']
+    charts = ChartBundle()
+    movement_tabs = {}
+    for movement_key, movement in build_movement_tabs.MOVEMENTS.items():
+        movement_tabs[movement['tab_id']] = build_movement_tabs.generate_movement_tab_html(
+            movement_key, df_complete, charts)
+    return brand_results, movement_tabs, charts
+
+
+def _stage_splice(ctx):
+    brand_results, movement_tabs, charts = ctx['html_render']
+    doc = TabDocument(ctx['index_html'])
+
+    for tab_id, tab_html in movement_tabs.items():
+        if tab_html and doc.has_tab(tab_id):
+            doc.replace_tab(tab_id, tab_html)
+    apply_brand_tabs(doc, brand_results, charts)
+
+    html = charts.finalize(doc.render())
+    charts.write(os.path.join(ctx['workdir'], 'charts'))
+    return len(html)
+
+
+STAGE_FUNCTIONS = {
+    'csv_load': _stage_csv_load,
+    'attributes': _stage_attributes,
+    'classification': _stage_classification,
+    'statistics': _stage_statistics,
+    'html_render': _stage_html_render,
+    'splice': _stage_splice,
+}
+
+
+def _run_stage(name, ctx, cache_path, trace_memory):
+    """
+    1ステージを実行（空の分類キャッシュで開始、ステージ内の進捗表示は出さない）
+
+    Returns:
+        (結果, 経過秒数, ピークメモリMB or None)
+    """
+    previous = set_cache(ClassificationCache(cache_path))
+    try:
+        if trace_memory:
+            tracemalloc.start()
+        start = time.perf_counter()
+        with contextlib.redirect_stdout(io.StringIO()):
+            result = STAGE_FUNCTIONS[name](ctx)
+        elapsed = time.perf_counter() - start
+        peak_mb = None
+        if trace_memory:
+            peak_mb = tracemalloc.get_traced_memory()[1] / 1024 / 1024
+            tracemalloc.stop()
+        return result, elapsed, peak_mb
+    finally:
+        set_cache(previous)
+
+
+def run_benchmark(n_rows, measure_memory=True, seed=0):
+    """
+    1つのデータ件数で全ステージを計測
+
+    Args:
+        n_rows: 合成データの件数
+        measure_memory: Trueならtracemallocでピークメモリも計測（各ステージを2回実行）
+        seed: 合成データの乱数シード
+
+    Returns:
+        {ステージ名: {'seconds', 'rows_per_sec', 'peak_mb'}} の辞書
+    """
+    csv_path = synthetic_csv_path(n_rows, seed)
+    with open(INDEX_HTML_PATH, 'r', encoding='utf-8') as f:
+        index_html = f.read()
+
+    results = {}
+    with tempfile.TemporaryDirectory() as workdir:
+        ctx = {'csv_path': csv_path, 'configs': load_configs(), 'index_html': index_html, 'workdir': workdir}
+        print(f"\n=== {n_rows:,}件 ===")
+        for name in STAGES:
+            result, elapsed, _ = _run_stage(name, ctx, os.path.join(workdir, f'{name}.sqlite'), False)
+            peak_mb = None
+            if measure_memory:
+                _, _, peak_mb = _run_stage(name, ctx, os.path.join(workdir, f'{name}_memory.sqlite'), True)
+            ctx[name] = result
+
+            results[name] = {
+                'seconds': round(elapsed, 4),
+                'rows_per_sec': round(n_rows / elapsed) if elapsed > 0 else None,
+                'peak_mb': round(peak_mb, 1) if peak_mb is not None else None,
+            }
+            memory = f"{peak_mb:8.1f}MB" if peak_mb is not None else '       -'
+            print(f"  {name:<15} {elapsed:8.3f}秒  {n_rows / elapsed:12,.0f}件/秒  {memory}")
+    return results
+
+
+# ============================================================
+# ベースライン
+# ============================================================
+
+def environment_info():
+    """計測環境（ベースラインと比較する際の参考情報）"""
+    return {
+        'python': platform.python_version(),
+        'pandas': pd.__version__,
+        'numpy': np.__version__,
+        'machine': platform.machine(),
+        'platform': platform.platform(),
+    }
+
+
+def load_baseline(path=BASELINE_PATH):
+    """ベースラインを読み込む（なければNone）"""
+    if not os.path.exists(path):
+        return None
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def save_baseline(all_results, path=BASELINE_PATH):
+    """
+    計測結果をベースラインとして保存（同じ件数の結果だけ上書き）
+
+    Args:
+        all_results: {件数: run_benchmark() の結果}
+        path: 保存先
+    """
+    baseline = load_baseline(path) or {'version': GENERATOR_VERSION, 'results': {}}
+    if baseline.get('version') != GENERATOR_VERSION:
+        baseline = {'version': GENERATOR_VERSION, 'results': {}}
+    baseline['environment'] = environment_info()
+    baseline['created_at'] = time.strftime('%Y-%m-%dT%H:%M:%S')
+    for n_rows, results in all_results.items():
+        baseline['results'][str(n_rows)] = results
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(baseline, f, ensure_ascii=False, indent=2)
+    print(f"\n💾 ベースライン保存: {path}")
+
+
+def compare_with_baseline(all_results, baseline, threshold=DEFAULT_THRESHOLD):
+    """
+    ベースラインと比較して回帰を検出
+
+    Args:
+        all_results: {件数: run_benchmark() の結果}
+        baseline: load_baseline() の結果
+        threshold: この割合以上 遅く（またはメモリが多く）なったら回帰
+                   （差が NOISE_FLOOR 未満の場合は計測誤差として扱う）
+
+    Returns:
+        回帰の説明文のリスト（なければ空）
+    """
+    regressions = []
+    if baseline.get('version') != GENERATOR_VERSION:
+        print("⚠️ ベースラインの合成データのバージョンが異なるため比較しません")
+        return regressions
+
+    print(f"\n=== ベースライン比較（許容: +{threshold:.0%}） ===")
+    for n_rows, results in all_results.items():
+        base_results = baseline['results'].get(str(n_rows))
+        if base_results is None:
+            print(f"  - {n_rows:,}件: ベースラインなし")
+            continue
+        for name, current in results.items():
+            base = base_results.get(name)
+            if base is None:
+                continue
+            for key, label in [('seconds', '時間'), ('peak_mb', 'メモリ')]:
+                if current.get(key) is None or not base.get(key):
+                    continue
+                ratio = current[key] / base[key] - 1
+                regressed = ratio > threshold and current[key] - base[key] >= NOISE_FLOOR[key]
+                mark = '❌' if regressed else '✓'
+                print(f"  {mark} {n_rows:>9,}件 {name:<15} {label}: {base[key]} → {current[key]} ({ratio:+.1%})")
+                if regressed:
+                    regressions.append(f"{n_rows:,}件 {name} {label} {ratio:+.1%}")
+    return regressions
+
+
+def main(argv):
+    sizes = DEFAULT_SIZES
+    if '--sizes' in argv:
+        pos = argv.index('--sizes') + 1
+        sizes = []
+        while pos < len(argv) and not argv[pos].startswith('--'):
+            sizes.append(int(argv[pos].replace('_', '').replace(',', '')))
+            pos += 1
+    threshold = DEFAULT_THRESHOLD
+    if '--threshold' in argv:
+        threshold = float(argv[argv.index('--threshold') + 1])
+
+    print(f"📊 パイプラインベンチマーク（{', '.join(f'{n:,}' for n in sizes)}件）")
+    all_results = {n_rows: run_benchmark(n_rows, measure_memory='--no-memory' not in argv) for n_rows in sizes}
+
+    if '--compare' in argv:
+        baseline = load_baseline()
+        if baseline is None:
+            print(f"\n⚠️ ベースラインがありません: {BASELINE_PATH}")
+        elif compare_with_baseline(all_results, baseline, threshold):
+            print("\n❌ 性能の回帰があります")
+            return 1
+        else:
+            print("\n✅ 回帰なし")
+
+    if '--save-baseline' in argv:
+        save_baseline(all_results)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main(sys.argv[1:]))
@@ -6,8 +6,12 @@
 
 import pandas as pd
 import numpy as np
-import json
 from urllib.parse import quote
+from utils.chart_bundle import ChartBundle
+from utils.data_loader import load_watch_data
+from utils.html_tabs import has_tab, replace_tab
+from utils.price_bands import DOLLAR50_TAB_BANDS
+from utils.quantile_sketch import median
 
 # 設定
 EXCHANGE_RATE = 155
@@ -80,11 +84,21 @@ MOVEMENTS = {
     }
 }
 
-# CSVデータ読み込み
-print("=== CSVデータ読み込み ===")
-df = pd.read_csv('/Users/naokijodan/Desktop/時計データ_分類済み.csv')
-df_complete = df[df['商品状態'] == '完品'].copy()
-print(f"完品データ: {len(df_complete)}件\n")
+# タブ生成に使う列（インクリメンタルビルドの入力宣言）
+INPUT_COLUMNS = ['駆動方式', 'ブランド', 'タイトル', '価格', 'デパートメント', '販売日']
+
+# index.htmlのパス
+INDEX_HTML_PATH = '/Users/naokijodan/Desktop/watch-market-analysis/index.html'
+
+
+def load_complete_data(df=None):
+    """完品データを取得（dfを渡した場合はCSVを読み直さない）"""
+    if df is None:
+        print("=== CSVデータ読み込み ===")
+        df = load_watch_data()
+    df_complete = df[df['商品状態'] == '完品'].copy()
+    print(f"完品データ: {len(df_complete)}件\n")
+    return df_complete
 
 
 def calculate_stats(df_mov):
@@ -92,16 +106,17 @@ def calculate_stats(df_mov):
     if len(df_mov) == 0:
         return None
 
+    median_price = median(df_mov['価格'])
     stats = {
         'total_sales': len(df_mov),
         'avg_price': df_mov['価格'].mean(),
-        'median_price': df_mov['価格'].median(),
+        'median_price': median_price,
         'min_price': df_mov['価格'].min(),
         'max_price': df_mov['価格'].max(),
         'total_revenue': df_mov['価格'].sum(),
         'cv': df_mov['価格'].std() / df_mov['価格'].mean() if df_mov['価格'].mean() > 0 else 0,
         'unique_models': df_mov['タイトル'].nunique(),
-        'breakeven_median': df_mov['価格'].median() * EXCHANGE_RATE * (1 - FEE_RATE) - SHIPPING
+        'breakeven_median': median_price * EXCHANGE_RATE * (1 - FEE_RATE) - SHIPPING
     }
 
     return stats
@@ -114,9 +129,9 @@ def get_brand_data(df_mov):
     for brand in df_mov['ブランド'].value_counts().index[:20]:  # Top20
         df_brand = df_mov[df_mov['ブランド'] == brand]
 
-        median = df_brand['価格'].median()
+        median_price = median(df_brand['価格'])
         cv = df_brand['価格'].std() / df_brand['価格'].mean() if df_brand['価格'].mean() > 0 else 0
-        breakeven = median * EXCHANGE_RATE * (1 - FEE_RATE) - SHIPPING
+        breakeven = median_price * EXCHANGE_RATE * (1 - FEE_RATE) - SHIPPING
 
         brand_data.append({
             'brand': brand,
@@ -124,8 +139,8 @@ def get_brand_data(df_mov):
             'count': len(df_brand),
             'min': df_brand['価格'].min(),
             'max': df_brand['価格'].max(),
-            'median': median,
-            'median_jpy': median * EXCHANGE_RATE,
+            'median': median_price,
+            'median_jpy': median_price * EXCHANGE_RATE,
             'breakeven': breakeven,
             'cv': cv
         })
@@ -133,8 +148,18 @@ def get_brand_data(df_mov):
     return brand_data
 
 
-def generate_movement_tab_html(movement_key, df_complete):
-    """駆動方式タブのHTMLを生成"""
+def generate_movement_tab_html(movement_key, df_complete, charts):
+    """
+    駆動方式タブのHTMLを生成
+
+    Args:
+        movement_key: MOVEMENTSのキー
+        df_complete: 完品データ
+        charts: グラフデータの登録先（ChartBundle）
+
+    Returns:
+        タブHTML（グラフはchartsに登録し、HTMLには埋め込まない）
+    """
 
     movement = MOVEMENTS[movement_key]
     df_mov = df_complete[df_complete['駆動方式'] == movement['ja']].copy()
@@ -155,19 +180,7 @@ def generate_movement_tab_html(movement_key, df_complete):
     brand_top10 = [(b['jp_brand'], b['count']) for b in brand_data[:10]]
 
     # 価格帯分布（50ドル刻み）
-    price_bins = list(range(0, 1001, 50))
-    price_bins.append(10000)  # 1000+
-    price_labels = [f'${i}-{i+49}' for i in range(0, 1000, 50)]
-    price_labels.append('$1000+')
-
-    price_dist = {}
-    for i, label in enumerate(price_labels):
-        if i < len(price_bins) - 1:
-            count = len(df_mov[(df_mov['価格'] >= price_bins[i]) & (df_mov['価格'] < price_bins[i+1])])
-            price_dist[label] = count
-        else:
-            count = len(df_mov[df_mov['価格'] >= 1000])
-            price_dist[label] = count
+    price_dist = DOLLAR50_TAB_BANDS.distribution(df_mov['価格'])
 
     # デパートメント分布
     dept_dist = df_mov['デパートメント'].value_counts().to_dict()
@@ -278,108 +291,83 @@ def generate_movement_tab_html(movement_key, df_complete):
             </table>
         </div>
     </div>
-
-    <script>
 '''
 
-    # グラフ用JavaScript
+    # グラフデータ（タブ表示時に charts/<タブID>.json から描画）
+    tab_id = movement['tab_id']
     brand_labels = [b[0] for b in brand_top10]
     brand_values = [b[1] for b in brand_top10]
 
-    price_labels_list = list(price_dist.keys())
-    price_values_list = list(price_dist.values())
-
-    dept_labels = list(dept_dist.keys())
-    dept_values = list(dept_dist.values())
-
-    html += f'''
-    // ブランド別販売数（横棒グラフ）
-    Plotly.newPlot('{movement['tab_id']}_brand_bar', [{{
-        x: {brand_values},
-        y: {json.dumps(brand_labels)},
-        type: 'bar',
-        orientation: 'h',
-        marker: {{color: '{movement['color']}'}}
-    }}], {{...plotlyLayout, title: 'ブランド別販売数（Top10）', xaxis: {{title: '販売数'}}, yaxis: {{title: 'ブランド'}}}}, plotlyConfig);
-
-    // ブランド別シェア（円グラフ）
-    Plotly.newPlot('{movement['tab_id']}_brand_pie', [{{
-        labels: {json.dumps(brand_labels)},
-        values: {brand_values},
-        type: 'pie'
-    }}], {{...plotlyLayout, title: 'ブランド別シェア（Top10）'}}, plotlyConfig);
-
-    // 価格帯分布
-    Plotly.newPlot('{movement['tab_id']}_price_dist', [{{
-        x: {json.dumps(price_labels_list)},
-        y: {price_values_list},
-        type: 'bar',
-        marker: {{color: '{movement['color']}'}}
-    }}], {{...plotlyLayout, title: '価格帯分布（50ドル刻み）', xaxis: {{title: '価格帯'}}, yaxis: {{title: '件数'}}}}, plotlyConfig);
-
-    // デパートメント分布
-    Plotly.newPlot('{movement['tab_id']}_dept_pie', [{{
-        labels: {json.dumps(dept_labels)},
-        values: {dept_values},
-        type: 'pie'
-    }}], {{...plotlyLayout, title: 'デパートメント分布'}}, plotlyConfig);
-    </script>
-'''
+    # ブランド別販売数（横棒グラフ）
+    charts.add(tab_id, f'{tab_id}_brand_bar', [{
+        'x': brand_values,
+        'y': brand_labels,
+        'type': 'bar',
+        'orientation': 'h',
+        'marker': {'color': movement['color']}
+    }], {'title': 'ブランド別販売数（Top10）', 'xaxis': {'title': '販売数'}, 'yaxis': {'title': 'ブランド'}},
+        base_layout=True)
+
+    # ブランド別シェア（円グラフ）
+    charts.add(tab_id, f'{tab_id}_brand_pie', [{
+        'labels': brand_labels,
+        'values': brand_values,
+        'type': 'pie'
+    }], {'title': 'ブランド別シェア（Top10）'}, base_layout=True)
+
+    # 価格帯分布
+    charts.add(tab_id, f'{tab_id}_price_dist', [{
+        'x': list(price_dist.keys()),
+        'y': list(price_dist.values()),
+        'type': 'bar',
+        'marker': {'color': movement['color']}
+    }], {'title': '価格帯分布（50ドル刻み）', 'xaxis': {'title': '価格帯'}, 'yaxis': {'title': '件数'}},
+        base_layout=True)
+
+    # デパートメント分布
+    charts.add(tab_id, f'{tab_id}_dept_pie', [{
+        'labels': list(dept_dist.keys()),
+        'values': list(dept_dist.values()),
+        'type': 'pie'
+    }], {'title': 'デパートメント分布'}, base_layout=True)
 
     return html
 
 
-# メイン処理
-print("=== 駆動方式タブHTML生成 ===\n")
+def main():
+    """メイン処理"""
+    df_complete = load_complete_data()
 
-# HTMLファイル読み込み
-with open('/Users/naokijodan/Desktop/watch-market-analysis/index.html', 'r', encoding='utf-8') as f:
-    html = f.read()
+    print("=== 駆動方式タブHTML生成 ===\n")
+
+    # HTMLファイル読み込み
+    with open(INDEX_HTML_PATH, 'r', encoding='utf-8') as f:
+        html = f.read()
+
+    # 全駆動方式タブを置換
+    charts = ChartBundle()
+    for movement_key in MOVEMENTS:
+        movement = MOVEMENTS[movement_key]
+
+        if not has_tab(html, movement['tab_id']):
+            print(f"❌ {movement['ja']}タブが見つかりません")
+            continue
+
+        # 新しいタブHTMLを生成して置換
+        new_tab_html = generate_movement_tab_html(movement_key, df_complete, charts)
+        html = replace_tab(html, movement['tab_id'], new_tab_html)
+        print(f"✅ {movement['ja']}タブを置換しました\n")
+
+    # グラフデータを書き出し、インラインのグラフスクリプトを遅延読み込みに置き換え
+    html = charts.save(INDEX_HTML_PATH, html)
+
+    # HTMLファイルを保存
+    with open(INDEX_HTML_PATH, 'w', encoding='utf-8') as f:
+        f.write(html)
+
+    print("=== 完了 ===")
+    print(f"ファイルサイズ: {len(html)}文字")
 
-# 全駆動方式タブを置換
-for movement_key in ['automatic', 'quartz', 'solar', 'manual', 'smartwatch', 'digital']:
-    movement = MOVEMENTS[movement_key]
 
-    # 既存タブの開始位置を探す
-    tab_start = html.find(f'<div id="{movement["tab_id"]}" class="tab-content">')
-
-    if tab_start == -1:
-        print(f"❌ {movement['ja']}タブが見つかりません")
-        continue
-
-    # タブの終了位置を探す（ネストカウント）
-    div_count = 1
-    search_pos = tab_start + len(f'<div id="{movement["tab_id"]}" class="tab-content">')
-
-    while div_count > 0 and search_pos < len(html):
-        next_open = html.find('<div', search_pos)
-        next_close = html.find('</div>', search_pos)
-
-        if next_close == -1:
-            print(f"❌ {movement['ja']}タブの終了位置が見つかりません")
-            break
-
-        if next_open != -1 and next_open < next_close:
-            div_count += 1
-            search_pos = next_open + 4
-        else:
-            div_count -= 1
-            if div_count == 0:
-                tab_end = next_close + 6
-                break
-            else:
-                search_pos = next_close + 6
-
-    # 新しいタブHTMLを生成
-    new_tab_html = generate_movement_tab_html(movement_key, df_complete)
-
-    # 置換
-    html = html[:tab_start] + new_tab_html + html[tab_end:]
-    print(f"✅ {movement['ja']}タブを置換しました\n")
-
-# HTMLファイルを保存
-with open('/Users/naokijodan/Desktop/watch-market-analysis/index.html', 'w', encoding='utf-8') as f:
-    f.write(html)
-
-print("=== 完了 ===")
-print(f"ファイルサイズ: {len(html)}文字")
+if __name__ == '__main__':
+    main()
@@ -4,11 +4,13 @@
 ベルト素材、ケース素材、文字盤色、ケースサイズの詳細分析タブを生成
 """
 
-import pandas as pd
-import numpy as np
-import json
 import re
 from urllib.parse import quote
+from utils.chart_bundle import ChartBundle
+from utils.data_loader import load_watch_data
+from utils.html_tabs import find_tab_position
+from utils.price_bands import DOLLAR50_TAB_BANDS
+from utils.quantile_sketch import median
 
 # 設定
 EXCHANGE_RATE = 155
@@ -150,28 +152,46 @@ def extract_case_size(title):
     else:
         return '不明'
 
-# CSVデータ読み込み
-print("=== CSVデータ読み込み ===")
-df = pd.read_csv('/Users/naokijodan/Desktop/時計データ_分類済み.csv')
-df_complete = df[df['商品状態'] == '完品'].copy()
-print(f"完品データ: {len(df_complete)}件\n")
+# タブ生成に使う列（インクリメンタルビルドの入力宣言）
+INPUT_COLUMNS = ['ブランド', 'タイトル', '価格', 'デパートメント']
 
-# 属性を抽出
-print("=== 属性抽出中 ===")
-df_complete['ベルト素材'] = df_complete['タイトル'].apply(extract_belt_material)
-df_complete['ケース素材'] = df_complete['タイトル'].apply(extract_case_material)
-df_complete['文字盤色'] = df_complete['タイトル'].apply(extract_dial_color)
-df_complete['ケースサイズ'] = df_complete['タイトル'].apply(extract_case_size)
+# パーツ属性列
+PARTS_ATTRIBUTES = ['ベルト素材', 'ケース素材', '文字盤色', 'ケースサイズ']
 
-# 属性分布を表示
-for attr in ['ベルト素材', 'ケース素材', '文字盤色', 'ケースサイズ']:
-    print(f"\n{attr}分布:")
-    print(df_complete[attr].value_counts())
-    unknown_rate = (df_complete[attr] == '不明').sum() / len(df_complete) * 100
-    known_count = (df_complete[attr] != '不明').sum()
-    print(f"不明率: {unknown_rate:.1f}% | 判別可能: {known_count}件")
+# index.htmlのパス
+INDEX_HTML_PATH = '/Users/naokijodan/Desktop/watch-market-analysis/index.html'
 
-print("\n")
+
+def add_parts_attributes(df_complete, verbose=True):
+    """パーツ属性列（ベルト素材/ケース素材/文字盤色/ケースサイズ）を追加"""
+    print("=== 属性抽出中 ===")
+    df_complete['ベルト素材'] = df_complete['タイトル'].apply(extract_belt_material)
+    df_complete['ケース素材'] = df_complete['タイトル'].apply(extract_case_material)
+    df_complete['文字盤色'] = df_complete['タイトル'].apply(extract_dial_color)
+    df_complete['ケースサイズ'] = df_complete['タイトル'].apply(extract_case_size)
+
+    if verbose:
+        # 属性分布を表示
+        for attr in PARTS_ATTRIBUTES:
+            print(f"\n{attr}分布:")
+            print(df_complete[attr].value_counts())
+            unknown_rate = (df_complete[attr] == '不明').sum() / len(df_complete) * 100
+            known_count = (df_complete[attr] != '不明').sum()
+            print(f"不明率: {unknown_rate:.1f}% | 判別可能: {known_count}件")
+
+        print("\n")
+
+    return df_complete
+
+
+def load_complete_data(df=None):
+    """完品データを取得してパーツ属性を追加（dfを渡した場合はCSVを読み直さない）"""
+    if df is None:
+        print("=== CSVデータ読み込み ===")
+        df = load_watch_data()
+    df_complete = df[df['商品状態'] == '完品'].copy()
+    print(f"完品データ: {len(df_complete)}件\n")
+    return add_parts_attributes(df_complete)
 
 
 def calculate_stats(df_part):
@@ -179,16 +199,17 @@ def calculate_stats(df_part):
     if len(df_part) == 0:
         return None
 
+    median_price = median(df_part['価格'])
     stats = {
         'total_sales': len(df_part),
         'avg_price': df_part['価格'].mean(),
-        'median_price': df_part['価格'].median(),
+        'median_price': median_price,
         'min_price': df_part['価格'].min(),
         'max_price': df_part['価格'].max(),
         'total_revenue': df_part['価格'].sum(),
         'cv': df_part['価格'].std() / df_part['価格'].mean() if df_part['価格'].mean() > 0 else 0,
         'unique_models': df_part['タイトル'].nunique(),
-        'breakeven_median': df_part['価格'].median() * EXCHANGE_RATE * (1 - FEE_RATE) - SHIPPING
+        'breakeven_median': median_price * EXCHANGE_RATE * (1 - FEE_RATE) - SHIPPING
     }
 
     return stats
@@ -201,9 +222,9 @@ def get_brand_data(df_part):
     for brand in df_part['ブランド'].value_counts().index[:20]:  # Top20
         df_brand = df_part[df_part['ブランド'] == brand]
 
-        median = df_brand['価格'].median()
+        median_price = median(df_brand['価格'])
         cv = df_brand['価格'].std() / df_brand['価格'].mean() if df_brand['価格'].mean() > 0 else 0
-        breakeven = median * EXCHANGE_RATE * (1 - FEE_RATE) - SHIPPING
+        breakeven = median_price * EXCHANGE_RATE * (1 - FEE_RATE) - SHIPPING
 
         brand_data.append({
             'brand': brand,
@@ -211,8 +232,8 @@ def get_brand_data(df_part):
             'count': len(df_brand),
             'min': df_brand['価格'].min(),
             'max': df_brand['価格'].max(),
-            'median': median,
-            'median_jpy': median * EXCHANGE_RATE,
+            'median': median_price,
+            'median_jpy': median_price * EXCHANGE_RATE,
             'breakeven': breakeven,
             'cv': cv
         })
@@ -220,8 +241,18 @@ def get_brand_data(df_part):
     return brand_data
 
 
-def generate_parts_tab_html(parts_key, df_complete):
-    """パーツタブのHTMLを生成"""
+def generate_parts_tab_html(parts_key, df_complete, charts):
+    """
+    パーツタブのHTMLを生成
+
+    Args:
+        parts_key: PARTS_TABSのキー
+        df_complete: 属性列を追加済みの完品データ
+        charts: グラフデータの登録先（ChartBundle）
+
+    Returns:
+        タブHTML（グラフはchartsに登録し、HTMLには埋め込まない）
+    """
 
     parts = PARTS_TABS[parts_key]
     attribute_name = parts['attribute']
@@ -245,19 +276,7 @@ def generate_parts_tab_html(parts_key, df_complete):
     brand_top10 = [(b['jp_brand'], b['count']) for b in brand_data[:10]]
 
     # 価格帯分布（50ドル刻み）
-    price_bins = list(range(0, 1001, 50))
-    price_bins.append(10000)  # 1000+
-    price_labels = [f'${i}-{i+49}' for i in range(0, 1000, 50)]
-    price_labels.append('$1000+')
-
-    price_dist = {}
-    for i, label in enumerate(price_labels):
-        if i < len(price_bins) - 1:
-            count = len(df_part[(df_part['価格'] >= price_bins[i]) & (df_part['価格'] < price_bins[i+1])])
-            price_dist[label] = count
-        else:
-            count = len(df_part[df_part['価格'] >= 1000])
-            price_dist[label] = count
+    price_dist = DOLLAR50_TAB_BANDS.distribution(df_part['価格'])
 
     # デパートメント分布
     dept_dist = df_part['デパートメント'].value_counts().to_dict()
@@ -375,131 +394,126 @@ def generate_parts_tab_html(parts_key, df_complete):
             </table>
         </div>
     </div>
-
-    <script>
 '''
 
-    # グラフ用JavaScript
+    # グラフデータ（タブ表示時に charts/<タブID>.json から描画）
+    tab_id = parts['tab_id']
     brand_labels = [b[0] for b in brand_top10]
     brand_values = [b[1] for b in brand_top10]
 
-    price_labels_list = list(price_dist.keys())
-    price_values_list = list(price_dist.values())
-
-    attr_labels = list(attr_dist.keys())
-    attr_values = list(attr_dist.values())
-
-    html += f'''
-    // ブランド別販売数（横棒グラフ）
-    Plotly.newPlot('{parts['tab_id']}_brand_bar', [{{
-        x: {brand_values},
-        y: {json.dumps(brand_labels)},
-        type: 'bar',
-        orientation: 'h',
-        marker: {{color: '{parts['color']}'}}
-    }}], {{...plotlyLayout, title: 'ブランド別販売数（Top10）', xaxis: {{title: '販売数'}}, yaxis: {{title: 'ブランド'}}}}, plotlyConfig);
-
-    // ブランド別シェア（円グラフ）
-    Plotly.newPlot('{parts['tab_id']}_brand_pie', [{{
-        labels: {json.dumps(brand_labels)},
-        values: {brand_values},
-        type: 'pie'
-    }}], {{...plotlyLayout, title: 'ブランド別シェア（Top10）'}}, plotlyConfig);
-
-    // 価格帯分布
-    Plotly.newPlot('{parts['tab_id']}_price_dist', [{{
-        x: {json.dumps(price_labels_list)},
-        y: {price_values_list},
-        type: 'bar',
-        marker: {{color: '{parts['color']}'}}
-    }}], {{...plotlyLayout, title: '価格帯分布（50ドル刻み）', xaxis: {{title: '価格帯'}}, yaxis: {{title: '件数'}}}}, plotlyConfig);
-
-    // {parts['ja']}別分布
-    Plotly.newPlot('{parts['tab_id']}_attr_pie', [{{
-        labels: {json.dumps(attr_labels)},
-        values: {attr_values},
-        type: 'pie'
-    }}], {{...plotlyLayout, title: '{parts['ja']}別分布（Top10）'}}, plotlyConfig);
-    </script>
-'''
+    # ブランド別販売数（横棒グラフ）
+    charts.add(tab_id, f'{tab_id}_brand_bar', [{
+        'x': brand_values,
+        'y': brand_labels,
+        'type': 'bar',
+        'orientation': 'h',
+        'marker': {'color': parts['color']}
+    }], {'title': 'ブランド別販売数（Top10）', 'xaxis': {'title': '販売数'}, 'yaxis': {'title': 'ブランド'}},
+        base_layout=True)
+
+    # ブランド別シェア（円グラフ）
+    charts.add(tab_id, f'{tab_id}_brand_pie', [{
+        'labels': brand_labels,
+        'values': brand_values,
+        'type': 'pie'
+    }], {'title': 'ブランド別シェア（Top10）'}, base_layout=True)
+
+    # 価格帯分布
+    charts.add(tab_id, f'{tab_id}_price_dist', [{
+        'x': list(price_dist.keys()),
+        'y': list(price_dist.values()),
+        'type': 'bar',
+        'marker': {'color': parts['color']}
+    }], {'title': '価格帯分布（50ドル刻み）', 'xaxis': {'title': '価格帯'}, 'yaxis': {'title': '件数'}},
+        base_layout=True)
+
+    # 属性別分布
+    charts.add(tab_id, f'{tab_id}_attr_pie', [{
+        'labels': list(attr_dist.keys()),
+        'values': list(attr_dist.values()),
+        'type': 'pie'
+    }], {'title': f"{parts['ja']}別分布（Top10）"}, base_layout=True)
 
     return html
 
 
-# メイン処理
-print("=== パーツタブHTML生成 ===\n")
+def insert_parts_tab_buttons(html):
+    """パーツタブボタンを追加（デジタルタブボタンの後、追加済みなら何もしない）"""
+    missing = [key for key in PARTS_TABS
+               if f'data-tab="{PARTS_TABS[key]["tab_id"]}"' not in html
+               and f"showTab('{PARTS_TABS[key]['tab_id']}')" not in html]
+    if not missing:
+        return html
+
+    tab_buttons_insert = html.find('<button class="tab-btn" data-tab="automatic">')
+    if tab_buttons_insert == -1:
+        print("❌ タブボタン挿入位置が見つかりません")
+        return html
+
+    # デジタルタブボタンの後を探す
+    digital_btn_pos = html.find('<button class="tab-btn" data-tab="digital">')
+    if digital_btn_pos == -1:
+        print("❌ デジタルタブボタンが見つかりません")
+        return html
+
+    # </button>の終了位置を探す
+    digital_btn_end = html.find('</button>', digital_btn_pos) + 9
+
+    # パーツタブボタンを生成
+    parts_buttons = ""
+    for parts_key in missing:
+        parts = PARTS_TABS[parts_key]
+        parts_buttons += f'\n                <button class="tab-btn" data-tab="{parts["tab_id"]}">{parts["icon"]} {parts["ja"]}</button>'
+
+    # 挿入
+    html = html[:digital_btn_end] + parts_buttons + html[digital_btn_end:]
+    print(f"✅ パーツタブボタンを追加しました\n")
+    return html
 
-# HTMLファイル読み込み
-with open('/Users/naokijodan/Desktop/watch-market-analysis/index.html', 'r', encoding='utf-8') as f:
-    html = f.read()
 
-# デジタルタブの終了位置を探す（パーツタブはその後に追加）
-digital_tab_start = html.find('<div id="digital" class="tab-content">')
-if digital_tab_start == -1:
-    print("❌ デジタルタブが見つかりません")
-    exit(1)
+def main():
+    """メイン処理"""
+    df_complete = load_complete_data()
 
-# デジタルタブの終了位置を探す（ネストカウント）
-div_count = 1
-search_pos = digital_tab_start + len('<div id="digital" class="tab-content">')
+    print("=== パーツタブHTML生成 ===\n")
 
-while div_count > 0 and search_pos < len(html):
-    next_open = html.find('<div', search_pos)
-    next_close = html.find('</div>', search_pos)
+    # HTMLファイル読み込み
+    with open(INDEX_HTML_PATH, 'r', encoding='utf-8') as f:
+        html = f.read()
 
-    if next_close == -1:
-        print("❌ デジタルタブの終了位置が見つかりません")
+    # デジタルタブの終了位置を探す（パーツタブはその後に追加）
+    try:
+        _, digital_tab_end = find_tab_position(html, 'digital')
+    except ValueError as e:
+        print(f"❌ {e}")
         exit(1)
 
-    if next_open != -1 and next_open < next_close:
-        div_count += 1
-        search_pos = next_open + 4
-    else:
-        div_count -= 1
-        if div_count == 0:
-            digital_tab_end = next_close + 6
-            break
-        else:
-            search_pos = next_close + 6
+    print(f"デジタルタブ終了位置: {digital_tab_end}")
 
-print(f"デジタルタブ終了位置: {digital_tab_end}")
+    # パーツタブを生成して挿入
+    all_parts_html = ""
+    charts = ChartBundle()
+    for parts_key in PARTS_TABS:
+        parts_html = generate_parts_tab_html(parts_key, df_complete, charts)
+        all_parts_html += parts_html
 
-# パーツタブを生成して挿入
-all_parts_html = ""
-for parts_key in ['belt-material', 'case-material', 'dial-color', 'case-size']:
-    parts_html = generate_parts_tab_html(parts_key, df_complete)
-    all_parts_html += parts_html
+    # 挿入
+    html = html[:digital_tab_end] + all_parts_html + html[digital_tab_end:]
+    print(f"\n✅ 全パーツタブを挿入しました\n")
 
-# 挿入
-html = html[:digital_tab_end] + all_parts_html + html[digital_tab_end:]
-print(f"\n✅ 全パーツタブを挿入しました\n")
+    # タブボタンも追加（駆動方式タブの後）
+    html = insert_parts_tab_buttons(html)
 
-# タブボタンも追加（駆動方式タブの後）
-tab_buttons_insert = html.find('<button class="tab-btn" data-tab="automatic">')
-if tab_buttons_insert == -1:
-    print("❌ タブボタン挿入位置が見つかりません")
-else:
-    # デジタルタブボタンの後を探す
-    digital_btn_pos = html.find('<button class="tab-btn" data-tab="digital">')
-    if digital_btn_pos == -1:
-        print("❌ デジタルタブボタンが見つかりません")
-    else:
-        # </button>の終了位置を探す
-        digital_btn_end = html.find('</button>', digital_btn_pos) + 9
+    # グラフデータを書き出し、インラインのグラフスクリプトを遅延読み込みに置き換え
+    html = charts.save(INDEX_HTML_PATH, html)
 
-        # パーツタブボタンを生成
-        parts_buttons = ""
-        for parts_key in ['belt-material', 'case-material', 'dial-color', 'case-size']:
-            parts = PARTS_TABS[parts_key]
-            parts_buttons += f'\n                <button class="tab-btn" data-tab="{parts['tab_id']}">{parts['icon']} {parts['ja']}</button>'
+    # HTMLファイルを保存
+    with open(INDEX_HTML_PATH, 'w', encoding='utf-8') as f:
+        f.write(html)
 
-        # 挿入
-        html = html[:digital_btn_end] + parts_buttons + html[digital_btn_end:]
-        print(f"✅ パーツタブボタンを追加しました\n")
+    print("=== 完了 ===")
+    print(f"ファイルサイズ: {len(html):,}文字")
 
-# HTMLファイルを保存
-with open('/Users/naokijodan/Desktop/watch-market-analysis/index.html', 'w', encoding='utf-8') as f:
-    f.write(html)
 
-print("=== 完了 ===")
-print(f"ファイルサイズ: {len(html):,}文字")
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,72 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+公開用サイトのビルド（タブの遅延読み込み）
+index.htmlを空のタブだけのシェルとタブ別HTMLフラグメント（tabs/<タブID>.html）に分けて出力先に書き出す
+（各タブは初めて表示されたときに読み込む。詳細は utils/lazy_tabs.py）
+
+元のindex.htmlは変更しない（各rebuildスクリプトは引き続き全タブを含むindex.htmlを編集する）。
+fetchで読み込むため、出力先はHTTPサーバー経由で開く（file:// では表示中のタブ以外は読み込めない）
+
+--publish を付けると公開用の処理（utils/site_publish.py）も行う:
+CSSの重複を除いた1つのスタイルシートと共通JSをハッシュ付きのファイル名で書き出し、
+.gz/.br の圧縮版とファイル一覧（asset-manifest.json）を作る
+
+使用方法:
+    python3 build_site.py                          # index.html -> site/
+    python3 build_site.py index.html --out public  # 出力先を指定
+    python3 build_site.py --publish                # 公開用の処理も行う
+"""
+import sys
+
+from utils.lazy_tabs import FRAGMENT_DIR_NAME, write_lazy_site
+from utils.site_publish import MANIFEST_NAME
+
+# 既定の出力先
+DEFAULT_OUTPUT_DIR = 'site'
+
+
+def parse_args(argv):
+    """
+    コマンドライン引数を解釈
+
+    Returns:
+        (index.htmlのパス, 出力先ディレクトリ, 公開用の処理を行うか)
+    """
+    index_path = 'index.html'
+    out_dir = DEFAULT_OUTPUT_DIR
+    publish = '--publish' in argv
+    args = [arg for arg in argv if arg != '--publish']
+    if '--out' in args:
+        pos = args.index('--out')
+        if pos + 1 < len(args):
+            out_dir = args[pos + 1]
+        del args[pos:pos + 2]
+    if args:
+        index_path = args[0]
+    return index_path, out_dir, publish
+
+
+def main(argv):
+    index_path, out_dir, publish = parse_args(argv)
+    print(f"📂 {index_path} -> {out_dir}/")
+
+    result = write_lazy_site(index_path, out_dir, publish=publish)
+
+    for tab_id, reason in result['eager'].items():
+        print(f"  - {tab_id}: シェルに残す（{reason}）")
+    print(f"  ✓ タブ別フラグメント: {result['fragments']}タブ")
+    print(f"  ✓ シェル: {result['shell'] / 1024:,.0f}KB（元のindex.html: {result['source'] / 1024:,.0f}KB）")
+    if publish:
+        files = result['manifest']['files']
+        for name, path in result['manifest']['assets'].items():
+            if not name.startswith(f'{FRAGMENT_DIR_NAME}/'):
+                print(f"  ✓ {path}: {files[path]['size'] / 1024:,.0f}KB")
+        print(f"  ✓ index.html: {files['index.html']['size'] / 1024:,.0f}KB"
+              f"（gzip {files['index.html'].get('gz', files['index.html']['size']) / 1024:,.0f}KB）")
+        print(f"  ✓ ファイル一覧: {MANIFEST_NAME}（{len(files)}ファイル）")
+    print(f"\n✅ 公開用サイトを出力しました（更新したファイル: {result['updated']}）")
+
+
+if __name__ == '__main__':
+    main(sys.argv[1:])
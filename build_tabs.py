@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+タブ一括ビルドスクリプト（1プロセス・インクリメンタル）
+駆動方式タブとパーツタブをビルドグラフに登録し、入力が変わったタブだけを再生成
+
+使用方法:
+    python3 build_tabs.py            # 変更のあったタブのみ再生成
+    python3 build_tabs.py --force    # 全タブを再生成
+"""
+import sys
+
+import build_movement_tabs
+import build_parts_tabs
+from utils.build_graph import BuildGraph, BuildTarget
+from utils.data_loader import DEFAULT_CSV_PATH, load_watch_data
+
+
+def create_build_graph():
+    """駆動方式・パーツタブのターゲットを登録したビルドグラフを作成"""
+    graph = BuildGraph()
+
+    # 駆動方式タブ（各駆動方式の行のみが入力）
+    for movement_key, movement in build_movement_tabs.MOVEMENTS.items():
+        graph.register(BuildTarget(
+            name=f'movement:{movement_key}',
+            tab_id=movement['tab_id'],
+            render=lambda df, charts, key=movement_key: build_movement_tabs.generate_movement_tab_html(key, df, charts),
+            columns=build_movement_tabs.INPUT_COLUMNS,
+            select=lambda df, ja=movement['ja']: df[df['駆動方式'] == ja],
+            version=2,
+        ))
+
+    # パーツタブ（判別率に全体件数を使うため、完品全体が入力）
+    previous_tab = 'digital'
+    for parts_key, parts in build_parts_tabs.PARTS_TABS.items():
+        graph.register(BuildTarget(
+            name=f'parts:{parts_key}',
+            tab_id=parts['tab_id'],
+            render=lambda df, charts, key=parts_key: build_parts_tabs.generate_parts_tab_html(key, df, charts),
+            columns=build_parts_tabs.INPUT_COLUMNS + [parts['attribute']],
+            insert_after=previous_tab,
+            version=2,
+        ))
+        previous_tab = parts['tab_id']
+
+    graph.add_finalizer(build_parts_tabs.insert_parts_tab_buttons)
+
+    return graph
+
+
+def run_build(csv_path=DEFAULT_CSV_PATH, index_path=build_movement_tabs.INDEX_HTML_PATH,
+              df=None, force=False, only=None):
+    """
+    タブをビルド
+
+    Args:
+        csv_path: 時計データCSVのパス
+        index_path: index.htmlのパス
+        df: 読み込み済みDataFrame（指定時はCSVを読まない）
+        force: Trueなら全タブを再生成
+        only: 対象ターゲット名のリスト（Noneなら全ターゲット。affected_targets() の結果など）
+
+    Returns:
+        再生成したターゲット名のリスト
+    """
+    if df is None:
+        print("=== CSVデータ読み込み ===")
+        df = load_watch_data(csv_path)
+
+    # 完品抽出とパーツ属性付与は全ターゲット共通で1回だけ
+    df_complete = build_parts_tabs.load_complete_data(df)
+
+    print("=== タブビルド ===")
+    graph = create_build_graph()
+    rebuilt = graph.build(df_complete, index_path, force=force, only=only)
+    print(f"\n✅ 再生成: {len(rebuilt)}/{len(graph.targets)}タブ")
+    return rebuilt
+
+
+def affected_targets(df_new):
+    """
+    追加データが入力に含まれるターゲット名のリスト
+
+    Args:
+        df_new: 追加した行（属性生成済み）
+
+    Returns:
+        ターゲット名のリスト（run_build(only=...) に渡す）
+    """
+    df_complete = build_parts_tabs.load_complete_data(df_new)
+    return [target.name for target in create_build_graph().targets
+            if len(target.input_frame(df_complete)) > 0]
+
+
+if __name__ == '__main__':
+    run_build(force='--force' in sys.argv[1:])
@@ -7,9 +7,10 @@ CSVデータから各タブの要件と現状を分析
 import pandas as pd
 from collections import Counter
 import re
+from utils.data_loader import load_watch_data
 
 # CSVファイル読み込み
-df = pd.read_csv('/Users/naokijodan/Desktop/時計データ_分類済み.csv')
+df = load_watch_data()
 
 print("=" * 80)
 print("watch-market-analysis 分析シート")
@@ -6,9 +6,10 @@
 import pandas as pd
 from collections import Counter
 import re
+from utils.data_loader import load_watch_data
 
 # CSVファイル読み込み
-df = pd.read_csv('/Users/naokijodan/Desktop/時計データ_分類済み.csv')
+df = load_watch_data()
 
 # Excelファイル作成
 with pd.ExcelWriter('/Users/naokijodan/Desktop/watch-market-analysis/分析シート.xlsx', engine='openpyxl') as writer:
@@ -7,6 +7,7 @@ OMEGA タブ修正スクリプト
 """
 
 import re
+from utils.html_tabs import TabDocument
 
 # HTML ファイルを読み込む
 with open('index.html', 'r', encoding='utf-8') as f:
@@ -30,38 +31,16 @@ else:
 # ===== 修正2: OMEGA セクションの価格表示を ¥ から $ に変更 =====
 print("\n2. OMEGA セクションの価格表示を修正中...")
 
-# OMEGA タブの開始位置を特定
-omega_start = html.find('<div id="OMEGA" class="tab-content">')
-if omega_start == -1:
+# OMEGA タブの位置を特定（TabDocumentが1回の走査でネストを解決）
+doc = TabDocument(html)
+if not doc.has_tab('OMEGA'):
     print("   ❌ OMEGA タブが見つかりません")
     exit(1)
 
-# OMEGA タブの終了位置を特定（ネストカウント）
-div_count = 1
-search_pos = omega_start + len('<div id="OMEGA" class="tab-content">')
-omega_end = -1
-
-while div_count > 0 and search_pos < len(html):
-    next_open = html.find('<div', search_pos)
-    next_close = html.find('</div>', search_pos)
-
-    if next_close == -1:
-        print("   ❌ OMEGA タブの終了タグが見つかりません")
-        exit(1)
-
-    if next_open != -1 and next_open < next_close:
-        div_count += 1
-        search_pos = next_open + 4
-    else:
-        div_count -= 1
-        if div_count == 0:
-            omega_end = next_close + 6
-            break
-        else:
-            search_pos = next_close + 6
-
-if omega_end == -1:
-    print("   ❌ OMEGA タブの終了位置が特定できません")
+try:
+    omega_start, omega_end = doc.tab_span('OMEGA')
+except ValueError:
+    print("   ❌ OMEGA タブの終了タグが見つかりません")
     exit(1)
 
 # OMEGA セクション内の ¥ を $ に置換
@@ -82,7 +61,8 @@ omega_section = re.sub(
 
 # 変更があったかチェック
 if omega_section != original_omega:
-    html = html[:omega_start] + omega_section + html[omega_end:]
+    doc.replace_tab('OMEGA', omega_section)
+    html = doc.render()
 
     # 変更数をカウント
     yen_count = original_omega.count('¥')
@@ -5,11 +5,11 @@
 2. 価格帯分布 → 50ドル刻みに変更
 """
 
-import pandas as pd
 import re
+from utils.data_loader import load_watch_data
 
 # CSVデータ読み込み
-df = pd.read_csv('/Users/naokijodan/Desktop/時計データ_分類済み.csv')
+df = load_watch_data()
 df_complete = df[df['商品状態'] == '完品'].copy()
 
 # 価格帯分布を50ドル刻みで計算
@@ -10,11 +10,12 @@ overview tabの問題を修正
 import pandas as pd
 import json
 from datetime import datetime
+from utils.data_loader import load_watch_data
 
 print("=== overview tab修正開始 ===\n")
 
 # CSVデータ読み込み
-df = pd.read_csv('/Users/naokijodan/Desktop/時計データ_分類済み.csv')
+df = load_watch_data()
 df_complete = df[df['商品状態'] == '完品'].copy()
 
 print(f"総データ数: {len(df):,}件")
@@ -3,12 +3,70 @@
 """
 時計データ属性生成スクリプト
 新規CSVデータに必須属性を自動生成します
+
+使用方法:
+    python3 generate_attributes.py <input_csv>             # 全件を読み込んで生成
+    python3 generate_attributes.py <input_csv> --stream    # チャンクごとに読み込み・生成・書き出し（省メモリ）
 """
 
+import numpy as np
 import pandas as pd
 import re
 from typing import Dict, Tuple
 
+from utils.classification_cache import cached_classify, classifier_version
+
+
+# ストリーミング処理で一度に読み込む行数
+STREAM_CHUNKSIZE = 50_000
+
+
+def attributes_csv_path(input_csv: str) -> str:
+    """属性生成済みCSVの出力パス（<input>_with_attributes.csv）"""
+    return input_csv.replace('.csv', '_with_attributes.csv')
+
+
+class ExtractionRateCounter:
+    """
+    抽出率の件数集計
+
+    チャンクごとに add() で件数を足し込み、rates() で全件の抽出率を返す
+    （全件をまとめて calculate_extraction_rates() に渡した場合と同じ値）
+
+    Attributes:
+        total: 集計した行数
+        counts: 抽出率ごとの該当件数
+    """
+
+    # 抽出率名 -> 該当行の判定
+    CRITERIA = {
+        '商品状態_完品率': lambda df: df['商品状態'] == '完品',
+        '駆動方式_判定率': lambda df: df['駆動方式'] != '不明',
+        'デパートメント_判定率': lambda df: df['デパートメント'] != '不明',
+        'JDM率': lambda df: df['JDM'],
+        'ヴィンテージ率': lambda df: df['ヴィンテージ'],
+        '箱付き率': lambda df: df['箱付き'],
+        '保証書付き率': lambda df: df['保証書付き'],
+    }
+
+    def __init__(self):
+        self.total = 0
+        self.counts = dict.fromkeys(self.CRITERIA, 0)
+
+    def add(self, df: pd.DataFrame) -> 'ExtractionRateCounter':
+        """属性生成済みデータの件数を足し込む"""
+        self.total += len(df)
+        for name, criterion in self.CRITERIA.items():
+            self.counts[name] += int(criterion(df).sum())
+        return self
+
+    def rates(self) -> Dict[str, float]:
+        """各属性の抽出率（%）。1件もなければ空のdict"""
+        if self.total == 0:
+            return {}
+        return {name: count / self.total * 100 for name, count in self.counts.items()}
+
+
 class WatchAttributeGenerator:
     """時計データの属性を生成するクラス"""
 
@@ -190,55 +248,126 @@ class WatchAttributeGenerator:
         return False
 
     @staticmethod
-    def generate_all_attributes(df: pd.DataFrame) -> pd.DataFrame:
+    def _keyword_pattern(keywords) -> str:
+        """キーワードリストを部分一致用の正規表現（選択）に変換"""
+        return '|'.join(re.escape(kw) for kw in keywords)
+
+    @staticmethod
+    def _contains(title_upper: pd.Series, keywords) -> np.ndarray:
+        """いずれかのキーワードを含むか（ベクトル演算）"""
+        pattern = WatchAttributeGenerator._keyword_pattern(keywords)
+        return title_upper.str.contains(pattern, regex=True).to_numpy(dtype=bool, copy=True)
+
+    @staticmethod
+    def _select_first(title_upper: pd.Series, keyword_dict: Dict[str, list],
+                      default: str) -> np.ndarray:
+        """辞書順で最初にマッチしたキーを返す（ベクトル演算）"""
+        keys = list(keyword_dict.keys())
+        conditions = [WatchAttributeGenerator._contains(title_upper, keyword_dict[k]) for k in keys]
+        if not conditions:
+            return np.full(len(title_upper), default, dtype=object)
+        return np.select(conditions, keys, default=default).astype(object)
+
+    # 分類キャッシュに保存する属性（この順序でタプル化）
+    ATTRIBUTE_COLUMNS = ['商品状態', '駆動方式', 'JDM', 'ヴィンテージ', '箱付き', '保証書付き', 'デパートメント']
+
+    # 判定ロジックのバージョン（判定方法を変えたら上げる）
+    ATTRIBUTE_LOGIC_VERSION = 1
+
+    @classmethod
+    def attribute_version(cls) -> str:
+        """キーワード辞書から分類キャッシュ用のバージョンを計算"""
+        return classifier_version(
+            cls.ATTRIBUTE_LOGIC_VERSION,
+            cls.PARTS_EXCLUSIVE_KEYWORDS, cls.PARTS_MAYBE_KEYWORDS, cls.JUNK_KEYWORDS,
+            list(cls.MOVEMENT_KEYWORDS.items()), list(cls.DEPARTMENT_KEYWORDS.items()),
+            cls.JDM_KEYWORDS, cls.VINTAGE_KEYWORDS, cls.BOX_KEYWORDS, cls.WARRANTY_KEYWORDS
+        )
+
+    @staticmethod
+    def classify_titles_upper(title_upper: pd.Series) -> list:
+        """
+        大文字化済みタイトル（欠損値なし）の属性を一括判定
+
+        各キーワード群は選択正規表現による str.contains でまとめて判定する
+        （結果は classify_* / detect_* を1件ずつ適用した場合と同一）
+
+        Args:
+            title_upper: 大文字化されたタイトルのSeries
+
+        Returns:
+            ATTRIBUTE_COLUMNS順の属性リストのリスト
+        """
+        G = WatchAttributeGenerator
+        title_upper = title_upper.astype(str)
+
+        # 商品状態（優先順位: ジャンク → 明確なパーツ → WATCHあり → パーツの可能性 → 完品）
+        is_junk = G._contains(title_upper, G.JUNK_KEYWORDS)
+        is_parts = G._contains(title_upper, G.PARTS_EXCLUSIVE_KEYWORDS)
+        has_watch = G._contains(title_upper, ['WATCH', ' WA'])
+        is_bundle = (G._contains(title_upper, ['LOT'])
+                     | (title_upper.str.count('WATCH').to_numpy() > 2))
+        maybe_parts = G._contains(title_upper, G.PARTS_MAYBE_KEYWORDS)
+        product_state = np.select(
+            [is_junk, is_parts, has_watch & is_bundle, has_watch, maybe_parts],
+            ['ジャンク', 'パーツ', 'まとめ売り', '完品', 'パーツ'],
+            default='完品'
+        )
+
+        # 駆動方式・デパートメント（辞書順で最初にマッチしたもの）
+        movement = G._select_first(title_upper, G.MOVEMENT_KEYWORDS, '不明')
+        department = G._select_first(title_upper, G.DEPARTMENT_KEYWORDS, '不明')
+
+        # フラグ類
+        jdm = G._contains(title_upper, G.JDM_KEYWORDS)
+        vintage = G._contains(title_upper, G.VINTAGE_KEYWORDS)
+        box = (G._contains(title_upper, G.BOX_KEYWORDS)
+               & ~G._contains(title_upper, ['NO BOX', 'EMPTY BOX']))
+        warranty = G._contains(title_upper, G.WARRANTY_KEYWORDS)
+
+        return [list(row) for row in zip(
+            product_state.tolist(), movement.tolist(), jdm.tolist(), vintage.tolist(),
+            box.tolist(), warranty.tolist(), department.tolist()
+        )]
+
+    @staticmethod
+    def generate_all_attributes(df: pd.DataFrame, use_cache: bool = True) -> pd.DataFrame:
         """
         全属性を生成
 
+        タイトルの大文字化は1回だけ行い、重複タイトルは1回だけ判定する
+        （use_cache=True なら判定結果を分類キャッシュに保存し、未判定のタイトルだけ処理）
+
         Args:
             df: 元のDataFrame（タイトル列が必須）
+            use_cache: 分類キャッシュを使うか
 
         Returns:
             属性が追加されたDataFrame
         """
+        G = WatchAttributeGenerator
         df_copy = df.copy()
 
         # タイトル_upper
         df_copy['タイトル_upper'] = df_copy['タイトル'].str.upper()
 
-        # 商品状態
-        df_copy['商品状態'] = df_copy['タイトル'].apply(
-            WatchAttributeGenerator.classify_product_state
-        )
-
-        # 駆動方式
-        df_copy['駆動方式'] = df_copy['タイトル'].apply(
-            WatchAttributeGenerator.classify_movement_type
-        )
-
-        # JDM
-        df_copy['JDM'] = df_copy['タイトル'].apply(
-            WatchAttributeGenerator.detect_jdm
-        )
-
-        # ヴィンテージ
-        df_copy['ヴィンテージ'] = df_copy['タイトル'].apply(
-            WatchAttributeGenerator.detect_vintage
-        )
-
-        # 箱付き
-        df_copy['箱付き'] = df_copy['タイトル'].apply(
-            WatchAttributeGenerator.detect_box
-        )
+        # 判定用の大文字タイトル（欠損値は判定せず既定値）
+        missing = df_copy['タイトル'].isna().to_numpy()
+        title_upper = df_copy['タイトル'][~missing].astype(str).str.upper().astype(object)
 
-        # 保証書付き
-        df_copy['保証書付き'] = df_copy['タイトル'].apply(
-            WatchAttributeGenerator.detect_warranty
-        )
+        if use_cache:
+            rows = cached_classify(title_upper, 'attributes', G.attribute_version(),
+                                   G.classify_titles_upper)
+        else:
+            rows = G.classify_titles_upper(title_upper)
 
-        # デパートメント
-        df_copy['デパートメント'] = df_copy['タイトル'].apply(
-            WatchAttributeGenerator.classify_department
-        )
+        defaults = ['完品', '不明', False, False, False, False, '不明']
+        columns = list(zip(*rows)) if len(rows) > 0 else [()] * len(defaults)
+        for col, default, column in zip(G.ATTRIBUTE_COLUMNS, defaults, columns):
+            values = np.empty(len(df_copy), dtype=object)
+            values[:] = default
+            values[~missing] = column
+            df_copy[col] = pd.Series(values.tolist(), index=df_copy.index)
 
         return df_copy
 
@@ -250,31 +379,68 @@ class WatchAttributeGenerator:
         Returns:
             各属性の抽出率
         """
-        total = len(df)
-        if total == 0:
-            return {}
+        return ExtractionRateCounter().add(df).rates()
 
-        return {
-            '商品状態_完品率': (df['商品状態'] == '完品').sum() / total * 100,
-            '駆動方式_判定率': (df['駆動方式'] != '不明').sum() / total * 100,
-            'デパートメント_判定率': (df['デパートメント'] != '不明').sum() / total * 100,
-            'JDM率': df['JDM'].sum() / total * 100,
-            'ヴィンテージ率': df['ヴィンテージ'].sum() / total * 100,
-            '箱付き率': df['箱付き'].sum() / total * 100,
-            '保証書付き率': df['保証書付き'].sum() / total * 100,
-        }
+    @staticmethod
+    def generate_attributes_streaming(input_csv: str, output_csv: str,
+                                      chunksize: int = STREAM_CHUNKSIZE,
+                                      use_cache: bool = True) -> ExtractionRateCounter:
+        """
+        CSVをチャンクごとに読み込んで属性を生成し、出力CSVにチャンクごとに書き出す
+        （メモリ使用量はチャンクの大きさで決まり、入力CSVの件数によらない）
+
+        Args:
+            input_csv: 入力CSV（タイトル列が必須）
+            output_csv: 属性生成済みCSVの出力先（上書き）
+            chunksize: 一度に読み込む行数
+            use_cache: 分類キャッシュを使うか
+
+        Returns:
+            全件の抽出率の件数集計（ExtractionRateCounter）
+        """
+        G = WatchAttributeGenerator
+        counter = ExtractionRateCounter()
+        header = True
+        for chunk in pd.read_csv(input_csv, chunksize=chunksize):
+            df_with_attrs = G.generate_all_attributes(chunk, use_cache=use_cache)
+            counter.add(df_with_attrs)
+            df_with_attrs.to_csv(output_csv, index=False, header=header, mode='w' if header else 'a')
+            header = False
+
+        # 空のCSV（ヘッダーのみ）でも列だけは書き出す
+        if header:
+            empty = G.generate_all_attributes(pd.read_csv(input_csv, nrows=0), use_cache=False)
+            empty.to_csv(output_csv, index=False)
+        return counter
 
 
 def main():
     """単体実行用メイン関数"""
     import sys
 
-    if len(sys.argv) < 2:
-        print("使用方法: python3 generate_attributes.py <input_csv>")
+    args = [arg for arg in sys.argv[1:] if not arg.startswith('--')]
+    stream = '--stream' in sys.argv[1:]
+
+    if len(args) < 1:
+        print("使用方法: python3 generate_attributes.py <input_csv> [--stream]")
         print("例: python3 generate_attributes.py ~/Desktop/new_watch_data.csv")
+        print(f"    --stream: {STREAM_CHUNKSIZE:,}件ずつ読み込み・生成・書き出し（大きなCSV向け）")
         sys.exit(1)
 
-    input_csv = sys.argv[1]
+    input_csv = args[0]
+    output_csv = attributes_csv_path(input_csv)
+
+    if stream:
+        print(f"📂 CSVをチャンクごとに処理中（{STREAM_CHUNKSIZE:,}件ずつ）: {input_csv}")
+        counter = WatchAttributeGenerator.generate_attributes_streaming(input_csv, output_csv)
+        print(f"✓ {counter.total}件の属性を生成しました\n")
+
+        print("📊 抽出率:")
+        for attr, rate in counter.rates().items():
+            print(f"  {attr}: {rate:.1f}%")
+        print()
+        print(f"✅ 保存完了: {output_csv}")
+        return
 
     print(f"📂 CSVを読み込み中: {input_csv}")
     df = pd.read_csv(input_csv)
@@ -290,8 +456,6 @@ def main():
         print(f"  {attr}: {rate:.1f}%")
     print()
 
-    # 出力ファイル名
-    output_csv = input_csv.replace('.csv', '_with_attributes.csv')
     df_with_attrs.to_csv(output_csv, index=False)
     print(f"✅ 保存完了: {output_csv}")
 
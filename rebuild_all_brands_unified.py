@@ -2,48 +2,33 @@
 # -*- coding: utf-8 -*-
 """
 全ブランド統合再構築スクリプト
-- SEIKO、CASIO、CITIZEN、Orientを1つのスクリプトで一括生成
-- HTMLの部分置換ではなく、データから全体を生成
-"""
-
-import pandas as pd
-import numpy as np
-import json
-import re
-from datetime import datetime
+- 戦略クラス（strategies/）で全ブランドのタブを一括生成
+- CSV・index.htmlは1回ずつ読み、完品データを1回だけブランド別に分けて、index.htmlを1回だけ保存する
 
-print("🔄 全ブランド統合再構築開始...")
-print(f"実行時刻: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
-print("=" * 60)
+- ブランド未指定では、v3スクリプトなど別レイアウトで作られた既存タブは置き換えない
+  （戦略のレイアウトはv3のセクションを含まないため。置き換える場合はブランドを指定する）
 
-# データ読み込み
-print("\n📄 データ読み込み中...")
-df = pd.read_csv('/Users/naokijodan/Desktop/時計データ_分類済み.csv')
-print(f"✓ 総データ数: {len(df)}件")
-
-# 完品データのみ抽出
-df_complete = df[df['商品状態'] == '完品'].copy()
-print(f"✓ 完品データ: {len(df_complete)}件")
+使用方法:
+    python3 rebuild_all_brands_unified.py                  # 全ブランド（別レイアウトの既存タブは保持）
+    python3 rebuild_all_brands_unified.py SEIKO CASIO      # 指定ブランドのみ（既存タブを置き換える）
+"""
+import sys
+from datetime import datetime
 
-# 各ブランドのデータを抽出
-df_seiko = df_complete[df_complete['ブランド'] == 'SEIKO'].copy()
-df_casio = df_complete[df_complete['ブランド'] == 'CASIO'].copy()
-df_citizen = df_complete[df_complete['ブランド'] == 'CITIZEN'].copy()
-df_orient = df_complete[df_complete['ブランド'] == 'Orient'].copy()
+from strategies.driver import all_strategy_classes, run_strategies
 
-print(f"\n📊 ブランド別データ数:")
-print(f"  SEIKO:   {len(df_seiko)}件")
-print(f"  CASIO:   {len(df_casio)}件")
-print(f"  CITIZEN: {len(df_citizen)}件")
-print(f"  Orient:  {len(df_orient)}件")
 
-# タイトル大文字化
-for brand_df in [df_seiko, df_casio, df_citizen, df_orient]:
-    brand_df['TITLE_UPPER'] = brand_df['タイトル'].str.upper()
+if __name__ == '__main__':
+    print("🔄 全ブランド統合再構築開始...")
+    print(f"実行時刻: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
+    print("=" * 60)
 
-print("\n" + "=" * 60)
-print("✅ データ準備完了")
-print("=" * 60)
+    brand_names = sys.argv[1:]
+    strategy_classes = all_strategy_classes()
+    known = {cls.BRAND_NAME for cls in strategy_classes} | {cls.TAB_ID for cls in strategy_classes}
+    unknown = [name for name in brand_names if name not in known]
+    if unknown:
+        print(f"❌ 対象ブランドが見つかりません: {', '.join(unknown)}")
+        sys.exit(1)
 
-# TODO: 各ブランドの生成関数を実装
-# 次のステップで実装します
+    run_strategies(brand_names=brand_names or None, strategy_classes=strategy_classes)
@@ -4,17 +4,17 @@
 1. 販売数を正しく集計（データ数 → 総販売数）
 2. リンク表示を改善
 """
-import pandas as pd
 import json
 from datetime import datetime
 from urllib.parse import quote
+from utils.data_loader import load_watch_data
 
 print("=" * 80)
 print("ブランド一覧タブの修正")
 print("=" * 80)
 
 # 1. CSVから正しい集計
-df = pd.read_csv('/Users/naokijodan/Desktop/時計データ_分類済み.csv')
+df = load_watch_data()
 
 # ブランド別の総販売数を集計
 brand_sales = df.groupby('ブランド')['販売数'].sum().sort_values(ascending=False)
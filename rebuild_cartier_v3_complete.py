@@ -8,6 +8,9 @@ template_brand_tab.pyを基準に8セクション構成で実装
 import pandas as pd
 import re
 from collections import Counter, defaultdict
+from utils.data_loader import load_watch_data
+from utils.group_stats import GroupStats
+from utils.line_classifier import KeywordLineClassifier
 
 # ============================================================
 # TODO 1: ブランド名の設定
@@ -28,14 +31,11 @@ CARTIER_LINES = {
     'Calibre': ['CALIBRE'],
 }
 
+LINE_CLASSIFIER = KeywordLineClassifier(CARTIER_LINES, default=f'その他{BRAND_NAME}')
+
 def classify_line(title):
     """タイトルからラインを分類"""
-    title_upper = str(title).upper()
-    for line_name, keywords in CARTIER_LINES.items():
-        for keyword in keywords:
-            if keyword in title_upper:
-                return line_name
-    return f'その他{BRAND_NAME}'
+    return LINE_CLASSIFIER.classify(str(title).upper())
 
 # ============================================================
 # TODO 3: 型番抽出関数（Cartier固有）
@@ -100,7 +100,7 @@ print(f"{BRAND_NAME}タブ完全実装スクリプト")
 print("=" * 60)
 
 # データ読み込み
-df = pd.read_csv('/Users/naokijodan/Desktop/時計データ_分類済み.csv')
+df = load_watch_data()
 
 # Cartierのデータを抽出
 brand_df = df[df['ブランド'] == BRAND_NAME].copy()
@@ -115,7 +115,7 @@ extraction_rate = (extracted_count / len(brand_df)) * 100
 print(f"✅ 型番抽出: {extracted_count}個 ({extraction_rate:.1f}%)")
 
 # ライン分類
-brand_df['ライン'] = brand_df['タイトル'].apply(classify_line)
+brand_df['ライン'] = LINE_CLASSIFIER.classify_titles(brand_df['タイトル'])
 line_counts = brand_df['ライン'].value_counts()
 
 print(f"✅ ライン分類: {len(line_counts)}ライン")
@@ -130,6 +130,10 @@ print(f"✅ 特別版: {len(special_counts)}種類")
 for special_name, count in special_counts.items():
     print(f"   - {special_name}: {count}個")
 
+# ライン別・型番別統計（1回のgroupbyで集計し、各セクションで共用）
+brand_stats = GroupStats(brand_df)
+line_table = brand_stats.by('ライン')
+
 # 統計計算
 median_price = brand_df['価格'].median()
 mean_price = brand_df['価格'].mean()
@@ -185,10 +189,8 @@ section1_basic_stats = f'''
 # ライン別中央値計算
 line_stats = {}
 for line_name in line_counts.index[:8]:  # 上位8ライン
-    line_data = brand_df[brand_df['ライン'] == line_name]
-    line_median = line_data['価格'].median()
-    line_count = len(line_data)
-    line_stats[line_name] = {'median': line_median, 'count': line_count}
+    line_row = line_table.loc[line_name]
+    line_stats[line_name] = {'median': line_row['median'], 'count': int(line_row['items'])}
 
 # 仕入戦略テキスト生成
 strategy_lines = []
@@ -323,16 +325,15 @@ else:
 section5_lines = []
 
 for line_name in line_counts.index[:8]:  # 上位8ライン
-    line_data = brand_df[brand_df['ライン'] == line_name].copy()
-    line_data = line_data[line_data['型番'].notna()]
+    line_models = brand_stats.within(['ライン', '型番'], line_name)
 
-    if len(line_data) == 0:
+    if len(line_models) == 0:
         continue
 
-    model_stats = line_data.groupby('型番').agg({
-        '価格': ['count', 'median']
-    }).round(2)
-    model_stats.columns = ['販売数', '中央値']
+    model_stats = pd.DataFrame({
+        '販売数': line_models['items'],
+        '中央値': line_models['median'].round(2),
+    })
     model_stats = model_stats.sort_values('販売数', ascending=False).head(15)
 
     model_rows = []
@@ -398,13 +399,12 @@ section5_line_tops = '\n'.join(section5_lines)
 line_detail_rows = []
 
 for line_name in line_counts.index[:8]:  # 上位8ライン
-    line_data = brand_df[brand_df['ライン'] == line_name]
-    count = len(line_data)
+    line_row = line_table.loc[line_name]
+    count = int(line_row['items'])
     ratio = (count / len(brand_df)) * 100
-    median = line_data['価格'].median()
-    mean = line_data['価格'].mean()
-    std_val = line_data['価格'].std()
-    cv = std_val / mean if mean > 0 else 0
+    median = line_row['median']
+    mean = line_row['mean']
+    cv = line_row['cv']
 
     # 仕入上限計算
     purchase_limit_usd = median * 0.65
@@ -475,21 +475,24 @@ section6_line_detail = f'''
 # セクション7: 全ライン横断Top30
 # ============================================================
 
-top30_df = brand_df[brand_df['型番'].notna()].copy()
-top30_stats = top30_df.groupby('型番').agg({
-    '価格': ['count', 'median']
-}).round(2)
-top30_stats.columns = ['販売数', '中央値']
+model_table = brand_stats.by('型番')
+top30_stats = pd.DataFrame({
+    '販売数': model_table['items'],
+    '中央値': model_table['median'].round(2),
+})
 top30_stats = top30_stats.sort_values('販売数', ascending=False).head(30)
 
+# 型番ごとの最頻ライン（同数なら名前順で先のライン）
+model_line_counts = brand_stats.by(['型番', 'ライン'])['items']
+model_lines = {model: line for model, line in model_line_counts.groupby(level=0).idxmax()}
+
 top30_rows = []
 for idx, (model, row) in enumerate(top30_stats.iterrows(), 1):
     sales = int(row['販売数'])
     median = row['中央値']
 
     # このモデルのライン名を取得
-    model_line = top30_df[top30_df['型番'] == model]['ライン'].mode()
-    line_name = model_line.iloc[0] if len(model_line) > 0 else 'その他Cartier'
+    line_name = model_lines.get(model, 'その他Cartier')
 
     purchase_limit_usd = median * 0.65
     purchase_limit_jpy = int(purchase_limit_usd * 155)
@@ -11,6 +11,8 @@ import pandas as pd
 import json
 import re
 import numpy as np
+from utils.data_loader import load_watch_data
+from utils.line_classifier import KeywordLineClassifier
 
 print("📄 CASIOタブ v3 完全版再構築開始...")
 
@@ -25,7 +27,7 @@ with open('/Users/naokijodan/Desktop/ブランド詳細分析.json', 'r', encodi
     brand_detail = json.load(f)
 
 # 元CSVを読み込み
-df = pd.read_csv('/Users/naokijodan/Desktop/時計データ_分類済み.csv')
+df = load_watch_data()
 df_casio = df[(df['ブランド']=='CASIO') & (df['商品状態']=='完品')].copy()
 
 print(f"✓ CASIO完品データ: {len(df_casio)}件")
@@ -108,13 +110,11 @@ CASIO_LINES_COMPLETE = {
     ],
 }
 
+LINE_CLASSIFIER = KeywordLineClassifier(CASIO_LINES_COMPLETE, default='その他CASIO')
+
 def classify_casio_line(title_upper):
     """タイトルからライン名を抽出（優先順位順）"""
-    for line_name, keywords in CASIO_LINES_COMPLETE.items():
-        for kw in keywords:
-            if kw in title_upper:
-                return line_name
-    return 'その他CASIO'
+    return LINE_CLASSIFIER.classify(title_upper)
 
 def extract_model_number(title):
     """タイトルから型番を抽出（CASIO用）"""
@@ -144,7 +144,7 @@ def calculate_cv(prices):
     return std / mean
 
 # ライン分類実行（通常）
-df_casio['ライン'] = df_casio['タイトル_upper'].apply(classify_casio_line)
+df_casio['ライン'] = LINE_CLASSIFIER.classify_series(df_casio['タイトル_upper'])
 
 # キャラクター/コラボ判定（別視点）
 CHARACTER_KEYWORDS = [
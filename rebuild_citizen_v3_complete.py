@@ -11,6 +11,8 @@ import pandas as pd
 import json
 import re
 import numpy as np
+from utils.data_loader import load_watch_data
+from utils.line_classifier import KeywordLineClassifier
 
 print("📄 CITIZENタブ v3 完全版再構築開始...")
 
@@ -25,7 +27,7 @@ with open('/Users/naokijodan/Desktop/ブランド詳細分析.json', 'r', encodi
     brand_detail = json.load(f)
 
 # 元CSVを読み込み
-df = pd.read_csv('/Users/naokijodan/Desktop/時計データ_分類済み.csv')
+df = load_watch_data()
 df_citizen = df[(df['ブランド']=='CITIZEN') & (df['商品状態']=='完品')].copy()
 
 print(f"✓ CITIZEN完品データ: {len(df_citizen)}件")
@@ -140,13 +142,11 @@ CITIZEN_LINES_COMPLETE = {
     ],
 }
 
+LINE_CLASSIFIER = KeywordLineClassifier(CITIZEN_LINES_COMPLETE, default='その他CITIZEN')
+
 def classify_citizen_line(title_upper):
     """タイトルからライン名を抽出（優先順位順）"""
-    for line_name, keywords in CITIZEN_LINES_COMPLETE.items():
-        for kw in keywords:
-            if kw in title_upper:
-                return line_name
-    return 'その他CITIZEN'
+    return LINE_CLASSIFIER.classify(title_upper)
 
 def extract_model_number(title):
     """タイトルから型番を抽出（CITIZEN用）"""
@@ -181,7 +181,7 @@ def calculate_cv(prices):
     return std / mean
 
 # ライン分類実行（通常）
-df_citizen['ライン'] = df_citizen['タイトル_upper'].apply(classify_citizen_line)
+df_citizen['ライン'] = LINE_CLASSIFIER.classify_series(df_citizen['タイトル_upper'])
 
 # キャラクター/コラボ判定（別視点）
 CHARACTER_KEYWORDS = [
@@ -11,10 +11,12 @@ template_brand_tab.py を基準に8セクション構成で実装
 ================================================================================
 """
 
-import pandas as pd
 import json
 import re
 import numpy as np
+from utils.chart_bundle import ChartBundle
+from utils.data_loader import load_watch_data
+from utils.line_classifier import KeywordLineClassifier
 
 BRAND_NAME = 'GUCCI'
 brand_name_lower = BRAND_NAME.lower()
@@ -25,7 +27,7 @@ print(f"📄 {BRAND_NAME}タブ v3 完全版再構築開始...")
 with open('index.html', 'r', encoding='utf-8') as f:
     html = f.read()
 
-df = pd.read_csv('/Users/naokijodan/Desktop/時計データ_分類済み.csv')
+df = load_watch_data()
 df_brand = df[(df['ブランド']==BRAND_NAME) & (df['商品状態']=='完品')].copy()
 
 print(f"✓ {BRAND_NAME}完品データ: {len(df_brand)}件")
@@ -40,13 +42,11 @@ GUCCI_LINES = {
     'Sync': ['SYNC'],
 }
 
+LINE_CLASSIFIER = KeywordLineClassifier(GUCCI_LINES, default=f'その他{BRAND_NAME}')
+
 def classify_gucci_line(title_upper):
     """タイトルからライン名を抽出（優先順位順）"""
-    for line_name, keywords in GUCCI_LINES.items():
-        for kw in keywords:
-            if kw in title_upper:
-                return line_name
-    return f'その他{BRAND_NAME}'
+    return LINE_CLASSIFIER.classify(title_upper)
 
 # ===== ユーティリティ関数 =====
 
@@ -85,7 +85,7 @@ def extract_model_number(title):
 df_brand['タイトル_upper'] = df_brand['タイトル'].str.upper()
 
 # ===== ライン分類実行 =====
-df_brand['ライン'] = df_brand['タイトル_upper'].apply(classify_gucci_line)
+df_brand['ライン'] = LINE_CLASSIFIER.classify_series(df_brand['タイトル_upper'])
 
 # ===== キャラクター/モチーフ判定 =====
 GUCCI_CHARACTERS = {
@@ -517,70 +517,41 @@ brand_html += '''
     </div>
 '''
 
-# ===== グラフスクリプト生成（Plotly使用） =====
-graph_script = f'''
-        <script>
-        const {brand_name_lower}Green = '{brand_color_primary}';
-        const {brand_name_lower}Red = '{brand_color_accent}';
-        const {brand_name_lower}Gradient = ['{brand_color_primary}', '#00875a', '#00a86b', '#10c77d', '#20e68f'];
-
-        Plotly.newPlot('{brand_name_lower}_price_chart', [{{
-            x: {price_ranges},
-            y: {price_counts},
-            type: 'bar',
-            marker: {{
-                color: {brand_name_lower}Green,
-                line: {{color: {brand_name_lower}Red, width: 1}}
-            }},
-            hovertemplate: '<b>%{{x}}</b><br>販売数: %{{y}}<extra></extra>'
-        }}], {{
-            xaxis: {{title: '価格帯', tickangle: -45}},
-            yaxis: {{title: '販売数'}},
-            margin: {{l: 50, r: 20, t: 20, b: 80}},
-            plot_bgcolor: '#f8f9fa',
-            paper_bgcolor: 'white'
-        }}, {{responsive: true}});
-
-        Plotly.newPlot('{brand_name_lower}_movement_chart', [{{
-            labels: {movement_labels},
-            values: {movement_values},
-            type: 'pie',
-            marker: {{colors: {brand_name_lower}Gradient}},
-            textposition: 'inside',
-            textinfo: 'label+percent',
-            hovertemplate: '<b>%{{label}}</b><br>販売数: %{{value}}<br>割合: %{{percent}}<extra></extra>'
-        }}], {{
-            margin: {{l: 20, r: 20, t: 20, b: 20}},
-            paper_bgcolor: 'white'
-        }}, {{responsive: true}});
-
-        Plotly.newPlot('{brand_name_lower}_gender_chart', [{{
-            labels: {dept_labels},
-            values: {dept_values},
-            type: 'pie',
-            marker: {{colors: {brand_name_lower}Gradient}},
-            textposition: 'inside',
-            textinfo: 'label+percent',
-            hovertemplate: '<b>%{{label}}</b><br>販売数: %{{value}}<br>割合: %{{percent}}<extra></extra>'
-        }}], {{
-            margin: {{l: 20, r: 20, t: 20, b: 20}},
-            paper_bgcolor: 'white'
-        }}, {{responsive: true}});
-
-        Plotly.newPlot('{brand_name_lower}_line_chart', [{{
-            labels: {line_labels},
-            values: {line_values},
-            type: 'pie',
-            marker: {{colors: {brand_name_lower}Gradient}},
-            textposition: 'inside',
-            textinfo: 'label+percent',
-            hovertemplate: '<b>%{{label}}</b><br>販売数: %{{value}}<br>割合: %{{percent}}<extra></extra>'
-        }}], {{
-            margin: {{l: 20, r: 20, t: 20, b: 20}},
-            paper_bgcolor: 'white'
-        }}, {{responsive: true}});
-        </script>
-'''
+# ===== グラフデータ生成（Plotly使用、charts/GUCCI.json に書き出してタブ表示時に描画） =====
+charts = ChartBundle()
+gucci_gradient = [brand_color_primary, '#00875a', '#00a86b', '#10c77d', '#20e68f']
+pie_layout = {'margin': {'l': 20, 'r': 20, 't': 20, 'b': 20}, 'paper_bgcolor': 'white'}
+pie_hovertemplate = '<b>%{label}</b><br>販売数: %{value}<br>割合: %{percent}<extra></extra>'
+
+charts.add(BRAND_NAME, f'{brand_name_lower}_price_chart', [{
+    'x': price_ranges,
+    'y': price_counts,
+    'type': 'bar',
+    'marker': {
+        'color': brand_color_primary,
+        'line': {'color': brand_color_accent, 'width': 1}
+    },
+    'hovertemplate': '<b>%{x}</b><br>販売数: %{y}<extra></extra>'
+}], {
+    'xaxis': {'title': '価格帯', 'tickangle': -45},
+    'yaxis': {'title': '販売数'},
+    'margin': {'l': 50, 'r': 20, 't': 20, 'b': 80},
+    'plot_bgcolor': '#f8f9fa',
+    'paper_bgcolor': 'white'
+}, config={'responsive': True})
+
+for chart_name, labels, values in [('movement', movement_labels, movement_values),
+                                   ('gender', dept_labels, dept_values),
+                                   ('line', line_labels, line_values)]:
+    charts.add(BRAND_NAME, f'{brand_name_lower}_{chart_name}_chart', [{
+        'labels': labels,
+        'values': values,
+        'type': 'pie',
+        'marker': {'colors': gucci_gradient},
+        'textposition': 'inside',
+        'textinfo': 'label+percent',
+        'hovertemplate': pie_hovertemplate
+    }], pie_layout, config={'responsive': True})
 
 # ===== CSS追加 =====
 css_insert = f'''
@@ -712,11 +683,9 @@ if style_end != -1:
     html = html[:style_end] + '\n' + css_insert + '\n' + html[style_end:]
     print(f"   ✓ GUCCI用CSSを追加しました")
 
-# 5. </body>の前にグラフスクリプトを追加
-body_end = html.find('</body>')
-if body_end != -1:
-    html = html[:body_end] + '\n' + graph_script + '\n' + html[body_end:]
-    print(f"   ✓ GUCCIグラフスクリプトを追加しました")
+# 5. グラフデータを書き出し、インラインのグラフスクリプトを遅延読み込みに置き換え
+html = charts.save('index.html', html)
+print(f"   ✓ GUCCIグラフデータを書き出しました")
 
 # 6. タブボタンを追加（存在しない場合）
 if 'data-tab="GUCCI"' not in html:
@@ -735,7 +704,7 @@ with open('index.html', 'w', encoding='utf-8') as f:
 
 print(f"\n✅ {BRAND_NAME}タブ再構築完了！")
 print(f"   - 8セクション構成")
-print(f"   - グラフ4つ（Plotly）")
+print(f"   - グラフ4つ（Plotly、charts/{BRAND_NAME}.json）")
 print(f"   - 型番抽出率: {df_brand['型番抽出'].notna().sum()/len(df_brand)*100:.1f}%")
 print(f"   - ライン数: {len(line_stats)}")
 print(f"   - Top30型番: {len(model_stats_all)}モデル")
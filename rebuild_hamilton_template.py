@@ -19,10 +19,11 @@
 ================================================================================
 """
 
-import pandas as pd
 import json
 import re
 import numpy as np
+from utils.data_loader import load_watch_data
+from utils.line_classifier import KeywordLineClassifier
 
 # TODO: ブランド名を変更
 BRAND_NAME = 'BRANDNAME'  # 例: 'OMEGA', 'RADO', 'CASIO'
@@ -35,7 +36,7 @@ with open('index.html', 'r', encoding='utf-8') as f:
     html = f.read()
 
 # 元CSVを読み込み
-df = pd.read_csv('/Users/naokijodan/Desktop/時計データ_分類済み.csv')
+df = load_watch_data()
 
 # TODO: ブランド名でフィルタ
 df_brand = df[(df['ブランド']==BRAND_NAME) & (df['商品状態']=='完品')].copy()
@@ -52,13 +53,11 @@ BRAND_LINES = {
     # 'Line3': ['LINE3', 'KEYWORD3'],
 }
 
+LINE_CLASSIFIER = KeywordLineClassifier(BRAND_LINES, default=f'その他{BRAND_NAME}')
+
 def classify_brand_line(title_upper):
     """タイトルからライン名を抽出（優先順位順）"""
-    for line_name, keywords in BRAND_LINES.items():
-        for kw in keywords:
-            if kw in title_upper:
-                return line_name
-    return f'その他{BRAND_NAME}'
+    return LINE_CLASSIFIER.classify(title_upper)
 
 # ===== ユーティリティ関数 =====
 
@@ -96,7 +95,7 @@ def extract_model_number(title):
 df_brand['タイトル_upper'] = df_brand['タイトル'].str.upper()
 
 # ===== ライン分類実行 =====
-df_brand['ライン'] = df_brand['タイトル_upper'].apply(classify_brand_line)
+df_brand['ライン'] = LINE_CLASSIFIER.classify_series(df_brand['タイトル_upper'])
 
 # ===== キャラクター/コラボ判定 =====
 # TODO: ブランド固有のキャラクター/コラボキーワードを定義
@@ -8,6 +8,12 @@ template_brand_tab.pyを基準に8セクション構成で実装
 import pandas as pd
 import re
 from collections import Counter, defaultdict
+from utils.brand_theme import BrandTheme, apply_brand_themes
+from utils.chart_bundle import ChartBundle
+from utils.data_loader import load_watch_data
+from utils.group_stats import GroupStats
+from utils.html_tabs import TabDocument
+from utils.line_classifier import KeywordLineClassifier
 
 # ============================================================
 # TODO 1: ブランド名の設定
@@ -28,14 +34,11 @@ HAMILTON_LINES = {
     'Broadway': ['BROADWAY'],
 }
 
+LINE_CLASSIFIER = KeywordLineClassifier(HAMILTON_LINES, default=f'その他{BRAND_NAME}')
+
 def classify_line(title):
     """タイトルからラインを分類"""
-    title_upper = str(title).upper()
-    for line_name, keywords in HAMILTON_LINES.items():
-        for keyword in keywords:
-            if keyword in title_upper:
-                return line_name
-    return f'その他{BRAND_NAME}'
+    return LINE_CLASSIFIER.classify(str(title).upper())
 
 # ============================================================
 # TODO 3: 型番抽出関数（Hamilton固有）
@@ -94,7 +97,7 @@ print(f"{BRAND_NAME}タブ 完全実装スクリプト")
 print(f"{'='*80}\n")
 
 # CSVファイルを読み込み
-df = pd.read_csv('/Users/naokijodan/Desktop/時計データ_分類済み.csv')
+df = load_watch_data()
 
 # Hamiltonのデータを抽出
 brand_df = df[df['ブランド'] == BRAND_NAME].copy()
@@ -114,8 +117,12 @@ print(f"抽出率: {extraction_rate:.1f}%\n")
 
 # ライン分類
 print("【ライン分類】")
-complete_data['line'] = complete_data['タイトル'].apply(classify_line)
+complete_data['line'] = LINE_CLASSIFIER.classify_titles(complete_data['タイトル'])
 line_counts = complete_data['line'].value_counts()
+
+# ライン別・型番別統計（1回のgroupbyで集計し、各セクションで共用）
+line_stats = GroupStats(complete_data)
+line_table = line_stats.by('line')
 for line_name, count in line_counts.items():
     print(f"  {line_name}: {count}個")
 print()
@@ -301,20 +308,18 @@ model_data = complete_data[complete_data['model_number'].notna()].copy()
 
 # ラインごとに型番を集計
 for line_name in line_counts.index[:9]:  # 上位9ライン
-    line_models = model_data[model_data['line'] == line_name]
+    line_models = line_stats.within(['line', 'model_number'], line_name, first=('タイトル',))
 
     if len(line_models) == 0:
         continue
 
-    # 型番ごとに統計を計算
-    model_stats = line_models.groupby('model_number').agg({
-        '価格': ['count', 'median', 'std', 'mean']
-    }).round(2)
-    model_stats.columns = ['count', 'median', 'std', 'mean']
+    # 型番ごとの統計（表示は小数2桁、CVは丸めた値から計算）
+    model_stats = line_models[['items', 'median', 'std', 'mean', 'first_タイトル']].rename(columns={'items': 'count'})
+    model_stats[['median', 'std', 'mean']] = model_stats[['median', 'std', 'mean']].round(2)
     model_stats['cv'] = (model_stats['std'] / model_stats['mean']).round(3)
     model_stats = model_stats.sort_values('count', ascending=False).head(15)
 
-    line_total = len(line_models)
+    line_total = int(line_models['items'].sum())
 
     line_model_analysis_html += f'''
                 <h4 style="color: {brand_color_primary}; margin-top: 25px; border-bottom: 2px solid {brand_color_primary}; padding-bottom: 5px;">
@@ -343,7 +348,7 @@ for line_name in line_counts.index[:9]:  # 上位9ライン
         purchase_limit = int(median * 155 * 0.65)
 
         # 商品例を取得
-        sample = line_models[line_models['model_number'] == model_num]['タイトル'].iloc[0]
+        sample = row['first_タイトル']
         sample_short = sample[:50] + '...' if len(sample) > 50 else sample
 
         line_model_analysis_html += f'''
@@ -406,9 +411,8 @@ line_detail_html = f'''
 '''
 
 for line_name, count in line_counts.items():
-    line_data = complete_data[complete_data['line'] == line_name]
-    median = line_data['価格'].median()
-    cv = line_data['価格'].std() / line_data['価格'].mean()
+    median = line_table.loc[line_name, 'median']
+    cv = line_table.loc[line_name, 'cv']
     ratio = count / len(complete_data) * 100
     purchase_limit = int(median * 155 * 0.65)
 
@@ -555,49 +559,29 @@ line_chart_data = {
     'hole': 0.4
 }
 
-graph_scripts = f'''
-        <script>
-            // Hamilton - 価格帯別分析
-            var hamilton_price_data = [{price_chart_data}];
-            var hamilton_price_layout = {{
-                title: '価格帯別 販売分布',
-                xaxis: {{title: '価格帯'}},
-                yaxis: {{title: '販売数'}},
-                plot_bgcolor: '#f8f9fa',
-                paper_bgcolor: '#ffffff'
-            }};
-            Plotly.newPlot('hamilton_price_chart', hamilton_price_data, hamilton_price_layout, {{responsive: true}});
-
-            // Hamilton - 駆動方式別分布
-            var hamilton_movement_data = [{movement_chart_data}];
-            var hamilton_movement_layout = {{
-                title: '駆動方式別 分布',
-                plot_bgcolor: '#f8f9fa',
-                paper_bgcolor: '#ffffff'
-            }};
-            Plotly.newPlot('hamilton_movement_chart', hamilton_movement_data, hamilton_movement_layout, {{responsive: true}});
-
-            // Hamilton - 性別・カテゴリー別
-            var hamilton_gender_data = [{gender_chart_data}];
-            var hamilton_gender_layout = {{
-                title: '性別・カテゴリー別 販売数',
-                xaxis: {{title: 'カテゴリー'}},
-                yaxis: {{title: '販売数'}},
-                plot_bgcolor: '#f8f9fa',
-                paper_bgcolor: '#ffffff'
-            }};
-            Plotly.newPlot('hamilton_gender_chart', hamilton_gender_data, hamilton_gender_layout, {{responsive: true}});
-
-            // Hamilton - ライン別売上比率
-            var hamilton_line_data = [{line_chart_data}];
-            var hamilton_line_layout = {{
-                title: 'ライン別 売上比率',
-                plot_bgcolor: '#f8f9fa',
-                paper_bgcolor: '#ffffff'
-            }};
-            Plotly.newPlot('hamilton_line_chart', hamilton_line_data, hamilton_line_layout, {{responsive: true}});
-        </script>
-'''
+# Plotlyグラフ（charts/<タブID>.json に書き出し、タブ表示時に描画）
+charts = ChartBundle()
+chart_layout = {'plot_bgcolor': '#f8f9fa', 'paper_bgcolor': '#ffffff'}
+
+# Hamilton - 価格帯別分析
+charts.add('Hamilton', 'hamilton_price_chart', [price_chart_data],
+           dict(chart_layout, title='価格帯別 販売分布', xaxis={'title': '価格帯'}, yaxis={'title': '販売数'}),
+           config={'responsive': True})
+
+# Hamilton - 駆動方式別分布
+charts.add('Hamilton', 'hamilton_movement_chart', [movement_chart_data],
+           dict(chart_layout, title='駆動方式別 分布'),
+           config={'responsive': True})
+
+# Hamilton - 性別・カテゴリー別
+charts.add('Hamilton', 'hamilton_gender_chart', [gender_chart_data],
+           dict(chart_layout, title='性別・カテゴリー別 販売数', xaxis={'title': 'カテゴリー'}, yaxis={'title': '販売数'}),
+           config={'responsive': True})
+
+# Hamilton - ライン別売上比率
+charts.add('Hamilton', 'hamilton_line_chart', [line_chart_data],
+           dict(chart_layout, title='ライン別 売上比率'),
+           config={'responsive': True})
 
 # ============================================================
 # 完全なHamiltonタブHTMLを組み立て
@@ -702,31 +686,18 @@ print("【HamiltonタブをROLEX直後に挿入】")
 html = html[:rolex_end] + '\n' + brand_tab_html + html[rolex_end:]
 print("Hamiltonタブを挿入しました\n")
 
-# CSS追加
+# CSS追加（ブランドカラーはテーマブロックにまとめる。再実行してもCSSは増えない）
 print("【CSS追加】")
-hamilton_css = f'''
-        /* Hamilton固有のスタイル */
-        #Hamilton .stat-card {{
-            background: linear-gradient(135deg, {brand_color_primary}15 0%, {brand_color_primary}05 100%);
-            border-top: 3px solid {brand_color_primary};
-        }}
-
-        #Hamilton .highlight {{
-            background: linear-gradient(135deg, {brand_color_accent}25 0%, {brand_color_accent}10 100%);
-        }}
-'''
-
-style_end = html.find('</style>')
-if style_end != -1:
-    html = html[:style_end] + hamilton_css + html[style_end:]
+doc = TabDocument(html)
+theme = BrandTheme('Hamilton', brand_color_primary, brand_color_accent, cards=True)
+if apply_brand_themes(doc, [theme]):
+    html = doc.render()
     print("CSSを追加しました\n")
 
-# JavaScriptグラフスクリプト追加
-print("【グラフスクリプト追加】")
-body_end = html.rfind('</body>')
-if body_end != -1:
-    html = html[:body_end] + graph_scripts + '\n' + html[body_end:]
-    print("グラフスクリプトを追加しました\n")
+# グラフデータを書き出し、インラインのグラフスクリプトを遅延読み込みに置き換え
+print("【グラフデータ書き出し】")
+html = charts.save('/Users/naokijodan/Desktop/watch-market-analysis/index.html', html)
+print("グラフデータを書き出しました\n")
 
 # 保存
 print("【index.html 保存】")
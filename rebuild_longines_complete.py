@@ -9,6 +9,7 @@ import numpy as np
 import json
 import re
 from datetime import datetime
+from utils.data_loader import load_watch_data
 
 print("=" * 60)
 print("🔵 Longines タブ完全再構築")
@@ -26,7 +27,7 @@ LINE_KEYWORDS = {
 
 # 1. データ読み込み
 print("\n📊 データ読み込み中...")
-df = pd.read_csv('/Users/naokijodan/Desktop/時計データ_分類済み.csv')
+df = load_watch_data()
 longines = df[(df['ブランド'] == 'Longines') & (df['商品状態'] == '完品')].copy()
 
 print(f"✅ 完品データ: {len(longines):,}件")
@@ -7,10 +7,11 @@ OMEGAタブ v3 完全版
 - 各ラインの人気モデルを正確に抽出
 """
 
-import pandas as pd
 import json
 import re
 import numpy as np
+from utils.data_loader import load_watch_data
+from utils.line_classifier import KeywordLineClassifier
 
 print("📄 OMEGAタブ v3 完全版再構築開始...")
 
@@ -25,7 +26,7 @@ with open('/Users/naokijodan/Desktop/ブランド詳細分析.json', 'r', encodi
     brand_detail = json.load(f)
 
 # 元CSVを読み込み
-df = pd.read_csv('/Users/naokijodan/Desktop/時計データ_分類済み.csv')
+df = load_watch_data()
 df_omega = df[(df['ブランド']=='OMEGA') & (df['商品状態']=='完品')].copy()
 
 print(f"✓ OMEGA完品データ: {len(df_omega)}件")
@@ -42,13 +43,11 @@ OMEGA_LINES = {
     'Railmaster': ['RAILMASTER'],
 }
 
+LINE_CLASSIFIER = KeywordLineClassifier(OMEGA_LINES, default='その他OMEGA')
+
 def classify_omega_line(title_upper):
     """タイトルからライン名を抽出（優先順位順）"""
-    for line_name, keywords in OMEGA_LINES.items():
-        for kw in keywords:
-            if kw in title_upper:
-                return line_name
-    return 'その他OMEGA'
+    return LINE_CLASSIFIER.classify(title_upper)
 
 def calculate_cv(prices):
     """変動係数を計算"""
@@ -94,7 +93,7 @@ def extract_model_number(title):
 df_omega['タイトル_upper'] = df_omega['タイトル'].str.upper()
 
 # ライン分類実行（通常）
-df_omega['ライン'] = df_omega['タイトル_upper'].apply(classify_omega_line)
+df_omega['ライン'] = LINE_CLASSIFIER.classify_series(df_omega['タイトル_upper'])
 
 # 特徴・価値軸判定（別視点）
 OMEGA_FEATURES = {
@@ -7,10 +7,12 @@ OMEGAタブ v3 正しい構造版
 - 仕入上限(¥)、比率、安定度を含む
 """
 
-import pandas as pd
 import json
 import re
 import numpy as np
+from utils.chart_bundle import ChartBundle
+from utils.data_loader import load_watch_data
+from utils.line_classifier import KeywordLineClassifier
 
 print("📄 OMEGAタブ v3 正しい構造版で再構築開始...")
 
@@ -19,7 +21,7 @@ with open('index.html', 'r', encoding='utf-8') as f:
     html = f.read()
 
 # 元CSVを読み込み
-df = pd.read_csv('/Users/naokijodan/Desktop/時計データ_分類済み.csv')
+df = load_watch_data()
 df_omega = df[(df['ブランド']=='OMEGA') & (df['商品状態']=='完品')].copy()
 
 print(f"✓ OMEGA完品データ: {len(df_omega)}件")
@@ -36,13 +38,11 @@ OMEGA_LINES = {
     'Railmaster': ['RAILMASTER'],
 }
 
+LINE_CLASSIFIER = KeywordLineClassifier(OMEGA_LINES, default='その他OMEGA')
+
 def classify_omega_line(title_upper):
     """タイトルからライン名を抽出（優先順位順）"""
-    for line_name, keywords in OMEGA_LINES.items():
-        for kw in keywords:
-            if kw in title_upper:
-                return line_name
-    return 'その他OMEGA'
+    return LINE_CLASSIFIER.classify(title_upper)
 
 def calculate_cv(prices):
     """変動係数を計算"""
@@ -88,7 +88,7 @@ def extract_model_number(title):
 df_omega['タイトル_upper'] = df_omega['タイトル'].str.upper()
 
 # ライン分類実行
-df_omega['ライン'] = df_omega['タイトル_upper'].apply(classify_omega_line)
+df_omega['ライン'] = LINE_CLASSIFIER.classify_series(df_omega['タイトル_upper'])
 
 # 特徴・価値軸判定
 OMEGA_FEATURES = {
@@ -603,70 +603,41 @@ omega_html += '''
     </div>
 '''
 
-# ===== グラフスクリプト生成（Plotly使用） =====
-graph_script = f'''
-        <script>
-        const omegaPurple = '#667eea';
-        const omegaAccent = '#764ba2';
-        const omegaGradient = ['#667eea', '#7b68ee', '#9370db', '#ba55d3', '#da70d6'];
-
-        Plotly.newPlot('omega_price_chart', [{{
-            x: {price_ranges},
-            y: {price_counts},
-            type: 'bar',
-            marker: {{
-                color: omegaPurple,
-                line: {{color: omegaAccent, width: 1}}
-            }},
-            hovertemplate: '<b>%{{x}}</b><br>販売数: %{{y}}<extra></extra>'
-        }}], {{
-            xaxis: {{title: '価格帯', tickangle: -45}},
-            yaxis: {{title: '販売数'}},
-            margin: {{l: 50, r: 20, t: 20, b: 80}},
-            plot_bgcolor: '#f8f9fa',
-            paper_bgcolor: 'white'
-        }}, {{responsive: true}});
-
-        Plotly.newPlot('omega_movement_chart', [{{
-            labels: {movement_labels},
-            values: {movement_values},
-            type: 'pie',
-            marker: {{colors: omegaGradient}},
-            textposition: 'inside',
-            textinfo: 'label+percent',
-            hovertemplate: '<b>%{{label}}</b><br>販売数: %{{value}}<br>割合: %{{percent}}<extra></extra>'
-        }}], {{
-            margin: {{l: 20, r: 20, t: 20, b: 20}},
-            paper_bgcolor: 'white'
-        }}, {{responsive: true}});
-
-        Plotly.newPlot('omega_gender_chart', [{{
-            labels: {dept_labels},
-            values: {dept_values},
-            type: 'pie',
-            marker: {{colors: omegaGradient}},
-            textposition: 'inside',
-            textinfo: 'label+percent',
-            hovertemplate: '<b>%{{label}}</b><br>販売数: %{{value}}<br>割合: %{{percent}}<extra></extra>'
-        }}], {{
-            margin: {{l: 20, r: 20, t: 20, b: 20}},
-            paper_bgcolor: 'white'
-        }}, {{responsive: true}});
-
-        Plotly.newPlot('omega_line_chart', [{{
-            labels: {line_labels},
-            values: {line_values},
-            type: 'pie',
-            marker: {{colors: omegaGradient}},
-            textposition: 'inside',
-            textinfo: 'label+percent',
-            hovertemplate: '<b>%{{label}}</b><br>販売数: %{{value}}<br>割合: %{{percent}}<extra></extra>'
-        }}], {{
-            margin: {{l: 20, r: 20, t: 20, b: 20}},
-            paper_bgcolor: 'white'
-        }}, {{responsive: true}});
-        </script>
-'''
+# ===== グラフデータ生成（Plotly使用、charts/OMEGA.json に書き出してタブ表示時に描画） =====
+charts = ChartBundle()
+omega_gradient = ['#667eea', '#7b68ee', '#9370db', '#ba55d3', '#da70d6']
+pie_layout = {'margin': {'l': 20, 'r': 20, 't': 20, 'b': 20}, 'paper_bgcolor': 'white'}
+pie_hovertemplate = '<b>%{label}</b><br>販売数: %{value}<br>割合: %{percent}<extra></extra>'
+
+charts.add('OMEGA', 'omega_price_chart', [{
+    'x': price_ranges,
+    'y': price_counts,
+    'type': 'bar',
+    'marker': {
+        'color': '#667eea',
+        'line': {'color': '#764ba2', 'width': 1}
+    },
+    'hovertemplate': '<b>%{x}</b><br>販売数: %{y}<extra></extra>'
+}], {
+    'xaxis': {'title': '価格帯', 'tickangle': -45},
+    'yaxis': {'title': '販売数'},
+    'margin': {'l': 50, 'r': 20, 't': 20, 'b': 80},
+    'plot_bgcolor': '#f8f9fa',
+    'paper_bgcolor': 'white'
+}, config={'responsive': True})
+
+for chart_name, labels, values in [('movement', movement_labels, movement_values),
+                                   ('gender', dept_labels, dept_values),
+                                   ('line', line_labels, line_values)]:
+    charts.add('OMEGA', f'omega_{chart_name}_chart', [{
+        'labels': labels,
+        'values': values,
+        'type': 'pie',
+        'marker': {'colors': omega_gradient},
+        'textposition': 'inside',
+        'textinfo': 'label+percent',
+        'hovertemplate': pie_hovertemplate
+    }], pie_layout, config={'responsive': True})
 
 # ===== CSS追加 =====
 css_insert = '''
@@ -782,15 +753,10 @@ if css_pos != -1:
 else:
     print("⚠️ CSS挿入位置が見つかりませんでした")
 
-# 4. グラフスクリプトを</body>の前に追加
-body_end = html.rfind('</body>')
-if body_end == -1:
-    print("❌ </body>タグが見つかりません")
-    exit(1)
-
-html = html[:body_end] + graph_script + '\n' + html[body_end:]
+# 4. グラフデータを書き出し、インラインのグラフスクリプトを遅延読み込みに置き換え
+html = charts.save('index.html', html)
 
-print(f"✓ Plotlyグラフスクリプト追加完了")
+print(f"✓ Plotlyグラフデータ書き出し完了")
 
 # ===== 保存 =====
 with open('index.html', 'w', encoding='utf-8') as f:
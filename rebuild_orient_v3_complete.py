@@ -11,13 +11,14 @@ ORIENTタブ v3 完全版 再構築スクリプト
 import pandas as pd
 import numpy as np
 from pathlib import Path
+from utils.data_loader import load_watch_data
 
 # ===========================
 # 1. データ読み込み
 # ===========================
 
 csv_path = Path.home() / 'Desktop' / '時計データ_分類済み.csv'
-df = pd.read_csv(csv_path)
+df = load_watch_data(csv_path)
 
 # Orientデータのみ抽出
 df_orient = df[df['ブランド'] == 'Orient'].copy()
@@ -6,6 +6,7 @@
 
 import pandas as pd
 import json
+from utils.data_loader import load_watch_data
 
 # Excelファイル読み込み
 print("📊 Excelファイルを読み込み中...")
@@ -17,7 +18,7 @@ df_price = pd.read_excel('/Users/naokijodan/Desktop/watch-market-analysis/分析
 
 # CSVファイルも読み込み（完品データ用）
 print("📄 CSVファイルを読み込み中...")
-df_csv = pd.read_csv('/Users/naokijodan/Desktop/時計データ_分類済み.csv')
+df_csv = load_watch_data()
 
 # 1. 基本統計
 basic_stats = {}
@@ -12,6 +12,8 @@ import pandas as pd
 import json
 import re
 import numpy as np
+from utils.data_loader import load_watch_data
+from utils.line_classifier import KeywordLineClassifier
 
 print("📄 RADOタブ v3 完全版再構築開始...")
 
@@ -26,7 +28,7 @@ with open('/Users/naokijodan/Desktop/ブランド詳細分析.json', 'r', encodi
     brand_detail = json.load(f)
 
 # 元CSVを読み込み
-df = pd.read_csv('/Users/naokijodan/Desktop/時計データ_分類済み.csv')
+df = load_watch_data()
 df_rado = df[(df['ブランド']=='RADO') & (df['商品状態']=='完品')].copy()
 
 print(f"✓ RADO完品データ: {len(df_rado)}件")
@@ -55,13 +57,11 @@ RADO_LINES_COMPLETE = {
     'Original': ['ORIGINAL'],
 }
 
+LINE_CLASSIFIER = KeywordLineClassifier(RADO_LINES_COMPLETE, default='その他RADO')
+
 def classify_rado_line(title_upper):
     """タイトルからライン名を抽出（優先順位順）"""
-    for line_name, keywords in RADO_LINES_COMPLETE.items():
-        for kw in keywords:
-            if kw in title_upper:
-                return line_name
-    return 'その他RADO'
+    return LINE_CLASSIFIER.classify(title_upper)
 
 def calculate_cv(prices):
     """変動係数を計算"""
@@ -134,7 +134,7 @@ def extract_model_number(title):
     return None
 
 # ライン分類実行（通常）
-df_rado['ライン'] = df_rado['タイトル_upper'].apply(classify_rado_line)
+df_rado['ライン'] = LINE_CLASSIFIER.classify_series(df_rado['タイトル_upper'])
 
 # 素材・ヴィンテージ判定（別視点）
 RADO_FEATURES = {
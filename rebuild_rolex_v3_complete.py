@@ -6,8 +6,14 @@ template_brand_tab.pyを基準に8セクション構成で実装
 """
 
 import pandas as pd
-import re
 from collections import Counter, defaultdict
+from utils.brand_theme import BrandTheme, apply_brand_themes
+from utils.chart_bundle import ChartBundle
+from utils.data_loader import load_watch_data
+from utils.group_stats import GroupStats
+from utils.html_tabs import TabDocument
+from utils.line_classifier import KeywordLineClassifier
+from utils.model_number import ROLEX_V3_EXTRACTOR
 
 # ============================================================
 # TODO 1: ブランド名の設定
@@ -32,14 +38,11 @@ ROLEX_LINES = {
     'Sky-Dweller': ['SKY-DWELLER', 'SKY DWELLER'],
 }
 
+LINE_CLASSIFIER = KeywordLineClassifier(ROLEX_LINES, default=f'その他{BRAND_NAME}')
+
 def classify_line(title):
     """タイトルからラインを分類"""
-    title_upper = str(title).upper()
-    for line_name, keywords in ROLEX_LINES.items():
-        for keyword in keywords:
-            if keyword in title_upper:
-                return line_name
-    return f'その他{BRAND_NAME}'
+    return LINE_CLASSIFIER.classify(str(title).upper())
 
 # ============================================================
 # TODO 3: 型番抽出関数（ROLEX固有）
@@ -48,34 +51,9 @@ def extract_model_number(title):
     """
     ROLEXの型番を抽出（3パターン）
     優先順位: 6桁 > 5桁 > 4桁（新しいモデルを優先）
+    パターンと除外ルールは utils.model_number.ROLEX_V3_EXTRACTOR に集約
     """
-    title_upper = str(title).upper()
-
-    # Pattern 1: 6桁数字（最新モデル）116528, 126303など
-    match = re.search(r'\b(\d{6})\b', title_upper)
-    if match:
-        model = match.group(1)
-        # ボックス型番を除外（39xxx, 68xxx等）
-        if not (model.startswith('39') or model.startswith('68')):
-            return model
-
-    # Pattern 2: 5桁数字（主要モデル）16233, 16610など
-    match = re.search(r'\b(\d{5})\b', title_upper)
-    if match:
-        model = match.group(1)
-        # ボックス型番を除外（39xxx等）
-        if not model.startswith('39'):
-            return model
-
-    # Pattern 3: 4桁数字（ヴィンテージ）5512, 6917など
-    match = re.search(r'\b(\d{4})\b', title_upper)
-    if match:
-        model = match.group(1)
-        # 年号を除外（1970-2025）
-        if not (1970 <= int(model) <= 2025):
-            return model
-
-    return None
+    return ROLEX_V3_EXTRACTOR.extract(title)
 
 # ============================================================
 # TODO 4: ボックス・パーツ検出
@@ -111,7 +89,7 @@ print(f"{BRAND_NAME}タブ 完全実装スクリプト")
 print(f"{'='*80}\n")
 
 # CSVファイルを読み込み
-df = pd.read_csv('/Users/naokijodan/Desktop/時計データ_分類済み.csv')
+df = load_watch_data()
 
 # ROLEXのデータを抽出
 brand_df = df[df['ブランド'] == BRAND_NAME].copy()
@@ -131,7 +109,7 @@ print(f"時計本体: {len(watch_data)}個\n")
 
 # 型番抽出
 print("【型番抽出】")
-complete_data['model_number'] = complete_data['タイトル'].apply(extract_model_number)
+complete_data['model_number'] = ROLEX_V3_EXTRACTOR.extract_series(complete_data['タイトル'])
 extracted_count = complete_data['model_number'].notna().sum()
 extraction_rate = extracted_count / len(complete_data) * 100
 print(f"抽出数: {extracted_count}/{len(complete_data)}")
@@ -139,8 +117,12 @@ print(f"抽出率: {extraction_rate:.1f}%\n")
 
 # ライン分類
 print("【ライン分類】")
-complete_data['line'] = complete_data['タイトル'].apply(classify_line)
+complete_data['line'] = LINE_CLASSIFIER.classify_titles(complete_data['タイトル'])
 line_counts = complete_data['line'].value_counts()
+
+# ライン別・型番別統計（1回のgroupbyで集計し、各セクションで共用）
+line_stats = GroupStats(complete_data)
+line_table = line_stats.by('line')
 for line_name, count in line_counts.items():
     print(f"  {line_name}: {count}個")
 print()
@@ -321,20 +303,18 @@ model_data = complete_data[complete_data['model_number'].notna()].copy()
 
 # ラインごとに型番を集計
 for line_name in line_counts.index[:13]:  # 上位13ライン
-    line_models = model_data[model_data['line'] == line_name]
+    line_models = line_stats.within(['line', 'model_number'], line_name, first=('タイトル',))
 
     if len(line_models) == 0:
         continue
 
-    # 型番ごとに統計を計算
-    model_stats = line_models.groupby('model_number').agg({
-        '価格': ['count', 'median', 'std', 'mean']
-    }).round(2)
-    model_stats.columns = ['count', 'median', 'std', 'mean']
+    # 型番ごとの統計（表示は小数2桁、CVは丸めた値から計算）
+    model_stats = line_models[['items', 'median', 'std', 'mean', 'first_タイトル']].rename(columns={'items': 'count'})
+    model_stats[['median', 'std', 'mean']] = model_stats[['median', 'std', 'mean']].round(2)
     model_stats['cv'] = (model_stats['std'] / model_stats['mean']).round(3)
     model_stats = model_stats.sort_values('count', ascending=False).head(15)
 
-    line_total = len(line_models)
+    line_total = int(line_models['items'].sum())
 
     line_model_analysis_html += f'''
                 <h4 style="color: {brand_color_primary}; margin-top: 25px; border-bottom: 2px solid {brand_color_primary}; padding-bottom: 5px;">
@@ -363,7 +343,7 @@ for line_name in line_counts.index[:13]:  # 上位13ライン
         purchase_limit = int(median * 155 * 0.65)
 
         # 商品例を取得
-        sample = line_models[line_models['model_number'] == model_num]['タイトル'].iloc[0]
+        sample = row['first_タイトル']
         sample_short = sample[:50] + '...' if len(sample) > 50 else sample
 
         line_model_analysis_html += f'''
@@ -426,9 +406,8 @@ line_detail_html = f'''
 '''
 
 for line_name, count in line_counts.items():
-    line_data = complete_data[complete_data['line'] == line_name]
-    median = line_data['価格'].median()
-    cv = line_data['価格'].std() / line_data['価格'].mean()
+    median = line_table.loc[line_name, 'median']
+    cv = line_table.loc[line_name, 'cv']
     ratio = count / len(complete_data) * 100
     purchase_limit = int(median * 155 * 0.65)
 
@@ -576,47 +555,29 @@ line_chart_data = {
     'hole': 0.4
 }
 
-graph_scripts = f'''
-        <script>
-            // ROLEX - 価格帯別分析
-            var rolex_price_data = [{price_chart_data}];
-            var rolex_price_layout = {{
-                title: '価格帯別 販売分布',
-                xaxis: {{title: '価格帯'}},
-                yaxis: {{title: '販売数'}},
-                plot_bgcolor: '#f8f9fa',
-                paper_bgcolor: '#ffffff'
-            }};
-            Plotly.newPlot('rolex_price_chart', rolex_price_data, rolex_price_layout, {{responsive: true}});
-
-            // ROLEX - ボックス vs 時計本体
-            var rolex_category_data = [{category_chart_data}];
-            var rolex_category_layout = {{
-                title: 'ボックス・パーツ vs 時計本体',
-                plot_bgcolor: '#f8f9fa',
-                paper_bgcolor: '#ffffff'
-            }};
-            Plotly.newPlot('rolex_category_chart', rolex_category_data, rolex_category_layout, {{responsive: true}});
-
-            // ROLEX - 駆動方式別分布
-            var rolex_movement_data = [{movement_chart_data}];
-            var rolex_movement_layout = {{
-                title: '駆動方式別 分布',
-                plot_bgcolor: '#f8f9fa',
-                paper_bgcolor: '#ffffff'
-            }};
-            Plotly.newPlot('rolex_movement_chart', rolex_movement_data, rolex_movement_layout, {{responsive: true}});
-
-            // ROLEX - ライン別売上比率
-            var rolex_line_data = [{line_chart_data}];
-            var rolex_line_layout = {{
-                title: 'ライン別 売上比率（Top10）',
-                plot_bgcolor: '#f8f9fa',
-                paper_bgcolor: '#ffffff'
-            }};
-            Plotly.newPlot('rolex_line_chart', rolex_line_data, rolex_line_layout, {{responsive: true}});
-        </script>
-'''
+# Plotlyグラフ（charts/<タブID>.json に書き出し、タブ表示時に描画）
+charts = ChartBundle()
+chart_layout = {'plot_bgcolor': '#f8f9fa', 'paper_bgcolor': '#ffffff'}
+
+# ROLEX - 価格帯別分析
+charts.add('ROLEX', 'rolex_price_chart', [price_chart_data],
+           dict(chart_layout, title='価格帯別 販売分布', xaxis={'title': '価格帯'}, yaxis={'title': '販売数'}),
+           config={'responsive': True})
+
+# ROLEX - ボックス vs 時計本体
+charts.add('ROLEX', 'rolex_category_chart', [category_chart_data],
+           dict(chart_layout, title='ボックス・パーツ vs 時計本体'),
+           config={'responsive': True})
+
+# ROLEX - 駆動方式別分布
+charts.add('ROLEX', 'rolex_movement_chart', [movement_chart_data],
+           dict(chart_layout, title='駆動方式別 分布'),
+           config={'responsive': True})
+
+# ROLEX - ライン別売上比率
+charts.add('ROLEX', 'rolex_line_chart', [line_chart_data],
+           dict(chart_layout, title='ライン別 売上比率（Top10）'),
+           config={'responsive': True})
 
 # ============================================================
 # 完全なROLEXタブHTMLを組み立て
@@ -652,103 +613,41 @@ brand_tab_html = f'''
 # TODO 7: index.htmlへの挿入
 # ============================================================
 print("【index.html 読み込み】")
-with open('/Users/naokijodan/Desktop/watch-market-analysis/index.html', 'r', encoding='utf-8') as f:
-    html = f.read()
+doc = TabDocument.from_file('/Users/naokijodan/Desktop/watch-market-analysis/index.html')
 
 print("index.html読み込み完了\n")
 
-# TAG HEUERタブの終了位置を検出
+# TAG HEUERタブの終了位置を検出（TabDocumentが1回の走査で記録済み）
 print("【TAG HEUERタブの終了位置を検出】")
-tagheuer_start = html.find('<div id="TAG_HEUER" class="tab-content">')
-if tagheuer_start == -1:
+if not doc.has_tab('TAG_HEUER'):
     print("エラー: TAG HEUERタブが見つかりません")
     exit(1)
 
-# nest countingでTAG HEUERタブの終了位置を正確に検出
-div_count = 1
-search_pos = tagheuer_start + len('<div id="TAG_HEUER" class="tab-content">')
-
-while div_count > 0 and search_pos < len(html):
-    next_open = html.find('<div', search_pos)
-    next_close = html.find('</div>', search_pos)
-
-    if next_close == -1:
-        break
-
-    if next_open != -1 and next_open < next_close:
-        div_count += 1
-        search_pos = next_open + 4
-    else:
-        div_count -= 1
-        search_pos = next_close + 6
-        if div_count == 0:
-            tagheuer_end = next_close + 6
-            break
-
+tagheuer_end = doc.tab_span('TAG_HEUER')[1]
 print(f"TAG HEUERタブ終了位置: {tagheuer_end}\n")
 
 # 既存のROLEXタブを削除
 print("【既存のROLEXタブを削除】")
-existing_start = html.find('<div id="ROLEX" class="tab-content">')
-if existing_start != -1:
-    div_count = 1
-    search_pos = existing_start + len('<div id="ROLEX" class="tab-content">')
-
-    while div_count > 0 and search_pos < len(html):
-        next_open = html.find('<div', search_pos)
-        next_close = html.find('</div>', search_pos)
-
-        if next_close == -1:
-            break
-
-        if next_open != -1 and next_open < next_close:
-            div_count += 1
-            search_pos = next_open + 4
-        else:
-            div_count -= 1
-            search_pos = next_close + 6
-            if div_count == 0:
-                existing_end = next_close + 6
-                break
-
-    html = html[:existing_start] + html[existing_end:]
+if doc.has_tab('ROLEX'):
+    doc.remove_tab('ROLEX')
     print("既存のROLEXタブを削除しました\n")
 else:
     print("既存のROLEXタブは存在しません\n")
 
 # TAG HEUERタブ直後に挿入
 print("【ROLEXタブをTAG HEUER直後に挿入】")
-html = html[:tagheuer_end] + '\n' + brand_tab_html + html[tagheuer_end:]
+doc.insert(tagheuer_end, '\n' + brand_tab_html)
 print("ROLEXタブを挿入しました\n")
 
-# CSS追加
+# CSS追加（ブランドカラーはテーマブロックにまとめる。再実行してもCSSは増えない）
 print("【CSS追加】")
-rolex_css = f'''
-        /* ROLEX固有のスタイル */
-        #ROLEX .stat-card {{
-            background: linear-gradient(135deg, {brand_color_primary}15 0%, {brand_color_primary}05 100%);
-            border-top: 3px solid {brand_color_primary};
-        }}
-
-        #ROLEX .highlight {{
-            background: linear-gradient(135deg, {brand_color_accent}25 0%, {brand_color_accent}10 100%);
-        }}
-'''
-
-style_end = html.find('</style>')
-if style_end != -1:
-    html = html[:style_end] + rolex_css + html[style_end:]
+theme = BrandTheme('ROLEX', brand_color_primary, brand_color_accent, cards=True)
+if apply_brand_themes(doc, [theme]):
     print("CSSを追加しました\n")
 
-# JavaScriptグラフスクリプト追加
-print("【グラフスクリプト追加】")
-body_end = html.rfind('</body>')
-if body_end != -1:
-    html = html[:body_end] + graph_scripts + '\n' + html[body_end:]
-    print("グラフスクリプトを追加しました\n")
-
-# 保存
+# 保存（グラフデータを書き出し、インラインのグラフスクリプトを遅延読み込みに置き換え）
 print("【index.html 保存】")
+html = charts.save('/Users/naokijodan/Desktop/watch-market-analysis/index.html', doc.render())
 with open('/Users/naokijodan/Desktop/watch-market-analysis/index.html', 'w', encoding='utf-8') as f:
     f.write(html)
 
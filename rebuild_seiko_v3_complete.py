@@ -11,6 +11,8 @@ import pandas as pd
 import json
 import re
 import numpy as np
+from utils.data_loader import load_watch_data
+from utils.line_classifier import KeywordLineClassifier
 
 print("📄 SEIKOタブ v3 完全版再構築開始...")
 
@@ -25,7 +27,7 @@ with open('/Users/naokijodan/Desktop/ブランド詳細分析.json', 'r', encodi
     brand_detail = json.load(f)
 
 # 元CSVを読み込み
-df = pd.read_csv('/Users/naokijodan/Desktop/時計データ_分類済み.csv')
+df = load_watch_data()
 df_seiko = df[(df['ブランド']=='SEIKO') & (df['商品状態']=='完品')].copy()
 
 print(f"✓ SEIKO完品データ: {len(df_seiko)}件")
@@ -70,13 +72,11 @@ SEIKO_LINES_COMPLETE = {
     'Ananta': ['ANANTA'],
 }
 
+LINE_CLASSIFIER = KeywordLineClassifier(SEIKO_LINES_COMPLETE, default='その他SEIKO')
+
 def classify_seiko_line(title_upper):
     """タイトルからライン名を抽出（優先順位順）"""
-    for line_name, keywords in SEIKO_LINES_COMPLETE.items():
-        for kw in keywords:
-            if kw in title_upper:
-                return line_name
-    return 'その他SEIKO'
+    return LINE_CLASSIFIER.classify(title_upper)
 
 def calculate_cv(prices):
     """変動係数を計算"""
@@ -112,7 +112,7 @@ def extract_model_number(title):
     return None
 
 # ライン分類実行（通常）
-df_seiko['ライン'] = df_seiko['タイトル_upper'].apply(classify_seiko_line)
+df_seiko['ライン'] = LINE_CLASSIFIER.classify_series(df_seiko['タイトル_upper'])
 
 # キャラクター/コラボ判定（別視点）
 CHARACTER_KEYWORDS = [
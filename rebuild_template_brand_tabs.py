@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+template_brand_tab.py形式のブランドタブを一括で再構築するスクリプト
+CSV・index.htmlは1回ずつ読み、全ブランドを1回のデータ走査で生成して1回だけ保存する
+（ブランドごとにスクリプトを実行する必要はない）
+
+使用方法:
+    python3 rebuild_template_brand_tabs.py                  # 全ブランド
+    python3 rebuild_template_brand_tabs.py Tissot DIOR      # 指定ブランドのみ
+    python3 rebuild_template_brand_tabs.py --jobs 4         # 4プロセスで並列生成（--jobs のみならCPUコア数）
+"""
+import importlib
+import os
+import sys
+
+from utils.brand_tab_renderer import rebuild_brand_tabs
+
+
+# ブランド設定（CONFIG）を定義しているスクリプト（新規タブはこの順に挿入）
+TEMPLATE_BRAND_MODULES = [
+    'rebuild_tissot_template_fixed',
+    'rebuild_breitling_template_fixed',
+    'rebuild_swatch_template_fixed',
+    'rebuild_nixon_template_fixed',
+    'rebuild_dior_template_fixed',
+    'rebuild_isseymiyake_template_fixed',
+    'rebuild_saintlaurent_template_fixed',
+    'rebuild_longines_template_fixed',
+    'rebuild_cartier_template_fixed',
+]
+
+
+def load_configs(brand_names=None):
+    """
+    ブランド設定を読み込む
+
+    Args:
+        brand_names: 対象ブランド名のリスト（Noneなら全ブランド）
+
+    Returns:
+        BrandTabConfigのリスト
+    """
+    configs = [importlib.import_module(name).CONFIG for name in TEMPLATE_BRAND_MODULES]
+    if brand_names:
+        configs = [c for c in configs if c.brand_name in brand_names or c.tab_id in brand_names]
+    return configs
+
+
+def parse_args(argv):
+    """
+    コマンドライン引数を解釈
+
+    Returns:
+        (ブランド名のリスト, 並列プロセス数)
+    """
+    brand_names = []
+    workers = 1
+    args = iter(argv)
+    for arg in args:
+        if arg in ('--jobs', '-j'):
+            value = next(args, None)
+            if value is not None and value.isdigit():
+                workers = int(value)
+            else:
+                workers = os.cpu_count() or 1
+                if value is not None:
+                    brand_names.append(value)
+        else:
+            brand_names.append(arg)
+    return brand_names, workers
+
+
+if __name__ == '__main__':
+    brand_names, workers = parse_args(sys.argv[1:])
+    configs = load_configs(brand_names)
+    if not configs:
+        print(f"❌ 対象ブランドが見つかりません: {', '.join(brand_names)}")
+        sys.exit(1)
+    rebuild_brand_tabs(configs, workers=workers)
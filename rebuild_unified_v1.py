@@ -4,8 +4,8 @@
 統合再構築スクリプト v1 - 骨組み
 各ブランドタブを順番に置換して、1回のファイル書き込みで完了
 """
-import pandas as pd
 from datetime import datetime
+from utils.data_loader import load_watch_data
 
 print("🔄 統合再構築スクリプト v1")
 print(f"実行時刻: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
@@ -13,7 +13,7 @@ print("=" * 60)
 
 # データ読み込み
 print("\n📄 データ読み込み中...")
-df = pd.read_csv('/Users/naokijodan/Desktop/時計データ_分類済み.csv')
+df = load_watch_data()
 df_complete = df[df['商品状態'] == '完品'].copy()
 print(f"✓ 完品データ: {len(df_complete)}件")
 
@@ -3,9 +3,10 @@
 """
 統合再構築スクリプト v2 - CITIZEN実装
 """
-import pandas as pd
 from datetime import datetime
 import sys
+from utils.data_loader import load_watch_data
+from utils.html_tabs import replace_tab
 
 # ストラテジーをインポート
 from strategies.citizen import CITIZENStrategy
@@ -16,7 +17,7 @@ print("=" * 60)
 
 # データ読み込み
 print("\n📄 データ読み込み中...")
-df = pd.read_csv('/Users/naokijodan/Desktop/時計データ_分類済み.csv')
+df = load_watch_data()
 df_complete = df[df['商品状態'] == '完品'].copy()
 
 # CITIZENデータ抽出
@@ -47,39 +48,9 @@ with open('index.html', 'r', encoding='utf-8') as f:
 print(f"✓ 読み込み完了: {len(html):,}文字")
 
 
-def find_tab_position(html, brand_name):
-    """タブ位置を特定"""
-    tab_start_tag = f'<div id="{brand_name}" class="tab-content">'
-    tab_start = html.find(tab_start_tag)
-
-    if tab_start == -1:
-        raise ValueError(f"{brand_name}タブが見つかりません")
-
-    # ネストカウント
-    div_count = 1
-    search_pos = tab_start + len(tab_start_tag)
-
-    while div_count > 0 and search_pos < len(html):
-        next_open = html.find('<div', search_pos)
-        next_close = html.find('</div>', search_pos)
-
-        if next_close == -1:
-            raise ValueError(f"{brand_name}タブの閉じタグが見つかりません")
-
-        if next_open != -1 and next_open < next_close:
-            div_count += 1
-            search_pos = next_open + 4
-        else:
-            div_count -= 1
-            if div_count == 0:
-                return (tab_start, next_close + 6)
-            search_pos = next_close + 6
-
-
 # CITIZENタブを置換
 print("\n🔄 CITIZENタブを置換中...")
-start_pos, end_pos = find_tab_position(html, 'CITIZEN')
-html = html[:start_pos] + citizen_html + html[end_pos:]
+html = replace_tab(html, 'CITIZEN', citizen_html)
 print(f"✓ 置換完了")
 
 # 保存
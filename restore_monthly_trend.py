@@ -1,7 +1,13 @@
 #!/usr/bin/env python3
 """
 月別販売数推移セクションを復元
+月別・駆動方式別の販売数は販売月パーティション（utils.month_partitions）の事前集計から作る
 """
+import json
+
+from utils.data_loader import DEFAULT_CSV_PATH
+from utils.month_partitions import MonthPartitionStore
+
 
 # HTMLファイル読み込み
 with open('/Users/naokijodan/Desktop/watch-market-analysis/index.html', 'r', encoding='utf-8') as f:
@@ -33,6 +39,13 @@ print(f"✅ 月別販売数推移セクションを追加しました（{insert_
 # 2. drawMonthlyTrendChart関数を追加
 print("\n=== drawMonthlyTrendChart関数を追加 ===")
 
+# 月別・駆動方式別の販売数（完品のみ）
+monthly = MonthPartitionStore(DEFAULT_CSV_PATH).open().monthly('movement_condition', match={'商品状態': '完品'})
+monthly_data = [{'month': month, 'data': dict(zip(group['駆動方式'], group['sales'].astype(int).tolist()))}
+                for month, group in monthly.groupby('販売月', sort=True)]
+months = [item['month'] for item in monthly_data]
+print(f"✓ 月別データ: {', '.join(months)}")
+
 # 価格帯分布関数の直前に挿入
 function_marker = '// 価格帯分布（50ドル刻み）'
 function_pos = html.find(function_marker)
@@ -42,37 +55,38 @@ if function_pos == -1:
     exit(1)
 
 # 月別販売数推移関数
-monthly_function = '''
+monthly_function = f'''
     // 月別販売数推移
-    function drawMonthlyTrendChart() {
-        const months = ["2025-12", "2026-01"];
-        const movementData = {};
+    function drawMonthlyTrendChart() {{
+        const months = {json.dumps(months)};
+        const monthlyData = {json.dumps(monthly_data, ensure_ascii=False)};
+        const movementData = {{}};
 
         // 各駆動方式ごとのデータを準備
-        [{"month": "2025-12", "data": {"クオーツ": 159, "スマートウォッチ": 2, "ソーラー": 45, "デジタル": 26, "不明": 146, "手巻き": 17, "自動巻": 63}}, {"month": "2026-01", "data": {"クオーツ": 2841, "スマートウォッチ": 29, "ソーラー": 878, "デジタル": 278, "不明": 2984, "手巻き": 254, "自動巻": 1553}}].forEach(item => {
-            Object.keys(item.data).forEach(movement => {
+        monthlyData.forEach(item => {{
+            Object.keys(item.data).forEach(movement => {{
                 if (!movementData[movement]) movementData[movement] = [];
-            });
-        });
+            }});
+        }});
 
-        Object.keys(movementData).forEach(movement => {
-            [{"month": "2025-12", "data": {"クオーツ": 159, "スマートウォッチ": 2, "ソーラー": 45, "デジタル": 26, "不明": 146, "手巻き": 17, "自動巻": 63}}, {"month": "2026-01", "data": {"クオーツ": 2841, "スマートウォッチ": 29, "ソーラー": 878, "デジタル": 278, "不明": 2984, "手巻き": 254, "自動巻": 1553}}].forEach(item => {
+        Object.keys(movementData).forEach(movement => {{
+            monthlyData.forEach(item => {{
                 movementData[movement].push(item.data[movement] || 0);
-            });
-        });
+            }});
+        }});
 
-        const traces = Object.keys(movementData).map(movement => ({
+        const traces = Object.keys(movementData).map(movement => ({{
             x: months,
             y: movementData[movement],
             name: movement,
             type: 'scatter',
             mode: 'lines+markers',
             stackgroup: 'one'
-        }));
+        }}));
 
-        const layout = {...plotlyLayout, title: '月別販売数推移（完品のみ）', xaxis: {title: '年月'}, yaxis: {title: '販売数'}};
+        const layout = {{...plotlyLayout, title: '月別販売数推移（完品のみ）', xaxis: {{title: '年月'}}, yaxis: {{title: '販売数'}}}};
         Plotly.newPlot('monthlyTrendChart', traces, layout, plotlyConfig);
-    }
+    }}
 
     '''
 
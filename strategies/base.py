@@ -12,10 +12,13 @@ import os
 # 親ディレクトリをパスに追加
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
+from utils.brand_theme import BrandTheme
 from utils.common import (
     format_price, calculate_cv, cv_to_stability,
     aggregate_top_lines, generate_search_link_html
 )
+from utils.line_classifier import KeywordLineClassifier
+from utils.price_bands import PriceBands
 
 
 class AbstractBrandStrategy(ABC):
@@ -26,6 +29,25 @@ class AbstractBrandStrategy(ABC):
     ブランド固有の処理は子クラスでオーバーライド
     """
 
+    # 価格帯別集計の区切り（ブランド固有の区切りは子クラスで上書き）
+    PRICE_BANDS = PriceBands([0, 100, 300, 500, 1000, float('inf')],
+                             ['~$100', '$100-300', '$300-500', '$500-1000', '$1000~'], right=True)
+
+    # ブランドの既定値（create() で使用。子クラスで上書き）
+    BRAND_NAME = None
+    BRAND_COLOR = '#333333'
+    BRAND_COLOR_LIGHT = '#f5f5f5'
+    # 統計カード・強調セルをブランドカラーにする場合のアクセントカラー（utils.brand_theme。Noneならしない）
+    THEME_ACCENT = None
+    # タブのid（Noneならブランド名）と、タブが存在しない場合に挿入する位置（直前のタブid）
+    TAB_ID = None
+    INSERT_AFTER = None
+    # ライン定義 {ライン名: [キーワード, ...]}（優先順位順。classify_line() の既定の実装で使用）
+    LINES = {}
+
+    # ライン分類器（クラスごとに初回利用時に1回だけ構築）
+    _line_classifier = None
+
     def __init__(self, brand_name, df_brand, brand_color, brand_color_light):
         """
         初期化
@@ -44,6 +66,44 @@ class AbstractBrandStrategy(ABC):
         # 統計情報を初期化
         self.stats = {}
 
+    @classmethod
+    def create(cls, df_brand):
+        """
+        クラス属性（BRAND_NAME・BRAND_COLOR・BRAND_COLOR_LIGHT）から戦略を作成
+
+        Args:
+            df_brand: ブランドの完品データ（TITLE_UPPER列を含むこと）
+
+        Returns:
+            戦略のインスタンス
+        """
+        return cls(cls.BRAND_NAME, df_brand, cls.BRAND_COLOR, cls.BRAND_COLOR_LIGHT)
+
+    @classmethod
+    def line_classifier(cls):
+        """LINES から作ったライン分類器"""
+        if cls.__dict__.get('_line_classifier') is None:
+            cls._line_classifier = KeywordLineClassifier(cls.LINES, default=f'その他{cls.BRAND_NAME}')
+        return cls._line_classifier
+
+    @property
+    def tab_id(self):
+        """index.html上のタブのid"""
+        return self.TAB_ID or self.brand_name
+
+    @classmethod
+    def has_own_layout(cls, tab_html):
+        """
+        既存のタブがこの戦略の生成するレイアウトか（一括生成で置き換えても内容が減らないか）
+
+        Args:
+            tab_html: index.html上の現在のタブHTML
+
+        Returns:
+            Falseならブランドを指定した場合のみ置き換える（個別スクリプトで作ったタブを保持）
+        """
+        return True
+
     @abstractmethod
     def extract_model_number(self, title_upper):
         """
@@ -57,17 +117,57 @@ class AbstractBrandStrategy(ABC):
         """
         pass
 
-    @abstractmethod
+    def extract_model_numbers(self, titles_upper):
+        """
+        型番を一括抽出（ブランド側で列単位の実装に差し替え可能）
+
+        Args:
+            titles_upper: 大文字化されたタイトルのSeries
+
+        Returns:
+            型番のSeries（抽出失敗時は"N/A"）
+        """
+        return titles_upper.apply(self.extract_model_number)
+
     def classify_line(self, row):
         """
-        商品をラインに分類（ブランド固有）
+        商品をラインに分類（1件ずつ。既定では LINES の優先順位順）
 
         Args:
-            row: DataFrameの行
+            row: DataFrameの行（TITLE_UPPER・駆動方式・型番などを列名で参照できるもの）
 
         Returns:
             ライン名
         """
+        return self.line_classifier().classify(row['TITLE_UPPER'])
+
+    def classify_lines(self, df):
+        """
+        ラインを一括分類（ブランド側で列単位の実装に差し替え可能）
+
+        classify_line() を上書きしていなければ、LINES のライン分類器で
+        TITLE_UPPER列をまとめて分類する（同じタイトルは1回だけ走査）。
+        上書きしている場合は classify_line() を1行ずつ呼ぶ
+        （df.apply(axis=1) と違い、行ごとにSeriesを作らない）
+
+        Args:
+            df: ブランドのDataFrame（TITLE_UPPER・駆動方式・型番などの列）
+
+        Returns:
+            ライン名のSeries（indexはdfと同じ）
+        """
+        if type(self).classify_line is AbstractBrandStrategy.classify_line:
+            return self.line_classifier().classify_series(df['TITLE_UPPER'])
+        rows = df.to_dict('records')
+        return pd.Series([self.classify_line(row) for row in rows], index=df.index, dtype=object)
+
+    def use_snapshot(self, snapshot):
+        """
+        分析スナップショット（utils.analytics_snapshot.AnalyticsSnapshot）の集計を使う
+
+        process_data() の前に呼ばれる。スナップショットに集計のあるブランドは
+        ここで統計を設定し、process_data() では集計を省略する（既定では何もしない）
+        """
         pass
 
     def process_data(self):
@@ -80,12 +180,12 @@ class AbstractBrandStrategy(ABC):
 
         # 1. 型番抽出
         print(f"\n📋 型番抽出中...")
-        self.df['型番'] = self.df['TITLE_UPPER'].apply(self.extract_model_number)
+        self.df['型番'] = self.extract_model_numbers(self.df['TITLE_UPPER'])
         print(f"  ✓ 型番抽出完了: {(self.df['型番'] != 'N/A').sum()}件")
 
         # 2. ライン分類
         print(f"\n📁 ライン分類中...")
-        self.df['ライン'] = self.df.apply(self.classify_line, axis=1)
+        self.df['ライン'] = self.classify_lines(self.df)
         line_counts = self.df['ライン'].value_counts()
         print(f"  ✓ ライン分類完了: {len(line_counts)}ライン")
 
@@ -116,13 +216,9 @@ class AbstractBrandStrategy(ABC):
 
     def _calculate_price_ranges(self):
         """価格帯別集計"""
-        bins = [0, 100, 300, 500, 1000, float('inf')]
-        labels = ['~$100', '$100-300', '$300-500', '$500-1000', '$1000~']
-
-        self.df['価格帯'] = pd.cut(self.df['価格'], bins=bins, labels=labels)
-        price_range_counts = self.df['価格帯'].value_counts().sort_index()
-
-        return price_range_counts
+        self.df['価格帯'] = self.PRICE_BANDS.cut(self.df['価格'])
+        return pd.Series(self.PRICE_BANDS.counts(self.df['価格']),
+                         index=pd.Index(self.PRICE_BANDS.labels, name='価格帯'), name='count')
 
     def _calculate_line_stats(self):
         """ライン別統計"""
@@ -161,6 +257,28 @@ class AbstractBrandStrategy(ABC):
         """
         pass
 
+    def generate_css(self):
+        """
+        タブ用のCSS（最初の</style>の前に追加する。不要なら空文字列）
+
+        ブランドカラーのスタイルは brand_theme() で返す（テーマブロックにまとめるため再生成しても増えない）
+        """
+        return ''
+
+    def brand_theme(self):
+        """
+        タブのブランドテーマ（utils.brand_theme.BrandTheme。不要ならNone）
+        """
+        if self.THEME_ACCENT is None:
+            return None
+        return BrandTheme(self.tab_id, self.brand_color, self.THEME_ACCENT, cards=True)
+
+    def chart_data(self):
+        """
+        タブ表示時に読み込むグラフデータ（utils.chart_bundle.ChartBundle.add() の引数のdictのリスト）
+        """
+        return []
+
     def generate_base_stats_html(self):
         """
         基本統計HTMLを生成（共通）
@@ -192,7 +310,35 @@ class AbstractBrandStrategy(ABC):
 
 
 if __name__ == '__main__':
+    class _LineStrategy(AbstractBrandStrategy):
+        BRAND_NAME = 'TEST'
+        LINES = {'Alpha': ['ALPHA'], 'Beta': ['BETA', 'B-']}
+
+        def extract_model_number(self, title_upper):
+            return 'N/A'
+
+        def generate_html(self):
+            return ''
+
+    class _RowStrategy(_LineStrategy):
+        def classify_line(self, row):
+            return f"{row['駆動方式']}:{row['TITLE_UPPER'][:4]}"
+
+    df = pd.DataFrame({
+        'TITLE_UPPER': ['ALPHA BETA', 'B-100', 'GAMMA', 'BETA', 'ALPHA'],
+        '駆動方式': ['自動巻き', 'クォーツ', '不明', 'クォーツ', '自動巻き'],
+    }, index=[10, 11, 12, 13, 14])
+
+    # 列単位の一括分類は1行ずつの分類（従来の df.apply(axis=1)）と同じ結果
+    for cls in (_LineStrategy, _RowStrategy):
+        strategy = cls.create(df)
+        lines = strategy.classify_lines(df)
+        assert lines.index.equals(df.index)
+        assert lines.tolist() == df.apply(strategy.classify_line, axis=1).tolist()
+    assert _LineStrategy.create(df).classify_lines(df).tolist() == ['Alpha', 'Beta', 'その他TEST', 'Beta', 'Alpha']
+
     print("✅ 基底クラス定義完了")
     print("   - AbstractBrandStrategy: 各ブランド戦略の基底クラス")
     print("   - 共通処理フロー: process_data() → calculate_statistics()")
-    print("   - 抽象メソッド: extract_model_number(), classify_line(), generate_html()")
+    print("   - 抽象メソッド: extract_model_number(), generate_html()")
+    print("   - ライン分類: classify_lines()（列単位。既定は LINES で一括分類、classify_line() は1件ずつの分類）")
@@ -0,0 +1,133 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+CASIO戦略クラス
+ライン定義・キャラクターキーワードは rebuild_casio_v3_complete.py と同じ
+"""
+import sys
+import os
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from strategies.standard import StandardBrandStrategy
+from utils.model_number import CASIO_EXTRACTOR
+
+# CASIOライン定義（優先順位順）
+CASIO_LINES = {
+    # ===== メインライン =====
+    'G-SHOCK': [
+        'G-SHOCK', 'GSHOCK', 'G SHOCK',
+        # メタルシリーズ
+        'GMW-', 'GM-', 'GMB-',
+        # マスターシリーズ
+        'MTG-', 'MRG-', 'MR-G',
+        # グラビティマスター
+        'GW-A', 'GA-1',
+        # フロッグマン
+        'FROGMAN', 'GWF-', 'GF-',
+        # レンジマン
+        'RANGEMAN', 'GW-9', 'GPR-',
+        # マッドマスター
+        'MUDMASTER', 'GG-',
+        # ガルフマスター
+        'GULFMASTER', 'GWN-',
+        # 一般型番
+        'DW-', 'GA-', 'GW-', 'GBD-', 'GST-', 'GAW-', 'GBA-',
+        'GD-', 'GDF-', 'G-', 'GLX-', 'GLS-', 'GMA-', 'GMD-',
+    ],
+
+    'BABY-G': [
+        'BABY-G', 'BABY G', 'BABYG',
+        'BG-', 'BGA-', 'BGD-', 'MSG-', 'BLX-', 'BSA-',
+    ],
+
+    'PRO TREK': [
+        'PRO TREK', 'PROTREK', 'PRO-TREK',
+        'PRW-', 'PRG-', 'PRT-', 'PRX-', 'PRJ-',
+        'CLIMBER', 'MANASLU',
+    ],
+
+    'OCEANUS': [
+        'OCEANUS',
+        'OCW-', 'OC-',
+        'MANTA',
+    ],
+
+    'EDIFICE': [
+        'EDIFICE',
+        'EF-', 'EQB-', 'ECB-', 'EFR-', 'EFS-', 'EFV-', 'ERA-',
+    ],
+
+    'LINEAGE': [
+        'LINEAGE',
+        'LCW-', 'LIW-', 'LWA-',
+    ],
+
+    'SHEEN': [
+        'SHEEN',
+        'SHE-', 'SHS-', 'SHB-', 'SHW-',
+    ],
+
+    'WAVE CEPTOR': [
+        'WAVE CEPTOR', 'WAVECEPTOR',
+        'WV-', 'WVA-', 'WVQ-', 'WVM-',
+    ],
+
+    # ===== クラシック/その他 =====
+    'CLASSIC': [
+        'CLASSIC', 'RETRO',
+        'A168', 'A700', 'B650', 'CA-',
+    ],
+
+    'DATA BANK': [
+        'DATA BANK', 'DATABANK',
+        'DB-', 'DBC-',
+    ],
+
+    'STANDARD': [
+        'STANDARD',
+        'AQ-', 'W-',
+    ],
+}
+
+# キャラクター/コラボ判定（別視点）
+CHARACTER_KEYWORDS = [
+    # コラボ一般
+    'COLLABORATION', 'COLLAB',
+    # 映画・ドラマ
+    'BACK TO THE FUTURE', 'BTTF',
+    'STRANGER THINGS',
+    'TRANSFORMERS',
+    # K-POP
+    'ITZY', 'BTS', 'BLACKPINK',
+    # アニメ・漫画
+    'EVANGELION', 'EVA',
+    'DRAGON BALL', 'DRAGONBALL',
+    'ONE PIECE', 'LUFFY',
+    'GUNDAM',
+    'POKEMON', 'PIKACHU',
+    # キャラクター
+    'BARBIE',
+    'HELLO KITTY', 'KITTY',
+    'SNOOPY',
+    # スポーツ・ブランド
+    'NASA', 'RED BULL',
+    'BRUCE LEE',
+    # ストリート
+    'KITH', 'BEAMS',
+    # ゲーム
+    'LEAGUE OF LEGENDS', 'LOL',
+]
+
+
+class CASIOStrategy(StandardBrandStrategy):
+    """CASIO戦略クラス"""
+
+    BRAND_NAME = 'CASIO'
+    BRAND_COLOR = '#d62828'
+    BRAND_COLOR_LIGHT = '#ffebee'
+    LINES = CASIO_LINES
+    MODEL_EXTRACTOR = CASIO_EXTRACTOR
+    CHARACTER_KEYWORDS = CHARACTER_KEYWORDS
+    CHART_COLORS = ['#d62828', '#e63946', '#f77f00', '#fcbf49', '#eae2b7']
+    EMOJI = '🔴'
@@ -0,0 +1,271 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+全ブランド一括生成ドライバー
+CSV・index.htmlは1回ずつ読み、完品データを1回のgroupbyでブランドごとに分けて
+各ブランドの戦略クラスでタブを生成し、index.htmlを1回だけ保存する
+
+- ブランドごとの rebuild_*_v3_complete.py / rebuild_*_template_fixed.py を順に実行する必要はない
+- 戦略は1ブランドずつ生成・反映し、反映後に破棄する（全ブランドの中間データを同時に保持しない）
+- ブランドを指定しない場合、既存タブが戦略と別のレイアウト（v3スクリプトのタブなど）のブランドは
+  置き換えない（戦略のレイアウトの方がセクションが少ないため。置き換える場合はブランドを指定する）
+"""
+import sys
+import os
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from strategies.seiko import SEIKOStrategy
+from strategies.casio import CASIOStrategy
+from strategies.citizen import CITIZENStrategy
+from strategies.orient import OrientStrategy
+from strategies.rado import RADOStrategy
+from strategies.omega import OMEGAStrategy
+from strategies.gucci import GUCCIStrategy
+from strategies.tagheuer import TAGHEUERStrategy
+from strategies.rolex import ROLEXStrategy
+from strategies.hamilton import HamiltonStrategy
+from strategies.template import TemplateBrandStrategy
+from utils.brand_theme import apply_brand_themes
+from utils.chart_bundle import ChartBundle
+from utils.html_tabs import TabDocument
+
+
+# 戦略クラスを定義したブランド（index.htmlのタブ順）
+STRATEGY_CLASSES = [
+    SEIKOStrategy,
+    CASIOStrategy,
+    CITIZENStrategy,
+    OrientStrategy,
+    RADOStrategy,
+    OMEGAStrategy,
+    GUCCIStrategy,
+    TAGHEUERStrategy,
+    ROLEXStrategy,
+    HamiltonStrategy,
+]
+
+
+def template_strategy_classes():
+    """template_brand_tab.py形式のブランド（rebuild_template_brand_tabs.py の設定）の戦略クラス"""
+    from rebuild_template_brand_tabs import load_configs
+    return [TemplateBrandStrategy.for_config(config) for config in load_configs()]
+
+
+def all_strategy_classes():
+    """全ブランドの戦略クラス（新規タブはこの順に挿入）"""
+    return STRATEGY_CLASSES + template_strategy_classes()
+
+
+def split_brands(df, brand_names):
+    """
+    完品データをブランドごとに分ける（1回のgroupby）
+
+    Args:
+        df: 時計データ（load_watch_data() の結果）
+        brand_names: 対象ブランド名のリスト
+
+    Returns:
+        {ブランド名: 完品データ（TITLE_UPPER列付き）}
+    """
+    df_target = df[(df['商品状態'] == '完品') & df['ブランド'].isin(brand_names)].copy()
+    if 'タイトル_upper' in df_target.columns:
+        df_target['TITLE_UPPER'] = df_target['タイトル_upper']
+    else:
+        df_target['TITLE_UPPER'] = df_target['タイトル'].str.upper()
+    return {brand: group for brand, group in df_target.groupby('ブランド', sort=False, observed=True)}
+
+
+def keeps_existing_tab(doc, cls):
+    """
+    ブランド未指定の一括生成で既存タブを保持するか
+
+    Args:
+        doc: TabDocument
+        cls: 戦略クラス
+
+    Returns:
+        既存タブが戦略と別のレイアウトならTrue（タブがない・同じレイアウトならFalse）
+    """
+    tab_id = cls.TAB_ID or cls.BRAND_NAME
+    if tab_id not in doc.tabs or cls.has_own_layout(doc.tab_html(tab_id)):
+        return False
+    print(f"⏭️ {cls.BRAND_NAME}: 既存タブは個別スクリプトのレイアウトのため保持"
+          f"（置き換える場合はブランドを指定）")
+    return True
+
+
+def apply_strategy(doc, charts, strategy, insert_after=None):
+    """
+    戦略の生成結果をTabDocumentとグラフデータに反映
+
+    既存タブはその位置で置き換え、ないタブは INSERT_AFTER（Noneなら insert_after）の直後に挿入する
+
+    Args:
+        doc: TabDocument
+        charts: グラフデータの登録先（ChartBundle）
+        strategy: process_data() 済みの戦略
+        insert_after: 戦略に INSERT_AFTER がない場合の挿入位置（直前のタブid）
+
+    Returns:
+        反映できたかどうか
+    """
+    tab_html = strategy.generate_html()
+    anchor = strategy.INSERT_AFTER or insert_after
+    if strategy.tab_id in doc.tabs:
+        doc.replace_tab(strategy.tab_id, tab_html.strip())
+    elif anchor is not None and doc.has_tab(anchor):
+        doc.insert_tab_after(anchor, '\n' + tab_html, tab_id=strategy.tab_id)
+    else:
+        print(f"❌ {strategy.brand_name}: {anchor}タブが見つかりません")
+        return False
+
+    css = strategy.generate_css()
+    if css:
+        doc.insert_before_style_end(css + '\n')
+    for chart in strategy.chart_data():
+        charts.add(strategy.tab_id, **chart)
+    return True
+
+
+def run_strategies(df=None, index_path='index.html', brand_names=None, strategy_classes=None, snapshot=None):
+    """
+    全ブランドのタブを生成してindex.htmlに保存
+
+    Args:
+        df: 読み込み済みDataFrame（Noneなら load_watch_data() で読む）
+        index_path: index.htmlのパス
+        brand_names: 対象ブランド名またはタブidのリスト
+                     （Noneなら全ブランド。ただし既存タブが戦略と別のレイアウトのブランドは除く）
+        strategy_classes: 戦略クラスのリスト（Noneなら all_strategy_classes()）
+        snapshot: 分析スナップショット（Noneで df も None なら load_snapshot() で開く。
+                  スナップショットに集計のあるブランドは集計を省略する）
+
+    Returns:
+        反映したブランド名のリスト
+    """
+    from utils.analytics_snapshot import load_snapshot
+    from utils.data_loader import load_watch_data
+
+    if strategy_classes is None:
+        strategy_classes = all_strategy_classes()
+    doc = TabDocument.from_file(index_path)
+    kept = []
+    if brand_names:
+        strategy_classes = [cls for cls in strategy_classes
+                            if cls.BRAND_NAME in brand_names or cls.TAB_ID in brand_names]
+    else:
+        kept = [cls for cls in strategy_classes if keeps_existing_tab(doc, cls)]
+    targets = [cls for cls in strategy_classes if cls not in kept]
+
+    print(f"📄 全ブランド一括生成開始（{len(targets)}ブランド）...")
+    if df is None:
+        df = load_watch_data()
+        # CSVから読む場合は分析スナップショットの集計を使える（渡されたdfはCSVと一致するとは限らない）
+        if snapshot is None:
+            snapshot = load_snapshot()
+    groups = split_brands(df, [cls.BRAND_NAME for cls in targets])
+
+    charts = ChartBundle()
+    applied = []
+    themes = []
+    previous_tab = None
+    for cls in strategy_classes:
+        if cls in kept:
+            # 保持したタブも新規タブの挿入位置にする
+            previous_tab = cls.TAB_ID or cls.BRAND_NAME
+            continue
+        df_brand = groups.pop(cls.BRAND_NAME, None)
+        if df_brand is None or len(df_brand) == 0:
+            print(f"⚠️ {cls.BRAND_NAME}: 完品データがないためスキップ")
+            continue
+
+        strategy = cls.create(df_brand)
+        del df_brand
+        if snapshot is not None:
+            strategy.use_snapshot(snapshot)
+        strategy.process_data()
+        if apply_strategy(doc, charts, strategy, insert_after=previous_tab):
+            applied.append(strategy.brand_name)
+            previous_tab = strategy.tab_id
+            theme = strategy.brand_theme()
+            if theme is not None:
+                themes.append(theme)
+        del strategy
+
+    # ブランドカラーのCSSはテーマブロック1つにまとめる（再生成しても増えない）
+    if themes:
+        apply_brand_themes(doc, themes)
+    html = charts.save(index_path, doc.render())
+    with open(index_path, 'w', encoding='utf-8') as f:
+        f.write(html)
+
+    print(f"\n✅ 全ブランド一括生成完了！（{len(applied)}/{len(targets)}ブランド）")
+    print(f"   - ファイルサイズ: {len(html):,}文字")
+    return applied
+
+
+if __name__ == '__main__':
+    import tempfile
+
+    import pandas as pd
+
+    from strategies.standard import StandardBrandStrategy
+    from utils.model_number import ModelNumberExtractor
+
+    class AlphaStrategy(StandardBrandStrategy):
+        BRAND_NAME = 'ALPHA'
+        LINES = {'One': ['ONE'], 'Two': ['TWO']}
+        MODEL_EXTRACTOR = ModelNumberExtractor([r'\b(A\d{3})\b'], default="N/A")
+        CHARACTER_KEYWORDS = ['DISNEY']
+
+    class BetaStrategy(AlphaStrategy):
+        BRAND_NAME = 'BETA'
+        TAB_ID = 'BETA_TAB'
+        THEME_ACCENT = '#C9B037'
+
+    df = pd.DataFrame({
+        'ブランド': ['ALPHA', 'ALPHA', 'ALPHA', 'BETA', 'BETA'],
+        '商品状態': ['完品', '完品', 'パーツ', '完品', '完品'],
+        'タイトル': ['Alpha One A100', 'ALPHA TWO DISNEY A200', 'ALPHA PARTS', 'BETA ONE A100', 'BETA'],
+        '価格': [100.0, 200.0, 10.0, 300.0, 400.0],
+        '販売数': [1, 1, 1, 1, 1],
+    })
+    groups = split_brands(df, ['ALPHA', 'BETA'])
+    assert len(groups['ALPHA']) == 2 and groups['ALPHA']['TITLE_UPPER'].iloc[0] == 'ALPHA ONE A100'
+
+    with tempfile.TemporaryDirectory() as tmp:
+        index_path = os.path.join(tmp, 'index.html')
+        with open(index_path, 'w', encoding='utf-8') as f:
+            f.write('<html><style>\n</style><body>\n'
+                    '<div id="ALPHA" class="tab-content">OLD TAB</div>\n'
+                    '<script>\nfunction showTab(tabId) {\n'
+                    "    document.getElementById(tabId).classList.add('active');\n"
+                    '}\n</script>\n</body></html>')
+
+        # ブランド未指定では別レイアウトの既存タブ（ALPHA）は置き換えない
+        applied = run_strategies(df, index_path, strategy_classes=[AlphaStrategy, BetaStrategy])
+        assert applied == ['BETA']
+        with open(index_path, 'r', encoding='utf-8') as f:
+            assert 'OLD TAB' in f.read()
+
+        # 指定すれば置き換え、以後は同じレイアウトなのでブランド未指定でも再生成する
+        assert run_strategies(df, index_path, brand_names=['ALPHA'],
+                              strategy_classes=[AlphaStrategy, BetaStrategy]) == ['ALPHA']
+        applied = run_strategies(df, index_path, strategy_classes=[AlphaStrategy, BetaStrategy])
+        assert applied == ['ALPHA', 'BETA']
+        with open(index_path, 'r', encoding='utf-8') as f:
+            html = f.read()
+        doc = TabDocument(html)
+        assert list(doc.tabs) == ['ALPHA', 'BETA_TAB']
+        assert 'OLD TAB' not in html and 'ALPHA 詳細分析' in html
+        assert doc.tab_span('ALPHA')[1] < doc.tab_span('BETA_TAB')[0]
+        assert html.count('class="tab-content"') == 2
+        assert ':is(#BETA_TAB) .stat-card {' in html and '#ALPHA {' not in html
+
+        # 再生成してもブランドテーマのCSSは増えない
+        run_strategies(df, index_path, strategy_classes=[AlphaStrategy, BetaStrategy])
+        with open(index_path, 'r', encoding='utf-8') as f:
+            assert f.read() == html
+
+    print("✅ 一括生成ドライバーテスト完了")
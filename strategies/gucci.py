@@ -0,0 +1,39 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+GUCCI戦略クラス
+ライン定義は rebuild_gucci_v3_complete.py と同じ（型番ベース）
+"""
+import sys
+import os
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from strategies.standard import StandardBrandStrategy
+from utils.model_number import GUCCI_EXTRACTOR
+
+# GUCCIライン定義（優先順位順）
+GUCCI_LINES = {
+    '1500L Series': ['1500L'],
+    '9000L Series': ['9000L', '9000M'],
+    'Sherry Line': ['SHERRY LINE'],
+    '2000L Series': ['2000L', '2000M'],
+    'G-Timeless': ['G-TIMELESS', 'G TIMELESS'],
+    'Sync': ['SYNC'],
+}
+
+# 特徴的デザイン判定
+CHARACTER_KEYWORDS = ['DIAMOND', 'G-FACE', 'G FACE', 'BEE', 'SNAKE']
+
+
+class GUCCIStrategy(StandardBrandStrategy):
+    """GUCCI戦略クラス"""
+
+    BRAND_NAME = 'GUCCI'
+    BRAND_COLOR = '#006341'
+    BRAND_COLOR_LIGHT = '#e8f5e9'
+    LINES = GUCCI_LINES
+    MODEL_EXTRACTOR = GUCCI_EXTRACTOR
+    CHARACTER_KEYWORDS = CHARACTER_KEYWORDS
+    CHART_COLORS = ['#006341', '#00875a', '#00a86b', '#10c77d', '#20e68f']
+    EMOJI = '🐝'
@@ -0,0 +1,42 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Hamilton戦略クラス
+ライン定義は rebuild_hamilton_v3_complete.py と同じ
+"""
+import sys
+import os
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from strategies.standard import StandardBrandStrategy
+from utils.model_number import HAMILTON_EXTRACTOR
+
+# Hamiltonライン定義（優先順位順）
+HAMILTON_LINES = {
+    'Jazzmaster': ['JAZZMASTER', 'JAZZ MASTER'],
+    'Khaki Field': ['KHAKI FIELD', 'KHAKI-FIELD'],
+    'Ventura': ['VENTURA'],
+    'Khaki Aviation': ['KHAKI AVIATION', 'KHAKI PILOT', 'KHAKI AIR', 'X-WIND'],
+    'American Classic': ['AMERICAN CLASSIC'],
+    'Khaki Navy': ['KHAKI NAVY', 'KHAKI SUB'],
+    'Intra-Matic': ['INTRA-MATIC', 'INTRAMATIC'],
+    'Broadway': ['BROADWAY'],
+}
+
+# コラボ/限定モデル判定
+CHARACTER_KEYWORDS = ['ELVIS', 'TOKYO CAT STREET', 'CAT STREET']
+
+
+class HamiltonStrategy(StandardBrandStrategy):
+    """Hamilton戦略クラス"""
+
+    BRAND_NAME = 'Hamilton'
+    BRAND_COLOR = '#002855'
+    BRAND_COLOR_LIGHT = '#e3e8f0'
+    LINES = HAMILTON_LINES
+    MODEL_EXTRACTOR = HAMILTON_EXTRACTOR
+    CHARACTER_KEYWORDS = CHARACTER_KEYWORDS
+    CHART_COLORS = ['#002855', '#C8A882', '#666666', '#999999', '#CCCCCC']
+    THEME_ACCENT = '#C8A882'
+    EMOJI = '🎖️'
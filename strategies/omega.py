@@ -0,0 +1,41 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+OMEGA戦略クラス
+ライン定義は rebuild_omega_v3_complete.py と同じ
+"""
+import sys
+import os
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from strategies.standard import StandardBrandStrategy
+from utils.model_number import OMEGA_EXTRACTOR
+
+# OMEGAライン定義（優先順位順）
+OMEGA_LINES = {
+    'De Ville': ['DE VILLE', 'DEVILLE'],
+    'Seamaster': ['SEAMASTER'],
+    'Speedmaster': ['SPEEDMASTER'],
+    'Constellation': ['CONSTELLATION'],
+    'Geneve': ['GENEVE', 'GENEVA'],
+    'Cosmic': ['COSMIC'],
+    'Dynamic': ['DYNAMIC'],
+    'Railmaster': ['RAILMASTER'],
+}
+
+# 限定/特別モデル判定
+CHARACTER_KEYWORDS = ['LIMITED', 'SPECIAL EDITION']
+
+
+class OMEGAStrategy(StandardBrandStrategy):
+    """OMEGA戦略クラス"""
+
+    BRAND_NAME = 'OMEGA'
+    BRAND_COLOR = '#667eea'
+    BRAND_COLOR_LIGHT = '#ede7f6'
+    LINES = OMEGA_LINES
+    MODEL_EXTRACTOR = OMEGA_EXTRACTOR
+    CHARACTER_KEYWORDS = CHARACTER_KEYWORDS
+    CHART_COLORS = ['#667eea', '#764ba2', '#666666', '#999999']
+    EMOJI = 'Ω'
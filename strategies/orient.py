@@ -0,0 +1,50 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Orient戦略クラス
+ライン定義・キャラクターキーワードは rebuild_orient_v3_complete.py と同じ
+（正規表現の選択肢 'A|B' をキーワードのリストにしたもの）
+"""
+import sys
+import os
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from strategies.standard import StandardBrandStrategy
+from utils.model_number import ORIENT_EXTRACTOR
+
+# Orientライン定義（優先順位順）
+ORIENT_LINES = {
+    'Orient Star': ['ORIENT STAR', 'ORIENTSTAR'],
+    'Bambino': ['BAMBINO'],
+    'Mako': ['MAKO'],
+    'Sun & Moon': ['SUN & MOON', 'SUN&MOON', 'SUN AND MOON'],
+    'Kamasu': ['KAMASU'],
+    'Neo 70s': ['NEO 70', 'NEO70', 'NEO SEVENTIES'],
+    'Ray II': ['RAY II', 'RAY2'],
+    'Panda': ['PANDA'],
+    'Sports': ['SPORTS'],
+    'Classic': ['CLASSIC'],
+    'Revival': ['REVIVAL'],
+    'Contemporary': ['CONTEMPORARY'],
+}
+
+# キャラクター/コラボ判定
+CHARACTER_KEYWORDS = [
+    'DISNEY', 'MARVEL', 'STAR WARS',
+    'HELLO KITTY', 'SNOOPY', 'PEANUTS',
+    'EVANGELION', 'GUNDAM',
+]
+
+
+class OrientStrategy(StandardBrandStrategy):
+    """Orient戦略クラス"""
+
+    BRAND_NAME = 'Orient'
+    BRAND_COLOR = '#FF6B35'
+    BRAND_COLOR_LIGHT = '#FFE5D9'
+    LINES = ORIENT_LINES
+    MODEL_EXTRACTOR = ORIENT_EXTRACTOR
+    CHARACTER_KEYWORDS = CHARACTER_KEYWORDS
+    CHART_COLORS = ['#FF6B35', '#FF8C61', '#FFB399', '#FFD9CC']
+    EMOJI = '🟠'
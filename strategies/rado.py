@@ -0,0 +1,53 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+RADO戦略クラス
+ライン定義は rebuild_rado_v3_complete.py と同じ
+"""
+import sys
+import os
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from strategies.standard import StandardBrandStrategy
+from utils.model_number import RADO_EXTRACTOR
+
+# RADOライン定義（優先順位順）
+RADO_LINES = {
+    # 主要ライン
+    'DiaStar': ['DIASTAR', 'DIA STAR', 'DIA-STAR'],
+    'Florence': ['FLORENCE'],
+    'Golden Horse': ['GOLDEN HORSE', 'GREEN HORSE', 'PURPLE HORSE'],
+
+    # サブライン
+    'Balboa': ['BALBOA'],
+    'Jubile': ['JUBILE', 'JUBILEE'],
+    'Coupole': ['COUPOLE'],
+    'Manchester': ['MANCHESTER'],
+    'Voyager': ['VOYAGER'],
+
+    # 現代ライン（データには少ないが定義）
+    'Captain Cook': ['CAPTAIN COOK'],
+    'Centrix': ['CENTRIX'],
+    'True': ['TRUE THINLINE', 'TRUE SQUARE', 'TRUE '],
+    'HyperChrome': ['HYPERCHROME', 'HYPER CHROME'],
+    'Ceramica': ['CERAMICA'],
+    'Integral': ['INTEGRAL'],
+    'Original': ['ORIGINAL'],
+}
+
+# 限定/記念モデル判定
+CHARACTER_KEYWORDS = ['LIMITED', 'SPECIAL EDITION', 'ANNIVERSARY']
+
+
+class RADOStrategy(StandardBrandStrategy):
+    """RADO戦略クラス"""
+
+    BRAND_NAME = 'RADO'
+    BRAND_COLOR = '#7b2cbf'
+    BRAND_COLOR_LIGHT = '#f3e5f5'
+    LINES = RADO_LINES
+    MODEL_EXTRACTOR = RADO_EXTRACTOR
+    CHARACTER_KEYWORDS = CHARACTER_KEYWORDS
+    CHART_COLORS = ['#7b2cbf', '#9d4edd', '#c77dff', '#e0aaff', '#f0d9ff']
+    EMOJI = '💎'
@@ -0,0 +1,42 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+ROLEX戦略クラス
+ライン定義は rebuild_rolex_v3_complete.py と同じ
+"""
+import sys
+import os
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from strategies.standard import StandardBrandStrategy
+from utils.model_number import ROLEX_EXTRACTOR
+
+# ROLEXライン定義（優先順位順）
+ROLEX_LINES = {
+    'Datejust': ['DATEJUST', 'DATE JUST'],
+    'Submariner': ['SUBMARINER', 'SUB'],
+    'Oyster Perpetual': ['OYSTER PERPETUAL'],
+    'Daytona': ['DAYTONA'],
+    'GMT-Master': ['GMT-MASTER', 'GMT MASTER', 'GMT'],
+    'Explorer': ['EXPLORER'],
+    'Day-Date': ['DAY-DATE', 'DAY DATE'],
+    'Yacht-Master': ['YACHT-MASTER', 'YACHT MASTER'],
+    'Sea-Dweller': ['SEA-DWELLER', 'SEA DWELLER'],
+    'Milgauss': ['MILGAUSS'],
+    'Air-King': ['AIR-KING', 'AIR KING'],
+    'Sky-Dweller': ['SKY-DWELLER', 'SKY DWELLER'],
+}
+
+
+class ROLEXStrategy(StandardBrandStrategy):
+    """ROLEX戦略クラス（キャラクター/コラボ判定なし）"""
+
+    BRAND_NAME = 'ROLEX'
+    BRAND_COLOR = '#006039'
+    BRAND_COLOR_LIGHT = '#e8f5e9'
+    LINES = ROLEX_LINES
+    MODEL_EXTRACTOR = ROLEX_EXTRACTOR
+    CHART_COLORS = ['#006039', '#C9B037', '#666666', '#999999']
+    THEME_ACCENT = '#C9B037'
+    EMOJI = '👑'
@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+SEIKO戦略クラス
+ライン定義・キャラクターキーワードは rebuild_seiko_v3_complete.py と同じ
+"""
+import sys
+import os
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from strategies.standard import StandardBrandStrategy
+from utils.model_number import SEIKO_EXTRACTOR
+
+# SEIKOライン定義（優先順位順）
+SEIKO_LINES = {
+    # 高級ライン
+    'Grand Seiko': ['GRAND SEIKO', 'GS ', ' GS', 'SBGR', 'SBGA', 'SBGM', 'SBGX', 'SBGE', 'SBGC'],
+    'Credor': ['CREDOR'],
+    'King Seiko': ['KING SEIKO'],
+
+    # メインライン
+    'Prospex': ['PROSPEX', 'SBDC', 'SBDN', 'SPB', 'SBDL', 'SBDY', 'SBDX', 'SBBN', 'SBEP'],
+    'Presage': ['PRESAGE', 'COCKTAIL', 'SARY', 'SRPB', 'SSA', 'SRPE', 'SRPC', 'SRPH', 'SRRX'],
+    'Astron': ['ASTRON', 'SSE', 'SSH'],
+    'SEIKO 5': ['SEIKO 5', 'SEIKO5', '5 SPORTS', 'SNZG', 'SNK', 'SRPD', 'SRPE'],
+
+    # サブブランド・特殊ライン
+    'ALBA': ['ALBA', 'AIGN', 'AQPS', 'AQGK', 'AEFN'],
+    'Spirit': ['SPIRIT', 'SCVE', 'SCXP', 'SBPX', 'SBPY'],
+    'Selection': ['SELECTION', 'SBTR', 'SBPX'],
+    'Dolce': ['DOLCE', 'SACL', 'SACM', 'SADZ', 'SCXK'],
+    'Exceline': ['EXCELINE', 'SWCW', 'SWCP'],
+    'Lukia': ['LUKIA', 'SSVW', 'SSQV', 'SSVR'],
+    'Brightz': ['BRIGHTZ', 'SAGA', 'SAGZ'],
+    'Wired': ['WIRED', 'AGAW', 'AGAV'],
+
+    # ヴィンテージライン
+    'Lord Marvel': ['LORD MARVEL'],
+    'Lord Matic': ['LORD MATIC', 'LORDMATIC'],
+    'Chariot': ['CHARIOT'],
+    'Bellmatic': ['BELLMATIC', 'BELL MATIC'],
+    'Sportsmatic': ['SPORTSMATIC', 'SPORTS MATIC'],
+    'King-Matic': ['KING MATIC', 'KINGMATIC', 'KM'],
+
+    # 特殊カテゴリ
+    'キャラクターウォッチ': ['DISNEY', 'MICKEY', 'HELLO KITTY', 'MARVEL', 'STAR WARS',
+                       'POKEMON', 'GUNDAM', 'ONE PIECE', 'DORAEMON', 'DEMON SLAYER',
+                       'CHARACTER', 'COLLABORATION'],
+    'Kinetic': ['KINETIC', 'AUTO RELAY'],
+    'Velatura': ['VELATURA'],
+    'Ananta': ['ANANTA'],
+}
+
+# キャラクター/コラボ判定（別視点）
+CHARACTER_KEYWORDS = [
+    'DISNEY', 'MICKEY', 'MINNIE',
+    'HELLO KITTY', 'KITTY', 'RILAKKUMA',
+    'GHIBLI', 'TOTORO', 'SPIRITED AWAY',  # ← ユーザー指摘！
+    'ONE PIECE', 'LUFFY', 'NARUTO', 'DRAGON BALL', 'DRAGONBALL',
+    'GUNDAM', 'MOBILE SUIT', 'EVANGELION', 'EVA',
+    'DORAEMON', 'DEMON SLAYER', 'KIMETSU', 'SAILOR MOON',
+    'POKEMON', 'PIKACHU',
+    'SPIDER', 'IRON MAN', 'CAPTAIN AMERICA', 'AVENGERS',
+    'SNOOPY', 'PEANUTS',  # ← ユーザー指摘！
+    'STAR WARS', 'DARTH', 'YODA', 'JEDI',
+    'COLLABORATION', 'COLLAB',
+    'STREET FIGHTER',
+    'KUMAMON',
+]
+
+
+class SEIKOStrategy(StandardBrandStrategy):
+    """SEIKO戦略クラス"""
+
+    BRAND_NAME = 'SEIKO'
+    BRAND_COLOR = '#0051a5'
+    BRAND_COLOR_LIGHT = '#e3f2fd'
+    LINES = SEIKO_LINES
+    MODEL_EXTRACTOR = SEIKO_EXTRACTOR
+    CHARACTER_KEYWORDS = CHARACTER_KEYWORDS
+    CHART_COLORS = ['#0051a5', '#0066cc', '#0080ff', '#3399ff', '#66b3ff']
+    EMOJI = '🔷'
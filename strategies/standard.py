@@ -0,0 +1,351 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+標準ブランド戦略クラス
+ライン定義・型番パターン・キャラクターキーワード・ブランドカラーをクラス属性で宣言するだけで
+ブランドタブ（基本統計・Top30・グラフ・ライン別詳細・キャラクター/コラボ分析）を生成する
+"""
+import json
+import sys
+import os
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from strategies.base import AbstractBrandStrategy
+from utils.common import aggregate_top_lines, format_price, generate_search_link_html
+
+
+class StandardBrandStrategy(AbstractBrandStrategy):
+    """
+    宣言的に定義するブランド戦略
+
+    子クラスで設定するクラス属性:
+        BRAND_NAME: CSVのブランド名（例: 'SEIKO'）
+        BRAND_COLOR / BRAND_COLOR_LIGHT: ブランドカラー（濃/淡）
+        LINES: ライン定義 {ライン名: [キーワード, ...]}（優先順位順）
+        MODEL_EXTRACTOR: utils.model_number.ModelNumberExtractor（抽出失敗は"N/A"）
+        CHARACTER_KEYWORDS: キャラクター/コラボ判定キーワード
+        CHART_COLORS: ライン別円グラフの配色
+        EMOJI: ライン別詳細の見出しの絵文字
+    """
+
+    MODEL_EXTRACTOR = None
+    CHARACTER_KEYWORDS = []
+    CHART_COLORS = []
+    EMOJI = '📁'
+
+    @classmethod
+    def has_own_layout(cls, tab_html):
+        """既存タブが標準レイアウトか（見出しで判定。v3スクリプトのタブはFalse）"""
+        return f'margin-bottom: 20px;">{cls.BRAND_NAME} 詳細分析</h2>' in tab_html
+
+    @property
+    def chart_prefix(self):
+        """グラフdivのidの接頭辞（例: 'citizen'、'tag_heuer'）"""
+        return self.tab_id.lower()
+
+    def extract_model_number(self, title_upper):
+        """型番抽出（パターンは MODEL_EXTRACTOR）"""
+        return self.MODEL_EXTRACTOR.extract(title_upper)
+
+    def extract_model_numbers(self, titles_upper):
+        """型番一括抽出"""
+        return self.MODEL_EXTRACTOR.extract_series(titles_upper)
+
+    def is_character_collab(self, title_upper):
+        """キャラクター/コラボ判定"""
+        for kw in self.CHARACTER_KEYWORDS:
+            if kw in title_upper:
+                return True
+        return False
+
+    def generate_top30_html(self):
+        """Top30テーブルHTML生成（検索リンク＋チェックボックス付き）"""
+        top30 = self.stats['top30'].head(30)
+
+        rows_html = []
+        for idx, (model, row) in enumerate(top30.iterrows(), 1):
+            sales = int(row['販売数'])
+            median_price = row['価格']
+
+            # 検索リンク＋チェックボックス
+            search_links = generate_search_link_html(
+                brand=self.brand_name,
+                keyword=model,
+                link_type='model',
+                include_checkbox=True
+            )
+
+            row_html = f'''
+                    <tr>
+                        <td>{idx}</td>
+                        <td><strong>{model}</strong></td>
+                        <td>{sales}</td>
+                        <td>{format_price(median_price)}</td>
+                        <td>
+                            {search_links}
+                        </td>
+                    </tr>'''
+            rows_html.append(row_html)
+
+        table_html = f'''
+        <h3 class="section-title" style="color: {self.brand_color};">🏆 Top30人気モデル（中央値ベース）</h3>
+        <div class="table-container">
+            <table>
+                <thead>
+                    <tr>
+                        <th>順位</th>
+                        <th>型番</th>
+                        <th>販売数</th>
+                        <th>中央値</th>
+                        <th>仕入れ先検索</th>
+                    </tr>
+                </thead>
+                <tbody>
+                    {''.join(rows_html)}
+                </tbody>
+            </table>
+        </div>
+        '''
+
+        return table_html
+
+    def generate_graphs_html(self):
+        """グラフHTML生成（価格帯別、ライン別）"""
+        color = self.brand_color
+        prefix = self.chart_prefix
+
+        # 価格帯別データ
+        price_ranges = self.stats['price_ranges']
+        price_labels = price_ranges.index.tolist()
+        price_values = price_ranges.values.tolist()
+
+        # ライン別データ（Top7 + その他）
+        line_stats = self.stats['line_stats']
+        line_sales = line_stats['販売数'].sort_values(ascending=False)
+        line_sales_aggregated = aggregate_top_lines(line_sales, top_n=7, others_label="その他")
+
+        line_labels = line_sales_aggregated.index.tolist()
+        line_values = line_sales_aggregated.values.tolist()
+        chart_colors = ', '.join(f"'{c}'" for c in (self.CHART_COLORS or [color]))
+
+        graphs_html = f'''
+        <h3 class="section-title" style="color: {color};">📊 グラフ分析</h3>
+        <div style="display: grid; grid-template-columns: repeat(auto-fit, minmax(400px, 1fr)); gap: 20px; margin-bottom: 30px;">
+
+            <div style="background: white; padding: 20px; border-radius: 8px; box-shadow: 0 2px 4px rgba(0,0,0,0.1);">
+                <h4 style="color: {color}; margin-bottom: 15px;">価格帯別販売分布</h4>
+                <div id="{prefix}_price_chart" style="height: 350px;"></div>
+            </div>
+
+            <div style="background: white; padding: 20px; border-radius: 8px; box-shadow: 0 2px 4px rgba(0,0,0,0.1);">
+                <h4 style="color: {color}; margin-bottom: 15px;">ライン別売上比率</h4>
+                <div id="{prefix}_line_chart" style="height: 350px;"></div>
+            </div>
+
+        </div>
+
+        <script>
+        // 価格帯別棒グラフ
+        Plotly.newPlot('{prefix}_price_chart', [{{
+            x: {json.dumps(price_labels, ensure_ascii=False)},
+            y: {json.dumps(price_values, ensure_ascii=False)},
+            type: 'bar',
+            marker: {{color: '{color}'}},
+            text: {json.dumps(price_values, ensure_ascii=False)},
+            textposition: 'outside',
+            hovertemplate: '<b>%{{x}}</b><br>販売数: %{{y}}<extra></extra>'
+        }}], {{
+            margin: {{l: 50, r: 20, t: 20, b: 80}},
+            paper_bgcolor: 'white',
+            plot_bgcolor: 'white',
+            xaxis: {{title: '価格帯'}},
+            yaxis: {{title: '販売数'}}
+        }}, {{responsive: true}});
+
+        // ライン別円グラフ
+        Plotly.newPlot('{prefix}_line_chart', [{{
+            labels: {json.dumps(line_labels, ensure_ascii=False)},
+            values: {json.dumps(line_values, ensure_ascii=False)},
+            type: 'pie',
+            marker: {{
+                colors: [{chart_colors}]
+            }},
+            textinfo: 'label+percent',
+            textposition: 'outside',
+            hovertemplate: '<b>%{{label}}</b><br>販売数: %{{value}}<br>比率: %{{percent}}<extra></extra>'
+        }}], {{
+            margin: {{l: 20, r: 20, t: 20, b: 20}},
+            paper_bgcolor: 'white'
+        }}, {{responsive: true}});
+        </script>
+        '''
+
+        return graphs_html
+
+    def generate_line_details_html(self):
+        """ライン別詳細分析HTML（検索リンク＋チェックボックス付き）"""
+        line_stats = self.stats['line_stats'].sort_values('販売数', ascending=False)
+
+        rows_html = []
+        for line_name, row in line_stats.iterrows():
+            sales = int(row['販売数'])
+            ratio = row['比率']
+            median = row['中央値']
+            cv = row['CV値']
+            stability = row['安定度']
+
+            # 検索リンク＋チェックボックス
+            search_links = generate_search_link_html(
+                brand=self.brand_name,
+                keyword=line_name,
+                link_type='line',
+                include_checkbox=True
+            )
+
+            row_html = f'''
+                    <tr>
+                        <td><strong>{line_name}</strong></td>
+                        <td>{sales}</td>
+                        <td style="color: {self.brand_color};">{ratio * 100:.1f}%</td>
+                        <td>{format_price(median)}</td>
+                        <td>{cv:.3f}</td>
+                        <td>{stability}</td>
+                        <td>
+                            {search_links}
+                        </td>
+                    </tr>'''
+            rows_html.append(row_html)
+
+        html = f'''
+        <h3 class="section-title" style="color: {self.brand_color};">{self.EMOJI} ライン別詳細分析（全{len(line_stats)}ライン）</h3>
+        <div class="table-container">
+            <table>
+                <thead>
+                    <tr>
+                        <th>ライン</th>
+                        <th>販売数</th>
+                        <th style="color: {self.brand_color};">比率</th>
+                        <th>中央値</th>
+                        <th>CV値</th>
+                        <th>安定度</th>
+                        <th>仕入れ先検索</th>
+                    </tr>
+                </thead>
+                <tbody>
+                    {''.join(rows_html)}
+                </tbody>
+            </table>
+        </div>
+        '''
+
+        return html
+
+    def generate_character_analysis_html(self):
+        """キャラクター/コラボ分析HTML（検索リンク＋チェックボックス付き）"""
+        color = self.brand_color
+
+        # キャラクター/コラボ判定
+        self.df['キャラクター/コラボ'] = self.df['TITLE_UPPER'].apply(self.is_character_collab)
+        character_df = self.df[self.df['キャラクター/コラボ']].copy()
+
+        if len(character_df) == 0:
+            return "<p style='color: #999;'>キャラクター/コラボ商品はありません</p>"
+
+        # キャラクター別集計
+        character_counts = {}
+        for title in character_df['TITLE_UPPER']:
+            for kw in self.CHARACTER_KEYWORDS:
+                if kw in title:
+                    kw_clean = kw.strip()
+                    character_counts[kw_clean] = character_counts.get(kw_clean, 0) + 1
+
+        # 上位を抽出
+        sorted_characters = sorted(character_counts.items(), key=lambda x: x[1], reverse=True)[:10]
+
+        total_char = len(character_df)
+        median_price = character_df['価格'].median()
+        ratio = total_char / len(self.df) * 100
+
+        rows_html = []
+        for char_name, count in sorted_characters:
+            char_ratio = count / total_char * 100
+
+            # 検索リンク＋チェックボックス
+            search_links = generate_search_link_html(
+                brand=self.brand_name,
+                keyword=char_name,
+                link_type='character',
+                include_checkbox=True
+            )
+
+            row_html = f'''
+                    <tr>
+                        <td><strong>{char_name}</strong></td>
+                        <td>{count}</td>
+                        <td style="color: {color};">{char_ratio:.1f}%</td>
+                        <td>
+                            {search_links}
+                        </td>
+                    </tr>'''
+            rows_html.append(row_html)
+
+        html = f'''
+        <h3 class="section-title" style="color: {color};">🤝 キャラクター/コラボ分析（複数視点）</h3>
+        <p style="color: #666; margin-bottom: 15px;">同じ商品を別の角度から分析</p>
+
+        <div style="display: grid; grid-template-columns: repeat(3, 1fr); gap: 15px; margin-bottom: 20px;">
+            <div style="background: white; padding: 15px; border-radius: 8px; box-shadow: 0 2px 4px rgba(0,0,0,0.1);">
+                <div style="color: #666; font-size: 0.9em;">キャラクター商品数</div>
+                <div style="color: {color}; font-size: 1.5em; font-weight: bold;">{total_char}個</div>
+            </div>
+            <div style="background: white; padding: 15px; border-radius: 8px; box-shadow: 0 2px 4px rgba(0,0,0,0.1);">
+                <div style="color: #666; font-size: 0.9em;">中央値</div>
+                <div style="font-size: 1.5em; font-weight: bold;">${int(median_price)}</div>
+            </div>
+            <div style="background: white; padding: 15px; border-radius: 8px; box-shadow: 0 2px 4px rgba(0,0,0,0.1);">
+                <div style="color: #666; font-size: 0.9em;">全体比率</div>
+                <div style="color: {color}; font-size: 1.5em; font-weight: bold;">{ratio:.1f}%</div>
+            </div>
+        </div>
+
+        <div class="table-container">
+            <table>
+                <thead>
+                    <tr>
+                        <th>キャラクター</th>
+                        <th>販売数</th>
+                        <th>比率</th>
+                        <th>仕入れ先検索</th>
+                    </tr>
+                </thead>
+                <tbody>
+                    {''.join(rows_html)}
+                </tbody>
+            </table>
+        </div>
+        '''
+
+        return html
+
+    def generate_html(self):
+        """HTML生成"""
+        html = f'''<div id="{self.tab_id}" class="tab-content">
+        <h2 style="color: {self.brand_color}; margin-bottom: 20px;">{self.brand_name} 詳細分析</h2>
+
+        {self.generate_base_stats_html()}
+
+        {self.generate_top30_html()}
+
+        {self.generate_graphs_html()}
+
+        {self.generate_line_details_html()}
+
+        {self.generate_character_analysis_html()}
+
+        <p style="color: #666; margin: 20px 0;">
+            ✅ {self.brand_name}完成：全セクション + 検索リンク＋チェックボックス
+        </p>
+    </div>'''
+
+        return html
@@ -0,0 +1,43 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+TAG HEUER戦略クラス
+ライン定義は rebuild_tagheuer_v3_complete.py と同じ
+"""
+import sys
+import os
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from strategies.standard import StandardBrandStrategy
+from utils.model_number import TAG_HEUER_EXTRACTOR
+
+# TAG HEUERライン定義（優先順位順）
+TAG_HEUER_LINES = {
+    'Professional': ['PROFESSIONAL', '2000', '3000', '4000', '6000'],
+    'Formula 1': ['FORMULA 1', 'FORMULA1', 'F1'],
+    'Carrera': ['CARRERA'],
+    'Link': ['LINK'],
+    'Aquaracer': ['AQUARACER'],
+    'Connected': ['CONNECTED'],
+    'Monaco': ['MONACO'],
+    'Autavia': ['AUTAVIA'],
+}
+
+# コラボ/限定モデル判定
+CHARACTER_KEYWORDS = ['SENNA', 'AYRTON', 'GULF']
+
+
+class TAGHEUERStrategy(StandardBrandStrategy):
+    """TAG HEUER戦略クラス（タブIDは 'TAG_HEUER'）"""
+
+    BRAND_NAME = 'TAG HEUER'
+    BRAND_COLOR = '#D0021B'
+    BRAND_COLOR_LIGHT = '#fdecea'
+    TAB_ID = 'TAG_HEUER'
+    LINES = TAG_HEUER_LINES
+    MODEL_EXTRACTOR = TAG_HEUER_EXTRACTOR
+    CHARACTER_KEYWORDS = CHARACTER_KEYWORDS
+    CHART_COLORS = ['#D0021B', '#000000', '#666666', '#999999']
+    THEME_ACCENT = '#000000'
+    EMOJI = '🏁'
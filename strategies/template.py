@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+テンプレートブランド戦略クラス
+template_brand_tab.py形式のブランド設定（BrandTabConfig）を戦略クラスとして扱うためのアダプター
+集計・描画は utils.brand_tab_renderer をそのまま使う（rebuild_template_brand_tabs.py と同じHTML・ブランドテーマ・グラフ）
+分析スナップショットを渡された場合（use_snapshot()）は保存済みの集計を使う
+"""
+import sys
+import os
+
+import pandas as pd
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from strategies.base import AbstractBrandStrategy
+from utils.brand_tab_renderer import compute_brand_stats, render_brand_tab
+
+
+class TemplateBrandStrategy(AbstractBrandStrategy):
+    """
+    BrandTabConfigを使うブランド戦略
+
+    for_config() でブランドごとの子クラスを作成して使う
+    """
+
+    # ブランド設定（for_config() で設定）
+    CONFIG = None
+
+    @classmethod
+    def for_config(cls, config):
+        """
+        ブランド設定から戦略クラスを作成
+
+        Args:
+            config: BrandTabConfig
+
+        Returns:
+            TemplateBrandStrategyの子クラス（BRAND_NAME・TAB_ID・INSERT_AFTER等は設定から）
+        """
+        return type(f'{config.tab_id}Strategy', (cls,), {
+            'CONFIG': config,
+            'BRAND_NAME': config.brand_name,
+            'BRAND_COLOR': config.color_primary,
+            'BRAND_COLOR_LIGHT': config.color_accent,
+            'TAB_ID': config.tab_id,
+            'INSERT_AFTER': config.insert_after,
+        })
+
+    @classmethod
+    def has_own_layout(cls, tab_html):
+        """既存タブがテンプレートのレイアウトか（見出しのクラスで判定）"""
+        return f'section-title {cls.CONFIG.brand_name_lower}-primary">' in tab_html
+
+    def __init__(self, brand_name, df_brand, brand_color, brand_color_light):
+        super().__init__(brand_name, df_brand, brand_color, brand_color_light)
+        self.rendered = None
+
+    def extract_model_number(self, title_upper):
+        """型番抽出（パターンはブランド設定の model_extractor）"""
+        return self.extract_model_numbers(pd.Series([title_upper])).iloc[0]
+
+    def extract_model_numbers(self, titles_upper):
+        """型番一括抽出（抽出失敗は"N/A"）"""
+        return self.CONFIG.extract_model_numbers(titles_upper).fillna('N/A')
+
+    @classmethod
+    def line_classifier(cls):
+        """ブランド設定の lines から作ったライン分類器"""
+        return cls.CONFIG.line_classifier
+
+    def use_snapshot(self, snapshot):
+        """分析スナップショットの template_brands セクションに集計があれば使う"""
+        entry = snapshot['template_brands'].get(self.TAB_ID)
+        if entry is not None:
+            self.stats = entry['stats']
+
+    def process_data(self):
+        """集計・描画（brand_tab_renderer の集計をそのまま使う）"""
+        print(f"\n{'='*60}")
+        print(f"{self.CONFIG.emoji} {self.brand_name}タブ生成開始")
+        print(f"{'='*60}")
+
+        if not self.stats:
+            self.stats = compute_brand_stats(self.df, self.CONFIG)
+        self.rendered = render_brand_tab(self.stats, self.CONFIG)
+        print(f"  ✓ ライン{len(self.stats['line_stats'])}種類、"
+              f"キャラクター/特別版{len(self.stats['character_stats'])}種類")
+
+        print(f"\n✅ {self.brand_name}データ処理完了")
+
+    def generate_html(self):
+        """タブHTML"""
+        return self.rendered['tab_html']
+
+    def brand_theme(self):
+        """ブランドテーマ（テンプレートのクラスのスタイル）"""
+        return self.rendered['theme']
+
+    def chart_data(self):
+        """グラフデータ"""
+        return self.rendered['charts']
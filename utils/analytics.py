@@ -0,0 +1,624 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+分析スナップショットの集計（セクション）
+ブランド詳細JSON・深掘り分析JSON・ブランド別Excel・テンプレートブランドタブが使う
+ブランド/ライン/型番の集計を、出力ごとのセクションとして計算する
+
+- 各セクションは section(df, csv_path, workers) の形の関数（utils.analytics_snapshot.SECTIONS に登録）
+- 結果はスナップショットとして保存され、同じデータ・同じ集計定義なら再計算しない
+- 出力側（JSON・Excel・HTML）はセクションの結果を整形するだけ
+"""
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+from utils.brand_tab_renderer import BRAND_INPUT_COLUMNS, compute_brand_stats
+from utils.group_stats import GroupStats, stat_record
+from utils.line_classifier import KeywordLineClassifier
+from utils.model_number import DETAIL_JSON_MODEL_REGISTRY, EXCEL_MODEL_REGISTRY
+from utils.month_partitions import MonthPartitionStore
+from utils.price_bands import COARSE_BANDS, DOLLAR50_BANDS, band_table
+
+
+def _run_jobs(func, jobs, workers=1):
+    """ジョブを実行（workers > 1 ならジョブごとに別プロセスで実行。結果はjobsの順）"""
+    if workers > 1 and len(jobs) > 1:
+        with ProcessPoolExecutor(max_workers=min(workers, len(jobs))) as pool:
+            return list(pool.map(func, *zip(*jobs)))
+    return [func(*job) for job in jobs]
+
+
+# ============================================================
+# ブランド詳細分析（ブランド詳細分析.json）
+# ============================================================
+
+# USD→JPY レート
+JPY_RATE = 155
+
+
+def calc_brand_stats(df_brand, df_brand_clean, brand):
+    """ブランド別の統計情報を計算"""
+    stats = {}
+    stats['total_records'] = len(df_brand)
+    stats['clean_records'] = len(df_brand_clean)
+    stats['total_sales'] = int(df_brand_clean['販売数'].sum()) if '販売数' in df_brand_clean.columns else len(df_brand_clean)
+
+    prices = df_brand_clean['価格'].dropna()
+    stats['median_price'] = float(prices.median()) if len(prices) > 0 else 0
+    stats['mean_price'] = float(prices.mean()) if len(prices) > 0 else 0
+    stats['std_price'] = float(prices.std()) if len(prices) > 1 else 0
+    stats['cv'] = round(stats['std_price'] / stats['mean_price'], 2) if stats['mean_price'] > 0 else 0
+    stats['min_price'] = float(prices.min()) if len(prices) > 0 else 0
+    stats['max_price'] = float(prices.max()) if len(prices) > 0 else 0
+
+    # 価格帯分布
+    price_segments = {}
+    if len(prices) > 0:
+        entry = prices[prices < 100]
+        mid = prices[(prices >= 100) & (prices < 500)]
+        high = prices[prices >= 500]
+        price_segments['エントリー'] = {'count': len(entry), 'ratio': round(len(entry)/len(prices)*100, 1)}
+        price_segments['ミドル'] = {'count': len(mid), 'ratio': round(len(mid)/len(prices)*100, 1)}
+        price_segments['ハイエンド'] = {'count': len(high), 'ratio': round(len(high)/len(prices)*100, 1)}
+    stats['price_segments'] = price_segments
+
+    # 駆動方式分布
+    if '駆動方式' in df_brand_clean.columns:
+        movement_dist = df_brand_clean['駆動方式'].value_counts().to_dict()
+        stats['movement_distribution'] = {k: int(v) for k, v in movement_dist.items()}
+    else:
+        stats['movement_distribution'] = {}
+
+    # デパートメント分布
+    if 'デパートメント' in df_brand_clean.columns:
+        dept_dist = df_brand_clean['デパートメント'].value_counts().to_dict()
+        stats['department_distribution'] = {k: int(v) for k, v in dept_dist.items()}
+    else:
+        stats['department_distribution'] = {}
+
+    # JDM分析
+    jdm_mask = df_brand_clean['タイトル'].str.contains('JDM|Japan Domestic|日本製|Made in Japan', case=False, na=False)
+    jdm_count = jdm_mask.sum()
+    stats['jdm_count'] = int(jdm_count)
+    if jdm_count > 0 and len(prices) > 0:
+        jdm_median = df_brand_clean.loc[jdm_mask, '価格'].median()
+        non_jdm_median = df_brand_clean.loc[~jdm_mask, '価格'].median()
+        stats['jdm_premium'] = round((jdm_median / non_jdm_median - 1) * 100, 1) if non_jdm_median > 0 else 0
+    else:
+        stats['jdm_premium'] = 0
+
+    # ヴィンテージ分析
+    vintage_mask = df_brand_clean['タイトル'].str.contains('Vintage|ヴィンテージ|ビンテージ|Antique', case=False, na=False)
+    stats['vintage_count'] = int(vintage_mask.sum())
+    if vintage_mask.sum() > 0 and len(prices) > 0:
+        v_median = df_brand_clean.loc[vintage_mask, '価格'].median()
+        nv_median = df_brand_clean.loc[~vintage_mask, '価格'].median()
+        stats['vintage_premium'] = round((v_median / nv_median - 1) * 100, 1) if nv_median > 0 else 0
+    else:
+        stats['vintage_premium'] = 0
+
+    # 箱付き分析
+    box_mask = df_brand_clean['タイトル'].str.contains('Box|箱付|With Box', case=False, na=False)
+    stats['box_count'] = int(box_mask.sum())
+    if box_mask.sum() > 0 and len(prices) > 0:
+        b_median = df_brand_clean.loc[box_mask, '価格'].median()
+        nb_median = df_brand_clean.loc[~box_mask, '価格'].median()
+        stats['box_premium'] = round((b_median / nb_median - 1) * 100, 1) if nb_median > 0 else 0
+    else:
+        stats['box_premium'] = 0
+
+    # 型番別統計（Top30）
+    df_brand_clean = df_brand_clean.copy()
+    df_brand_clean['型番'] = DETAIL_JSON_MODEL_REGISTRY.extract_series(df_brand_clean['タイトル'], brand)
+    model_groups = df_brand_clean.dropna(subset=['型番']).groupby('型番')
+
+    model_stats = []
+    for model, group in model_groups:
+        if len(group) >= 2:
+            prices_g = group['価格']
+            sales = int(group['販売数'].sum()) if '販売数' in group.columns else len(group)
+            jpy = int(prices_g.median() * JPY_RATE)
+            model_stats.append({
+                'model': model,
+                'count': sales,
+                'transactions': len(group),
+                'min': float(prices_g.min()),
+                'max': float(prices_g.max()),
+                'median': float(prices_g.median()),
+                'cv': float(prices_g.std() / prices_g.mean()) if prices_g.mean() > 0 else 0,
+                'jpy': jpy,
+                'breakeven': int(jpy * 0.722)
+            })
+
+    model_stats.sort(key=lambda x: x['count'], reverse=True)
+    stats['model_stats'] = model_stats[:30]
+
+    return stats
+
+
+def brand_detail_stats(df, csv_path=None, workers=1):
+    """
+    ブランド詳細分析のセクション
+
+    Args:
+        df: 時計データ（load_watch_data() の結果）
+
+    Returns:
+        {'brands': {ブランド: calc_brand_stats() の結果}（完品5件以上のブランドのみ）,
+         'parts_by_brand': {ブランド: {'count', 'total_sales'}}}
+    """
+    brands = df['ブランド'].unique()
+    by_brand = dict(iter(df.groupby('ブランド', sort=False)))
+    clean = df[df['商品状態'] == '完品']
+    clean_by_brand = dict(iter(clean.groupby('ブランド', sort=False)))
+    parts_by_brand_df = dict(iter(df[df['商品状態'] != '完品'].groupby('ブランド', sort=False)))
+
+    brand_data = {}
+    for brand in brands:
+        df_brand_clean = clean_by_brand.get(brand, clean.iloc[0:0])
+        if len(df_brand_clean) >= 5:  # 最低5件のデータがあるブランドのみ
+            brand_data[brand] = calc_brand_stats(by_brand[brand], df_brand_clean, brand)
+
+    # パーツデータ
+    parts_by_brand = {}
+    for brand in brands:
+        df_bp = parts_by_brand_df.get(brand)
+        if df_bp is not None and len(df_bp) > 0:
+            parts_by_brand[brand] = {
+                'count': len(df_bp),
+                'total_sales': int(df_bp['販売数'].sum()) if '販売数' in df_bp.columns else len(df_bp)
+            }
+
+    return {'brands': brand_data, 'parts_by_brand': parts_by_brand}
+
+
+# ============================================================
+# 深掘り分析（時計分析_深掘り版.json）
+# ============================================================
+
+# SEIKOライン定義
+SEIKO_LINES = {
+    'Grand Seiko': ['GRAND SEIKO', 'GS ', 'SBGR', 'SBGA', 'SBGM', 'SBGX'],
+    'SEIKO 5': ['SEIKO 5', 'SEIKO5', '5 SPORTS', 'SNZG', 'SNK', 'SRPD'],
+    'Prospex': ['PROSPEX', 'SBDC', 'SBDN', 'SPB', 'SRP'],
+    'Presage': ['PRESAGE', 'SARY', 'SRPB', 'SSA', 'SRPE'],
+    'Astron': ['ASTRON', 'SSE'],
+    'King Seiko': ['KING SEIKO'],
+    'Lord Marvel': ['LORD MARVEL'],
+    'Dolce': ['DOLCE'],
+    'Chariot': ['CHARIOT'],
+}
+
+# CASIOライン定義
+CASIO_LINES = {
+    'G-SHOCK': ['G-SHOCK', 'GSHOCK', 'G SHOCK', 'DW-', 'GA-', 'GW-', 'GMW-', 'GBD-', 'GST-', 'MTG-'],
+    'BABY-G': ['BABY-G', 'BABY G', 'BABYG', 'BG-', 'BGA-', 'BGD-'],
+    'PRO TREK': ['PRO TREK', 'PROTREK', 'PRW-', 'PRG-', 'PRT-'],
+    'OCEANUS': ['OCEANUS', 'OCW-'],
+    'EDIFICE': ['EDIFICE', 'EF-', 'EQB-', 'ECB-'],
+    'LINEAGE': ['LINEAGE', 'LCW-', 'LIW-'],
+    'SHEEN': ['SHEEN', 'SHE-'],
+}
+
+# CITIZENライン定義
+CITIZEN_LINES = {
+    'Promaster': ['PROMASTER', 'プロマスター', 'BN', 'JY', 'JV'],
+    'Attesa': ['ATTESA', 'アテッサ', 'AT', 'CB', 'CC'],
+    'Exceed': ['EXCEED', 'エクシード', 'EBS', 'EBG'],
+    'The CITIZEN': ['THE CITIZEN'],
+    'Collection': ['COLLECTION'],
+    'Eco-Drive One': ['ECO-DRIVE ONE', 'AR5'],
+    'Chandler': ['CHANDLER'],
+}
+
+# ライン分類器（オートマトンはここで1回だけ構築）
+SEIKO_CLASSIFIER = KeywordLineClassifier(SEIKO_LINES, default='その他SEIKO')
+CASIO_CLASSIFIER = KeywordLineClassifier(CASIO_LINES, default='その他CASIO')
+CITIZEN_CLASSIFIER = KeywordLineClassifier(CITIZEN_LINES, default='その他CITIZEN')
+
+
+def top_model_stats(stats, line, limit):
+    """ライン内の型番別Top（出品2件以上・販売数2以上）"""
+    if '型番' not in stats.df.columns:
+        return []
+    table = stats.within(['ライン', '型番'], line)
+    table = table[(table.index != '') & (table['items'] >= 2) & (table['sales'] >= 2)]
+    model_stats = [{
+        'model': model,
+        'count': int(row['sales']),
+        'median': float(row['median']),
+        'cv': float(row['cv'])
+    } for model, row in table.iterrows()]
+    return sorted(model_stats, key=lambda x: x['count'], reverse=True)[:limit]
+
+
+def flag_premium(stats, line, column):
+    """
+    ライン内でフラグ列（JDM・Eco-Driveなど）がTrueの商品の件数と中央値プレミアム（%）
+
+    Returns:
+        (件数, プレミアム%)（Trueが2件未満・Falseの中央値が0以下の場合は0%）
+    """
+    table = stats.within(['ライン', column], line)
+    count = int(table.loc[True, 'items']) if True in table.index else 0
+    flag_median = table.loc[True, 'median'] if count > 0 else 0
+    other_median = table.loc[False, 'median'] if False in table.index else 0
+    premium = ((flag_median - other_median) / other_median * 100) if other_median > 0 and count >= 2 else 0
+    return count, premium
+
+
+def price_distributions(df, by):
+    """グループごとの価格帯分布（全グループを1回で集計）"""
+    table = band_table(df, COARSE_BANDS, by=by)
+    return {key: {label: int(count) for label, count in row.items()} for key, row in table.iterrows()}
+
+
+def deepdive_stats(df, csv_path, workers=1):
+    """
+    深掘り分析のセクション（SEIKO/CASIO/CITIZENのライン別分析・駆動方式別の市場構造）
+
+    Args:
+        df: 時計データ（load_watch_data() の結果）
+        csv_path: 時計データCSVのパス（駆動方式別の月別推移は販売月パーティションから）
+
+    Returns:
+        {'seiko_lines', 'casio_lines', 'citizen_lines', 'movement_details'}
+    """
+    df_complete = df[df['商品状態']=='完品'].copy()
+
+    # === 1. SEIKOライン別分析 ===
+    df_seiko = df_complete[df_complete['ブランド']=='SEIKO'].copy()
+    df_seiko['ライン'] = SEIKO_CLASSIFIER.classify_series(df_seiko['タイトル_upper'])
+
+    seiko_stats = GroupStats(df_seiko)
+    seiko_line_table = seiko_stats.by('ライン')
+    seiko_price_dist = price_distributions(df_seiko, 'ライン')
+
+    seiko_lines = {}
+    for line, group in df_seiko.groupby('ライン'):
+        if len(group) < 2:
+            continue
+
+        # 駆動方式分布
+        movement_dist = group['駆動方式'].value_counts().to_dict()
+
+        # JDM分析
+        jdm_count, jdm_premium = flag_premium(seiko_stats, line, 'JDM')
+
+        # 型番別Top5
+        model_stats = top_model_stats(seiko_stats, line, 5)
+
+        seiko_lines[line] = stat_record(seiko_line_table.loc[line], {
+            'movement_distribution': movement_dist,
+            'jdm_count': int(jdm_count),
+            'jdm_premium': float(jdm_premium),
+            'price_distribution': seiko_price_dist[line],
+            'top_models': model_stats
+        })
+
+    # === 2. CASIOライン別分析 ===
+    df_casio = df_complete[df_complete['ブランド']=='CASIO'].copy()
+    df_casio['ライン'] = CASIO_CLASSIFIER.classify_series(df_casio['タイトル_upper'])
+
+    casio_stats = GroupStats(df_casio)
+    casio_line_table = casio_stats.by('ライン')
+    casio_price_dist = price_distributions(df_casio, 'ライン')
+
+    casio_lines = {}
+    for line, group in df_casio.groupby('ライン'):
+        if len(group) < 2:
+            continue
+
+        movement_dist = group['駆動方式'].value_counts().to_dict()
+
+        jdm_count, jdm_premium = flag_premium(casio_stats, line, 'JDM')
+
+        # コラボ・限定判定（G-SHOCK用）
+        if line == 'G-SHOCK':
+            collab_count = group['タイトル_upper'].str.contains('×|COLLABORATION|COLLAB', na=False).sum()
+            limited_count = group['タイトル_upper'].str.contains('LIMITED|EDITION|限定', na=False).sum()
+        else:
+            collab_count = 0
+            limited_count = 0
+
+        model_stats = top_model_stats(casio_stats, line, 10 if line == 'G-SHOCK' else 5)
+
+        casio_lines[line] = stat_record(casio_line_table.loc[line], {
+            'movement_distribution': movement_dist,
+            'jdm_count': int(jdm_count),
+            'jdm_premium': float(jdm_premium),
+            'collab_count': int(collab_count),
+            'limited_count': int(limited_count),
+            'price_distribution': casio_price_dist[line],
+            'top_models': model_stats
+        })
+
+    # === 3. CITIZENライン別分析 ===
+    df_citizen = df_complete[df_complete['ブランド']=='CITIZEN'].copy()
+    df_citizen['ライン'] = CITIZEN_CLASSIFIER.classify_series(df_citizen['タイトル_upper'])
+
+    # Eco-Drive判定
+    df_citizen['Eco-Drive'] = df_citizen['タイトル_upper'].str.contains('ECO-DRIVE|ECO DRIVE|ECODRIVE', na=False)
+
+    citizen_stats = GroupStats(df_citizen)
+    citizen_line_table = citizen_stats.by('ライン')
+    citizen_price_dist = price_distributions(df_citizen, 'ライン')
+
+    citizen_lines = {}
+    for line, group in df_citizen.groupby('ライン'):
+        if len(group) < 2:
+            continue
+
+        movement_dist = group['駆動方式'].value_counts().to_dict()
+
+        jdm_count, jdm_premium = flag_premium(citizen_stats, line, 'JDM')
+
+        # Eco-Drive分析
+        eco_count, eco_premium = flag_premium(citizen_stats, line, 'Eco-Drive')
+
+        model_stats = top_model_stats(citizen_stats, line, 5)
+
+        citizen_lines[line] = stat_record(citizen_line_table.loc[line], {
+            'movement_distribution': movement_dist,
+            'jdm_count': int(jdm_count),
+            'jdm_premium': float(jdm_premium),
+            'eco_drive_count': int(eco_count),
+            'eco_drive_premium': float(eco_premium),
+            'price_distribution': citizen_price_dist[line],
+            'top_models': model_stats
+        })
+
+    # === 4. 駆動方式別詳細分析 ===
+    movement_details = {}
+    movement_stats = GroupStats(df_complete)
+    movement_price_dist = price_distributions(df_complete, '駆動方式')
+    # 月別推移は販売月パーティションの事前集計から
+    movement_monthly = MonthPartitionStore(csv_path).open().monthly(
+        'movement_condition', match={'商品状態': '完品'})
+
+    for movement, group in df_complete.groupby('駆動方式'):
+        if movement in ['不明', ''] or len(group) < 10:
+            continue
+
+        # ブランド別ランキングTop15
+        brand_table = movement_stats.within(['駆動方式', 'ブランド'], movement)
+        brand_table = brand_table[(brand_table.index != '(不明)') & (brand_table['sales'] >= 3)]
+        brand_ranking = [{
+            'brand': brand,
+            'count': int(row['sales']),
+            'median': float(row['median']),
+            'cv': float(row['cv']),
+            'items': int(row['items'])
+        } for brand, row in brand_table.iterrows()]
+
+        brand_ranking = sorted(brand_ranking, key=lambda x: x['count'], reverse=True)[:15]
+
+        # 価格帯分布
+        prices = group['価格'].values
+        price_dist = movement_price_dist[movement]
+
+        # 売れ筋価格帯（中央値±25%）
+        median_price = np.median(prices)
+        lower = median_price * 0.75
+        upper = median_price * 1.25
+        bestseller_count = int(np.count_nonzero((prices >= lower) & (prices <= upper)))
+        bestseller_ratio = bestseller_count / len(prices) * 100
+
+        # 月別推移
+        monthly_rows = movement_monthly[movement_monthly['駆動方式'] == movement]
+        monthly_list = [{'month': m, 'count': int(v)} for m, v in zip(monthly_rows['販売月'], monthly_rows['sales'])]
+
+        movement_details[movement] = {
+            'total_count': int(group['販売数'].sum()),
+            'total_items': len(group),
+            'median': float(median_price),
+            'brand_ranking': brand_ranking,
+            'price_distribution': price_dist,
+            'bestseller_range': f'${lower:.0f}-${upper:.0f}',
+            'bestseller_ratio': float(bestseller_ratio),
+            'monthly_trend': monthly_list
+        }
+
+    return {
+        'seiko_lines': seiko_lines,
+        'casio_lines': casio_lines,
+        'citizen_lines': citizen_lines,
+        'movement_details': movement_details,
+    }
+
+
+# ============================================================
+# ブランド別詳細分析（ブランド別詳細分析.xlsx）
+# ============================================================
+
+# 主要12ブランド
+EXCEL_TARGET_BRANDS = ['SEIKO', 'CASIO', 'OMEGA', 'CITIZEN', 'Orient', 'TAG HEUER',
+                       'GUCCI', 'ROLEX', 'Hamilton', 'Longines', 'Cartier', 'RADO']
+
+# ブランドごとの集計に使う列（並列実行時はこの列だけをワーカーに渡す）
+EXCEL_INPUT_COLUMNS = ['タイトル', '価格', '販売数', '駆動方式']
+
+# ブランドごとのライン定義（優先順位順。定義のないブランド・該当なしは'不明'）
+EXCEL_LINE_KEYWORDS = {
+    'SEIKO': {
+        'Presage': ['PRESAGE', 'プレザージュ'],
+        'Prospex': ['PROSPEX', 'プロスペックス'],
+        'SEIKO 5': ['5 SPORTS', 'SEIKO 5', 'SEIKO5'],
+        'Grand Seiko': ['GRAND SEIKO', 'グランドセイコー'],
+        'Astron': ['ASTRON', 'アストロン'],
+        'Brightz': ['BRIGHTZ', 'ブライツ'],
+        'Lukia': ['LUKIA', 'ルキア'],
+    },
+    'CASIO': {
+        'G-SHOCK': ['G-SHOCK', 'GSHOCK'],
+        'BABY-G': ['BABY-G', 'BABYG'],
+        'OCEANUS': ['OCEANUS', 'オシアナス'],
+        'PRO TREK': ['PRO TREK', 'PROTREK'],
+        'EDIFICE': ['EDIFICE', 'エディフィス'],
+        'SHEEN': ['SHEEN', 'シーン'],
+        'LINEAGE': ['LINEAGE', 'リニエージ'],
+    },
+    'OMEGA': {
+        'Seamaster': ['SEAMASTER'],
+        'Speedmaster': ['SPEEDMASTER'],
+        'Constellation': ['CONSTELLATION'],
+        'De Ville': ['DE VILLE'],
+    },
+    'ROLEX': {
+        'Submariner': ['SUBMARINER'],
+        'Datejust': ['DATEJUST'],
+        'Daytona': ['DAYTONA'],
+        'GMT-Master': ['GMT-MASTER', 'GMT MASTER'],
+        'Oyster Perpetual': ['OYSTER'],
+    },
+}
+EXCEL_LINE_CLASSIFIERS = {brand: KeywordLineClassifier(lines, default='不明')
+                          for brand, lines in EXCEL_LINE_KEYWORDS.items()}
+
+# キャラクター/コラボキーワード（優先順位順）
+CHARACTER_KEYWORDS = {
+    'ジブリ': ['GHIBLI', 'ジブリ', 'トトロ', 'TOTORO'],
+    'ディズニー': ['DISNEY', 'ディズニー', 'MICKEY', 'ミッキー'],
+    'マリオ': ['MARIO', 'マリオ', 'LUIGI', 'ルイージ'],
+    'ポケモン': ['POKEMON', 'ポケモン', 'PIKACHU', 'ピカチュウ'],
+    'ドラゴンボール': ['DRAGON BALL', 'ドラゴンボール', 'GOKU', '悟空'],
+    'ワンピース': ['ONE PIECE', 'ワンピース', 'LUFFY', 'ルフィ'],
+    'ガンダム': ['GUNDAM', 'ガンダム', 'ZAKU', 'ザク'],
+    '記念モデル': ['ANNIVERSARY', 'アニバーサリー', '記念', 'MEMORIAL'],
+    '限定モデル': ['LIMITED', 'リミテッド', '限定', 'SPECIAL EDITION'],
+    'コラボ': ['COLLABORATION', 'コラボ', 'COLLAB', 'X ']
+}
+CHARACTER_CLASSIFIER = KeywordLineClassifier(CHARACTER_KEYWORDS, default=None)
+
+
+def classify_lines_generic(titles, brand):
+    """ブランドごとのライン一括分類（定義のないブランドは全て'不明'）"""
+    if brand not in EXCEL_LINE_CLASSIFIERS:
+        return pd.Series('不明', index=titles.index, dtype=object)
+    return EXCEL_LINE_CLASSIFIERS[brand].classify_titles(titles)
+
+
+def calculate_cv(values):
+    """変動係数を計算"""
+    if len(values) == 0:
+        return 0
+    mean = sum(values) / len(values)
+    if mean == 0:
+        return 0
+    variance = sum((x - mean) ** 2 for x in values) / len(values)
+    std_dev = variance ** 0.5
+    return std_dev / mean
+
+
+def excel_brand_aggregates(brand, brand_df, monthly):
+    """
+    1ブランド分のExcelシート用の集計（並列実行時はワーカープロセスで実行）
+
+    Args:
+        brand: ブランド名
+        brand_df: ブランドの完品データ
+        monthly: 月別推移（販売月・出品数・販売数）
+
+    Returns:
+        {'summary': 基本統計のdict,
+         'models' / 'lines' / 'line_models' / 'characters' / 'movements': GroupStatsの集計結果
+         （型番・ライン・ライン×型番・キャラクター/コラボ・駆動方式。CV値は母標準偏差）,
+         'price_bands': 価格帯分布（50ドル刻み）, 'monthly': 月別推移}
+    """
+    brand_df = brand_df.copy()
+    brand_df['型番'] = EXCEL_MODEL_REGISTRY.extract_series(brand_df['タイトル'], brand)
+    brand_df['ライン'] = classify_lines_generic(brand_df['タイトル'], brand)
+    brand_df['キャラクター/コラボ'] = CHARACTER_CLASSIFIER.classify_titles(brand_df['タイトル'])
+
+    # グループ別統計（CV値はcalculate_cvと同じ母標準偏差）
+    stats = GroupStats(brand_df, ddof=0)
+
+    return {
+        'summary': {
+            'items': len(brand_df),
+            'sales': brand_df['販売数'].sum(),
+            'mean': brand_df['価格'].mean(),
+            'median': brand_df['価格'].median(),
+            'min': brand_df['価格'].min(),
+            'max': brand_df['価格'].max(),
+            'cv': calculate_cv(brand_df['価格'].tolist()),
+            'extraction_rate': brand_df['型番'].notna().sum() / len(brand_df) * 100,
+        },
+        'models': stats.by('型番'),
+        'lines': stats.by('ライン'),
+        'line_models': stats.by(['ライン', '型番']),
+        'characters': stats.by('キャラクター/コラボ'),
+        'movements': stats.by('駆動方式'),
+        'price_bands': pd.DataFrame({
+            '価格帯': DOLLAR50_BANDS.labels,
+            '出品数': DOLLAR50_BANDS.counts(brand_df['価格']),
+            '販売数': DOLLAR50_BANDS.counts(brand_df['価格'], weights=brand_df['販売数']),
+        }),
+        'monthly': monthly,
+    }
+
+
+def excel_brand_stats(df, csv_path, workers=1):
+    """
+    ブランド別詳細分析（Excel）のセクション
+
+    Args:
+        df: 時計データ（load_watch_data() の結果）
+        csv_path: 時計データCSVのパス（月別推移は販売月パーティションから）
+        workers: ブランドごとの集計を並列実行するプロセス数
+
+    Returns:
+        {ブランド: excel_brand_aggregates() の結果}（EXCEL_TARGET_BRANDS の順。完品データがないブランドは含まない）
+    """
+    partitions = MonthPartitionStore(csv_path).open()
+
+    # 完品データを1回のgroupbyでブランド別に分ける
+    df_target = df[(df['商品状態'] == '完品') & df['ブランド'].isin(EXCEL_TARGET_BRANDS)]
+    groups = {brand: group[EXCEL_INPUT_COLUMNS]
+              for brand, group in df_target.groupby('ブランド', sort=False, observed=True)}
+
+    jobs = []
+    for brand in EXCEL_TARGET_BRANDS:
+        brand_df = groups.get(brand)
+        if brand_df is None or len(brand_df) == 0:
+            continue
+        monthly = partitions.monthly('brand_condition', match={'ブランド': brand, '商品状態': '完品'})
+        monthly = monthly[['販売月', 'items', 'sales']].rename(columns={'items': '出品数', 'sales': '販売数'})
+        jobs.append((brand, brand_df, monthly))
+
+    results = _run_jobs(excel_brand_aggregates, jobs, workers=workers)
+    return {brand: result for (brand, _, _), result in zip(jobs, results)}
+
+
+# ============================================================
+# テンプレートブランドタブ（utils.brand_tab_renderer）
+# ============================================================
+
+def template_brand_stats(df, csv_path=None, workers=1):
+    """
+    テンプレートブランドタブのセクション（rebuild_template_brand_tabs.py の全ブランド）
+
+    Args:
+        df: 時計データ（load_watch_data() の結果）
+        workers: ブランドごとの集計を並列実行するプロセス数
+
+    Returns:
+        {タブid: {'rows': 完品件数, 'stats': compute_brand_stats() の結果}}（完品データがないブランドは含まない）
+    """
+    from rebuild_template_brand_tabs import load_configs
+
+    configs = load_configs()
+    brand_names = [config.brand_name for config in configs]
+    df_target = df[(df['商品状態'] == '完品') & df['ブランド'].isin(brand_names)]
+    if workers > 1:
+        df_target = df_target[[c for c in BRAND_INPUT_COLUMNS if c in df_target.columns]
+                              + ['ブランド']]
+    groups = {brand: group for brand, group in df_target.groupby('ブランド', sort=False, observed=True)}
+
+    jobs = [(groups[config.brand_name], config) for config in configs
+            if config.brand_name in groups and len(groups[config.brand_name]) > 0]
+    results = _run_jobs(compute_brand_stats, jobs, workers=workers)
+    return {config.tab_id: {'rows': len(df_brand), 'stats': stats}
+            for (df_brand, config), stats in zip(jobs, results)}
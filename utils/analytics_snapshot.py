@@ -0,0 +1,348 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+分析スナップショット
+ブランド詳細JSON・深掘り分析JSON・ブランド別Excel・テンプレートブランドタブの集計
+（utils.analytics のセクション）を、データのバージョンごとに1回だけ計算して保存する
+
+- バージョンは「CSVのSHA-256」と「集計定義のハッシュ」の組
+  （集計定義 = SNAPSHOT_VERSION・分位点の計算方法・pandasのバージョンとpyarrowの有無・
+    SNAPSHOT_SOURCES とテンプレートブランド設定のソース）
+- 保存先は .cache/snapshots/<CSVパスのハッシュ>/<バージョン>/
+  - <セクション名>.pkl: セクションの集計結果（DataFrame・dict）
+  - manifest.json: バージョン・元CSVのSHA-256・セクションごとの作成時刻と計算時間
+- 同じバージョンのセクションは読み込むだけ。保存されていないセクションは最初に要求されたときに計算して追加する
+- CSV・集計定義が変わると新しいバージョンのディレクトリを作り、古いバージョンは SNAPSHOT_KEEP 個まで残す
+
+使用方法:
+    python3 -m utils.analytics_snapshot                  # 全セクションを計算して保存
+    python3 -m utils.analytics_snapshot --jobs 4         # ブランドごとの集計を4プロセスで並列実行
+"""
+import hashlib
+import importlib.util
+import json
+import os
+import pickle
+import shutil
+import time
+from datetime import datetime
+
+import pandas as pd
+
+from utils.analytics import brand_detail_stats, deepdive_stats, excel_brand_stats, template_brand_stats
+from utils.data_loader import CACHE_DIR, DEFAULT_CSV_PATH, HAS_PYARROW, data_sha256, load_watch_data
+from utils.quantile_sketch import resolve_mode
+
+
+# スナップショットの保存先
+SNAPSHOT_DIR = os.path.join(CACHE_DIR, 'snapshots')
+
+# 保存形式のバージョン（セクションの形式を変えたら上げる）
+SNAPSHOT_VERSION = 1
+
+# CSVごとに残すバージョン数（現在のバージョンを含む）
+SNAPSHOT_KEEP = 3
+
+# セクション {名前: 集計関数(df, csv_path, workers)}
+SECTIONS = {
+    'brand_detail': brand_detail_stats,
+    'deepdive': deepdive_stats,
+    'excel_brands': excel_brand_stats,
+    'template_brands': template_brand_stats,
+}
+
+# 集計結果に影響するモジュール（ソースが変わればバージョンが変わる）
+SNAPSHOT_SOURCES = [
+    'utils.analytics',
+    'utils.brand_tab_renderer',
+    'utils.group_stats',
+    'utils.quantile_sketch',
+    'utils.line_classifier',
+    'utils.model_number',
+    'utils.price_bands',
+    'utils.month_partitions',
+    'utils.delta_stats',
+    'rebuild_template_brand_tabs',
+]
+
+
+def definitions_version():
+    """
+    集計定義のハッシュ
+
+    Returns:
+        16進数のハッシュ文字列（SNAPSHOT_VERSION・分位点の計算方法・pandasのバージョンとpyarrowの有無・
+        集計モジュールとブランド設定のソースから計算。pickleの互換性もpandasのバージョンに依存する）
+    """
+    from rebuild_template_brand_tabs import TEMPLATE_BRAND_MODULES
+
+    h = hashlib.sha256(f'{SNAPSHOT_VERSION}:{resolve_mode()}:{pd.__version__}:{HAS_PYARROW}'.encode('utf-8'))
+    for name in SNAPSHOT_SOURCES + TEMPLATE_BRAND_MODULES:
+        with open(importlib.util.find_spec(name).origin, 'rb') as f:
+            h.update(name.encode('utf-8') + b'\0' + f.read())
+    return h.hexdigest()
+
+
+class AnalyticsSnapshot:
+    """
+    CSV1つ分の分析スナップショット
+
+    Args:
+        csv_path: 時計データCSVのパス
+        root: 保存先
+        workers: セクションを計算するときの並列プロセス数
+
+    Attributes:
+        version: データのバージョン（open() で決定）
+        sections: 保存済みのセクション {名前: {'created_at', 'seconds'}}
+    """
+
+    def __init__(self, csv_path=DEFAULT_CSV_PATH, root=SNAPSHOT_DIR, workers=1):
+        self.csv_path = str(csv_path)
+        self.workers = workers
+        key = hashlib.sha1(os.path.abspath(self.csv_path).encode('utf-8')).hexdigest()[:16]
+        self.root = os.path.join(root, key)
+        self.version = None
+        self.sha256 = None
+        self.sections = {}
+        self._results = {}
+        self._df = None
+
+    @property
+    def path(self):
+        return os.path.join(self.root, self.version)
+
+    @property
+    def _manifest_path(self):
+        return os.path.join(self.path, 'manifest.json')
+
+    def _section_path(self, name):
+        return os.path.join(self.path, f'{name}.pkl')
+
+    def open(self):
+        """
+        現在のデータのバージョンのスナップショットを開く（なければ空のスナップショットを作成）
+
+        Returns:
+            self
+        """
+        self.sha256 = data_sha256(self.csv_path)
+        self.version = f'{self.sha256[:16]}-{definitions_version()[:12]}'
+        self._results = {}
+        try:
+            with open(self._manifest_path, 'r', encoding='utf-8') as f:
+                manifest = json.load(f)
+            self.sections = manifest['sections'] if manifest.get('version') == self.version else {}
+        except (OSError, ValueError, KeyError):
+            self.sections = {}
+
+        if self.sections:
+            print(f"✓ 分析スナップショットを読み込み: {self.version}（{', '.join(self.sections)}）")
+        else:
+            os.makedirs(self.path, exist_ok=True)
+            self._save_manifest()
+            self._prune()
+        return self
+
+    def _save_manifest(self):
+        manifest = {
+            'version': self.version,
+            'snapshot_version': SNAPSHOT_VERSION,
+            'csv_path': os.path.abspath(self.csv_path),
+            'sha256': self.sha256,
+            'sections': self.sections,
+        }
+        tmp_path = self._manifest_path + '.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(manifest, f, ensure_ascii=False, indent=2)
+        os.replace(tmp_path, self._manifest_path)
+
+    def _prune(self):
+        """古いバージョンのディレクトリを削除（新しい順に SNAPSHOT_KEEP 個を残す）"""
+        versions = [os.path.join(self.root, name) for name in os.listdir(self.root)
+                    if os.path.isdir(os.path.join(self.root, name))]
+        versions.sort(key=os.path.getmtime, reverse=True)
+        for path in versions[SNAPSHOT_KEEP:]:
+            if path != self.path:
+                shutil.rmtree(path, ignore_errors=True)
+
+    def _data(self):
+        if self._df is None:
+            self._df = load_watch_data(self.csv_path)
+        return self._df
+
+    def section(self, name):
+        """
+        セクションの集計結果（保存済みなら読み込み、なければ計算して保存）
+
+        Args:
+            name: セクション名（SECTIONS のキー）
+
+        Returns:
+            集計結果（呼び出し側で変更しないこと）
+        """
+        if self.version is None:
+            self.open()
+        if name in self._results:
+            return self._results[name]
+        if name not in SECTIONS:
+            raise KeyError(f"未定義のセクションです: {name}")
+
+        result = None
+        if name in self.sections:
+            try:
+                with open(self._section_path(name), 'rb') as f:
+                    result = pickle.load(f)
+            except Exception:
+                # 壊れたファイル・互換性のないpickleなどは計算し直す
+                result = None
+        if result is None:
+            result = self._build(name)
+        self._results[name] = result
+        return result
+
+    __getitem__ = section
+
+    def _build(self, name):
+        """セクションを計算して保存"""
+        print(f"🔧 分析スナップショット: {name} を集計中...")
+        start = time.perf_counter()
+        result = SECTIONS[name](self._data(), self.csv_path, workers=self.workers)
+        seconds = time.perf_counter() - start
+
+        tmp_path = self._section_path(name) + '.tmp'
+        with open(tmp_path, 'wb') as f:
+            pickle.dump(result, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_path, self._section_path(name))
+        self.sections[name] = {'created_at': datetime.now().isoformat(timespec='seconds'),
+                               'seconds': round(seconds, 3)}
+        self._save_manifest()
+        print(f"  ✓ {name}: {seconds:.2f}秒")
+        return result
+
+    def build(self, names=None):
+        """
+        セクションをまとめて用意（保存済みのものは計算しない）
+
+        Args:
+            names: セクション名のリスト（Noneなら全セクション）
+
+        Returns:
+            self
+        """
+        for name in names or SECTIONS:
+            self.section(name)
+        return self
+
+
+def load_snapshot(csv_path=DEFAULT_CSV_PATH, workers=1):
+    """
+    現在のデータのバージョンの分析スナップショットを開く
+
+    Args:
+        csv_path: 時計データCSVのパス
+        workers: セクションを計算するときの並列プロセス数
+
+    Returns:
+        AnalyticsSnapshot
+    """
+    return AnalyticsSnapshot(csv_path, workers=workers).open()
+
+
+if __name__ == '__main__':
+    import sys
+
+    args = sys.argv[1:]
+    workers = 1
+    if '--jobs' in args or '-j' in args:
+        i = args.index('--jobs') if '--jobs' in args else args.index('-j')
+        value = args[i + 1] if i + 1 < len(args) else None
+        workers = int(value) if value is not None and value.isdigit() else (os.cpu_count() or 1)
+        del args[i:i + (2 if value is not None and value.isdigit() else 1)]
+
+    if args == ['--test']:
+        import tempfile
+
+        import numpy as np
+
+        import utils.data_loader as data_loader
+
+        print("✅ 分析スナップショットテスト")
+        rng = np.random.default_rng(0)
+        n = 3000
+        brands = rng.choice(['SEIKO', 'CASIO', 'CITIZEN', 'OMEGA', 'Tissot'], n)
+        words = rng.choice(['PROSPEX SRP777', 'G-SHOCK DW-5600', 'PROMASTER BN0150', 'SEAMASTER',
+                            'JDM VINTAGE', 'ECO-DRIVE', 'PRX', 'BOX LIMITED'], n)
+        df = pd.DataFrame({
+            'タイトル': [f'{b} {w} WATCH' for b, w in zip(brands, words)],
+            '価格': rng.gamma(2.0, 150.0, n).round(2),
+            '販売数': rng.integers(1, 4, n),
+            'ブランド': brands,
+            '商品状態': rng.choice(['完品', '完品', '完品', 'パーツ'], n),
+            '駆動方式': rng.choice(['自動巻き', 'クォーツ', 'ソーラー', '不明'], n),
+            'デパートメント': rng.choice(['メンズ', 'レディース', '不明'], n),
+            'JDM': rng.random(n) < 0.2,
+            '型番': '',
+            '販売日': rng.choice(pd.date_range('2025-09-01', '2025-12-31').strftime('%Y-%m-%d'), n),
+        })
+
+        with tempfile.TemporaryDirectory() as tmp:
+            csv_path = os.path.join(tmp, 'data.csv')
+            df.to_csv(csv_path, index=False)
+            root = os.path.join(tmp, 'snapshots')
+
+            snapshot = AnalyticsSnapshot(csv_path, root=root).open()
+            detail = snapshot['brand_detail']
+            assert set(detail['brands']) == {'SEIKO', 'CASIO', 'CITIZEN', 'OMEGA', 'Tissot'}
+            assert detail['brands']['SEIKO']['total_records'] == int((df['ブランド'] == 'SEIKO').sum())
+            assert list(snapshot.sections) == ['brand_detail']
+
+            # 同じバージョンは読み込むだけ（集計関数を呼ばない）
+            calls = []
+            builder = SECTIONS['brand_detail']
+            SECTIONS['brand_detail'] = lambda *a, **k: calls.append(a) or builder(*a, **k)
+            reopened = AnalyticsSnapshot(csv_path, root=root).open()
+            assert reopened.version == snapshot.version
+            assert reopened['brand_detail'] == detail and calls == []
+
+            # 全セクション
+            reopened.build()
+            assert set(reopened.sections) == set(SECTIONS)
+            excel = reopened['excel_brands']
+            assert list(excel) == ['SEIKO', 'CASIO', 'OMEGA', 'CITIZEN']
+            assert excel['SEIKO']['summary']['items'] == int(((df['ブランド'] == 'SEIKO') & (df['商品状態'] == '完品')).sum())
+            assert 'Prospex' in reopened['deepdive']['seiko_lines']
+            assert 'Tissot' in reopened['template_brands']
+
+            # データが変わると新しいバージョン（集計し直す）
+            df.iloc[:10].to_csv(csv_path, mode='a', header=False, index=False)
+            updated = AnalyticsSnapshot(csv_path, root=root).open()
+            assert updated.version != snapshot.version and updated.sections == {}
+            assert updated['brand_detail']['brands']['SEIKO']['total_records'] > detail['brands']['SEIKO']['total_records']
+            assert len(calls) == 1
+            SECTIONS['brand_detail'] = builder
+            assert sorted(os.listdir(updated.root)) == sorted([snapshot.version, updated.version])
+
+            # 壊れたセクションファイルは作り直す
+            with open(updated._section_path('brand_detail'), 'wb') as f:
+                f.write(b'broken')
+            assert AnalyticsSnapshot(csv_path, root=root).open()['brand_detail'] == updated['brand_detail']
+
+            # 読み込めないpickle（存在しないモジュールを参照するなど）も作り直す
+            with open(updated._section_path('brand_detail'), 'wb') as f:
+                f.write(b'cno_such_module\nNoSuchClass\n.')
+            assert AnalyticsSnapshot(csv_path, root=root).open()['brand_detail'] == updated['brand_detail']
+
+            data_loader.clear_cache(csv_path)
+            from utils.month_partitions import MonthPartitionStore
+            shutil.rmtree(MonthPartitionStore(csv_path).root, ignore_errors=True)
+
+        print("✅ 分析スナップショットテスト完了")
+        sys.exit(0)
+
+    csv_path = args[0] if args else DEFAULT_CSV_PATH
+    print("📦 分析スナップショット作成")
+    snapshot = load_snapshot(csv_path, workers=workers).build()
+    print(f"\n✅ 分析スナップショット: {snapshot.path}")
+    for name, info in snapshot.sections.items():
+        print(f"   - {name}: {info['created_at']}（{info['seconds']:.2f}秒）")
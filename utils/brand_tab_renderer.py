@@ -0,0 +1,959 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+ブランドタブ共通レンダラー（template_brand_tab.py形式）
+8セクション構成のブランドタブを、事前コンパイルしたテンプレートで生成する
+
+- テンプレートはモジュール読み込み時に1回だけ解析（string.Formatter）
+- 行はリストバッファに追記し、最後に1回だけ join する（html += の繰り返しをしない）
+- 複数ブランドはCSV・index.htmlを1回ずつ読み、1回のデータ走査でまとめて生成
+- workers を指定するとブランドごとの分類・集計・描画をプロセスプールで並列実行し、
+  index.htmlへの反映は最後に1回だけ行う（各ワーカーには自ブランドの必要な列だけを渡す）
+- ブランドごとの違い（ライン定義・型番パターン・色・戦略文言など）は BrandTabConfig に集約
+- グラフデータは charts/<タブID>.json に書き出し、タブ表示時に読み込む（utils/chart_bundle.py）
+- rebuild_brand_tabs() はCSVの集計を分析スナップショット（utils.analytics_snapshot）から読む
+
+セクション構成:
+    1. ヘッダー・基本統計  2. 仕入れ戦略  3. 市場分析グラフ  4. キャラクター/特別版
+    5. 各ライン別型番Top15  6. ライン別詳細  7. 型番Top30  8. グラフデータ・CSS
+"""
+import string
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+from utils.brand_theme import BrandTheme, apply_brand_themes
+from utils.chart_bundle import ChartBundle
+from utils.data_loader import DEFAULT_CSV_PATH
+from utils.group_stats import GroupStats
+from utils.html_tabs import TabDocument
+from utils.line_classifier import KeywordLineClassifier
+from utils.price_bands import BRAND_TAB_BANDS
+from utils.quantile_sketch import median
+
+
+# 仕入上限の計算（中央値$ × 155円 × 0.65）
+EXCHANGE_RATE = 155
+PURCHASE_RATIO = 0.65
+
+# ブランドごとの集計・描画に使う列（並列実行時はこの列だけをワーカーに渡す）
+BRAND_INPUT_COLUMNS = ['タイトル', 'タイトル_upper', '価格', '販売数', '駆動方式', 'デパートメント']
+
+# キャラクター/特別版セクションの見出し（タイトル, 説明, ラベル）
+SPECIAL_EDITION_HEADING = ('特別版・限定モデル 分析', 'Navigation Limited、Anniversary等の特別版分析', '特別版')
+CHARACTER_HEADING = ('キャラクター/コラボ分析（複数視点）', '同じ商品を別の角度から分析', 'キャラクター')
+
+
+class CompiledTemplate:
+    """
+    str.format形式のテンプレートを事前に解析したもの
+
+    リテラル部分と置換フィールドの列に分解しておき、
+    render_into() では解析せずにバッファへ追記するだけにする
+
+    Args:
+        source: テンプレート文字列（置換フィールドは {名前} または {名前:書式}）
+    """
+
+    def __init__(self, source):
+        self.source = source
+        self._parts = []
+        self.fields = []
+        for literal, field_name, format_spec, conversion in string.Formatter().parse(source):
+            if field_name is not None and not field_name.isidentifier():
+                raise ValueError(f"置換フィールドは名前のみ指定できます: {{{field_name}}}")
+            if conversion is not None:
+                raise ValueError(f"変換指定には対応していません: {{{field_name}!{conversion}}}")
+            self._parts.append((literal, field_name, format_spec or ''))
+            if field_name is not None and field_name not in self.fields:
+                self.fields.append(field_name)
+
+    def render_into(self, out, values):
+        """
+        バッファ（list）に描画結果を追記
+
+        Args:
+            out: 追記先のリスト
+            values: {フィールド名: 値}
+        """
+        for literal, field_name, format_spec in self._parts:
+            if literal:
+                out.append(literal)
+            if field_name is not None:
+                out.append(format(values[field_name], format_spec))
+
+    def render(self, values):
+        """描画結果を文字列で返す"""
+        out = []
+        self.render_into(out, values)
+        return ''.join(out)
+
+
+# ============================================================
+# テンプレート（8セクション）
+# ============================================================
+
+# 1. ヘッダー・基本統計
+SUMMARY_SECTION = CompiledTemplate('''
+    <div id="{tab_id}" class="tab-content">
+        <h2 class="section-title {brand_name_lower}-primary">{emoji} {brand_name} 詳細分析</h2>
+
+        <div class="stats-grid">
+            <div class="stat-card">
+                <div class="label">総販売数</div>
+                <div class="value">{total_sales:,}</div>
+            </div>
+            <div class="stat-card">
+                <div class="label">中央値</div>
+                <div class="value">${median_price:.2f}</div>
+            </div>
+            <div class="stat-card">
+                <div class="label">CV（変動係数）</div>
+                <div class="value">{cv_value:.3f}</div>
+            </div>
+            <div class="stat-card">
+                <div class="label">型番抽出率</div>
+                <div class="value {brand_name_lower}-accent">{extraction_rate:.1f}%</div>
+            </div>
+        </div>
+''')
+
+# 2. 仕入れ戦略
+STRATEGY_SECTION = CompiledTemplate('''
+        <div class="insight-box" style="border-left: 5px solid {color_primary};">
+            <h3 class="{brand_name_lower}-primary">🎯 仕入れ戦略（実践ガイド）</h3>
+            <div style="display: grid; gap: 15px;">
+                <div style="background: #e3f2fd; padding: 15px; border-radius: 8px; border-left: 4px solid {color_primary};">
+                    <h4 style="color: {color_primary}; margin-bottom: 10px;">✅ 狙い目条件</h4>
+                    <ul style="margin-left: 20px;">
+{target_items}
+                    </ul>
+                </div>
+                <div style="background: #fff3e0; padding: 15px; border-radius: 8px; border-left: 4px solid {color_accent};">
+                    <h4 style="color: #ff6b35; margin-bottom: 10px;">⚠️ 避けるべき条件</h4>
+                    <ul style="margin-left: 20px;">
+{avoid_items}
+                    </ul>
+                </div>
+                <div style="background: #f3e5f5; padding: 15px; border-radius: 8px; border-left: 4px solid #7b1fa2;">
+                    <h4 style="color: #7b1fa2; margin-bottom: 10px;">💰 仕入れ価格目安</h4>
+                    <p style="margin: 0;"><strong>通常モデル:</strong> {normal_price}</p>
+                    <p style="margin: 5px 0 0 0;"><strong class="{brand_name_lower}-accent">{popular_label}:</strong> {popular_price}</p>
+                </div>
+            </div>
+        </div>
+''')
+
+# 3. 市場分析グラフ
+CHART_SECTION = CompiledTemplate('''
+        <h3 class="section-title {brand_name_lower}-primary">📊 市場分析グラフ</h3>
+        <div class="{brand_name_lower}-grid">
+            <div class="{brand_name_lower}-chart-container">
+                <h4 class="{brand_name_lower}-primary">価格帯別分析（50ドル刻み）</h4>
+                <div id="{brand_name_lower}_price_chart" style="height: 350px;"></div>
+            </div>
+            <div class="{brand_name_lower}-chart-container">
+                <h4 class="{brand_name_lower}-primary">駆動方式別分布</h4>
+                <div id="{brand_name_lower}_movement_chart" style="height: 350px;"></div>
+            </div>
+            <div class="{brand_name_lower}-chart-container">
+                <h4 class="{brand_name_lower}-primary">性別・カテゴリー別分布</h4>
+                <div id="{brand_name_lower}_gender_chart" style="height: 300px;"></div>
+            </div>
+            <div class="{brand_name_lower}-chart-container">
+                <h4 class="{brand_name_lower}-primary">ライン別売上比率</h4>
+                <div id="{brand_name_lower}_line_chart" style="height: 350px;"></div>
+            </div>
+        </div>
+''')
+
+# 4. キャラクター/特別版
+CHARACTER_HEAD = CompiledTemplate('''
+        <h3 class="section-title {brand_name_lower}-primary">🎭 {character_title}</h3>
+        <p style="color: #666; margin-bottom: 15px;">{character_subtitle}</p>
+
+        <div class="stats-grid" style="margin-bottom: 20px;">
+            <div class="stat-card">
+                <div class="label">{character_label}商品数</div>
+                <div class="value {brand_name_lower}-accent">{character_count}個</div>
+            </div>
+            <div class="stat-card">
+                <div class="label">中央値</div>
+                <div class="value">${character_median:.0f}</div>
+            </div>
+            <div class="stat-card">
+                <div class="label">全体比率</div>
+                <div class="value {brand_name_lower}-accent">{character_ratio:.1f}%</div>
+            </div>
+        </div>
+
+        <div class="table-container">
+            <table>
+                <thead>
+                    <tr>
+                        <th>{character_label}</th>
+                        <th>販売数</th>
+                        <th>比率</th>
+                        <th>中央値</th>
+                        <th class="{brand_name_lower}-accent">仕入上限(¥)</th>
+                        <th>検索</th>
+                    </tr>
+                </thead>
+                <tbody>
+''')
+
+CHARACTER_ROW = CompiledTemplate('''
+                    <tr>
+                        <td><strong>{name}</strong></td>
+                        <td>{count}</td>
+                        <td class="{brand_name_lower}-accent">{ratio:.1f}%</td>
+                        <td>${median:.0f}</td>
+                        <td class="highlight {brand_name_lower}-accent">¥{breakeven:,}</td>
+                        <td>
+                            <a href="https://www.ebay.com/sch/i.html?_nkw={brand_name}+{ebay_keyword}+Watch&LH_Sold=1" target="_blank" class="link-btn link-ebay">eBay</a>
+                            <input type="checkbox" class="search-checkbox">
+                            <a href="https://jp.mercari.com/search?keyword={brand_name}%20{mercari_keyword}%20時計&status=on_sale" target="_blank" class="link-btn link-mercari">メルカリ</a>
+                            <input type="checkbox" class="search-checkbox">
+                        </td>
+                    </tr>
+    ''')
+
+TABLE_FOOT = CompiledTemplate('''
+                </tbody>
+            </table>
+        </div>
+''')
+
+# 5. 各ライン別型番Top15
+LINE_MODELS_HEAD = CompiledTemplate('''
+
+        <h3 class="section-title {brand_name_lower}-primary">📌 各ラインの人気モデル（実データより）Top15</h3>
+        <p style="color: #666; margin-bottom: 20px;">元CSVデータから再分類した正確な人気モデルTop15</p>
+''')
+
+LINE_MODELS_TABLE_HEAD = CompiledTemplate('''
+        <h4 style="color: {color_primary}; margin-top: 25px; border-bottom: 2px solid {color_primary}; padding-bottom: 5px;">
+            {line_name} <span style="font-size: 0.9em; color: #666;">（販売数: {line_count}個）</span>
+        </h4>
+        <div class="table-container">
+            <table>
+                <thead>
+                    <tr>
+                        <th>順位</th>
+                        <th>型番</th>
+                        <th>販売数</th>
+                        <th>中央値</th>
+                        <th class="{brand_name_lower}-accent">仕入上限(¥)</th>
+                        <th>CV値</th>
+                        <th>商品例</th>
+                        <th>検索</th>
+                    </tr>
+                </thead>
+                <tbody>
+    ''')
+
+LINE_MODELS_ROW = CompiledTemplate('''
+                    <tr>
+                        <td><strong class="{brand_name_lower}-accent">{rank}</strong></td>
+                        <td><strong>{model}</strong></td>
+                        <td>{count}</td>
+                        <td>${median:.0f}</td>
+                        <td class="highlight {brand_name_lower}-accent">¥{breakeven:,}</td>
+                        <td>{cv:.3f}</td>
+                        <td class="model-sample">{title_sample}</td>
+                        <td>
+                            <a href="https://www.ebay.com/sch/i.html?_nkw={brand_name}+{ebay_keyword}&LH_Sold=1" target="_blank" class="link-btn link-ebay">eBay</a>
+                            <input type="checkbox" class="search-checkbox">
+                            <a href="https://jp.mercari.com/search?keyword={brand_name}%20{mercari_keyword}&status=on_sale" target="_blank" class="link-btn link-mercari">メルカリ</a>
+                            <input type="checkbox" class="search-checkbox">
+                        </td>
+                    </tr>
+        ''')
+
+LINE_MODELS_TABLE_FOOT = CompiledTemplate('''
+                </tbody>
+            </table>
+        </div>
+    ''')
+
+# 6. ライン別詳細
+LINE_DETAIL_HEAD = CompiledTemplate('''
+
+        <h3 class="section-title {brand_name_lower}-primary">🔵 ライン別詳細分析（全{line_total}ライン）</h3>
+        <div class="table-container">
+            <table>
+                <thead>
+                    <tr>
+                        <th>ライン</th>
+                        <th>販売数</th>
+                        <th class="{brand_name_lower}-accent">比率</th>
+                        <th>中央値</th>
+                        <th class="{brand_name_lower}-accent">仕入上限(¥)</th>
+                        <th>CV値</th>
+                        <th>安定度</th>
+                        <th>検索</th>
+                    </tr>
+                </thead>
+                <tbody>
+''')
+
+LINE_DETAIL_ROW = CompiledTemplate('''
+                    <tr>
+                        <td><strong>{name}</strong></td>
+                        <td>{count:,}</td>
+                        <td class="{brand_name_lower}-accent">{ratio:.1f}%</td>
+                        <td>${median:.0f}</td>
+                        <td class="highlight {brand_name_lower}-accent">¥{breakeven:,}</td>
+                        <td>{cv:.3f}</td>
+                        <td>{stability}</td>
+                        <td>
+                            <a href="https://www.ebay.com/sch/i.html?_nkw={brand_name}+{ebay_keyword}+Watch&LH_Sold=1" target="_blank" class="link-btn link-ebay">eBay</a>
+                            <input type="checkbox" class="search-checkbox">
+                            <a href="https://jp.mercari.com/search?keyword={brand_name}%20{mercari_keyword}%20時計&status=on_sale" target="_blank" class="link-btn link-mercari">メルカリ</a>
+                            <input type="checkbox" class="search-checkbox">
+                        </td>
+                    </tr>
+    ''')
+
+# 7. 型番Top30
+TOP_MODELS_HEAD = CompiledTemplate('''
+
+        <h3 class="section-title {brand_name_lower}-primary">🏆 全ライン横断 型番分析Top30</h3>
+        <div class="table-container">
+            <table>
+                <thead>
+                    <tr>
+                        <th>順位</th>
+                        <th>型番</th>
+                        <th>販売数</th>
+                        <th>中央値($)</th>
+                        <th class="{brand_name_lower}-accent">仕入上限(¥)</th>
+                        <th>CV</th>
+                        <th>検索</th>
+                    </tr>
+                </thead>
+                <tbody>
+''')
+
+TOP_MODELS_ROW = CompiledTemplate('''
+                    <tr>
+                        <td><strong class="{brand_name_lower}-accent">{rank}</strong></td>
+                        <td>{model}</td>
+                        <td>{count}</td>
+                        <td>${median:.2f}</td>
+                        <td class="highlight {brand_name_lower}-accent">¥{breakeven:,}</td>
+                        <td>{cv:.3f}</td>
+                        <td>
+                            <a href="https://www.ebay.com/sch/i.html?_nkw={brand_name}+{ebay_keyword}&LH_Sold=1" target="_blank" class="link-btn link-ebay">eBay</a>
+                            <input type="checkbox" class="search-checkbox">
+                            <a href="https://jp.mercari.com/search?keyword={brand_name}%20{mercari_keyword}&status=on_sale" target="_blank" class="link-btn link-mercari">メルカリ</a>
+                            <input type="checkbox" class="search-checkbox">
+                        </td>
+                    </tr>
+    ''')
+
+TAB_FOOT = CompiledTemplate('''
+                </tbody>
+            </table>
+        </div>
+
+    </div>
+''')
+
+# 8. CSS（ブランドカラーは utils.brand_theme のテーマブロックに、グラフデータは brand_charts() でタブ別JSONに書き出す）
+
+
+class BrandTabConfig:
+    """
+    ブランドタブ1つ分の設定
+
+    Args:
+        brand_name: CSVのブランド名（例: 'Tissot'）
+        lines: ライン定義 {ライン名: [キーワード, ...]}（優先順位順）
+        characters: キャラクター/特別版定義 {名前: [キーワード, ...]}（優先順位順）
+        model_extractor: ModelNumberExtractor、またはタイトル1件から型番を返す関数
+        color_primary: ブランドカラー
+        color_accent: アクセントカラー
+        emoji: 見出しの絵文字
+        target_conditions: 狙い目条件（<li>の中身のリスト）
+        avoid_conditions: 避けるべき条件（<li>の中身のリスト）
+        price_guide: 仕入れ価格目安 (通常モデル, 人気ラインの見出し, 人気ライン)
+        character_heading: キャラクターセクションの (タイトル, 説明, ラベル)
+        tab_id: タブのid（Noneならbrand_name）
+        brand_name_lower: CSSクラス・グラフidの接頭辞（Noneならbrand_name.lower()）
+        insert_after: タブが存在しない場合に挿入する位置（直前のタブid）
+    """
+
+    def __init__(self, brand_name, lines, characters, model_extractor,
+                 color_primary, color_accent, emoji,
+                 target_conditions, avoid_conditions, price_guide,
+                 character_heading=SPECIAL_EDITION_HEADING,
+                 tab_id=None, brand_name_lower=None, insert_after='Hamilton'):
+        self.brand_name = brand_name
+        self.lines = dict(lines)
+        self.characters = dict(characters)
+        self.model_extractor = model_extractor
+        self.color_primary = color_primary
+        self.color_accent = color_accent
+        self.emoji = emoji
+        self.target_conditions = list(target_conditions)
+        self.avoid_conditions = list(avoid_conditions)
+        self.price_guide = tuple(price_guide)
+        self.character_heading = tuple(character_heading)
+        self.tab_id = tab_id or brand_name
+        self.brand_name_lower = brand_name_lower or brand_name.lower()
+        self.insert_after = insert_after
+
+        self.line_classifier = KeywordLineClassifier(self.lines, default=f'その他{brand_name}')
+        self.character_classifier = KeywordLineClassifier(self.characters, default=None)
+
+    def extract_model_numbers(self, titles):
+        """タイトルのSeriesから型番を抽出（抽出失敗はNone）"""
+        if hasattr(self.model_extractor, 'extract_series'):
+            return self.model_extractor.extract_series(titles)
+        return titles.apply(self.model_extractor)
+
+
+# ============================================================
+# 集計
+# ============================================================
+
+def calculate_cv(prices):
+    """変動係数を計算（標本標準偏差 / 平均）"""
+    if len(prices) < 2:
+        return 0
+    mean = np.mean(prices)
+    if mean == 0:
+        return 0
+    std = np.std(prices, ddof=1)
+    return std / mean
+
+
+def breakeven_price(median):
+    """中央値($)から仕入上限(¥)を計算"""
+    return int(median * EXCHANGE_RATE * PURCHASE_RATIO)
+
+
+def stability_stars(cv):
+    """CV値を安定度の★表示に変換"""
+    return '★★★' if cv <= 0.15 else ('★★☆' if cv <= 0.25 else ('★☆☆' if cv <= 0.30 else '☆☆☆'))
+
+
+def _model_stats(table, with_sample):
+    """型番別の集計結果（GroupStats）を統計のリストに変換（販売数2未満は除外）"""
+    stats = []
+    for model, row in table[table['sales'] >= 2].iterrows():
+        stat = {
+            'model': model,
+            'count': int(row['sales']),
+            'median': float(row['median']),
+            'cv': float(row['cv']),
+        }
+        if with_sample:
+            stat['title_sample'] = row['first_タイトル'][:60]
+        stats.append(stat)
+    return stats
+
+
+def _top_by_count(stats, limit):
+    """販売数の多い順に上位limit件（同数は元の順序を維持）"""
+    return sorted(stats, key=lambda x: x['count'], reverse=True)[:limit]
+
+
+def classify_brand_frame(df_brand, config):
+    """
+    1ブランド分のデータにライン・キャラクター・型番の列を追加
+
+    Args:
+        df_brand: ブランドの完品データ
+        config: BrandTabConfig
+
+    Returns:
+        ライン・キャラクター・型番抽出 列を追加したコピー
+    """
+    df_brand = df_brand.copy()
+    if 'タイトル_upper' not in df_brand.columns:
+        df_brand['タイトル_upper'] = df_brand['タイトル'].str.upper()
+
+    df_brand['ライン'] = config.line_classifier.classify_series(df_brand['タイトル_upper'])
+    df_brand['キャラクター'] = config.character_classifier.classify_series(df_brand['タイトル_upper'])
+    df_brand['型番抽出'] = config.extract_model_numbers(df_brand['タイトル'])
+    return df_brand
+
+
+def classify_lines(df, configs):
+    """
+    複数ブランドの完品行にライン・型番抽出の列を追加（差分集計用）
+
+    Args:
+        df: 時計データ
+        configs: BrandTabConfigのリスト
+
+    Returns:
+        ライン・型番抽出 列を追加したコピー（対象外のブランド・完品以外の行は欠損値）
+    """
+    df = df.copy()
+    df['ライン'] = pd.Series(None, index=df.index, dtype=object)
+    df['型番抽出'] = pd.Series(None, index=df.index, dtype=object)
+
+    complete = df['商品状態'] == '完品'
+    for config in configs:
+        mask = complete & (df['ブランド'] == config.brand_name)
+        if mask.any():
+            classified = classify_brand_frame(df[mask], config)
+            df.loc[mask, 'ライン'] = classified['ライン']
+            df.loc[mask, '型番抽出'] = classified['型番抽出']
+    return df
+
+
+def compute_brand_stats(df_brand, config):
+    """
+    1ブランド分の統計を計算
+
+    Args:
+        df_brand: ブランドの完品データ（タイトル・価格・販売数・駆動方式・デパートメント列）
+                  classify_brand_frame() 済みならライン・型番の分類は省略する
+        config: BrandTabConfig
+
+    Returns:
+        テンプレートに渡す統計のdict
+    """
+    if not {'ライン', 'キャラクター', '型番抽出'} <= set(df_brand.columns):
+        df_brand = classify_brand_frame(df_brand, config)
+
+    df_brand_character = df_brand[df_brand['キャラクター'].notna()]
+    total_line_sales = df_brand['販売数'].sum()
+    stats = GroupStats(df_brand)
+
+    # ライン別統計（ライン×型番は1回のgroupbyで集計）
+    line_stats = {}
+    line_models_dict = {}
+    for line, row in stats.by('ライン').iterrows():
+        if row['items'] < 2:
+            continue
+        line_stats[line] = {
+            'count': int(row['sales']),
+            'median': float(row['median']),
+            'cv': float(row['cv']),
+        }
+        line_models = stats.within(['ライン', '型番抽出'], line, first=('タイトル',))
+        models = _top_by_count(_model_stats(line_models, with_sample=True), 15)
+        if len(models) > 0:
+            line_models_dict[line] = {'count': int(row['sales']), 'models': models}
+
+    # キャラクター別統計
+    character_stats = {}
+    for character, row in stats.by('キャラクター').iterrows():
+        character_stats[character] = {
+            'count': int(row['sales']),
+            'median': float(row['median']),
+            'ratio': float(row['sales'] / total_line_sales * 100),
+        }
+
+    # 型番Top30
+    model_stats_all = _top_by_count(_model_stats(stats.by('型番抽出'), with_sample=False), 30)
+
+    # 価格帯別分布（区切りの左端を含む、utils.price_bands.BRAND_TAB_BANDS）
+    price_counts = BRAND_TAB_BANDS.counts(df_brand['価格']).tolist()
+
+    # 駆動方式別・デパートメント別分布
+    movement_counts = df_brand.groupby('駆動方式')['販売数'].sum().to_dict()
+    movement_labels = [k for k in movement_counts.keys() if k != '不明']
+    dept_dist = df_brand.groupby('デパートメント')['販売数'].sum().sort_values(ascending=False)
+    dept_labels = [dept for dept in dept_dist.index if dept != '不明']
+
+    # ライン別売上比率（Top7のみ）
+    top_lines = _top_by_count([dict(data, name=line) for line, data in line_stats.items()], 7)
+
+    return {
+        'total_sales': int(df_brand['販売数'].sum()),
+        'median_price': float(median(df_brand['価格'])),
+        'cv_value': float(calculate_cv(df_brand['価格'].values)),
+        'extraction_rate': df_brand['型番抽出'].notna().sum() / len(df_brand) * 100,
+        'total_line_sales': total_line_sales,
+        'line_stats': line_stats,
+        'line_models_dict': line_models_dict,
+        'character_stats': character_stats,
+        'character_count': len(df_brand_character),
+        'character_median': float(median(df_brand_character['価格'])) if len(df_brand_character) > 0 else 0,
+        'character_ratio': float(len(df_brand_character) / len(df_brand) * 100),
+        'model_stats_all': model_stats_all,
+        'price_ranges': BRAND_TAB_BANDS.labels,
+        'price_counts': price_counts,
+        'movement_labels': movement_labels,
+        'movement_values': [int(movement_counts[k]) for k in movement_labels],
+        'dept_labels': dept_labels,
+        'dept_values': [int(dept_dist[dept]) for dept in dept_labels],
+        'line_labels': [line['name'] for line in top_lines],
+        'line_values': [line['count'] for line in top_lines],
+    }
+
+
+# ============================================================
+# 描画
+# ============================================================
+
+def _search_keywords(keyword):
+    """eBay・メルカリ検索用のキーワード（空白を置換）"""
+    return {'ebay_keyword': keyword.replace(' ', '+'), 'mercari_keyword': keyword.replace(' ', '%20')}
+
+
+def brand_charts(stats, config):
+    """
+    ブランドタブのグラフ定義（価格帯・駆動方式・デパートメント・ライン）を作成
+
+    Args:
+        stats: compute_brand_stats() の結果
+        config: BrandTabConfig
+
+    Returns:
+        ChartBundle.add() の引数（div id, data, layout, config）の辞書のリスト
+    """
+    prefix = config.brand_name_lower
+    gradient = [config.color_primary, '#7b68ee', '#9370db', '#ba55d3', '#da70d6']
+    pie_layout = {'margin': {'l': 20, 'r': 20, 't': 20, 'b': 20}, 'paper_bgcolor': 'white'}
+
+    def pie(name, labels, values):
+        return {
+            'div_id': f'{prefix}_{name}_chart',
+            'data': [{
+                'labels': labels,
+                'values': values,
+                'type': 'pie',
+                'marker': {'colors': gradient},
+                'textposition': 'inside',
+                'textinfo': 'label+percent',
+                'hovertemplate': '<b>%{label}</b><br>販売数: %{value}<br>割合: %{percent}<extra></extra>'
+            }],
+            'layout': pie_layout,
+            'config': {'responsive': True},
+        }
+
+    return [
+        {
+            'div_id': f'{prefix}_price_chart',
+            'data': [{
+                'x': stats['price_ranges'],
+                'y': stats['price_counts'],
+                'type': 'bar',
+                'marker': {
+                    'color': config.color_primary,
+                    'line': {'color': config.color_accent, 'width': 1}
+                },
+                'hovertemplate': '<b>%{x}</b><br>販売数: %{y}<extra></extra>'
+            }],
+            'layout': {
+                'xaxis': {'title': '価格帯', 'tickangle': -45},
+                'yaxis': {'title': '販売数'},
+                'margin': {'l': 50, 'r': 20, 't': 20, 'b': 80},
+                'plot_bgcolor': '#f8f9fa',
+                'paper_bgcolor': 'white'
+            },
+            'config': {'responsive': True},
+        },
+        pie('movement', stats['movement_labels'], stats['movement_values']),
+        pie('gender', stats['dept_labels'], stats['dept_values']),
+        pie('line', stats['line_labels'], stats['line_values']),
+    ]
+
+
+def render_brand_tab(stats, config):
+    """
+    統計からブランドタブを描画
+
+    Args:
+        stats: compute_brand_stats() の結果
+        config: BrandTabConfig
+
+    Returns:
+        {'tab_html': タブHTML, 'charts': グラフ定義のリスト, 'theme': ブランドテーマ（utils.brand_theme.BrandTheme）}
+    """
+    character_title, character_subtitle, character_label = config.character_heading
+    normal_price, popular_label, popular_price = config.price_guide
+    base = {
+        'tab_id': config.tab_id,
+        'brand_name': config.brand_name,
+        'brand_name_lower': config.brand_name_lower,
+        'color_primary': config.color_primary,
+        'color_accent': config.color_accent,
+        'emoji': config.emoji,
+    }
+
+    out = []
+    values = dict(base, **stats)
+    values.update({
+        'target_items': '\n'.join(f'                        <li>{item}</li>' for item in config.target_conditions),
+        'avoid_items': '\n'.join(f'                        <li>{item}</li>' for item in config.avoid_conditions),
+        'normal_price': normal_price,
+        'popular_label': popular_label,
+        'popular_price': popular_price,
+        'character_title': character_title,
+        'character_subtitle': character_subtitle,
+        'character_label': character_label,
+        'line_total': len(stats['line_stats']),
+    })
+    SUMMARY_SECTION.render_into(out, values)
+    STRATEGY_SECTION.render_into(out, values)
+    CHART_SECTION.render_into(out, values)
+
+    # キャラクター/特別版
+    CHARACTER_HEAD.render_into(out, values)
+    for name, data in sorted(stats['character_stats'].items(), key=lambda x: x[1]['count'], reverse=True):
+        CHARACTER_ROW.render_into(out, dict(base, name=name, breakeven=breakeven_price(data['median']),
+                                            **data, **_search_keywords(name)))
+    TABLE_FOOT.render_into(out, base)
+
+    # 各ライン別型番Top15
+    LINE_MODELS_HEAD.render_into(out, base)
+    for line_name, line_data in sorted(stats['line_models_dict'].items(), key=lambda x: x[1]['count'], reverse=True):
+        LINE_MODELS_TABLE_HEAD.render_into(out, dict(base, line_name=line_name, line_count=line_data['count']))
+        for rank, model_data in enumerate(line_data['models'], 1):
+            LINE_MODELS_ROW.render_into(out, dict(base, rank=rank, breakeven=breakeven_price(model_data['median']),
+                                                  **model_data, **_search_keywords(model_data['model'])))
+        LINE_MODELS_TABLE_FOOT.render_into(out, base)
+
+    # ライン別詳細
+    LINE_DETAIL_HEAD.render_into(out, values)
+    for line_name, data in sorted(stats['line_stats'].items(), key=lambda x: x[1]['count'], reverse=True):
+        LINE_DETAIL_ROW.render_into(out, dict(base, name=line_name, stability=stability_stars(data['cv']),
+                                              ratio=data['count'] / stats['total_line_sales'] * 100,
+                                              breakeven=breakeven_price(data['median']),
+                                              **data, **_search_keywords(line_name)))
+
+    # 型番Top30
+    TABLE_FOOT.render_into(out, base)
+    TOP_MODELS_HEAD.render_into(out, base)
+    for rank, model_data in enumerate(stats['model_stats_all'], 1):
+        TOP_MODELS_ROW.render_into(out, dict(base, rank=rank, breakeven=breakeven_price(model_data['median']),
+                                             **model_data, **_search_keywords(model_data['model'])))
+    TAB_FOOT.render_into(out, base)
+
+    return {
+        'tab_html': ''.join(out),
+        'charts': brand_charts(stats, config),
+        'theme': BrandTheme(config.tab_id, config.color_primary, config.color_accent,
+                            class_prefix=config.brand_name_lower),
+    }
+
+
+def _render_brand(df_brand, config):
+    """1ブランド分を集計・描画（並列実行時はワーカープロセスで実行）"""
+    stats = compute_brand_stats(df_brand, config)
+    return render_brand_tab(stats, config), len(stats['line_stats']), len(stats['character_stats'])
+
+
+def render_brand_tabs(df, configs, workers=1):
+    """
+    複数ブランドのタブを1回のデータ走査で描画
+
+    Args:
+        df: 時計データ（load_watch_data() の結果）
+        configs: BrandTabConfigのリスト
+        workers: 並列実行するプロセス数（1なら現在のプロセスで順に実行）
+
+    Returns:
+        [(config, 描画結果 or None)] のリスト（configsの順。完品データがないブランドはNone）
+    """
+    brand_names = [config.brand_name for config in configs]
+    df_target = df[(df['商品状態'] == '完品') & df['ブランド'].isin(brand_names)]
+    if workers > 1:
+        df_target = df_target[[c for c in BRAND_INPUT_COLUMNS + ['ブランド'] if c in df_target.columns]]
+    groups = {brand: group for brand, group in df_target.groupby('ブランド', sort=False, observed=True)}
+
+    jobs = [(config, groups.get(config.brand_name)) for config in configs]
+    pending = [(config, df_brand) for config, df_brand in jobs if df_brand is not None and len(df_brand) > 0]
+    if workers > 1 and len(pending) > 1:
+        with ProcessPoolExecutor(max_workers=min(workers, len(pending))) as pool:
+            futures = {config.tab_id: pool.submit(_render_brand, df_brand, config) for config, df_brand in pending}
+            rendered = {tab_id: future.result() for tab_id, future in futures.items()}
+    else:
+        rendered = {config.tab_id: _render_brand(df_brand, config) for config, df_brand in pending}
+
+    results = []
+    for config, df_brand in jobs:
+        if config.tab_id not in rendered:
+            print(f"⚠️ {config.brand_name}: 完品データがないためスキップ")
+            results.append((config, None))
+            continue
+
+        tab, line_count, character_count = rendered[config.tab_id]
+        results.append((config, tab))
+        print(f"✓ {config.brand_name}: {len(df_brand)}件、ライン{line_count}種類、"
+              f"キャラクター/特別版{character_count}種類")
+    return results
+
+
+def render_snapshot_tabs(configs, snapshot):
+    """
+    分析スナップショットの集計（template_brands セクション）からタブを描画（集計は行わない）
+
+    Args:
+        configs: BrandTabConfigのリスト
+        snapshot: 分析スナップショット（utils.analytics_snapshot.AnalyticsSnapshot）
+
+    Returns:
+        render_brand_tabs() と同じ形式のリスト
+    """
+    sections = snapshot['template_brands']
+    results = []
+    for config in configs:
+        entry = sections.get(config.tab_id)
+        if entry is None:
+            print(f"⚠️ {config.brand_name}: 完品データがないためスキップ")
+            results.append((config, None))
+            continue
+
+        stats = entry['stats']
+        results.append((config, render_brand_tab(stats, config)))
+        print(f"✓ {config.brand_name}: {entry['rows']}件、ライン{len(stats['line_stats'])}種類、"
+              f"キャラクター/特別版{len(stats['character_stats'])}種類")
+    return results
+
+
+def apply_brand_tabs(doc, results, charts):
+    """
+    描画結果をTabDocumentとグラフデータに反映
+
+    既存タブはその位置で置き換え、ないタブは insert_after の直後に挿入する。
+    ブランドカラーのCSSはテーマブロック（utils.brand_theme）にまとめ、グラフはchartsに登録する。
+    同じ doc に対しては1回だけ呼ぶ
+
+    Args:
+        doc: TabDocument
+        results: render_brand_tabs() の結果
+        charts: グラフデータの登録先（ChartBundle）
+
+    Returns:
+        反映したブランド名のリスト
+    """
+    applied = []
+    themes = []
+    for config, rendered in results:
+        if rendered is None:
+            continue
+        if config.tab_id in doc.tabs:
+            doc.replace_tab(config.tab_id, rendered['tab_html'].strip())
+        elif doc.has_tab(config.insert_after):
+            doc.insert_tab_after(config.insert_after, '\n' + rendered['tab_html'], tab_id=config.tab_id)
+        else:
+            print(f"❌ {config.brand_name}: {config.insert_after}タブが見つかりません")
+            continue
+        themes.append(rendered['theme'])
+        for chart in rendered['charts']:
+            charts.add(config.tab_id, **chart)
+        applied.append(config.brand_name)
+    if themes:
+        apply_brand_themes(doc, themes)
+    return applied
+
+
+def rebuild_brand_tabs(configs, index_path='index.html', df=None, workers=1, csv_path=DEFAULT_CSV_PATH):
+    """
+    ブランドタブを再構築してindex.htmlに保存
+
+    Args:
+        configs: BrandTabConfigのリスト
+        index_path: index.htmlのパス
+        df: 読み込み済みDataFrame（Noneなら分析スナップショットの集計を使う）
+        workers: ブランドごとの集計・描画を並列実行するプロセス数
+        csv_path: 時計データCSVのパス（dfがNoneのとき、このCSVの分析スナップショットを使う）
+
+    Returns:
+        反映したブランド名のリスト
+    """
+    from utils.analytics_snapshot import load_snapshot
+
+    print(f"📄 ブランドタブ再構築開始（{len(configs)}ブランド"
+          + (f"、{workers}プロセス" if workers > 1 else "") + "）...")
+    if df is None:
+        # CSVの集計は分析スナップショットから（データが変わっていなければ再計算しない）
+        results = render_snapshot_tabs(configs, load_snapshot(csv_path, workers=workers))
+    else:
+        results = render_brand_tabs(df, configs, workers=workers)
+
+    doc = TabDocument.from_file(index_path)
+    charts = ChartBundle()
+    applied = apply_brand_tabs(doc, results, charts)
+    html = charts.save(index_path, doc.render())
+    with open(index_path, 'w', encoding='utf-8') as f:
+        f.write(html)
+
+    print(f"\n✅ ブランドタブ実装完了！（{len(applied)}/{len(configs)}ブランド）")
+    print(f"   - ファイルサイズ: {len(html):,}文字")
+    return applied
+
+
+if __name__ == '__main__':
+    from utils.model_number import ModelNumberExtractor
+
+    print("✅ ブランドタブレンダラーテスト")
+
+    template = CompiledTemplate('<p>{name}: {price:,.0f} {{x}}</p>')
+    assert template.fields == ['name', 'price']
+    assert template.render({'name': 'A', 'price': 1234.5}) == '<p>A: 1,234 {x}</p>'
+    print("  ✓ CompiledTemplate")
+
+    df = pd.DataFrame({
+        'ブランド': ['TEST'] * 6 + ['OTHER'],
+        '商品状態': ['完品'] * 5 + ['パーツ', '完品'],
+        'タイトル': ['TEST ALPHA A100', 'Test Alpha A100 Gold', 'TEST BETA B200',
+                  'TEST BETA B200', 'TEST WATCH', 'TEST ALPHA PARTS', 'OTHER'],
+        '価格': [90.0, 160.0, 250.0, 2500.0, 120.0, 10.0, 50.0],
+        '販売数': [1, 1, 1, 1, 1, 1, 1],
+        '駆動方式': ['自動巻き', '自動巻き', 'クォーツ', '不明', 'クォーツ', '不明', '不明'],
+        'デパートメント': ['メンズ', 'メンズ', '不明', 'レディース', 'メンズ', '不明', '不明'],
+    })
+    config = BrandTabConfig(
+        brand_name='TEST',
+        lines={'Alpha': ['ALPHA'], 'Beta': ['BETA']},
+        characters={'Gold': ['GOLD']},
+        model_extractor=ModelNumberExtractor([r'\b([AB]\d{3})\b']),
+        color_primary='#000000',
+        color_accent='#FFFFFF',
+        emoji='🧪',
+        target_conditions=['<strong>Alpha:</strong> 人気'],
+        avoid_conditions=['パーツのみ'],
+        price_guide=('¥10,000以下', '人気ライン', '¥20,000が上限'),
+    )
+    (_, rendered), = render_brand_tabs(df, [config])
+    tab_html = rendered['tab_html']
+
+    assert tab_html.count('<div') == tab_html.count('</div>')
+    assert '<div id="TEST" class="tab-content">' in tab_html
+    assert '{brand_name_lower}' not in tab_html and 'test-primary">📌' in tab_html
+    assert '<td><strong>Beta</strong></td>' in tab_html and '<td><strong>Alpha</strong></td>' in tab_html
+    assert '<td><strong>B200</strong></td>' in tab_html
+    price_chart = rendered['charts'][0]
+    assert price_chart['div_id'] == 'test_price_chart' and price_chart['data'][0]['x'][:2] == ['~$100', '$100-150']
+    assert price_chart['data'][0]['y'] == [1, 1, 1, 1, 0, 0, 0, 1]
+    assert rendered['theme'].variables_css().startswith('#TEST { --brand-primary: #000000; --brand-accent: #FFFFFF;')
+    assert rendered['theme'].class_prefix == 'test'
+    print("  ✓ render_brand_tabs（1ブランド・完品のみ集計）")
+
+    doc = TabDocument('<style>a{}</style><body><div id="Hamilton" class="tab-content">h</div></body>')
+    charts = ChartBundle()
+    assert apply_brand_tabs(doc, [(config, rendered)], charts) == ['TEST']
+    assert [c['id'] for c in charts.charts('TEST')] == [
+        'test_price_chart', 'test_movement_chart', 'test_gender_chart', 'test_line_chart']
+    html = doc.render()
+    assert ':is(.test-accent) { color: var(--brand-accent); font-weight: bold; }' in html
+    doc2 = TabDocument(html)
+    assert doc2.tab_html('TEST') == tab_html.strip()
+    doc2.replace_tab('TEST', '<div id="TEST" class="tab-content">old</div>')
+    doc3 = TabDocument(doc2.render())
+    apply_brand_tabs(doc3, [(config, rendered)], ChartBundle())
+    html3 = doc3.render()
+    assert TabDocument(html3).tab_html('TEST') == tab_html.strip()
+    assert html3.count('.test-grid') == html.count('.test-grid') == 2  # 再生成してもCSSは増えない
+    print("  ✓ apply_brand_tabs（新規挿入・既存タブの置換・グラフ登録）")
+
+    other = BrandTabConfig('OTHER', {'Alpha': ['ALPHA']}, {}, config.model_extractor, '#111111', '#222222',
+                           '🧪', [], [], ('', '', ''))
+    serial = render_brand_tabs(df, [config, other])
+    parallel = render_brand_tabs(df, [config, other], workers=2)
+    assert [c.tab_id for c, _ in parallel] == ['TEST', 'OTHER']
+    assert all(a == b for (_, a), (_, b) in zip(serial, parallel))
+    print("  ✓ render_brand_tabs（プロセス並列でも同じ結果）")
+
+    print("\n✅ すべてのテスト成功")
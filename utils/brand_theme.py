@@ -0,0 +1,309 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+ブランドテーマ（ブランドカラーのCSS）
+各ブランドのカラーはタブごとのCSSカスタムプロパティ（--brand-primary / --brand-accent など）として持ち、
+統計カード・強調セル・テンプレートタブのクラス（.<接頭辞>-primary など）のスタイルは
+全ブランド共通のルール1組で書く。
+
+index.htmlの最初の<style>内のマーカーで囲んだ1ブロックにまとめて出力し、
+再生成時は既存のブロックの内容（登録済みのブランド）に今回のブランドを加えて置き換える
+（何回実行してもブロックは1つ）。置き換えるブランドの旧形式のCSS
+（/* <ブランド>固有のスタイル */ の #<タブ> .stat-card などや、.<接頭辞>-grid など）は削除する
+"""
+import re
+
+from utils.site_publish import css_statements
+
+
+# テーマブロックの開始・終了マーカー
+THEME_START = '/* ブランドテーマ（utils/brand_theme.py が生成。再生成時はこのブロックごと置き換える） */'
+THEME_END = '/* ブランドテーマここまで */'
+
+# カスタムプロパティ（#RRGGBB の後ろに付ける不透明度の16進数）
+PRIMARY_ALPHAS = ('15', '05')
+ACCENT_ALPHAS = ('25', '10')
+
+_VARS_RE = re.compile(r'^\s*#([\w-]+) \{ --brand-primary: ([^;]+); --brand-accent: ([^;]+);', re.M)
+_CARDS_RE = re.compile(r':is\(([^)]*)\) \.stat-card \{')
+_PREFIXES_RE = re.compile(r':is\(([^)]*)\) \{ color: var\(--brand-primary\); \}')
+
+
+class BrandTheme:
+    """
+    ブランドテーマ1つ分
+
+    Args:
+        tab_id: タブのid（カスタムプロパティはこのタブに設定する）
+        color_primary: ブランドカラー（#RRGGBB）
+        color_accent: アクセントカラー（#RRGGBB）
+        class_prefix: テンプレートタブのクラスの接頭辞（.<接頭辞>-primary/-accent/-grid/-chart-container。
+                      Noneならクラスのスタイルなし）
+        cards: Trueならタブ内の統計カード（.stat-card）・強調セル（.highlight）をブランドカラーにする
+    """
+
+    def __init__(self, tab_id, color_primary, color_accent, class_prefix=None, cards=False):
+        self.tab_id = tab_id
+        self.color_primary = color_primary
+        self.color_accent = color_accent
+        self.class_prefix = class_prefix
+        self.cards = cards
+
+    def __eq__(self, other):
+        return isinstance(other, BrandTheme) and vars(self) == vars(other)
+
+    def variables_css(self):
+        """タブに設定するカスタムプロパティ（1行）"""
+        values = [('primary', self.color_primary), ('accent', self.color_accent)]
+        values += [(f'primary-{alpha}', self.color_primary + alpha) for alpha in PRIMARY_ALPHAS]
+        values += [(f'accent-{alpha}', self.color_accent + alpha) for alpha in ACCENT_ALPHAS]
+        return f"#{self.tab_id} {{ {' '.join(f'--brand-{name}: {value};' for name, value in values)} }}"
+
+
+def _selector_list(selectors):
+    return f":is({', '.join(selectors)})"
+
+
+def render_theme_css(colors, card_tabs, class_prefixes):
+    """
+    テーマブロックのCSS
+
+    Args:
+        colors: {タブid: (ブランドカラー, アクセントカラー)}（登録順）
+        card_tabs: 統計カード・強調セルをブランドカラーにするタブidのリスト
+        class_prefixes: テンプレートタブのクラスの接頭辞のリスト
+
+    Returns:
+        マーカーを含むCSSの文字列（前後の改行を含む）
+    """
+    lines = [f'\n    {THEME_START}']
+    for tab_id, (primary, accent) in colors.items():
+        lines.append('    ' + BrandTheme(tab_id, primary, accent).variables_css())
+
+    if card_tabs:
+        tabs = _selector_list(f'#{tab_id}' for tab_id in card_tabs)
+        lines.append(f'''    {tabs} .stat-card {{
+        background: linear-gradient(135deg, var(--brand-primary-15) 0%, var(--brand-primary-05) 100%);
+        border-top: 3px solid var(--brand-primary);
+    }}
+    {tabs} .highlight {{
+        background: linear-gradient(135deg, var(--brand-accent-25) 0%, var(--brand-accent-10) 100%);
+    }}''')
+
+    if class_prefixes:
+        def classes(suffix):
+            return _selector_list(f'.{prefix}-{suffix}' for prefix in class_prefixes)
+
+        lines.append(f'''    {classes('primary')} {{ color: var(--brand-primary); }}
+    {classes('accent')} {{ color: var(--brand-accent); font-weight: bold; }}
+    {classes('grid')} {{
+        display: grid;
+        grid-template-columns: repeat(2, 1fr);
+        gap: 20px;
+        margin: 20px 0;
+    }}
+    {classes('chart-container')} {{
+        background: white;
+        padding: 15px;
+        border-radius: 10px;
+        box-shadow: 0 2px 8px rgba(0,0,0,0.1);
+    }}
+    {classes('chart-container')} h4 {{
+        margin-bottom: 10px;
+        font-size: 16px;
+    }}
+    @media (max-width: 768px) {{
+        {classes('grid')} {{
+            grid-template-columns: 1fr;
+        }}
+    }}''')
+
+    lines.append(f'    {THEME_END}\n')
+    return '\n'.join(lines)
+
+
+def parse_theme_css(css):
+    """
+    テーマブロックから登録済みのテーマを読み取る
+
+    Returns:
+        ({タブid: (ブランドカラー, アクセントカラー)}, 統計カードのタブidのリスト, クラスの接頭辞のリスト)
+    """
+    colors = {m.group(1): (m.group(2), m.group(3)) for m in _VARS_RE.finditer(css)}
+    card_tabs = []
+    m = _CARDS_RE.search(css)
+    if m:
+        card_tabs = [item.strip()[1:] for item in m.group(1).split(',')]
+    class_prefixes = []
+    m = _PREFIXES_RE.search(css)
+    if m:
+        class_prefixes = [item.strip()[1:-len('-primary')] for item in m.group(1).split(',')]
+    return colors, card_tabs, class_prefixes
+
+
+def _legacy_rules(card_tabs, class_prefixes):
+    """テーマで置き換える旧形式のルール（空白を1つにまとめたもの）"""
+    rules = set()
+    for tab_id in card_tabs:
+        rules.add(f'#{tab_id} .stat-card')
+        rules.add(f'#{tab_id} .highlight')
+    for prefix in class_prefixes:
+        for suffix in ('primary', 'accent', 'grid', 'chart-container', 'chart-container h4'):
+            rules.add(f'.{prefix}-{suffix}')
+        rules.add(f'@media (max-width: 768px) {{ .{prefix}-grid {{ grid-template-columns: 1fr; }} }}')
+    return rules
+
+
+def _rule_key(rule):
+    """旧形式のルールとの照合用（@mediaは全体、それ以外はセレクタ）"""
+    rule = ' '.join(rule.split())
+    return rule if rule.startswith('@') else rule.split(' {', 1)[0]
+
+
+def apply_brand_themes(doc, themes):
+    """
+    テーマブロックを更新（なければ最初の</style>の前に追加）し、置き換える旧形式のCSSを削除する
+
+    同じ TabDocument に対しては1回だけ呼ぶ（編集範囲が重なるため）
+
+    Args:
+        doc: TabDocument
+        themes: BrandThemeのリスト
+
+    Returns:
+        更新したかどうか（<style>がない場合はFalse）
+    """
+    if not doc.style_ranges:
+        print("⚠️ <style>が見つからないため、ブランドテーマを追加できません")
+        return False
+
+    style_start, style_end = doc.style_ranges[0]
+    css_start = doc.html.index('>', style_start) + 1
+    css = doc.html[css_start:style_end]
+
+    # 既存ブロック（前の空白と後ろの改行を含めて置き換える範囲）
+    block = None
+    block_start = css.find(THEME_START)
+    if block_start != -1:
+        block_end = css.find(THEME_END, block_start)
+        if block_end != -1:
+            block = (block_start, block_end + len(THEME_END))
+            line_start = css.rfind('\n', 0, block[0])
+            replace_start = line_start if line_start != -1 and not css[line_start:block[0]].strip() else block[0]
+            replace_end = block[1] + 1 if css[block[1]:block[1] + 1] == '\n' else block[1]
+    colors, card_tabs, class_prefixes = parse_theme_css(css[block[0]:block[1]] if block else '')
+
+    for theme in themes:
+        colors[theme.tab_id] = (theme.color_primary, theme.color_accent)
+        if theme.cards and theme.tab_id not in card_tabs:
+            card_tabs.append(theme.tab_id)
+        if theme.class_prefix and theme.class_prefix not in class_prefixes:
+            class_prefixes.append(theme.class_prefix)
+
+    # 旧形式のルール（直前の「固有のスタイル」コメントも）を、前の空白ごと削除
+    legacy = _legacy_rules(card_tabs, class_prefixes)
+    statements = css_statements(css)
+    prev_end = 0
+    pending_comment = None
+    for start, end, comment in statements:
+        if block and block[0] <= start < block[1]:
+            prev_end = replace_end
+            pending_comment = None
+            continue
+        if comment:
+            is_brand_comment = '固有のスタイル' in css[start:end]
+            pending_comment = (prev_end, end) if is_brand_comment else None
+        elif _rule_key(css[start:end]) in legacy:
+            remove_start = pending_comment[0] if pending_comment else prev_end
+            doc.replace_range(css_start + remove_start, css_start + end, '')
+            pending_comment = None
+        else:
+            pending_comment = None
+        prev_end = end
+
+    theme_css = render_theme_css(colors, card_tabs, class_prefixes)
+    if block:
+        doc.replace_range(css_start + replace_start, css_start + replace_end, theme_css)
+    else:
+        doc.insert_before_style_end(theme_css)
+    return True
+
+
+if __name__ == '__main__':
+    from utils.html_tabs import TabDocument
+
+    print("✅ ブランドテーマテスト")
+
+    page = '''<html><head><style>
+    .stat-card { padding: 10px; }
+
+        /* ROLEX固有のスタイル */
+        #ROLEX .stat-card {
+            background: linear-gradient(135deg, #00603915 0%, #00603905 100%);
+            border-top: 3px solid #006039;
+        }
+
+        #ROLEX .highlight {
+            background: linear-gradient(135deg, #C9B03725 0%, #C9B03710 100%);
+        }
+
+    .gucci-primary { color: #006341; }
+    .gucci-accent { color: #c8102e; font-weight: bold; }
+    .gucci-grid {
+        display: grid;
+    }
+    .gucci-chart-container h4 { font-size: 16px; }
+    @media (max-width: 768px) {
+        .gucci-grid {
+            grid-template-columns: 1fr;
+        }
+    }
+    .gucci-note { color: red; }
+
+        /* ROLEX固有のスタイル */
+        #ROLEX .stat-card { border-top: 3px solid #006039; }
+</style></head><body><div id="ROLEX" class="tab-content">r</div></body></html>'''
+
+    rolex = BrandTheme('ROLEX', '#006039', '#C9B037', cards=True)
+    gucci = BrandTheme('GUCCI', '#006341', '#c8102e', class_prefix='gucci')
+    assert rolex.variables_css() == ('#ROLEX { --brand-primary: #006039; --brand-accent: #C9B037; '
+                                     '--brand-primary-15: #00603915; --brand-primary-05: #00603905; '
+                                     '--brand-accent-25: #C9B03725; --brand-accent-10: #C9B03710; }')
+
+    doc = TabDocument(page)
+    assert apply_brand_themes(doc, [rolex, gucci])
+    html = doc.render()
+    assert html.count(THEME_START) == 1 and '固有のスタイル' not in html
+    assert '#ROLEX .stat-card' not in html and '.gucci-grid {' not in html and '.gucci-note { color: red; }' in html
+    assert ':is(#ROLEX) .stat-card {' in html and ':is(.gucci-primary) { color: var(--brand-primary); }' in html
+    assert '.stat-card { padding: 10px; }' in html
+    assert parse_theme_css(html) == ({'ROLEX': ('#006039', '#C9B037'), 'GUCCI': ('#006341', '#c8102e')},
+                                     ['ROLEX'], ['gucci'])
+    print("  ✓ apply_brand_themes（旧形式のCSSを削除し、テーマブロックを1つ追加）")
+
+    # 再生成（同じテーマ）では変わらない
+    doc = TabDocument(html)
+    apply_brand_themes(doc, [rolex, gucci])
+    assert doc.render() == html
+
+    # 別のスクリプトが別のブランドを追加しても、ブロックは1つのまま（登録済みのブランドは残る）
+    hamilton_css = '''
+        /* Hamilton固有のスタイル */
+        #Hamilton .stat-card { border-top: 3px solid #002855; }
+'''
+    doc = TabDocument(html.replace('</style>', hamilton_css + '</style>'))
+    apply_brand_themes(doc, [BrandTheme('Hamilton', '#002855', '#C8A882', cards=True),
+                             BrandTheme('ROLEX', '#111111', '#C9B037', cards=True)])
+    html2 = doc.render()
+    assert html2.count(THEME_START) == 1 and 'Hamilton固有' not in html2
+    assert ':is(#ROLEX, #Hamilton) .stat-card {' in html2 and '--brand-primary: #111111;' in html2
+    assert '#GUCCI { --brand-primary: #006341;' in html2
+    doc = TabDocument(html2)
+    apply_brand_themes(doc, [])
+    assert doc.render() == html2
+    print("  ✓ 再生成しても同じ結果・ブランドの追加はブロック内で更新")
+
+    doc = TabDocument('<body></body>')
+    assert not apply_brand_themes(doc, [rolex])
+
+    print("\n✅ すべてのテスト成功")
@@ -0,0 +1,206 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+インクリメンタルビルドグラフ
+各タブ生成処理を「入力宣言付きターゲット」として登録し、
+入力データが変わったターゲットだけを1プロセス内で再生成する
+
+- 共有DataFrameは1回だけ読み込む
+- index.htmlは最初に1回読み（TabDocumentで1回走査）、編集をまとめて適用して1回だけ書き込む
+- index.htmlのパスごとに、ターゲットの入力フィンガープリントと生成したタブHTMLのハッシュを
+  .cache/build_state.json に保存（別のindex.htmlや git checkout で戻したタブはスキップしない）
+- グラフデータは共有のChartBundleに登録し、index.htmlの隣の charts/ にタブ別JSONとして書き出す
+"""
+import hashlib
+import json
+import os
+
+import pandas as pd
+
+from utils.chart_bundle import ChartBundle
+from utils.html_tabs import TabDocument
+
+
+# ビルド状態の保存先
+STATE_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                          '.cache', 'build_state.json')
+
+
+def tab_html_hash(tab_html):
+    """タブHTMLのハッシュ（SHA-256の16進数文字列）"""
+    return hashlib.sha256(tab_html.encode('utf-8')).hexdigest()
+
+
+class BuildTarget:
+    """
+    ビルドターゲット（1タブ = 1ターゲット）
+
+    Args:
+        name: ターゲット名（状態保存のキー）
+        tab_id: 置換対象の tab-content div の id
+        render: df とグラフ登録先（ChartBundle）を受け取ってタブHTMLを返す関数
+        columns: 入力として参照する列
+        brands: 入力として参照するブランド（Noneなら全ブランド）
+        select: 入力行を絞り込む関数（df -> df、Noneなら絞り込みなし）
+        insert_after: タブが存在しない場合に挿入する位置（直前のタブid）
+        version: 生成ロジックのバージョン（HTMLの形を変えたら上げる）
+    """
+
+    def __init__(self, name, tab_id, render, columns, brands=None, select=None,
+                 insert_after=None, version=1):
+        self.name = name
+        self.tab_id = tab_id
+        self.render = render
+        self.columns = list(columns)
+        self.brands = list(brands) if brands is not None else None
+        self.select = select
+        self.insert_after = insert_after
+        self.version = version
+
+    def input_frame(self, df):
+        """ターゲットの入力となる行・列だけを取り出す"""
+        if self.brands is not None:
+            df = df[df['ブランド'].isin(self.brands)]
+        if self.select is not None:
+            df = self.select(df)
+        return df[[c for c in self.columns if c in df.columns]]
+
+    def fingerprint(self, df):
+        """
+        入力データのフィンガープリントを計算
+
+        Args:
+            df: 共有DataFrame
+
+        Returns:
+            SHA-256の16進数文字列
+        """
+        frame = self.input_frame(df)
+        h = hashlib.sha256()
+        h.update(f'{self.name}|{self.version}|{",".join(frame.columns)}|{len(frame)}'.encode('utf-8'))
+        if len(frame) > 0:
+            row_hashes = pd.util.hash_pandas_object(frame, index=False).values
+            h.update(row_hashes.tobytes())
+        return h.hexdigest()
+
+
+class BuildGraph:
+    """ビルドターゲットの登録と実行"""
+
+    def __init__(self, state_path=STATE_PATH):
+        self.state_path = state_path
+        self.targets = []
+        self.finalizers = []
+        self.charts = ChartBundle()
+
+    def register(self, target):
+        """ターゲットを登録"""
+        if any(t.name == target.name for t in self.targets):
+            raise ValueError(f"ターゲット名が重複しています: {target.name}")
+        self.targets.append(target)
+        return target
+
+    def add_finalizer(self, func):
+        """全ターゲット処理後にHTMLへ適用する関数（html -> html）を登録"""
+        self.finalizers.append(func)
+        return func
+
+    def _load_state(self):
+        if not os.path.exists(self.state_path):
+            return {}
+        try:
+            with open(self.state_path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def _save_state(self, state):
+        os.makedirs(os.path.dirname(self.state_path), exist_ok=True)
+        with open(self.state_path, 'w', encoding='utf-8') as f:
+            json.dump(state, f, ensure_ascii=False, indent=2)
+
+    def build(self, df, index_path, force=False, only=None):
+        """
+        ビルド実行
+
+        Args:
+            df: 共有DataFrame（各ターゲットはこれを読むだけ）
+            index_path: index.htmlのパス
+            force: Trueなら入力が変わっていなくても全ターゲットを再生成
+            only: 対象ターゲット名のリスト（Noneなら全ターゲット）
+
+        Returns:
+            再生成したターゲット名のリスト
+        """
+        doc = TabDocument.from_file(index_path)
+
+        # 状態は index.html ごと（ターゲット名 -> 入力フィンガープリントとタブHTMLのハッシュ）
+        all_state = {key: value for key, value in self._load_state().items() if isinstance(value, dict)}
+        state_key = os.path.abspath(index_path)
+        state = all_state.get(state_key, {})
+        rebuilt = []
+
+        for target in self.targets:
+            if only is not None and target.name not in only:
+                continue
+
+            fp = target.fingerprint(df)
+            tab_exists = doc.has_tab(target.tab_id)
+
+            entry = state.get(target.name)
+            up_to_date = (
+                tab_exists
+                and isinstance(entry, dict)
+                and entry.get('fingerprint') == fp
+                and target.tab_id in doc.tabs
+                and entry.get('html') == tab_html_hash(doc.tab_html(target.tab_id))
+            )
+            if not force and up_to_date:
+                print(f"  - {target.name}: 変更なし（スキップ）")
+                continue
+
+            new_tab_html = target.render(df, self.charts)
+            if not new_tab_html:
+                print(f"  ⚠️ {target.name}: 生成結果が空のためスキップ")
+                continue
+
+            if tab_exists:
+                doc.replace_tab(target.tab_id, new_tab_html)
+            elif target.insert_after is not None:
+                doc.insert_tab_after(target.insert_after, new_tab_html, tab_id=target.tab_id)
+            else:
+                print(f"  ❌ {target.name}: {target.tab_id}タブが見つかりません")
+                continue
+
+            state[target.name] = {'fingerprint': fp}
+            rebuilt.append(target.name)
+            print(f"  ✓ {target.name}: 再生成")
+
+        html = doc.render()
+        for func in self.finalizers:
+            html = func(html)
+
+        # 再生成したタブのグラフデータを書き出し、インラインのグラフスクリプトを置き換え
+        if self.charts.tabs:
+            html = self.charts.save(index_path, html)
+
+        if html != doc.html:
+            with open(index_path, 'w', encoding='utf-8') as f:
+                f.write(html)
+            print(f"✓ index.html保存: {len(html):,}文字")
+        else:
+            print("✓ index.htmlに変更なし")
+
+        # 書き込んだindex.htmlのタブHTMLのハッシュを記録（仕上げ処理・グラフ置換後の内容）
+        saved = TabDocument(html)
+        for target in self.targets:
+            entry = state.get(target.name)
+            if not isinstance(entry, dict):
+                continue
+            if target.tab_id in saved.tabs:
+                entry['html'] = tab_html_hash(saved.tab_html(target.tab_id))
+            else:
+                del state[target.name]
+        all_state[state_key] = state
+        self._save_state(all_state)
+        return rebuilt
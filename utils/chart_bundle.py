@@ -0,0 +1,336 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+タブ別グラフデータバンドル
+Plotlyグラフのデータをindex.htmlにインラインで埋め込まず、タブごとのJSONファイル
+（charts/<タブID>.json と gzip圧縮版 .json.gz）に書き出す。
+ページ側は showTab でタブが表示されたときに、そのタブのJSONだけを取得して描画する。
+
+- ChartBundle.add: グラフ1個分（div id・trace・layout・config）を登録
+- ChartBundle.write: タブごとのJSONを書き出す（内容が変わったタブのみ）
+- ChartBundle.finalize: index.htmlから移行済みグラフのインライン<script>を削除し、
+  遅延読み込みスクリプトと showTab からの呼び出しを追加（何度実行しても同じ結果）
+"""
+import gzip
+import json
+import math
+import os
+import re
+
+import numpy as np
+
+
+# グラフデータの保存先ディレクトリ（index.htmlからの相対パス）
+CHART_DIR_NAME = 'charts'
+
+# 遅延読み込みスクリプト（index.htmlに1回だけ追加）
+CHART_LOADER_ID = 'chart-loader'
+CHART_LOADER_SCRIPT = f'''    <script id="{CHART_LOADER_ID}">
+    // タブ別グラフデータの遅延読み込み（タブ表示時に {CHART_DIR_NAME}/<タブID>.json を1回だけ取得して描画）
+    const chartTabsLoaded = {{}};
+
+    function fetchChartData(tabId) {{
+        const url = '{CHART_DIR_NAME}/' + encodeURIComponent(tabId) + '.json';
+        const fetchJson = () => fetch(url).then(res => res.ok ? res.json() : []);
+        if (!('DecompressionStream' in window)) {{
+            return fetchJson();
+        }}
+        return fetch(url + '.gz').then(res => {{
+            if (!res.ok) throw new Error(res.status);
+            return new Response(res.body.pipeThrough(new DecompressionStream('gzip'))).json();
+        }}).catch(fetchJson);
+    }}
+
+    function loadTabCharts(tabId) {{
+        if (!chartTabsLoaded[tabId]) {{
+            chartTabsLoaded[tabId] = fetchChartData(tabId).then(charts => {{
+                const baseLayout = typeof plotlyLayout !== 'undefined' ? plotlyLayout : {{}};
+                const baseConfig = typeof plotlyConfig !== 'undefined' ? plotlyConfig : {{responsive: true}};
+                charts.forEach(chart => {{
+                    if (!document.getElementById(chart.id)) return;
+                    const layout = chart.base ? Object.assign({{}}, baseLayout, chart.layout) : (chart.layout || {{}});
+                    Plotly.newPlot(chart.id, chart.data, layout, chart.config || baseConfig);
+                }});
+            }}).catch(err => {{
+                delete chartTabsLoaded[tabId];
+                console.error('グラフデータの読み込みに失敗: ' + tabId, err);
+            }});
+        }}
+        return chartTabsLoaded[tabId];
+    }}
+
+    document.addEventListener('DOMContentLoaded', () => {{
+        document.querySelectorAll('.tab-content.active').forEach(el => loadTabCharts(el.id));
+    }});
+    </script>
+'''
+
+# 属性なしの<script>ブロック
+_INLINE_SCRIPT_RE = re.compile(r'[ \t]*<script>(.*?)</script>[ \t]*\n?', re.S)
+
+# Plotly.newPlot の呼び出しと、div idが文字列リテラルのもの
+_NEWPLOT_CALL_RE = re.compile(r'Plotly\.newPlot\(')
+_NEWPLOT_ID_RE = re.compile(r'''Plotly\.newPlot\(\s*['"]([^'"]+)['"]''')
+
+# showTab 内でタブを表示する行（この直後に loadTabCharts を呼ぶ）
+_SHOW_TAB_RE = re.compile(
+    r"function showTab\((\w+)\)\s*\{.*?\n([ \t]*)document\.getElementById\(\1\)\.classList\.add\('active'\);",
+    re.S)
+
+
+def chart_dir_for(index_path):
+    """index.htmlと同じディレクトリの charts/ のパスを返す"""
+    return os.path.join(os.path.dirname(os.path.abspath(index_path)), CHART_DIR_NAME)
+
+
+def _to_json_value(value):
+    """numpy/pandasの値をJSONに書ける値に変換（json.dumpsのdefault）"""
+    if isinstance(value, np.integer):
+        return int(value)
+    if isinstance(value, np.floating):
+        return None if math.isnan(value) else float(value)
+    if isinstance(value, np.ndarray):
+        return value.tolist()
+    if hasattr(value, 'tolist'):
+        return value.tolist()
+    raise TypeError(f"JSONに変換できない値です: {type(value).__name__}")
+
+
+def _replace_nan(value):
+    """float の NaN を null にする（Plotlyは null を欠損として扱う）"""
+    if isinstance(value, float) and math.isnan(value):
+        return None
+    if isinstance(value, dict):
+        return {k: _replace_nan(v) for k, v in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_replace_nan(v) for v in value]
+    return value
+
+
+def encode_charts(charts):
+    """
+    タブ1個分のグラフ定義をコンパクトなJSONバイト列にする
+
+    Args:
+        charts: グラフ定義のリスト
+
+    Returns:
+        UTF-8のJSONバイト列（空白なし・日本語はエスケープしない）
+    """
+    text = json.dumps(_replace_nan(charts), ensure_ascii=False, separators=(',', ':'),
+                      default=_to_json_value, allow_nan=False)
+    return text.encode('utf-8')
+
+
+def _write_if_changed(path, data):
+    """内容が変わった場合だけ書き込む（書き込んだらTrue）"""
+    if os.path.exists(path):
+        with open(path, 'rb') as f:
+            if f.read() == data:
+                return False
+    with open(path, 'wb') as f:
+        f.write(data)
+    return True
+
+
+def strip_inline_charts(html, div_ids):
+    """
+    バンドルに移行したグラフのインライン<script>を削除
+
+    Plotly.newPlot の描画先がすべて div_ids に含まれる<script>ブロックだけを削除する
+    （関数定義を含むブロックや、移行していないグラフを含むブロックは残す）。
+
+    Args:
+        html: index.htmlの文字列
+        div_ids: バンドルに移行したグラフのdiv idの集合
+
+    Returns:
+        (削除後のHTML, 削除したブロック数) のタプル
+    """
+    div_ids = set(div_ids)
+    removed = 0
+
+    def replace(m):
+        nonlocal removed
+        body = m.group(1)
+        ids = _NEWPLOT_ID_RE.findall(body)
+        if (not ids or len(ids) != len(_NEWPLOT_CALL_RE.findall(body))
+                or 'function' in body or not set(ids) <= div_ids):
+            return m.group()
+        removed += 1
+        return ''
+
+    return _INLINE_SCRIPT_RE.sub(replace, html), removed
+
+
+def install_chart_loader(html):
+    """
+    遅延読み込みスクリプトと showTab からの呼び出しを追加（追加済みなら何もしない）
+
+    Args:
+        html: index.htmlの文字列
+
+    Returns:
+        追加後のHTML文字列
+    """
+    if f'<script id="{CHART_LOADER_ID}">' not in html:
+        body_end = html.rfind('</body>')
+        if body_end == -1:
+            print("⚠️ </body>が見つからないため、グラフ読み込みスクリプトを追加できません")
+        else:
+            html = html[:body_end] + CHART_LOADER_SCRIPT + html[body_end:]
+
+    m = _SHOW_TAB_RE.search(html)
+    if m is None:
+        print("⚠️ showTab関数が見つからないため、グラフ読み込みの呼び出しを追加できません")
+    elif not html[m.end():].lstrip().startswith('loadTabCharts('):
+        call = f'\n{m.group(2)}loadTabCharts({m.group(1)});'
+        html = html[:m.end()] + call + html[m.end():]
+    return html
+
+
+class ChartBundle:
+    """
+    タブ別グラフデータの集約
+
+    グラフはタブごとに登録順で保持し、同じdiv idを再登録した場合は置き換える。
+    """
+
+    def __init__(self):
+        self.tabs = {}
+
+    def add(self, tab_id, div_id, data, layout=None, config=None, base_layout=False):
+        """
+        グラフを登録
+
+        Args:
+            tab_id: グラフを含むタブのid
+            div_id: 描画先のdiv id
+            data: Plotlyのtraceのリスト
+            layout: Plotlyのlayout
+            config: Plotlyのconfig（Noneならページの plotlyConfig）
+            base_layout: Trueならページの plotlyLayout に layout を重ねる
+                         （{...plotlyLayout, ...} と同じ）
+        """
+        chart = {'id': div_id, 'data': data}
+        if layout:
+            chart['layout'] = layout
+        if config is not None:
+            chart['config'] = config
+        if base_layout:
+            chart['base'] = 1
+        self.tabs.setdefault(tab_id, {})[div_id] = chart
+
+    def charts(self, tab_id):
+        """タブのグラフ定義リストを返す"""
+        return list(self.tabs.get(tab_id, {}).values())
+
+    @property
+    def div_ids(self):
+        """登録済みの全div id"""
+        return {div_id for charts in self.tabs.values() for div_id in charts}
+
+    def write(self, chart_dir):
+        """
+        タブごとのJSON（.json と .json.gz）を書き出す
+
+        Args:
+            chart_dir: 出力ディレクトリ（通常は chart_dir_for(index.htmlのパス)）
+
+        Returns:
+            内容が変わって書き込んだタブidのリスト
+        """
+        os.makedirs(chart_dir, exist_ok=True)
+        written = []
+        for tab_id in self.tabs:
+            data = encode_charts(self.charts(tab_id))
+            path = os.path.join(chart_dir, f'{tab_id}.json')
+            changed = _write_if_changed(path, data)
+            # mtime=0で圧縮結果を毎回同じにする（内容が同じなら書き換えない）
+            changed |= _write_if_changed(path + '.gz', gzip.compress(data, compresslevel=9, mtime=0))
+            if changed:
+                written.append(tab_id)
+        return written
+
+    def finalize(self, html):
+        """
+        index.htmlを遅延読み込み用に整える
+
+        移行済みグラフのインライン<script>を削除し、読み込みスクリプトを追加する。
+
+        Args:
+            html: index.htmlの文字列
+
+        Returns:
+            整えたHTML文字列
+        """
+        html, removed = strip_inline_charts(html, self.div_ids)
+        if removed:
+            print(f"  ✓ インライングラフスクリプト削除: {removed}ブロック")
+        return install_chart_loader(html)
+
+    def save(self, index_path, html):
+        """
+        グラフJSONを書き出し、finalize済みのHTMLを返す
+
+        Args:
+            index_path: index.htmlのパス（charts/ はこの隣に作る）
+            html: index.htmlの文字列
+
+        Returns:
+            finalize済みのHTML文字列
+        """
+        written = self.write(chart_dir_for(index_path))
+        print(f"  ✓ グラフデータ: {len(self.tabs)}タブ（更新 {len(written)}タブ）")
+        return self.finalize(html)
+
+
+if __name__ == '__main__':
+    import tempfile
+
+    print("✅ グラフデータバンドルテスト")
+
+    bundle = ChartBundle()
+    bundle.add('A', 'a_bar', [{'x': np.array([1, 2]), 'y': [np.int64(3), float('nan')], 'type': 'bar'}],
+               {'title': 'A'}, base_layout=True)
+    bundle.add('A', 'a_pie', [{'labels': ['自動巻'], 'values': [1], 'type': 'pie'}],
+               config={'responsive': True})
+    bundle.add('A', 'a_bar', [{'x': [1, 2], 'y': [3, None], 'type': 'bar'}], {'title': 'A'}, base_layout=True)
+
+    charts = json.loads(encode_charts(bundle.charts('A')))
+    assert [c['id'] for c in charts] == ['a_bar', 'a_pie']
+    assert charts[0] == {'id': 'a_bar', 'data': [{'x': [1, 2], 'y': [3, None], 'type': 'bar'}],
+                         'layout': {'title': 'A'}, 'base': 1}
+    assert b'\xe8\x87\xaa' in encode_charts(bundle.charts('A'))  # 日本語はエスケープしない
+    print("  ✓ add / encode_charts（再登録は置換・NaNはnull）")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        assert bundle.write(tmp) == ['A']
+        assert bundle.write(tmp) == []
+        with gzip.open(os.path.join(tmp, 'A.json.gz'), 'rb') as f:
+            assert json.loads(f.read()) == charts
+    print("  ✓ write（.json / .json.gz、変更がなければ書き込まない）")
+
+    page = '''<body>
+    <script>
+    function showTab(tabId) {
+        document.getElementById(tabId).classList.add('active');
+    }
+    </script>
+    <script>
+    Plotly.newPlot('a_bar', [], {});
+    </script>
+    <script>
+    Plotly.newPlot('a_bar', [], {});
+    Plotly.newPlot('other', [], {});
+    </script>
+</body>'''
+    stripped, removed = strip_inline_charts(page, bundle.div_ids)
+    assert removed == 1 and "'other'" in stripped and 'function showTab' in stripped
+    print("  ✓ strip_inline_charts（移行済みグラフだけのブロックを削除）")
+
+    once = bundle.finalize(page)
+    assert once.count(CHART_LOADER_ID) == 1 and once.count('loadTabCharts(tabId);') == 1
+    assert "classList.add('active');\n        loadTabCharts(tabId);" in once
+    assert bundle.finalize(once) == once
+    print("  ✓ finalize（読み込みスクリプト追加・2回目は変更なし）")
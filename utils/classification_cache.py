@@ -0,0 +1,352 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+タイトル分類キャッシュ
+ライン・型番・駆動方式などの分類結果を「正規化タイトル + 分類器バージョン」の
+ハッシュをキーに保存し、再実行やCSV追加時は未分類のタイトルだけを処理する
+
+- ディスク: .cache/classification_cache.sqlite（SQLite）
+- メモリ: プロセス内LRU
+- 分類器バージョンはキーワード辞書・パターンから計算するため、
+  辞書を変更すると古い結果は自動的に参照されなくなる
+- バージョンごとに最終利用日時を記録し、新しいバージョンを初めて使うときに、同じ種類で
+  VERSION_RETENTION_DAYS 日以上使われていないバージョンの結果を削除する
+  （'line'・'model_number' はブランドごとの分類器が別々のバージョンで共有するため、
+  現在のバージョン以外をすぐには消さない）
+"""
+import hashlib
+import json
+import os
+import sqlite3
+import time
+from collections import OrderedDict
+
+import numpy as np
+import pandas as pd
+
+
+# キャッシュ保存先（data_loaderと同じ .cache/）
+CACHE_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                          '.cache', 'classification_cache.sqlite')
+
+# メモリLRUの最大件数
+DEFAULT_MEMORY_SIZE = 200_000
+
+# 使われなくなったバージョンの結果を残す日数
+VERSION_RETENTION_DAYS = 30
+
+# SQLiteのIN句に渡す1回あたりの件数
+_QUERY_CHUNK = 500
+
+
+def classifier_version(*parts):
+    """
+    分類器のバージョン文字列を計算
+
+    Args:
+        *parts: 分類結果を左右するもの（キーワード辞書、パターン、既定値など）
+
+    Returns:
+        16桁の16進数文字列（辞書の中身・順序が変われば変わる）
+    """
+    payload = json.dumps(parts, ensure_ascii=False, default=repr)
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()[:16]
+
+
+def make_key(namespace, version, text):
+    """正規化タイトルと分類器バージョンからキャッシュキーを作成"""
+    return hashlib.sha1(f'{namespace}\0{version}\0{text}'.encode('utf-8')).hexdigest()
+
+
+class ClassificationCache:
+    """
+    分類結果キャッシュ（SQLite + メモリLRU）
+
+    Args:
+        path: SQLiteファイルのパス
+        memory_size: メモリLRUの最大件数
+    """
+
+    def __init__(self, path=CACHE_PATH, memory_size=DEFAULT_MEMORY_SIZE):
+        self.path = path
+        self.memory_size = memory_size
+        self._memory = OrderedDict()
+        self._conn = None
+        self._pid = None
+        self._registered = set()  # このプロセスで利用を記録した (namespace, version)
+
+    def _connect(self):
+        # fork後の子プロセスでは親の接続を使わない
+        if self._conn is None or self._pid != os.getpid():
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            conn = sqlite3.connect(self.path, timeout=30)
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute('PRAGMA synchronous=NORMAL')
+            conn.execute(
+                'CREATE TABLE IF NOT EXISTS labels ('
+                ' key TEXT PRIMARY KEY,'
+                ' namespace TEXT NOT NULL,'
+                ' version TEXT NOT NULL,'
+                ' value TEXT NOT NULL)'
+            )
+            has_versions = conn.execute(
+                "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'versions'").fetchone()
+            conn.execute(
+                'CREATE TABLE IF NOT EXISTS versions ('
+                ' namespace TEXT NOT NULL,'
+                ' version TEXT NOT NULL,'
+                ' last_used REAL NOT NULL,'
+                ' PRIMARY KEY (namespace, version))'
+            )
+            if not has_versions:
+                # 以前のキャッシュにある結果は今使われたものとして記録（すぐには削除しない）
+                conn.execute('INSERT OR IGNORE INTO versions (namespace, version, last_used)'
+                             ' SELECT DISTINCT namespace, version, ? FROM labels', (time.time(),))
+            conn.commit()
+            self._conn = conn
+            self._pid = os.getpid()
+            self._registered = set()
+        return self._conn
+
+    def _remember(self, key, value):
+        self._memory[key] = value
+        self._memory.move_to_end(key)
+        if len(self._memory) > self.memory_size:
+            self._memory.popitem(last=False)
+
+    def _read_disk(self, keys):
+        """ディスクからまとめて読み込む（見つかったものだけ返す）"""
+        found = {}
+        conn = self._connect()
+        for i in range(0, len(keys), _QUERY_CHUNK):
+            chunk = keys[i:i + _QUERY_CHUNK]
+            placeholders = ','.join('?' * len(chunk))
+            rows = conn.execute(f'SELECT key, value FROM labels WHERE key IN ({placeholders})', chunk)
+            for key, value in rows:
+                found[key] = json.loads(value)
+        return found
+
+    def _write_disk(self, namespace, version, items):
+        """ディスクにまとめて書き込む（1トランザクション）"""
+        conn = self._connect()
+        with conn:
+            conn.executemany(
+                'INSERT OR REPLACE INTO labels (key, namespace, version, value) VALUES (?, ?, ?, ?)',
+                [(key, namespace, version, json.dumps(value, ensure_ascii=False))
+                 for key, value in items.items()]
+            )
+
+    def _register_version(self, namespace, version):
+        """
+        バージョンの最終利用日時を記録（プロセスごとに1回）
+
+        初めて使うバージョンなら、同じ種類で VERSION_RETENTION_DAYS 日以上使われていないバージョンを削除する
+        """
+        if (namespace, version) in self._registered and self._pid == os.getpid():
+            return
+        conn = self._connect()
+        is_new = conn.execute('SELECT 1 FROM versions WHERE namespace = ? AND version = ?',
+                              (namespace, version)).fetchone() is None
+        with conn:
+            conn.execute('INSERT OR REPLACE INTO versions (namespace, version, last_used) VALUES (?, ?, ?)',
+                         (namespace, version, time.time()))
+        if is_new:
+            self.prune(namespace, version, max_age=VERSION_RETENTION_DAYS * 86400)
+        self._registered.add((namespace, version))
+
+    def lookup(self, namespace, version, texts, compute):
+        """
+        正規化タイトルのリストを分類（キャッシュにないものだけcomputeで計算）
+
+        Args:
+            namespace: 分類の種類（例: "line", "model_number"）
+            version: classifier_version() の値
+            texts: 正規化タイトルのリスト（重複なし）
+            compute: 未分類タイトルのSeriesを受け取り、結果のリストを返す関数
+
+        Returns:
+            textsと同じ順序の分類結果リスト
+        """
+        try:
+            self._register_version(namespace, version)
+        except sqlite3.Error as e:
+            print(f"⚠️ 分類キャッシュのバージョン記録に失敗しました（処理は続行）: {e}")
+
+        keys = [make_key(namespace, version, t) for t in texts]
+        results = [None] * len(texts)
+        missing = []
+
+        for i, key in enumerate(keys):
+            if key in self._memory:
+                self._memory.move_to_end(key)
+                results[i] = self._memory[key]
+            else:
+                missing.append(i)
+
+        if missing:
+            try:
+                found = self._read_disk([keys[i] for i in missing])
+            except sqlite3.Error:
+                found = {}
+            still_missing = []
+            for i in missing:
+                if keys[i] in found:
+                    results[i] = found[keys[i]]
+                    self._remember(keys[i], results[i])
+                else:
+                    still_missing.append(i)
+            missing = still_missing
+
+        if missing:
+            computed = list(compute(pd.Series([texts[i] for i in missing], dtype=object)))
+            new_items = {}
+            for i, value in zip(missing, computed):
+                results[i] = value
+                new_items[keys[i]] = value
+                self._remember(keys[i], value)
+            try:
+                self._write_disk(namespace, version, new_items)
+            except sqlite3.Error as e:
+                print(f"⚠️ 分類キャッシュ保存に失敗しました（処理は続行）: {e}")
+
+        return results
+
+    def prune(self, namespace, version, max_age=None):
+        """
+        指定namespaceで現在のバージョン以外の結果を削除
+
+        Args:
+            namespace: 分類の種類
+            version: 残すバージョン
+            max_age: 指定した場合、この秒数以内に使われたバージョンも残す（Noneなら現在のバージョンのみ残す）
+
+        Returns:
+            削除した結果の件数
+        """
+        cutoff = time.time() - max_age if max_age is not None else float('inf')
+        conn = self._connect()
+        keep = ('SELECT version FROM versions WHERE namespace = ? AND last_used >= ?')
+        with conn:
+            deleted = conn.execute(
+                f'DELETE FROM labels WHERE namespace = ? AND version != ? AND version NOT IN ({keep})',
+                (namespace, version, namespace, cutoff)).rowcount
+            conn.execute('DELETE FROM versions WHERE namespace = ? AND version != ? AND last_used < ?',
+                         (namespace, version, cutoff))
+        return deleted
+
+    def clear(self):
+        """メモリとディスクのキャッシュをすべて削除"""
+        self._memory.clear()
+        if self._conn is not None and self._pid == os.getpid():
+            self._conn.close()
+        self._conn = None
+        for suffix in ('', '-wal', '-shm'):
+            if os.path.exists(self.path + suffix):
+                os.remove(self.path + suffix)
+
+
+_DEFAULT_CACHE = None
+
+
+def get_cache():
+    """プロセス共通のキャッシュを返す"""
+    global _DEFAULT_CACHE
+    if _DEFAULT_CACHE is None:
+        _DEFAULT_CACHE = ClassificationCache()
+    return _DEFAULT_CACHE
+
+
+def set_cache(cache):
+    """
+    プロセス共通のキャッシュを差し替える（ベンチマーク・テスト用）
+
+    Args:
+        cache: ClassificationCache（Noneなら次回 get_cache() で既定のものを作り直す）
+
+    Returns:
+        差し替え前のキャッシュ
+    """
+    global _DEFAULT_CACHE
+    previous = _DEFAULT_CACHE
+    _DEFAULT_CACHE = cache
+    return previous
+
+
+def cached_classify(texts, namespace, version, compute, cache=None):
+    """
+    正規化タイトルのSeriesをキャッシュ経由で分類
+
+    Args:
+        texts: 正規化タイトルのSeries（欠損値なし）
+        namespace: 分類の種類
+        version: classifier_version() の値
+        compute: 未分類タイトルのSeriesを受け取り、結果のリストを返す関数
+        cache: ClassificationCache（Noneならプロセス共通のもの）
+
+    Returns:
+        分類結果のobject配列（textsと同じ順序）
+    """
+    cache = cache if cache is not None else get_cache()
+    codes, uniques = pd.factorize(texts)
+    values = cache.lookup(namespace, version, [str(u) for u in uniques], compute)
+    labels = np.empty(len(values), dtype=object)
+    for i, value in enumerate(values):
+        labels[i] = value
+    return labels[codes]
+
+
+if __name__ == '__main__':
+    import sys
+    import tempfile
+
+    if '--clear' in sys.argv[1:]:
+        get_cache().clear()
+        print("✓ 分類キャッシュを削除しました")
+        sys.exit(0)
+
+    print("✅ 分類キャッシュテスト")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'cache.sqlite')
+        calls = []
+
+        def compute(series):
+            calls.append(list(series))
+            return [len(t) for t in series]
+
+        version = classifier_version({'A': ['X', 'Y']}, 'default')
+        cache = ClassificationCache(path, memory_size=2)
+        texts = pd.Series(['AAA', 'BB', 'AAA', 'C'])
+        assert list(cached_classify(texts, 'len', version, compute, cache)) == [3, 2, 3, 1]
+        assert calls == [['AAA', 'BB', 'C']]
+        print("  ✓ 初回は重複を除いて計算")
+
+        cache2 = ClassificationCache(path)
+        assert list(cached_classify(pd.Series(['C', 'DDDD']), 'len', version, compute, cache2)) == [1, 4]
+        assert calls[-1] == ['DDDD']
+        print("  ✓ 2回目は未分類のタイトルだけ計算（ディスクから再利用）")
+
+        version2 = classifier_version({'A': ['X', 'Y', 'Z']}, 'default')
+        assert version2 != version
+        cached_classify(pd.Series(['C']), 'len', version2, compute, cache2)
+        assert calls[-1] == ['C']
+        print("  ✓ 辞書が変わると再計算")
+
+        # 使われなくなったバージョンの削除（新しいバージョンを初めて使ったときに、古いものだけ）
+        def label_versions(c):
+            return {v for (v,) in c._connect().execute(
+                "SELECT DISTINCT version FROM labels WHERE namespace = 'len'")}
+
+        assert label_versions(cache2) == {version, version2}
+        stale = time.time() - (VERSION_RETENTION_DAYS + 1) * 86400
+        with cache2._connect() as conn:
+            conn.execute('UPDATE versions SET last_used = ? WHERE version = ?', (stale, version))
+        version3 = classifier_version({'A': ['X']}, 'default')
+        cached_classify(pd.Series(['C']), 'len', version3, compute, ClassificationCache(path))
+        assert label_versions(cache2) == {version2, version3}
+        print("  ✓ 新しいバージョンを使うと、長く使われていないバージョンの結果を削除")
+
+        assert cache2.prune('len', version3) == 1 and label_versions(cache2) == {version3}
+        cache2.clear()
+
+    print("\n✅ すべてのテスト成功")
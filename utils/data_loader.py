@@ -0,0 +1,357 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+時計データ共通ローダー
+時計データ_分類済み.csv を型付きの列指向キャッシュに変換し、全スクリプトで共有する
+
+- ブランド/駆動方式/商品状態はcategoryで保持
+- 販売日はdatetimeに変換済み
+- タイトル_upper は事前計算済み
+- キャッシュはCSVのmtime・サイズ・SHA-256をキーに自動で作り直す
+"""
+import hashlib
+import io
+import json
+import os
+import pickle
+
+import pandas as pd
+
+try:
+    import pyarrow  # noqa: F401
+    HAS_PYARROW = True
+except ImportError:
+    HAS_PYARROW = False
+
+
+# 既定のCSVパス（各rebuildスクリプトが参照しているもの）
+DEFAULT_CSV_PATH = '/Users/naokijodan/Desktop/時計データ_分類済み.csv'
+
+# キャッシュ保存先（リポジトリ直下の .cache/）
+CACHE_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), '.cache')
+
+# キャッシュ形式のバージョン（列の作り方を変えたら上げる）
+CACHE_VERSION = 1
+
+# category型で保持する列
+CATEGORICAL_COLUMNS = ['ブランド', '駆動方式', '商品状態']
+
+# プロセス内キャッシュ（同一プロセスで複数回呼ばれた場合はディスクも読まない）
+_MEMORY_CACHE = {}
+
+
+def file_sha256(path, chunk_size=1 << 20):
+    """
+    ファイルのSHA-256を計算
+
+    Args:
+        path: ファイルパス
+        chunk_size: 読み込み単位（バイト）
+
+    Returns:
+        16進数のハッシュ文字列
+    """
+    h = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(chunk_size), b''):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def data_sha256(csv_path=DEFAULT_CSV_PATH):
+    """
+    CSVのSHA-256（データのバージョン）
+
+    型付きキャッシュのメタ情報とmtime・サイズが一致すれば、記録済みのハッシュを返す（再計算しない）
+
+    Args:
+        csv_path: CSVパス
+
+    Returns:
+        16進数のハッシュ文字列
+    """
+    stat = os.stat(csv_path)
+    meta = _read_meta(_cache_paths(csv_path)[2])
+    if meta is not None and meta.get('mtime_ns') == stat.st_mtime_ns and meta.get('size') == stat.st_size:
+        return meta['sha256']
+    return file_sha256(csv_path)
+
+
+def _cache_paths(csv_path):
+    """CSVパスに対応するキャッシュファイルとメタ情報ファイルのパスを返す"""
+    key = hashlib.sha1(os.path.abspath(csv_path).encode('utf-8')).hexdigest()[:16]
+    base = os.path.join(CACHE_DIR, f'watch_data_{key}')
+    return base + '.parquet', base + '.pkl', base + '.meta.json'
+
+
+def build_typed_frame(df):
+    """
+    読み込んだDataFrameに型付けと派生列を適用
+
+    Args:
+        df: pd.read_csv直後のDataFrame
+
+    Returns:
+        型付け済みDataFrame
+    """
+    df = df.copy()
+
+    if 'タイトル' in df.columns and 'タイトル_upper' not in df.columns:
+        df['タイトル_upper'] = df['タイトル'].str.upper()
+
+    if '販売日' in df.columns:
+        df['販売日'] = pd.to_datetime(df['販売日'], errors='coerce')
+
+    for col in CATEGORICAL_COLUMNS:
+        if col in df.columns:
+            df[col] = df[col].astype('category')
+
+    return df
+
+
+def _read_meta(meta_path):
+    """メタ情報を読み込む（存在しない/壊れている場合はNone）"""
+    if not os.path.exists(meta_path):
+        return None
+    try:
+        with open(meta_path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def _write_cache(df, csv_path, stat, sha256):
+    """型付け済みDataFrameをキャッシュに保存"""
+    parquet_path, pickle_path, meta_path = _cache_paths(csv_path)
+    os.makedirs(CACHE_DIR, exist_ok=True)
+
+    fmt = 'pickle'
+    if HAS_PYARROW:
+        try:
+            df.to_parquet(parquet_path, index=False)
+            fmt = 'parquet'
+        except Exception:
+            # 型が混在した列などでArrow変換できない場合はpickleにフォールバック
+            fmt = 'pickle'
+    if fmt == 'pickle':
+        with open(pickle_path, 'wb') as f:
+            pickle.dump(df, f, protocol=pickle.HIGHEST_PROTOCOL)
+
+    meta = {
+        'version': CACHE_VERSION,
+        'csv_path': os.path.abspath(csv_path),
+        'mtime_ns': stat.st_mtime_ns,
+        'size': stat.st_size,
+        'sha256': sha256,
+        'format': fmt,
+        'rows': len(df),
+    }
+    with open(meta_path, 'w', encoding='utf-8') as f:
+        json.dump(meta, f, ensure_ascii=False, indent=2)
+
+
+def _read_cache(csv_path, meta):
+    """キャッシュからDataFrameを読み込む"""
+    parquet_path, pickle_path, _ = _cache_paths(csv_path)
+    if meta['format'] == 'parquet':
+        return pd.read_parquet(parquet_path)
+    with open(pickle_path, 'rb') as f:
+        return pickle.load(f)
+
+
+def _load_typed(csv_path, use_cache=True):
+    """
+    型付け済みDataFrameを取得（キャッシュ有効時はキャッシュ優先）
+
+    mtimeとサイズが一致すればハッシュ計算を省略し、
+    不一致の場合のみSHA-256を比較する（touchされただけのCSVは再パースしない）
+    """
+    stat = os.stat(csv_path)
+    if not use_cache:
+        return build_typed_frame(pd.read_csv(csv_path)), None
+
+    _, _, meta_path = _cache_paths(csv_path)
+    meta = _read_meta(meta_path)
+
+    if meta is not None and meta.get('version') == CACHE_VERSION:
+        if meta['mtime_ns'] == stat.st_mtime_ns and meta['size'] == stat.st_size:
+            try:
+                return _read_cache(csv_path, meta), meta['sha256']
+            except Exception:
+                pass
+        else:
+            sha256 = file_sha256(csv_path)
+            if sha256 == meta['sha256']:
+                try:
+                    df = _read_cache(csv_path, meta)
+                    meta['mtime_ns'] = stat.st_mtime_ns
+                    meta['size'] = stat.st_size
+                    with open(meta_path, 'w', encoding='utf-8') as f:
+                        json.dump(meta, f, ensure_ascii=False, indent=2)
+                    return df, sha256
+                except Exception:
+                    pass
+
+    sha256 = file_sha256(csv_path)
+    df = build_typed_frame(pd.read_csv(csv_path))
+    try:
+        _write_cache(df, csv_path, stat, sha256)
+    except OSError as e:
+        print(f"⚠️ キャッシュ保存に失敗しました（処理は続行）: {e}")
+    return df, sha256
+
+
+def load_watch_data(csv_path=DEFAULT_CSV_PATH, categorical=False, use_cache=True):
+    """
+    時計データを読み込む（pd.read_csvの置き換え）
+
+    Args:
+        csv_path: CSVパス
+        categorical: Trueならブランド/駆動方式/商品状態をcategory型のまま返す
+                     （Falseの場合は従来のread_csvと同じ文字列列に戻す）
+        use_cache: Falseならキャッシュを使わずCSVを直接パース
+
+    Returns:
+        DataFrame（呼び出し側で自由に変更してよいコピー）
+    """
+    csv_path = str(csv_path)
+    stat = os.stat(csv_path)
+    mem_key = (os.path.abspath(csv_path), stat.st_mtime_ns, stat.st_size)
+
+    if use_cache and mem_key in _MEMORY_CACHE:
+        df = _MEMORY_CACHE[mem_key]
+    else:
+        df, _ = _load_typed(csv_path, use_cache=use_cache)
+        if use_cache:
+            _MEMORY_CACHE.clear()
+            _MEMORY_CACHE[mem_key] = df
+
+    df = df.copy()
+    if not categorical:
+        for col in CATEGORICAL_COLUMNS:
+            if col in df.columns and isinstance(df[col].dtype, pd.CategoricalDtype):
+                df[col] = df[col].astype(df[col].cat.categories.dtype)
+    return df
+
+
+def append_rows(csv_path, df, update_cache=True):
+    """
+    CSVの末尾に行を追加し、型付きキャッシュも追加分だけ更新（既存行は再パースしない）
+
+    Args:
+        csv_path: CSVパス
+        df: 追加する行（CSVにない列は無視し、dfにない列は空欄にする）
+        update_cache: Falseならキャッシュを更新しない（チャンクごとに何度も追記する場合、毎回キャッシュ全体を
+                      書き直さないために使う。最後に append_cache_since() で追記分をまとめて反映する）
+
+    Returns:
+        追加前のCSVのサイズ（バイト）。ロールバック時はこの位置で切り詰める
+    """
+    csv_path = str(csv_path)
+    before = os.stat(csv_path)
+    header = list(pd.read_csv(csv_path, nrows=0).columns)
+    text = df.reindex(columns=header).to_csv(index=False, header=False, lineterminator='\n')
+
+    needs_newline = False
+    if before.st_size > 0:
+        with open(csv_path, 'rb') as f:
+            f.seek(-1, os.SEEK_END)
+            needs_newline = f.read(1) != b'\n'
+    with open(csv_path, 'a', encoding='utf-8', newline='') as f:
+        if needs_newline:
+            f.write('\n')
+        f.write(text)
+
+    if not update_cache:
+        return before.st_size
+    try:
+        _append_cache(csv_path, before, header, text)
+    except Exception as e:
+        # 次回の load_watch_data() で全件から作り直される
+        print(f"⚠️ キャッシュの差分更新に失敗しました（処理は続行）: {e}")
+    return before.st_size
+
+
+def append_cache_since(csv_path, before):
+    """
+    追記前のCSV（before）以降に追記された部分だけをパースして型付きキャッシュに連結
+    （append_rows(update_cache=False) で複数回追記した後に1回だけ呼ぶ。既存行は再パースしない）
+
+    Args:
+        csv_path: CSVパス
+        before: 最初の追記前の os.stat(csv_path) の結果
+    """
+    csv_path = str(csv_path)
+    header = list(pd.read_csv(csv_path, nrows=0).columns)
+    with open(csv_path, 'rb') as f:
+        f.seek(before.st_size)
+        text = f.read().decode('utf-8')
+    try:
+        _append_cache(csv_path, before, header, text)
+    except Exception as e:
+        # 次回の load_watch_data() で全件から作り直される
+        print(f"⚠️ キャッシュの差分更新に失敗しました（処理は続行）: {e}")
+
+
+def _append_cache(csv_path, before, header, text):
+    """追加前のCSVに対応するキャッシュがあれば、追加行だけをパースして連結"""
+    _, _, meta_path = _cache_paths(csv_path)
+    meta = _read_meta(meta_path)
+    if (meta is None or meta.get('version') != CACHE_VERSION
+            or meta['mtime_ns'] != before.st_mtime_ns or meta['size'] != before.st_size):
+        return
+
+    added = build_typed_frame(pd.read_csv(io.StringIO(text), header=None, names=header))
+    df = pd.concat([_read_cache(csv_path, meta), added], ignore_index=True)
+    # カテゴリが異なるcategory列は連結で文字列に戻るため、全件読み込み時と同じ型に揃える
+    for col in CATEGORICAL_COLUMNS:
+        if col in df.columns:
+            df[col] = df[col].astype(object).astype('category')
+
+    stat = os.stat(csv_path)
+    _write_cache(df, csv_path, stat, file_sha256(csv_path))
+    _MEMORY_CACHE.clear()
+    _MEMORY_CACHE[(os.path.abspath(csv_path), stat.st_mtime_ns, stat.st_size)] = df
+
+
+def clear_cache(csv_path=None):
+    """
+    キャッシュを削除
+
+    Args:
+        csv_path: 指定した場合はそのCSVのキャッシュのみ削除（Noneなら全削除）
+    """
+    _MEMORY_CACHE.clear()
+    if not os.path.isdir(CACHE_DIR):
+        return
+
+    if csv_path is not None:
+        targets = _cache_paths(csv_path)
+    else:
+        targets = [os.path.join(CACHE_DIR, name) for name in os.listdir(CACHE_DIR)
+                   if name.startswith('watch_data_')]
+
+    for path in targets:
+        if os.path.exists(path):
+            os.remove(path)
+
+
+if __name__ == '__main__':
+    import sys
+    import time
+
+    csv_path = sys.argv[1] if len(sys.argv) > 1 else DEFAULT_CSV_PATH
+
+    print(f"📂 キャッシュ構築: {csv_path}")
+    start = time.perf_counter()
+    df = load_watch_data(csv_path, categorical=True)
+    print(f"  ✓ 1回目: {len(df):,}件 ({time.perf_counter() - start:.3f}秒)")
+
+    _MEMORY_CACHE.clear()
+    start = time.perf_counter()
+    df = load_watch_data(csv_path, categorical=True)
+    print(f"  ✓ キャッシュ読み込み: {len(df):,}件 ({time.perf_counter() - start:.3f}秒)")
+
+    for col in CATEGORICAL_COLUMNS:
+        if col in df.columns:
+            print(f"  - {col}: {df[col].dtype} ({len(df[col].cat.categories)}種類)")
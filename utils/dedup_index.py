@@ -0,0 +1,298 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+重複チェック用のキーインデックス
+既存データの「タイトル + 販売日」を64bitハッシュにしてソート済み配列で保存し、
+新規データの重複を np.searchsorted でまとめて判定する
+
+- 既存CSV全体を読み込んで結合・drop_duplicates する必要がない
+- インデックスは .npy（ハッシュ配列）と .meta.json（キー列・件数・元CSVのサイズとmtime）で保存
+- DedupIndex.for_csv() はCSVごとのインデックスを .cache/dedup/ に保持し、
+  CSVが変わっていればキー列だけを読み直して作り直す
+- ハッシュは pd.util.hash_pandas_object（文字列化した値）で計算するため、
+  判定結果は drop_duplicates(subset=キー列) と同じ（64bitハッシュの衝突を除く）
+"""
+import hashlib
+import json
+import os
+
+import numpy as np
+import pandas as pd
+
+from utils.data_loader import CACHE_DIR
+
+
+# 重複判定に使う列（従来の drop_duplicates(subset=...) と同じ）
+DEDUP_KEY_COLUMNS = ['タイトル', '販売日']
+
+# CSVごとのインデックスの保存先
+INDEX_DIR = os.path.join(CACHE_DIR, 'dedup')
+
+
+def csv_signature(csv_path):
+    """CSVのサイズとmtime（インデックス・集計が最新かどうかの判定用）"""
+    stat = os.stat(csv_path)
+    return {'size': stat.st_size, 'mtime_ns': stat.st_mtime_ns}
+
+
+def _index_path(csv_path):
+    key = hashlib.sha1(os.path.abspath(csv_path).encode('utf-8')).hexdigest()[:16]
+    return os.path.join(INDEX_DIR, f'keys_{key}')
+
+
+def row_fingerprints(df, columns=DEDUP_KEY_COLUMNS):
+    """
+    行ごとのキーのハッシュ
+
+    Args:
+        df: データフレーム（columnsの列を含むこと）
+        columns: キー列
+
+    Returns:
+        uint64の配列（行順）。欠損値は空文字列として扱う
+        （CSVをキー列だけ文字列で読んだ場合と、通常のread_csvの結果で同じ値になる）
+    """
+    keys = df[list(columns)].astype(object).fillna('').astype(str)
+    return pd.util.hash_pandas_object(keys, index=False).to_numpy(dtype=np.uint64)
+
+
+class DedupIndex:
+    """
+    重複チェック用のキーインデックス
+
+    Args:
+        hashes: 登録済みキーのハッシュ（未ソート・重複ありでもよい）
+        columns: キー列
+
+    Attributes:
+        rows: 登録した行数（キーが重複する行も数える。len() はキーの種類数）
+    """
+
+    def __init__(self, hashes=None, columns=DEDUP_KEY_COLUMNS):
+        self.columns = list(columns)
+        if hashes is None:
+            hashes = np.empty(0, dtype=np.uint64)
+        hashes = np.asarray(hashes, dtype=np.uint64)
+        self.rows = len(hashes)
+        self.hashes = np.unique(hashes)
+
+    def __len__(self):
+        return len(self.hashes)
+
+    @classmethod
+    def from_frame(cls, df, columns=DEDUP_KEY_COLUMNS):
+        """データフレームの全行を登録したインデックスを作成"""
+        return cls(row_fingerprints(df, columns), columns)
+
+    @classmethod
+    def from_csv(cls, csv_path, columns=DEDUP_KEY_COLUMNS, chunksize=200_000):
+        """
+        CSVのキー列だけを読み込んでインデックスを作成
+
+        Args:
+            csv_path: CSVパス
+            columns: キー列
+            chunksize: 一度に読み込む行数
+
+        Returns:
+            DedupIndex
+        """
+        parts = [row_fingerprints(chunk, columns)
+                 for chunk in pd.read_csv(csv_path, usecols=list(columns), dtype=str,
+                                          keep_default_na=False, chunksize=chunksize)]
+        return cls(np.concatenate(parts) if parts else None, columns)
+
+    @classmethod
+    def for_csv(cls, csv_path, columns=DEDUP_KEY_COLUMNS):
+        """
+        CSVのインデックスを取得（保存済みで、CSVが変わっていなければ読み込むだけ）
+
+        Args:
+            csv_path: CSVパス
+            columns: キー列
+
+        Returns:
+            DedupIndex
+        """
+        path = _index_path(csv_path)
+        source = csv_signature(csv_path)
+        index = cls.load(path, source=source)
+        if index is None or index.columns != list(columns):
+            index = cls.from_csv(csv_path, columns)
+            index.save(path, source=source)
+        return index
+
+    def save_for_csv(self, csv_path):
+        """
+        CSVのインデックスとして保存（CSVを更新した後に呼ぶ。次回の for_csv() で再利用される）
+
+        Args:
+            csv_path: このインデックスの全キーを含むCSVのパス
+        """
+        self.save(_index_path(csv_path), source=csv_signature(csv_path))
+
+    def contains(self, hashes):
+        """
+        各ハッシュが登録済みかどうか
+
+        Args:
+            hashes: uint64の配列
+
+        Returns:
+            boolの配列
+        """
+        hashes = np.asarray(hashes, dtype=np.uint64)
+        if len(self.hashes) == 0:
+            return np.zeros(len(hashes), dtype=bool)
+        pos = np.searchsorted(self.hashes, hashes)
+        pos[pos == len(self.hashes)] = 0
+        return self.hashes[pos] == hashes
+
+    def split(self, df):
+        """
+        新規データを「新しい行」と「重複」に分ける
+
+        Args:
+            df: 新規データ
+
+        Returns:
+            (新しい行のDataFrame, 既存データとの重複件数, 新規データ内の重複件数)
+            新規データ内で重複する行は最初の1行だけを残す（drop_duplicates(keep='first')と同じ）
+        """
+        hashes = row_fingerprints(df, self.columns)
+        in_history = self.contains(hashes)
+        in_batch = pd.Series(hashes).duplicated(keep='first').to_numpy() & ~in_history
+        keep = ~in_history & ~in_batch
+        return df[keep], int(in_history.sum()), int(in_batch.sum())
+
+    def split_chunks(self, chunks):
+        """
+        チャンクごとに新規データを「新しい行」と「重複」に分ける（新規データ全体を読み込まない）
+
+        新規データ内の重複はチャンクをまたいでも判定する
+        （全チャンクを結合して split() した場合と同じ結果。インデックス自体は変更しない）
+
+        Args:
+            chunks: 新規データのチャンク（pd.read_csv(chunksize=...) の結果など）
+
+        Yields:
+            (新しい行のDataFrame, 既存データとの重複件数, 新規データ内の重複件数)
+        """
+        seen = np.empty(0, dtype=np.uint64)
+        for chunk in chunks:
+            hashes = row_fingerprints(chunk, self.columns)
+            in_history = self.contains(hashes)
+            in_batch = pd.Series(hashes).duplicated(keep='first').to_numpy()
+            if len(seen):
+                in_batch = in_batch | np.isin(hashes, seen)
+            in_batch = in_batch & ~in_history
+            keep = ~in_history & ~in_batch
+            seen = np.union1d(seen, hashes[keep])
+            yield chunk[keep], int(in_history.sum()), int(in_batch.sum())
+
+    def add(self, df):
+        """データフレームの全行のキーを登録"""
+        return self.add_fingerprints(row_fingerprints(df, self.columns))
+
+    def add_fingerprints(self, hashes):
+        """キーのハッシュ（row_fingerprints() の結果）を登録"""
+        self.hashes = np.union1d(self.hashes, hashes)
+        self.rows += len(hashes)
+        return self
+
+    def save(self, path, source=None):
+        """
+        インデックスを保存
+
+        Args:
+            path: 保存先（拡張子なし。path.npy と path.meta.json を作成）
+            source: 元データの情報（csv_signature() の結果など。load() で照合する）
+        """
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        np.save(path + '.npy', self.hashes)
+        meta = {'columns': self.columns, 'keys': len(self.hashes), 'rows': self.rows, 'source': source}
+        with open(path + '.meta.json', 'w', encoding='utf-8') as f:
+            json.dump(meta, f, ensure_ascii=False, indent=2)
+
+    @classmethod
+    def load(cls, path, source=None):
+        """
+        保存したインデックスを読み込む（存在しない/壊れている/元データが異なる場合はNone）
+
+        Args:
+            path: save()に渡したパス
+            source: 指定した場合、save() 時の source と一致するときだけ読み込む
+        """
+        try:
+            with open(path + '.meta.json', 'r', encoding='utf-8') as f:
+                meta = json.load(f)
+            if source is not None and meta.get('source') != source:
+                return None
+            index = cls(columns=meta['columns'])
+            index.hashes = np.load(path + '.npy')
+            index.rows = meta['rows']
+        except (OSError, ValueError, KeyError):
+            return None
+        if len(index.hashes) != meta['keys']:
+            return None
+        return index
+
+
+if __name__ == '__main__':
+    import tempfile
+
+    # 簡易テスト（従来の concat + drop_duplicates と同じ結果になること）
+    rng = np.random.default_rng(0)
+    titles = [f'WATCH {i}' for i in range(300)]
+    dates = ['2025-12-01', '2025-12-02', '2025-12-03']
+
+    def sample(n):
+        return pd.DataFrame({'タイトル': rng.choice(titles, n), '販売日': rng.choice(dates, n),
+                             '価格': rng.gamma(2.0, 150.0, n).round(2)})
+
+    existing = sample(500).drop_duplicates(subset=DEDUP_KEY_COLUMNS)
+    existing.iloc[:2, 1] = None
+    new = sample(200)
+
+    merged = pd.concat([existing, new], ignore_index=True).drop_duplicates(subset=DEDUP_KEY_COLUMNS)
+    expected = merged.iloc[len(existing):]
+
+    index = DedupIndex.from_frame(existing)
+    fresh, dup_history, dup_batch = index.split(new)
+    assert fresh.equals(new.loc[expected.index - len(existing) + new.index[0]])
+    assert dup_history + dup_batch + len(fresh) == len(new)
+
+    # チャンクごとの判定も同じ結果（新規データ内の重複はチャンクをまたいで判定）
+    parts = list(index.split_chunks(new.iloc[i:i + 30] for i in range(0, len(new), 30)))
+    assert pd.concat([p[0] for p in parts]).equals(fresh)
+    assert sum(p[1] for p in parts) == dup_history and sum(p[2] for p in parts) == dup_batch
+
+    # 追加後は全て重複扱い
+    index.add(fresh)
+    assert len(index.split(fresh)[0]) == 0
+
+    # CSVから作成・保存・復元
+    with tempfile.TemporaryDirectory() as tmp:
+        csv_path = os.path.join(tmp, 'data.csv')
+        existing.to_csv(csv_path, index=False)
+        from_csv = DedupIndex.from_csv(csv_path, chunksize=100)
+        assert np.array_equal(from_csv.hashes, DedupIndex.from_frame(pd.read_csv(csv_path)).hashes)
+        assert len(from_csv.split(new)[0]) == len(expected)
+
+        index.save(os.path.join(tmp, 'keys'))
+        restored = DedupIndex.load(os.path.join(tmp, 'keys'))
+        assert np.array_equal(restored.hashes, index.hashes) and restored.rows == index.rows
+        assert from_csv.rows == len(existing)
+        assert DedupIndex.load(os.path.join(tmp, 'missing')) is None
+
+        # CSVごとのインデックス（CSVを変更すると作り直す）
+        index_dir = INDEX_DIR
+        INDEX_DIR = os.path.join(tmp, 'dedup')
+        first = DedupIndex.for_csv(csv_path)
+        assert DedupIndex.load(_index_path(csv_path), source=csv_signature(csv_path)) is not None
+        new.iloc[:5].to_csv(csv_path, mode='a', header=False, index=False)
+        assert DedupIndex.load(_index_path(csv_path), source=csv_signature(csv_path)) is None
+        assert len(DedupIndex.for_csv(csv_path).split(new.iloc[:5])[0]) == 0
+        INDEX_DIR = index_dir
+
+    print("✅ dedup_index テスト完了")
@@ -0,0 +1,287 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+マージ可能なグループ別集計（差分更新用）
+キーごとに「件数・販売数合計・価格の平均と偏差平方和・最小/最大・分位点スケッチ」を保持し、
+追加データの集計を足し込むだけで全体の統計を更新する（元データの再集計は不要）
+
+- 平均・分散は偏差平方和（M2）をChanの並列アルゴリズムでマージ
+  （単純な二乗和より桁落ちに強い）
+- 中央値・分位点は utils.quantile_sketch のスケッチから推定
+- summary() は utils.group_stats.group_stats() と同じ列構成のDataFrameを返す
+"""
+import math
+
+import numpy as np
+import pandas as pd
+
+from utils.group_stats import STAT_COLUMNS
+from utils.quantile_sketch import DEFAULT_ALPHA, QuantileSketch, build_sketches
+
+
+class GroupAggregate:
+    """1グループ分の集計"""
+
+    __slots__ = ('items', 'sales', 'n', 'mean', 'm2', 'sketch')
+
+    def __init__(self, alpha=DEFAULT_ALPHA):
+        self.items = 0
+        self.sales = 0
+        self.n = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+        self.sketch = QuantileSketch(alpha)
+
+    def merge(self, other):
+        """別の集計を取り込む"""
+        self.items += other.items
+        self.sales += other.sales
+        if other.n:
+            n = self.n + other.n
+            delta = other.mean - self.mean
+            self.mean += delta * other.n / n
+            self.m2 += other.m2 + delta * delta * self.n * other.n / n
+            self.n = n
+        self.sketch.merge(other.sketch)
+        return self
+
+    def std(self, ddof=1):
+        """標準偏差（算出できない場合はNaN）"""
+        if self.n - ddof <= 0:
+            return math.nan
+        return math.sqrt(max(self.m2, 0.0) / (self.n - ddof))
+
+    def to_dict(self):
+        return {'items': self.items, 'sales': self.sales, 'n': self.n,
+                'mean': self.mean, 'm2': self.m2, 'sketch': self.sketch.to_dict()}
+
+    @classmethod
+    def from_dict(cls, data):
+        agg = cls()
+        agg.items = data['items']
+        agg.sales = data['sales']
+        agg.n = data['n']
+        agg.mean = data['mean']
+        agg.m2 = data['m2']
+        agg.sketch = QuantileSketch.from_dict(data['sketch'])
+        return agg
+
+
+class DeltaStats:
+    """
+    キーごとのマージ可能な集計
+
+    Args:
+        keys: グループ化する列名のリスト（例: ['ブランド', 'ライン']）
+        value: 統計を取る数値列（既定: 価格）
+        sales: 合計する列（既定: 販売数）
+        alpha: 分位点スケッチの相対誤差
+    """
+
+    def __init__(self, keys, value='価格', sales='販売数', alpha=DEFAULT_ALPHA):
+        self.keys = [keys] if isinstance(keys, str) else list(keys)
+        self.value = value
+        self.sales = sales
+        self.alpha = alpha
+        self.groups = {}
+
+    @classmethod
+    def from_frame(cls, df, keys, value='価格', sales='販売数', alpha=DEFAULT_ALPHA):
+        """
+        データフレームから集計を作成（1回のgroupby）
+
+        Args:
+            df: 集計対象のデータフレーム（キーの列が無い場合は空の集計）
+            keys: グループ化する列名のリスト
+
+        Returns:
+            DeltaStats
+        """
+        stats = cls(keys, value=value, sales=sales, alpha=alpha)
+        if len(df) == 0 or not set(stats.keys) <= set(df.columns):
+            return stats
+
+        grouped = df.groupby(stats.keys, sort=True, observed=True, dropna=True)
+        values = grouped[value]
+        table = pd.DataFrame({
+            'items': grouped.size(),
+            'sales': grouped[sales].sum(),
+            'n': values.count(),
+            'mean': values.mean(),
+            'var': values.var(ddof=0),
+        })
+        codes = grouped.ngroup().fillna(-1).to_numpy(dtype=np.int64)
+        sketches = build_sketches(df[value].to_numpy(dtype=float), codes, len(table), alpha)
+
+        for (key, row), sketch in zip(table.iterrows(), sketches):
+            agg = GroupAggregate(alpha)
+            agg.items = int(row['items'])
+            agg.sales = int(row['sales'])
+            agg.n = int(row['n'])
+            if agg.n:
+                agg.mean = float(row['mean'])
+                agg.m2 = float(row['var']) * agg.n
+            agg.sketch = sketch
+            stats.groups[key if isinstance(key, tuple) else (key,)] = agg
+        return stats
+
+    def merge(self, other):
+        """
+        別の集計（同じキー）を取り込む
+
+        Returns:
+            取り込んだグループのキーのset
+        """
+        if other.keys != self.keys:
+            raise ValueError(f"キーが異なる集計はマージできません: {self.keys} != {other.keys}")
+        for key, agg in other.groups.items():
+            current = self.groups.get(key)
+            if current is None:
+                current = self.groups[key] = GroupAggregate(self.alpha)
+            current.merge(agg)
+        return set(other.groups)
+
+    def update(self, df):
+        """
+        追加データの集計を足し込む
+
+        Args:
+            df: 追加データ
+
+        Returns:
+            更新されたグループのキーのset
+        """
+        return self.merge(DeltaStats.from_frame(df, self.keys, self.value, self.sales, self.alpha))
+
+    def rollup(self, keys):
+        """
+        キーの一部で集計し直す（例: ブランド×ライン -> ブランド）。元データは不要
+
+        Args:
+            keys: self.keys の部分集合
+
+        Returns:
+            DeltaStats
+        """
+        keys = [keys] if isinstance(keys, str) else list(keys)
+        positions = [self.keys.index(k) for k in keys]
+        result = DeltaStats(keys, value=self.value, sales=self.sales, alpha=self.alpha)
+        for key, agg in self.groups.items():
+            sub_key = tuple(key[p] for p in positions)
+            current = result.groups.get(sub_key)
+            if current is None:
+                current = result.groups[sub_key] = GroupAggregate(self.alpha)
+            current.merge(agg)
+        return result
+
+    def summary(self, quantiles=(0.25, 0.75), ddof=1, only=None):
+        """
+        集計結果をDataFrameで返す（utils.group_stats.group_stats と同じ列構成）
+
+        Args:
+            quantiles: 推定する分位点
+            ddof: 標準偏差の自由度
+            only: 対象グループのキーの集合（Noneなら全グループ）
+
+        Returns:
+            キーをインデックスとするDataFrame（median・分位点はスケッチからの推定値）
+        """
+        rows = []
+        index = []
+        for key in sorted(self.groups if only is None else (k for k in only if k in self.groups), key=str):
+            agg = self.groups[key]
+            std = agg.std(ddof)
+            mean = agg.mean if agg.n else math.nan
+            cv = std / mean if agg.n and mean and not math.isnan(std) else 0.0
+            row = [agg.items, agg.sales, mean, agg.sketch.median(), std, cv,
+                   agg.sketch.min if agg.n else math.nan, agg.sketch.max if agg.n else math.nan]
+            row += [agg.sketch.quantile(q) for q in quantiles]
+            rows.append(row)
+            index.append(key)
+
+        columns = STAT_COLUMNS + [f'q{round(q * 100):g}' for q in quantiles]
+        if len(self.keys) == 1:
+            index = pd.Index([k[0] for k in index], name=self.keys[0])
+        else:
+            index = pd.MultiIndex.from_tuples(index, names=self.keys) if index else \
+                pd.MultiIndex.from_arrays([[]] * len(self.keys), names=self.keys)
+        result = pd.DataFrame(rows, index=index, columns=columns)
+        return result.astype({'items': np.int64, 'sales': np.int64})
+
+    def to_dict(self):
+        """JSON保存用のdict"""
+        return {
+            'keys': self.keys,
+            'value': self.value,
+            'sales': self.sales,
+            'alpha': self.alpha,
+            'groups': [{'key': [_json_key(k) for k in key], **agg.to_dict()}
+                       for key, agg in self.groups.items()],
+        }
+
+    @classmethod
+    def from_dict(cls, data):
+        """to_dict()の結果から復元"""
+        stats = cls(data['keys'], value=data['value'], sales=data['sales'], alpha=data['alpha'])
+        for group in data['groups']:
+            stats.groups[tuple(group['key'])] = GroupAggregate.from_dict(group)
+        return stats
+
+
+def _json_key(value):
+    """キーの値をJSONに保存できる型に変換"""
+    if isinstance(value, (np.bool_, bool)):
+        return bool(value)
+    if isinstance(value, np.integer):
+        return int(value)
+    if isinstance(value, np.floating):
+        return float(value)
+    return value
+
+
+if __name__ == '__main__':
+    import json
+
+    from utils.group_stats import group_stats
+
+    # 簡易テスト（全体を一度に集計した結果と、分割して足し込んだ結果が一致すること）
+    rng = np.random.default_rng(0)
+    n = 30000
+    df = pd.DataFrame({
+        'ブランド': rng.choice(['SEIKO', 'CASIO', 'OMEGA'], n),
+        'ライン': rng.choice(['A', 'B', None], n),
+        '価格': rng.gamma(2.0, 150.0, n).round(2),
+        '販売数': rng.integers(1, 4, n),
+    })
+
+    full = DeltaStats.from_frame(df, ['ブランド', 'ライン'])
+    inc = DeltaStats.from_frame(df.iloc[:25000], ['ブランド', 'ライン'])
+    touched = inc.update(df.iloc[25000:])
+    assert touched and set(inc.groups) == set(full.groups)
+
+    exact = group_stats(df, ['ブランド', 'ライン'])
+    approx = inc.summary()
+    assert list(approx.index) == list(exact.index)
+    for column in ['items', 'sales']:
+        assert (approx[column] == exact[column]).all()
+    for column in ['mean', 'std', 'cv', 'min', 'max']:
+        assert np.allclose(approx[column], exact[column])
+    for column in ['median', 'q25', 'q75']:
+        assert (abs(approx[column] - exact[column]) <= exact[column] * 0.02).all()
+
+    # ロールアップ（ブランド×ライン -> ブランド、ラインが欠損の行は元から含まない）
+    brands = inc.rollup('ブランド').summary()
+    expected = group_stats(df[df['ライン'].notna()], 'ブランド')
+    assert (brands['items'] == expected['items']).all()
+    assert np.allclose(brands['std'], expected['std'])
+
+    # 保存・復元
+    restored = DeltaStats.from_dict(json.loads(json.dumps(inc.to_dict())))
+    assert restored.summary().equals(inc.summary())
+
+    # 1件のみのグループ・空のデータ
+    single = DeltaStats.from_frame(df.iloc[:1], 'ブランド').summary()
+    assert single['cv'].iloc[0] == 0 and np.isnan(single['std'].iloc[0])
+    assert len(DeltaStats.from_frame(df.iloc[:0], 'ブランド').summary()) == 0
+
+    print("✅ delta_stats テスト完了")
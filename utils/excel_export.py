@@ -0,0 +1,209 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Excel出力エンジン
+シートのセルをメモリ上で組み立て（SheetBuilder）、書き込み専用のストリーミングバックエンドで
+ブック全体を1回で書き出す
+
+- 見出し行・表ごとに DataFrame.to_excel を呼び、startrow を管理する必要はない
+- バックエンドは xlsxwriter（constant_memory: 行を書いたそばからディスクに出す）。
+  インストールされていなければ openpyxl の write_only モード
+- 表のヘッダー行は DataFrame.to_excel と同じ書式（太字・細罫線・中央揃え）、
+  欠損値は空セル（to_excel の既定の na_rep='' と同じ）
+- SheetBuilder はセル値のリストだけを持つため、シートの組み立てを別プロセスで行える（build_sheets）
+"""
+from concurrent.futures import ProcessPoolExecutor
+
+import pandas as pd
+
+
+class SheetBuilder:
+    """
+    1シート分のセル（行のリスト）
+
+    Args:
+        name: シート名（Excelの制限により31文字まで）
+
+    Attributes:
+        rows: セル値の行のリスト（None・空文字列は空セル）
+        header_rows: 表のヘッダー行の行番号（0始まり）
+    """
+
+    def __init__(self, name):
+        self.name = name[:31]
+        self.rows = []
+        self.header_rows = set()
+
+    def add_title(self, text, width=1):
+        """
+        見出し行を追加（従来の pd.DataFrame([[text, '', ...]]).to_excel(header=False) と同じ位置）
+
+        Args:
+            text: 見出し
+            width: 見出し行の列数（2列目以降は空セル）
+        """
+        self.rows.append([text] + [''] * (width - 1))
+        return self
+
+    def add_table(self, df, gap=1):
+        """
+        表（ヘッダー行 + データ行）を追加
+
+        Args:
+            df: 表のDataFrame（インデックスは出力しない）
+            gap: 表の後に空ける行数
+        """
+        self.header_rows.add(len(self.rows))
+        self.rows.append([str(col) for col in df.columns])
+        if len(df):
+            values = df.astype(object).where(df.notna(), None)
+            self.rows.extend(values.to_numpy().tolist())
+        self.add_blank(gap)
+        return self
+
+    def add_blank(self, count=1):
+        """空行を追加"""
+        self.rows.extend([] for _ in range(count))
+        return self
+
+
+def build_sheets(build, jobs, workers=1):
+    """
+    シートを組み立てる（workers > 1 ならジョブごとに別プロセスで実行）
+
+    Args:
+        build: SheetBuilderを返す関数（モジュールの最上位で定義したもの）
+        jobs: build に渡す引数のタプルのリスト
+        workers: 並列実行するプロセス数
+
+    Returns:
+        build の結果のリスト（jobsの順）
+    """
+    if workers > 1 and len(jobs) > 1:
+        with ProcessPoolExecutor(max_workers=min(workers, len(jobs))) as pool:
+            return list(pool.map(build, *zip(*jobs)))
+    return [build(*job) for job in jobs]
+
+
+def _is_blank(value):
+    return value is None or (isinstance(value, str) and value == '')
+
+
+def _write_xlsxwriter(path, sheets, xlsxwriter):
+    workbook = xlsxwriter.Workbook(path, {
+        'constant_memory': True,
+        'strings_to_urls': False,
+        'strings_to_formulas': False,
+        'nan_inf_to_errors': True,
+    })
+    header_format = workbook.add_format({'bold': True, 'border': 1, 'align': 'center', 'valign': 'top'})
+    for sheet in sheets:
+        worksheet = workbook.add_worksheet(sheet.name)
+        for r, row in enumerate(sheet.rows):
+            cell_format = header_format if r in sheet.header_rows else None
+            for c, value in enumerate(row):
+                if not _is_blank(value):
+                    worksheet.write(r, c, value, cell_format)
+    workbook.close()
+
+
+def _write_openpyxl(path, sheets):
+    from openpyxl import Workbook
+    from openpyxl.cell import WriteOnlyCell
+    from openpyxl.styles import Alignment, Border, Font, Side
+
+    workbook = Workbook(write_only=True)
+    thin = Side(style='thin')
+    font = Font(bold=True)
+    border = Border(left=thin, right=thin, top=thin, bottom=thin)
+    alignment = Alignment(horizontal='center', vertical='top')
+    for sheet in sheets:
+        worksheet = workbook.create_sheet(sheet.name)
+        for r, row in enumerate(sheet.rows):
+            if r in sheet.header_rows:
+                cells = []
+                for value in row:
+                    cell = WriteOnlyCell(worksheet, value=None if _is_blank(value) else value)
+                    cell.font, cell.border, cell.alignment = font, border, alignment
+                    cells.append(cell)
+                worksheet.append(cells)
+            else:
+                worksheet.append([None if _is_blank(value) else value for value in row])
+    workbook.save(path)
+
+
+def write_workbook(path, sheets, engine=None):
+    """
+    シートをまとめてExcelファイルに書き出す
+
+    Args:
+        path: 出力先（.xlsx）
+        sheets: SheetBuilderのリスト（この順にシートを作成）
+        engine: 'xlsxwriter' / 'openpyxl'（Noneなら xlsxwriter があればそれを使う）
+
+    Returns:
+        使ったバックエンド名
+    """
+    if engine in (None, 'xlsxwriter'):
+        try:
+            import xlsxwriter
+        except ImportError:
+            if engine == 'xlsxwriter':
+                raise
+        else:
+            _write_xlsxwriter(path, sheets, xlsxwriter)
+            return 'xlsxwriter'
+    _write_openpyxl(path, sheets)
+    return 'openpyxl'
+
+
+if __name__ == '__main__':
+    import os
+    import tempfile
+
+    import numpy as np
+
+    print("✅ Excel出力エンジンテスト")
+
+    table = pd.DataFrame({'型番': ['A100', 'B200', None], '販売数': np.array([3, 2, 1]),
+                          '中央値': [100.5, np.nan, 80.0], 'フラグ': [True, False, True]})
+    sheet = SheetBuilder('x' * 40)
+    sheet.add_table(pd.DataFrame({'項目': ['出品数'], '値': ['3 件']}))
+    sheet.add_title('Top30人気モデル（型番別）', 4)
+    sheet.add_table(table)
+    sheet.add_title('空の表', 2)
+    sheet.add_table(table.iloc[:0])
+    assert sheet.name == 'x' * 31
+    assert sheet.header_rows == {0, 4, 10}
+    assert sheet.rows[5] == ['A100', 3, 100.5, True] and sheet.rows[6][2] is None and sheet.rows[7][0] is None
+    assert type(sheet.rows[5][1]) is int
+
+    # 従来の to_excel（startrow を手で管理）と同じセル配置・値になること
+    with tempfile.TemporaryDirectory() as tmp:
+        expected_path = os.path.join(tmp, 'expected.xlsx')
+        with pd.ExcelWriter(expected_path, engine='openpyxl') as writer:
+            pd.DataFrame({'項目': ['出品数'], '値': ['3 件']}).to_excel(writer, sheet_name=sheet.name, index=False)
+            pd.DataFrame([['Top30人気モデル（型番別）', '', '', '']]).to_excel(
+                writer, sheet_name=sheet.name, startrow=3, index=False, header=False)
+            table.to_excel(writer, sheet_name=sheet.name, startrow=4, index=False)
+            pd.DataFrame([['空の表', '']]).to_excel(writer, sheet_name=sheet.name, startrow=9, index=False, header=False)
+            table.iloc[:0].to_excel(writer, sheet_name=sheet.name, startrow=10, index=False)
+        expected = pd.read_excel(expected_path, sheet_name=None, header=None)
+
+        for engine in ('xlsxwriter', 'openpyxl'):
+            try:
+                path = os.path.join(tmp, f'{engine}.xlsx')
+                write_workbook(path, [sheet, SheetBuilder('B').add_title('見出し')], engine=engine)
+            except ImportError:
+                print(f"  - {engine}: 未インストールのためスキップ")
+                continue
+            actual = pd.read_excel(path, sheet_name=None, header=None)
+            assert list(actual) == [sheet.name, 'B']
+            assert actual[sheet.name].equals(expected[sheet.name])
+
+            from openpyxl import load_workbook
+            cell = load_workbook(path)[sheet.name]['B5']
+            assert cell.value == '販売数' and cell.font.bold and cell.border.left.style == 'thin'
+            print(f"  ✓ {engine}")
+
+    print("✅ Excel出力エンジンテスト完了")
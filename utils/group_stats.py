@@ -0,0 +1,328 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+グループ別統計エンジン
+ブランド・ライン・型番などの任意のキーで、出品数・販売数合計・平均・中央値・
+標準偏差・CV・最小/最大・分位点を1回のgroupbyでまとめて集計する
+
+従来の「グループごとに brand_df[brand_df['ライン'] == line] で再抽出して計算」
+（グループ数 × 行数）を置き換える。キーの因数分解は1回だけ行い、
+各統計はpandasの集計関数で全グループ同時に計算する
+
+GroupStats は同じデータフレームに対する集計結果をキーごとに保持するため、
+タブ・Excelシート・JSON出力で同じ集計を使い回せる
+
+中央値・分位点は utils.quantile_sketch.QUANTILE_MODE に従い、
+既定では全件ソートの正確な値（mode='sketch' でグループごとの分位点スケッチからの推定値）
+"""
+import numpy as np
+import pandas as pd
+
+from utils.quantile_sketch import DEFAULT_ALPHA, build_sketches, resolve_mode
+
+
+# 既定で計算する分位点
+DEFAULT_QUANTILES = (0.25, 0.75)
+
+# 集計結果の列（分位点列 q25, q75 などと first_<列名> はこの後ろに付く）
+STAT_COLUMNS = ['items', 'sales', 'mean', 'median', 'std', 'cv', 'min', 'max']
+
+
+def _quantile_column(q):
+    """分位点の列名（0.25 -> 'q25'）"""
+    return f'q{round(q * 100):g}'
+
+
+def group_stats(df, keys, value='価格', sales='販売数', quantiles=DEFAULT_QUANTILES,
+                ddof=1, first=(), mode=None):
+    """
+    キーごとの統計を1回のgroupbyで計算
+
+    Args:
+        df: 集計対象のデータフレーム
+        keys: グループ化する列名（文字列またはリスト）
+        value: 統計を取る数値列（既定: 価格）
+        sales: 合計する列（既定: 販売数）
+        quantiles: 計算する分位点のタプル
+        ddof: 標準偏差の自由度（1: 標本標準偏差、0: 母標準偏差）
+        first: グループ内の先頭値を取る列（例: ('タイトル',) -> first_タイトル 列）
+        mode: 中央値・分位点の計算方法（'sketch' / 'exact'、Noneなら QUANTILE_MODE）
+
+    Returns:
+        キーをインデックスとするDataFrame
+        （items: 行数, sales: 販売数合計, mean/median/std/min/max: value列の統計,
+         cv: std / mean（算出できない場合は0）, q25/q75...: 分位点）
+        キーが欠損値の行は集計しない。グループの順序はキーの昇順
+    """
+    keys = [keys] if isinstance(keys, str) else list(keys)
+    grouped = df.groupby(keys, sort=True, observed=True, dropna=True)
+    values = grouped[value]
+    exact = resolve_mode(mode) == 'exact'
+
+    result = pd.DataFrame({
+        'items': grouped.size(),
+        'sales': grouped[sales].sum(),
+        'mean': values.mean(),
+        'median': values.median() if exact else np.nan,
+        'std': values.std(ddof=ddof),
+        'min': values.min(),
+        'max': values.max(),
+    })
+
+    # CV（1件のみ・平均0のグループは0）
+    mean = result['mean'].to_numpy(dtype=float)
+    std = result['std'].to_numpy(dtype=float)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        cv = std / mean
+    cv[~np.isfinite(cv)] = 0.0
+    result.insert(STAT_COLUMNS.index('cv'), 'cv', cv)
+
+    if exact:
+        if quantiles:
+            q_table = values.quantile(list(quantiles)).unstack(level=-1).reindex(columns=list(quantiles))
+            for q in quantiles:
+                result[_quantile_column(q)] = q_table[q]
+    else:
+        sketches = _build_group_sketches(df, grouped, value, len(result))
+        result['median'] = [sketch.median() for sketch in sketches]
+        for q in quantiles:
+            result[_quantile_column(q)] = [sketch.quantile(q) for sketch in sketches]
+
+    for column in first:
+        result[f'first_{column}'] = grouped[column].first()
+
+    return result
+
+
+def _build_group_sketches(df, grouped, value, n_groups, alpha=DEFAULT_ALPHA):
+    # キーが欠損の行は ngroup() がNaNになるため -1（集計しない）にする
+    codes = grouped.ngroup().fillna(-1).to_numpy(dtype=np.int64)
+    return build_sketches(df[value].to_numpy(dtype=float), codes, n_groups, alpha)
+
+
+def group_sketches(df, keys, value='価格', alpha=DEFAULT_ALPHA):
+    """
+    キーごとの分位点スケッチ（保存・マージ用）
+
+    Args:
+        df: 集計対象のデータフレーム
+        keys: グループ化する列名（文字列またはリスト）
+        value: スケッチを作る数値列（既定: 価格）
+        alpha: スケッチの相対誤差
+
+    Returns:
+        キーをインデックスとするQuantileSketchのSeries（group_stats()と同じ順序）
+    """
+    keys = [keys] if isinstance(keys, str) else list(keys)
+    grouped = df.groupby(keys, sort=True, observed=True, dropna=True)
+    index = grouped.size().index
+    return pd.Series(_build_group_sketches(df, grouped, value, len(index), alpha), index=index, dtype=object)
+
+
+class GroupStats:
+    """
+    1つのデータフレームに対するグループ別統計のキャッシュ
+
+    同じキー・オプションでの集計は2回目以降、保持している結果を返す
+    （元のデータフレームを変更した場合は新しいGroupStatsを作ること）
+
+    Args:
+        df: 集計対象のデータフレーム
+        value: 統計を取る数値列（既定: 価格）
+        sales: 合計する列（既定: 販売数）
+        ddof: 標準偏差の自由度（1: 標本標準偏差、0: 母標準偏差）
+        mode: 中央値・分位点の計算方法（'sketch' / 'exact'、Noneなら QUANTILE_MODE）
+    """
+
+    def __init__(self, df, value='価格', sales='販売数', ddof=1, mode=None):
+        self.df = df
+        self.value = value
+        self.sales = sales
+        self.ddof = ddof
+        self.mode = resolve_mode(mode)
+        self._results = {}
+
+    def by(self, keys, quantiles=DEFAULT_QUANTILES, first=()):
+        """
+        キーごとの統計（group_stats()の結果をキャッシュ）
+
+        Args:
+            keys: グループ化する列名（文字列またはリスト）
+            quantiles: 計算する分位点のタプル
+            first: グループ内の先頭値を取る列
+
+        Returns:
+            キーをインデックスとするDataFrame（呼び出し側で変更しないこと）
+        """
+        key_tuple = (keys,) if isinstance(keys, str) else tuple(keys)
+        cache_key = (key_tuple, tuple(quantiles), tuple(first))
+        result = self._results.get(cache_key)
+        if result is None:
+            result = group_stats(self.df, list(key_tuple), value=self.value, sales=self.sales,
+                                 quantiles=quantiles, ddof=self.ddof, first=first, mode=self.mode)
+            self._results[cache_key] = result
+        return result
+
+    def within(self, keys, outer, first=()):
+        """
+        複合キーの集計を外側キーの値ごとに分割
+
+        Args:
+            keys: グループ化する列名のリスト（先頭が外側キー。例: ['ライン', '型番']）
+            outer: 外側キーの値
+            first: グループ内の先頭値を取る列
+
+        Returns:
+            外側キーを除いたインデックスのDataFrame（該当なしは空のDataFrame）
+        """
+        return split_outer(self.by(keys, first=first), outer)
+
+    def total(self, quantiles=DEFAULT_QUANTILES):
+        """
+        データフレーム全体の統計
+
+        Returns:
+            group_stats()と同じ項目のdict
+        """
+        cache_key = ((), tuple(quantiles), ())
+        result = self._results.get(cache_key)
+        if result is None:
+            ones = pd.Series(0, index=self.df.index, name='_all')
+            frame = self.df[[self.value, self.sales]].assign(_all=ones)
+            result = group_stats(frame, '_all', value=self.value, sales=self.sales,
+                                 quantiles=quantiles, ddof=self.ddof, mode=self.mode)
+            self._results[cache_key] = result
+        if len(result) == 0:
+            return {column: 0 for column in result.columns}
+        return result.iloc[0].to_dict()
+
+
+def split_outer(table, outer):
+    """
+    複合キーの集計結果（group_stats() の結果）から外側キーの値の行を取り出す
+
+    Args:
+        table: 複合キーをインデックスとする集計結果
+        outer: 外側キー（インデックスの1段目）の値
+
+    Returns:
+        外側キーを除いたインデックスのDataFrame（該当なしは空のDataFrame）
+    """
+    if outer not in table.index.get_level_values(0):
+        return table.iloc[0:0].droplevel(0)
+    return table.xs(outer, level=0, drop_level=True)
+
+
+def compare_quantile_modes(df, keys, value='価格', quantiles=DEFAULT_QUANTILES):
+    """
+    スケッチでの推定値と正確な値を比較（検証用）
+
+    Args:
+        df: 集計対象のデータフレーム
+        keys: グループ化する列名（文字列またはリスト）
+        value: 数値列
+        quantiles: 比較する分位点（中央値は常に比較）
+
+    Returns:
+        キーをインデックスとし、median・分位点の列ごとの相対誤差（|推定 - 正確| / |正確|）と
+        items列を持つDataFrame
+    """
+    exact = group_stats(df, keys, value=value, quantiles=quantiles, mode='exact')
+    approx = group_stats(df, keys, value=value, quantiles=quantiles, mode='sketch')
+    columns = ['median'] + [_quantile_column(q) for q in quantiles]
+    with np.errstate(divide='ignore', invalid='ignore'):
+        errors = (approx[columns] - exact[columns]).abs() / exact[columns].abs()
+    errors = errors.where(exact[columns] != 0, (approx[columns] - exact[columns]).abs())
+    errors.insert(0, 'items', exact['items'])
+    return errors
+
+
+def stat_record(row, extra=None):
+    """
+    集計結果の1行をJSON出力用のdictに変換
+
+    Args:
+        row: group_stats()の結果の1行（Series）
+        extra: 追加する項目のdict
+
+    Returns:
+        {'count': 販売数合計, 'items': 行数, 'median', 'mean', 'cv', 'min', 'max'}
+    """
+    record = {
+        'count': int(row['sales']),
+        'items': int(row['items']),
+        'median': float(row['median']),
+        'mean': float(row['mean']),
+        'cv': float(row['cv']),
+        'min': float(row['min']),
+        'max': float(row['max']),
+    }
+    if extra:
+        record.update(extra)
+    return record
+
+
+if __name__ == '__main__':
+    # 簡易テスト（グループごとに再抽出する従来の計算と一致すること）
+    rng = np.random.default_rng(0)
+    n = 5000
+    df = pd.DataFrame({
+        'ライン': rng.choice(['A', 'B', 'C', 'D'], n),
+        '型番': rng.choice(['M1', 'M2', 'M3', None], n),
+        '価格': rng.gamma(2.0, 150.0, n).round(2),
+        '販売数': rng.integers(1, 4, n),
+        'タイトル': [f't{i}' for i in range(n)],
+    })
+    df.loc[df.index[:3], 'ライン'] = 'solo'
+    df.loc[df.index[0], 'ライン'] = 'single'
+
+    stats = GroupStats(df, mode='exact')
+    lines = stats.by('ライン')
+    for line, row in lines.iterrows():
+        prices = df[df['ライン'] == line]['価格'].to_numpy()
+        assert row['items'] == len(prices)
+        assert row['sales'] == df[df['ライン'] == line]['販売数'].sum()
+        assert np.isclose(row['median'], np.median(prices))
+        assert np.isclose(row['min'], prices.min()) and np.isclose(row['max'], prices.max())
+        assert np.isclose(row['q25'], np.quantile(prices, 0.25))
+        expected_cv = np.std(prices, ddof=1) / np.mean(prices) if len(prices) >= 2 else 0
+        assert np.isclose(row['cv'], expected_cv)
+    assert lines.loc['single', 'cv'] == 0
+    assert stats.by('ライン') is lines
+
+    # 複合キー（型番が欠損の行は除外）
+    pairs = stats.by(['ライン', '型番'], first=('タイトル',))
+    assert pairs['items'].sum() == df['型番'].notna().sum()
+    b_models = stats.within(['ライン', '型番'], 'B')
+    sub = df[(df['ライン'] == 'B') & (df['型番'] == 'M2')]
+    assert b_models.loc['M2', 'items'] == len(sub)
+    assert np.isclose(b_models.loc['M2', 'cv'], np.std(sub['価格'], ddof=1) / np.mean(sub['価格']))
+    assert len(stats.within(['ライン', '型番'], 'missing')) == 0
+
+    # 母標準偏差・全体統計
+    pop = GroupStats(df, ddof=0, mode='exact')
+    prices = df['価格'].to_numpy()
+    assert np.isclose(pop.total()['cv'], np.std(prices) / np.mean(prices))
+    assert pop.by('ライン').loc['single', 'cv'] == 0
+    assert stat_record(lines.loc['A'])['items'] == (df['ライン'] == 'A').sum()
+
+    # カテゴリ型のキー（未出現のカテゴリは含まない）
+    cat = df.assign(ライン=df['ライン'].astype(pd.CategoricalDtype(['A', 'B', 'C', 'D', 'solo', 'single', 'Z'])))
+    assert 'Z' not in group_stats(cat, 'ライン').index
+
+    # 全行のキーが欠損（空の結果）
+    for mode in ('exact', 'sketch'):
+        empty = group_stats(df.assign(型番=None), '型番', mode=mode)
+        assert len(empty) == 0 and list(empty.columns)[:len(STAT_COLUMNS)] == STAT_COLUMNS
+
+    # スケッチでの推定（中央値・分位点以外は正確な値と同じ、中央値・分位点は相対誤差2%以内）
+    approx = group_stats(df, ['ライン', '型番'], mode='sketch')
+    exact = pairs.drop(columns='first_タイトル')
+    assert approx.drop(columns=['median', 'q25', 'q75']).equals(exact.drop(columns=['median', 'q25', 'q75']))
+    for column in ['median', 'q25', 'q75']:
+        assert (abs(approx[column] - exact[column]) <= exact[column] * 0.02).all()
+    sketches = group_sketches(df, ['ライン', '型番'])
+    assert list(sketches.index) == list(approx.index)
+    assert sketches.iloc[0].median() == approx['median'].iloc[0]
+
+    print("✅ group_stats テスト完了")
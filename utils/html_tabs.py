@@ -0,0 +1,318 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+index.html タブ操作ユーティリティ
+tab-content div の位置特定・置換・挿入を共通化
+
+- find_tab_position / replace_tab / insert_tab_after: 1タブだけ操作する場合
+- TabDocument: index.htmlを1回だけ走査して全タブ・</style>・</body> の位置を記録し、
+  複数の置換・挿入をまとめて1回の文字列再構築で適用する場合
+"""
+import re
+
+
+# 1回の走査で拾うトークン（divの開閉・styleの開閉・bodyの終了）
+_TOKEN_RE = re.compile(r'<div|</div>|<style|</style>|</body>')
+
+# tab-content div の開始タグ
+_TAB_START_RE = re.compile(r'<div id="([^"]*)" class="tab-content">')
+
+
+def tab_start_tag(tab_id):
+    """タブ開始タグを返す"""
+    return f'<div id="{tab_id}" class="tab-content">'
+
+
+def find_tab_position(html, tab_id):
+    """
+    タブ位置をネストカウントで特定
+
+    Args:
+        html: index.htmlの文字列
+        tab_id: タブのid（例: "SEIKO", "automatic"）
+
+    Returns:
+        (開始位置, 終了位置) のタプル（終了位置は</div>の直後）
+
+    Raises:
+        ValueError: タブまたは閉じタグが見つからない場合
+    """
+    start_tag = tab_start_tag(tab_id)
+    tab_start = html.find(start_tag)
+
+    if tab_start == -1:
+        raise ValueError(f"{tab_id}タブが見つかりません")
+
+    div_count = 1
+    search_pos = tab_start + len(start_tag)
+
+    while div_count > 0 and search_pos < len(html):
+        next_open = html.find('<div', search_pos)
+        next_close = html.find('</div>', search_pos)
+
+        if next_close == -1:
+            break
+
+        if next_open != -1 and next_open < next_close:
+            div_count += 1
+            search_pos = next_open + 4
+        else:
+            div_count -= 1
+            if div_count == 0:
+                return (tab_start, next_close + 6)
+            search_pos = next_close + 6
+
+    raise ValueError(f"{tab_id}タブの閉じタグが見つかりません")
+
+
+def has_tab(html, tab_id):
+    """タブが存在するか"""
+    return tab_start_tag(tab_id) in html
+
+
+def replace_tab(html, tab_id, new_tab_html):
+    """
+    既存タブを置換
+
+    Args:
+        html: index.htmlの文字列
+        tab_id: 置換するタブのid
+        new_tab_html: 新しいタブHTML
+
+    Returns:
+        置換後のHTML文字列
+    """
+    start_pos, end_pos = find_tab_position(html, tab_id)
+    return html[:start_pos] + new_tab_html + html[end_pos:]
+
+
+def insert_tab_after(html, anchor_tab_id, new_tab_html):
+    """
+    指定タブの直後に新しいタブを挿入
+
+    Args:
+        html: index.htmlの文字列
+        anchor_tab_id: 挿入位置の基準となるタブのid
+        new_tab_html: 挿入するタブHTML
+
+    Returns:
+        挿入後のHTML文字列
+    """
+    _, end_pos = find_tab_position(html, anchor_tab_id)
+    return html[:end_pos] + new_tab_html + html[end_pos:]
+
+
+class TabDocument:
+    """
+    index.htmlの文書モデル（1回走査 + 一括編集）
+
+    生成時に1回だけ走査し、各tab-content divの (開始位置, 終了位置)、
+    <style>ブロックの位置、最後の</body>の位置を記録する。
+    replace_tab などの編集は記録するだけで、render() で元の位置を基準に
+    まとめて適用する（各操作ごとに文字列を作り直さない）。
+
+    Args:
+        html: index.htmlの文字列
+    """
+
+    def __init__(self, html):
+        self.html = html
+        self.tabs = {}
+        self.style_ranges = []
+        self.body_end = -1
+        self._ops = []
+        self._inserted_tabs = {}
+        self._scan()
+
+    @classmethod
+    def from_file(cls, path):
+        """ファイルから読み込む"""
+        with open(path, 'r', encoding='utf-8') as f:
+            return cls(f.read())
+
+    def _scan(self):
+        """div・style・bodyの位置を1回の走査で記録"""
+        html = self.html
+        stack = []          # 開いているdivのタブid（tab-content以外はNone）
+        open_tabs = {}      # タブid -> 開始位置（閉じタグ待ち）
+        style_start = None
+
+        for m in _TOKEN_RE.finditer(html):
+            token = m.group()
+            pos = m.start()
+
+            if token == '<div':
+                tab_match = _TAB_START_RE.match(html, pos)
+                tab_id = None
+                if tab_match:
+                    tab_id = tab_match.group(1)
+                    # 同じidが複数ある場合は最初のもの（str.findと同じ）
+                    if tab_id in self.tabs or tab_id in open_tabs:
+                        tab_id = None
+                    else:
+                        open_tabs[tab_id] = pos
+                stack.append(tab_id)
+            elif token == '</div>':
+                if stack:
+                    tab_id = stack.pop()
+                    if tab_id is not None:
+                        self.tabs[tab_id] = (open_tabs.pop(tab_id), m.end())
+            elif token == '<style':
+                style_start = pos
+            elif token == '</style>':
+                self.style_ranges.append((style_start, pos))
+                style_start = None
+            else:
+                self.body_end = pos
+
+        # 閉じタグが見つからないタブ（find_tab_positionと同様にエラー扱い）
+        self._unclosed_tabs = set(open_tabs)
+
+    # ------------------------------------------------------------
+    # 参照
+    # ------------------------------------------------------------
+    def has_tab(self, tab_id):
+        """タブが存在するか（このドキュメントで挿入予定のタブも含む）"""
+        return tab_id in self.tabs or tab_id in self._unclosed_tabs or tab_id in self._inserted_tabs
+
+    def tab_span(self, tab_id):
+        """
+        タブの位置を返す
+
+        Returns:
+            (開始位置, 終了位置) のタプル（終了位置は</div>の直後）
+
+        Raises:
+            ValueError: タブまたは閉じタグが見つからない場合
+        """
+        if tab_id in self.tabs:
+            return self.tabs[tab_id]
+        if tab_id in self._unclosed_tabs:
+            raise ValueError(f"{tab_id}タブの閉じタグが見つかりません")
+        raise ValueError(f"{tab_id}タブが見つかりません")
+
+    def tab_html(self, tab_id):
+        """タブのHTML（編集前）を返す"""
+        start, end = self.tab_span(tab_id)
+        return self.html[start:end]
+
+    @property
+    def style_end(self):
+        """最初の</style>の位置（なければ-1）"""
+        return self.style_ranges[0][1] if self.style_ranges else -1
+
+    # ------------------------------------------------------------
+    # 編集（render()でまとめて適用）
+    # ------------------------------------------------------------
+    def replace_range(self, start, end, text):
+        """元のHTMLの [start, end) をtextに置き換える"""
+        self._ops.append((start, end, len(self._ops), text))
+
+    def insert(self, pos, text):
+        """元のHTMLのposにtextを挿入（同じ位置への挿入は登録順）"""
+        self.replace_range(pos, pos, text)
+
+    def replace_tab(self, tab_id, new_tab_html):
+        """既存タブを置換"""
+        start, end = self.tab_span(tab_id)
+        self.replace_range(start, end, new_tab_html)
+
+    def remove_tab(self, tab_id):
+        """既存タブを削除"""
+        self.replace_tab(tab_id, '')
+
+    def insert_tab_after(self, anchor_tab_id, new_tab_html, tab_id=None):
+        """
+        指定タブの直後に新しいタブを挿入
+
+        Args:
+            anchor_tab_id: 基準タブのid（このドキュメントで挿入予定のタブも指定可）
+            new_tab_html: 挿入するHTML
+            tab_id: 挿入するタブのid（指定すると後続の挿入の基準にできる）
+        """
+        if anchor_tab_id in self._inserted_tabs:
+            pos = self._inserted_tabs[anchor_tab_id]
+        else:
+            _, pos = self.tab_span(anchor_tab_id)
+        self.insert(pos, new_tab_html)
+        if tab_id is not None:
+            self._inserted_tabs[tab_id] = pos
+
+    def insert_before_style_end(self, css):
+        """最初の</style>の直前にCSSを挿入（</style>がなければFalse）"""
+        if self.style_end == -1:
+            return False
+        self.insert(self.style_end, css)
+        return True
+
+    def insert_before_body_end(self, text):
+        """最後の</body>の直前に挿入（</body>がなければFalse）"""
+        if self.body_end == -1:
+            return False
+        self.insert(self.body_end, text)
+        return True
+
+    @property
+    def changed(self):
+        """未適用の編集があるか"""
+        return bool(self._ops)
+
+    def render(self):
+        """
+        記録した編集をまとめて適用したHTMLを返す（1回の文字列再構築）
+
+        Raises:
+            ValueError: 編集範囲が重なっている場合
+        """
+        parts = []
+        cursor = 0
+        for start, end, _, text in sorted(self._ops):
+            if start < cursor:
+                raise ValueError(f"編集範囲が重なっています: {start}-{end}")
+            parts.append(self.html[cursor:start])
+            parts.append(text)
+            cursor = end
+        parts.append(self.html[cursor:])
+        return ''.join(parts)
+
+    def save(self, path):
+        """編集を適用して保存し、保存したHTMLを返す"""
+        html = self.render()
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write(html)
+        return html
+
+
+if __name__ == '__main__':
+    print("✅ タブ操作ユーティリティテスト")
+
+    sample = ('<body><div id="A" class="tab-content"><div>x</div></div>'
+              '<div id="B" class="tab-content">b</div></body>')
+
+    assert find_tab_position(sample, 'A') == (6, 56)
+    print("  ✓ find_tab_position")
+
+    replaced = replace_tab(sample, 'B', '<div id="B" class="tab-content">new</div>')
+    assert '>new</div>' in replaced and '>b</div>' not in replaced
+    print("  ✓ replace_tab")
+
+    inserted = insert_tab_after(sample, 'A', '<div id="C" class="tab-content">c</div>')
+    assert inserted.index('id="C"') < inserted.index('id="B"')
+    print("  ✓ insert_tab_after")
+
+    doc = TabDocument('<style>a{}</style>' + sample)
+    assert doc.tab_span('A') == find_tab_position(doc.html, 'A')
+    assert doc.tab_span('B') == find_tab_position(doc.html, 'B')
+    doc.replace_tab('A', '<div id="A" class="tab-content">a</div>')
+    doc.insert_tab_after('B', '<div id="C" class="tab-content">c</div>', tab_id='C')
+    doc.insert_tab_after('C', '<div id="D" class="tab-content">d</div>')
+    doc.insert_before_style_end('b{}')
+    doc.insert_before_body_end('<script></script>')
+    expected = replace_tab(doc.html, 'A', '<div id="A" class="tab-content">a</div>')
+    expected = insert_tab_after(expected, 'B', '<div id="C" class="tab-content">c</div>')
+    expected = insert_tab_after(expected, 'C', '<div id="D" class="tab-content">d</div>')
+    expected = expected.replace('</style>', 'b{}</style>').replace('</body>', '<script></script></body>')
+    assert doc.render() == expected
+    print("  ✓ TabDocument（一括適用が逐次適用と一致）")
+
+    print("\n✅ すべてのテスト成功")
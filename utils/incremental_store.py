@@ -0,0 +1,355 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+追加データの差分集計ストア
+既存CSVの重複チェック用キーインデックス（utils.dedup_index）と、
+ブランド・ライン・型番ごとのマージ可能な集計（utils.delta_stats）をまとめて保存し、
+新規データの追加時は新規行だけを処理する（既存CSVの再読み込み・再集計をしない）
+
+- 状態は .cache/incremental/<CSVパスのハッシュ>/ に保存
+- 保存時のCSVのサイズ・mtimeと一致しない場合（手動編集・全件マージ後など）は全件から作り直す
+- 新規行はCSVの末尾に追記し、失敗時は追記前のサイズに切り詰めて元に戻す
+- append_chunks() は新規データをチャンクごとに処理する（新規データ全体をメモリに載せない。
+  取り消しは append() と同じく1回の rollback() で全チャンク分）
+- partitions（utils.month_partitions.MonthPartitionStore）を渡すと、新規行を販売月パーティションにも追加する
+"""
+import hashlib
+import json
+import os
+
+from utils.data_loader import CACHE_DIR, append_cache_since, append_rows, clear_cache, load_watch_data
+from utils.dedup_index import DedupIndex, csv_signature, row_fingerprints
+from utils.delta_stats import DeltaStats
+
+
+# 状態の保存先
+STATE_DIR = os.path.join(CACHE_DIR, 'incremental')
+
+# 状態の形式のバージョン（集計の作り方を変えたら上げる）
+STATE_VERSION = 1
+
+# 保持する集計 {名前: キー列}
+# ライン・型番抽出は annotate（例: brand_tab_renderer.classify_lines）で付与した列
+STATS_TABLES = {
+    'condition': ['商品状態'],
+    'brand': ['ブランド'],
+    'brand_condition': ['ブランド', '商品状態'],
+    'brand_movement': ['ブランド', '駆動方式'],
+    'brand_line': ['ブランド', 'ライン'],
+    'brand_line_model': ['ブランド', 'ライン', '型番抽出'],
+}
+
+
+class AppendResult:
+    """
+    追加処理の結果
+
+    Attributes:
+        new_rows: 追加した行（DataFrame。append_chunks() の場合はNone）
+        new_count: 追加した件数
+        duplicate_existing: 既存データと重複した件数
+        duplicate_batch: 新規データ内で重複した件数
+        affected: {集計名: 更新されたグループのキーのset}
+        months: 新規行を追加した販売月のリスト（パーティションを使う場合のみ）
+    """
+
+    def __init__(self, new_rows, duplicate_existing, duplicate_batch, new_count=None):
+        self.new_rows = new_rows
+        self.new_count = len(new_rows) if new_rows is not None else new_count
+        self.duplicate_existing = duplicate_existing
+        self.duplicate_batch = duplicate_batch
+        self.affected = {}
+        self.months = []
+
+    @property
+    def duplicate_count(self):
+        return self.duplicate_existing + self.duplicate_batch
+
+
+class IncrementalStore:
+    """
+    CSV1つ分の差分集計ストア
+
+    Args:
+        csv_path: 時計データCSVのパス
+        annotate: 集計前に列を追加する関数（df -> df、Noneなら追加しない）
+        tables: 保持する集計 {名前: キー列}
+        state_dir: 状態の保存先
+        partitions: 新規行を追加する販売月パーティション（Noneなら追加しない）
+    """
+
+    def __init__(self, csv_path, annotate=None, tables=STATS_TABLES, state_dir=STATE_DIR, partitions=None):
+        self.csv_path = str(csv_path)
+        self.annotate = annotate
+        self.tables = {name: list(keys) for name, keys in tables.items()}
+        key = hashlib.sha1(os.path.abspath(self.csv_path).encode('utf-8')).hexdigest()[:16]
+        self.state_dir = os.path.join(state_dir, key)
+        self.partitions = partitions
+        self.index = None
+        self.stats = {}
+        self.rows = 0
+        self._previous_size = None
+
+    @property
+    def _index_path(self):
+        return os.path.join(self.state_dir, 'keys')
+
+    @property
+    def _stats_path(self):
+        return os.path.join(self.state_dir, 'stats.json')
+
+    def open(self):
+        """
+        保存済みの状態を読み込む（CSVと一致しない・存在しない場合は全件から作成）
+
+        Returns:
+            self
+        """
+        if not self._load():
+            self.rebuild()
+        if self.partitions is not None:
+            self.partitions.open()
+        return self
+
+    def _load(self):
+        try:
+            with open(self._stats_path, 'r', encoding='utf-8') as f:
+                state = json.load(f)
+        except (OSError, ValueError):
+            return False
+
+        if (state.get('version') != STATE_VERSION or state.get('csv') != csv_signature(self.csv_path)
+                or state.get('tables') != self.tables):
+            return False
+
+        index = DedupIndex.load(self._index_path)
+        if index is None:
+            return False
+
+        self.index = index
+        self.rows = state['rows']
+        self.stats = {name: DeltaStats.from_dict(data) for name, data in state['stats'].items()}
+        print(f"✓ 差分集計を読み込み: {self.rows:,}件（キー{len(index):,}件）")
+        return True
+
+    def rebuild(self):
+        """CSV全件からキーインデックスと集計を作り直す"""
+        print("🔧 差分集計を全件から作成中...")
+        self.index = DedupIndex.from_csv(self.csv_path)
+        df = load_watch_data(self.csv_path)
+        self.rows = len(df)
+        self.stats = self._aggregate(df)
+        self.save()
+        print(f"✓ 差分集計を作成: {self.rows:,}件（キー{len(self.index):,}件）")
+
+    def _aggregate(self, df):
+        if self.annotate is not None:
+            df = self.annotate(df)
+        return {name: DeltaStats.from_frame(df, keys) for name, keys in self.tables.items()}
+
+    def append(self, df_new):
+        """
+        新規データのうち重複しない行をCSVに追記し、集計に足し込む
+
+        Args:
+            df_new: 新規データ（属性生成済み）
+
+        Returns:
+            AppendResult
+        """
+        fresh, duplicate_existing, duplicate_batch = self.index.split(df_new)
+        result = AppendResult(fresh, duplicate_existing, duplicate_batch)
+        if len(fresh) == 0:
+            return result
+
+        self._previous_size = append_rows(self.csv_path, fresh)
+        self.index.add(fresh)
+        for name, delta in self._aggregate(fresh).items():
+            result.affected[name] = self.stats[name].merge(delta)
+        self.rows += len(fresh)
+        self.save()
+        if self.partitions is not None:
+            result.months = self.partitions.append(fresh)
+        return result
+
+    def append_chunks(self, chunks, on_rows=None):
+        """
+        新規データをチャンクごとに append() と同じく処理する（新規データ全体を読み込まない）
+
+        新規データ内の重複はチャンクをまたいで判定する（全チャンクを結合して append() した場合と同じ結果）。
+        型付きキャッシュはチャンクごとには更新せず、最後に追記分だけをまとめて反映する（既存行は再パースしない）
+
+        Args:
+            chunks: 新規データのチャンク（属性生成済み。pd.read_csv(chunksize=...) の結果など）
+            on_rows: 追記した行を受け取る関数（チャンクごとに呼ぶ。Noneなら呼ばない）
+
+        Returns:
+            AppendResult（new_rows はNone。rollback() で全チャンクの追記を取り消せる）
+        """
+        result = AppendResult(None, 0, 0, new_count=0)
+        before = None
+        months = set()
+        added = []
+        for fresh, duplicate_existing, duplicate_batch in self.index.split_chunks(chunks):
+            result.duplicate_existing += duplicate_existing
+            result.duplicate_batch += duplicate_batch
+            if len(fresh) == 0:
+                continue
+
+            if before is None:
+                before = os.stat(self.csv_path)
+                # 取り消し位置は最初のチャンクの追記前
+                self._previous_size = before.st_size
+            append_rows(self.csv_path, fresh, update_cache=False)
+            added.append(row_fingerprints(fresh, self.index.columns))
+            for name, delta in self._aggregate(fresh).items():
+                result.affected.setdefault(name, set()).update(self.stats[name].merge(delta))
+            self.rows += len(fresh)
+            result.new_count += len(fresh)
+            if self.partitions is not None:
+                months.update(self.partitions.append(fresh))
+            if on_rows is not None:
+                on_rows(fresh)
+
+        if result.new_count:
+            # キーはチャンクをまたいだ重複判定が終わってから登録する（split_chunks はインデックスを変更しない）
+            for hashes in added:
+                self.index.add_fingerprints(hashes)
+            append_cache_since(self.csv_path, before)
+            self.save()
+        result.months = sorted(months)
+        return result
+
+    def rollback(self):
+        """直前の append() で追記した行を取り消す（集計・パーティションは次回の open() で作り直す）"""
+        if self._previous_size is None:
+            return
+        os.truncate(self.csv_path, self._previous_size)
+        self._previous_size = None
+        clear_cache(self.csv_path)
+        if os.path.exists(self._stats_path):
+            os.remove(self._stats_path)
+
+    def save(self):
+        """キーインデックスと集計を保存"""
+        os.makedirs(self.state_dir, exist_ok=True)
+        self.index.save(self._index_path)
+        state = {
+            'version': STATE_VERSION,
+            'csv': csv_signature(self.csv_path),
+            'tables': self.tables,
+            'rows': self.rows,
+            'stats': {name: stats.to_dict() for name, stats in self.stats.items()},
+        }
+        with open(self._stats_path, 'w', encoding='utf-8') as f:
+            json.dump(state, f, ensure_ascii=False)
+
+    def count(self, table, key):
+        """
+        集計の1グループの件数
+
+        Args:
+            table: 集計名（例: 'condition'）
+            key: グループのキー（1列の場合は値そのもの）
+
+        Returns:
+            件数（グループがなければ0）
+        """
+        key = key if isinstance(key, tuple) else (key,)
+        agg = self.stats[table].groups.get(key)
+        return agg.items if agg is not None else 0
+
+    def summary(self, table, only=None):
+        """集計結果のDataFrame（DeltaStats.summary()）"""
+        return self.stats[table].summary(only=only)
+
+
+if __name__ == '__main__':
+    import tempfile
+
+    import numpy as np
+    import pandas as pd
+
+    import utils.data_loader as data_loader
+    from utils.group_stats import group_stats
+
+    # 一時CSVの型付きキャッシュは一時ディレクトリに作る（リポジトリの .cache/ に残さない）
+    cache_dir = tempfile.TemporaryDirectory()
+    data_loader.CACHE_DIR = cache_dir.name
+
+    # 簡易テスト（分割して追加した結果が、全件から作った集計と一致すること）
+    rng = np.random.default_rng(0)
+    n = 3000
+    df = pd.DataFrame({
+        'タイトル': [f'WATCH {i % 2500}' for i in range(n)],
+        'ブランド': rng.choice(['SEIKO', 'CASIO'], n),
+        '価格': rng.gamma(2.0, 150.0, n).round(2),
+        '販売数': rng.integers(1, 4, n),
+        '販売日': rng.choice(['2025-12-01', '2025-12-02'], n),
+        '商品状態': rng.choice(['完品', 'パーツ'], n),
+        '駆動方式': rng.choice(['自動巻き', 'クォーツ'], n),
+    })
+    tables = {name: keys for name, keys in STATS_TABLES.items() if 'ライン' not in keys}
+
+    with tempfile.TemporaryDirectory() as tmp:
+        csv_path = os.path.join(tmp, 'data.csv')
+        df.iloc[:2000].to_csv(csv_path, index=False)
+
+        store = IncrementalStore(csv_path, tables=tables, state_dir=tmp).open()
+        result = store.append(df.iloc[2000:])
+        assert result.new_count + result.duplicate_count == 1000
+        assert store.rows == len(pd.read_csv(csv_path))
+
+        merged = pd.concat([df.iloc[:2000], df.iloc[2000:]]).drop_duplicates(subset=['タイトル', '販売日'])
+        assert result.new_count == len(merged) - 2000
+        expected = group_stats(pd.read_csv(csv_path), ['ブランド', '商品状態'])
+        assert (store.summary('brand_condition')['items'] == expected['items']).all()
+
+        # 保存した状態の再利用・CSV変更時の作り直し
+        reopened = IncrementalStore(csv_path, tables=tables, state_dir=tmp).open()
+        assert reopened.rows == store.rows and reopened.count('condition', '完品') == store.count('condition', '完品')
+
+        # ロールバック（追記前のCSVに戻る）
+        before = os.path.getsize(csv_path)
+        extra = df.iloc[:10].assign(販売日='2026-01-01')
+        assert store.append(extra).new_count == 10
+        store.rollback()
+        assert os.path.getsize(csv_path) == before
+        assert IncrementalStore(csv_path, tables=tables, state_dir=tmp).open().rows == reopened.rows
+
+    # チャンクごとの追加（結合して append() した場合と同じ結果、rollback() は全チャンク分を取り消す）
+    data = pd.concat([df.iloc[2000:], df.iloc[2100:2200]], ignore_index=True)
+    with tempfile.TemporaryDirectory() as tmp:
+        whole_path = os.path.join(tmp, 'whole.csv')
+        chunk_path = os.path.join(tmp, 'chunks.csv')
+        df.iloc[:2000].to_csv(whole_path, index=False)
+        df.iloc[:2000].to_csv(chunk_path, index=False)
+
+        whole = IncrementalStore(whole_path, tables=tables, state_dir=tmp).open()
+        expected = whole.append(data)
+        chunked = IncrementalStore(chunk_path, tables=tables, state_dir=tmp).open()
+        before = os.path.getsize(chunk_path)
+        seen = []
+        result = chunked.append_chunks((data.iloc[i:i + 300] for i in range(0, len(data), 300)),
+                                       on_rows=seen.append)
+        assert expected.duplicate_batch > 0 and expected.duplicate_existing > 0
+        assert ((result.new_count, result.duplicate_existing, result.duplicate_batch)
+                == (expected.new_count, expected.duplicate_existing, expected.duplicate_batch))
+        assert result.new_rows is None and sum(len(rows) for rows in seen) == result.new_count
+        assert result.affected == expected.affected
+        assert pd.read_csv(chunk_path).equals(pd.read_csv(whole_path))
+        # 型付きキャッシュは追記分だけ反映済み（次回の読み込みでCSV全体を再パースしない）
+        meta = data_loader._read_meta(data_loader._cache_paths(chunk_path)[2])
+        assert meta['size'] == os.path.getsize(chunk_path) and meta['rows'] == len(pd.read_csv(chunk_path))
+        assert len(load_watch_data(chunk_path)) == meta['rows']
+        summary, expected_summary = chunked.summary('brand_condition'), whole.summary('brand_condition')
+        assert (summary['items'] == expected_summary['items']).all()
+        assert np.allclose(summary['std'], expected_summary['std'])
+
+        reopened = IncrementalStore(chunk_path, tables=tables, state_dir=tmp).open()
+        assert reopened.rows == whole.rows and len(reopened.index) == len(whole.index)
+        chunked.rollback()
+        assert os.path.getsize(chunk_path) == before
+
+    cache_dir.cleanup()
+    print("✅ incremental_store テスト完了")
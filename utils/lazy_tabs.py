@@ -0,0 +1,418 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+タブの遅延読み込み（タブ別HTMLフラグメント）
+index.htmlの各tab-contentの中身をタブごとのHTMLファイル（tabs/<タブID>.html）に分け、
+index.htmlには空のタブ（シェル）だけを残す。
+ページ側は showTab で初めて表示されたタブのフラグメントを取得して挿入し、以降は再利用する。
+
+- 表示中（class="tab-content active"）のタブはシェルに残す（初回表示はこのタブだけ）
+- タブの外にある属性なしの<script>で、参照する要素（getElementById・Plotly.newPlot・
+  querySelector('#...')。文書にないidは除く）がすべて1つのタブ内にあり、関数定義を含まないもの（グラフ描画など）は
+  そのタブのフラグメントの末尾に移す（フラグメント挿入時に実行）
+- 上記以外の<script>（関数定義を含む・複数タブにまたがる）が要素を参照するタブは、
+  読み込み時に要素が必要な可能性があるためシェルに残す
+- フラグメント内の<script>は挿入時に実行し、挿入後に document へ 'tabfragmentload' イベント
+  （detail.tabId）を送る（全タブの要素を走査するページ側の処理はこのイベントで追従できる）
+- 損益分岐点の再計算（ページの recalculate()。document の .highlight をクラスで走査するため、
+  要素idの参照からは分からない）は、為替・送料・手数料が初期値から変わっていれば
+  'tabfragmentload' で再実行する（後から読み込んだタブが初期値の円換算のまま残らないように）
+- グラフデータの遅延読み込み（utils/chart_bundle.py）は、フラグメントの挿入後に行う
+- 元のindex.html（各rebuildスクリプトが編集するもの）は変更せず、出力先ディレクトリに書き出す
+"""
+import html as html_lib
+import os
+import re
+from urllib.parse import quote
+
+from utils.html_tabs import TabDocument, tab_start_tag
+
+
+# フラグメントの保存先ディレクトリ（index.htmlからの相対パス）
+FRAGMENT_DIR_NAME = 'tabs'
+
+# 遅延読み込みスクリプト（シェルに1回だけ追加）
+TAB_LOADER_ID = 'tab-loader'
+TAB_LOADER_SCRIPT = f'''    <script id="{TAB_LOADER_ID}">
+    // タブ別HTMLフラグメントの遅延読み込み（初回表示時に data-fragment のファイルを1回だけ取得して挿入）
+    const tabFragmentsLoaded = {{}};
+
+    function loadTabFragment(tabId) {{
+        const tab = document.getElementById(tabId);
+        if (!tab || !tab.dataset.fragment) {{
+            return Promise.resolve();
+        }}
+        if (!tabFragmentsLoaded[tabId]) {{
+            tabFragmentsLoaded[tabId] = fetch(tab.dataset.fragment).then(res => {{
+                if (!res.ok) throw new Error(res.status);
+                return res.text();
+            }}).then(html => {{
+                tab.innerHTML = html;
+                tab.querySelectorAll('script').forEach(old => {{
+                    const script = document.createElement('script');
+                    Array.from(old.attributes).forEach(attr => script.setAttribute(attr.name, attr.value));
+                    script.textContent = old.textContent;
+                    old.replaceWith(script);
+                }});
+                delete tab.dataset.fragment;
+                document.dispatchEvent(new CustomEvent('tabfragmentload', {{detail: {{tabId: tabId}}}}));
+            }}).catch(err => {{
+                delete tabFragmentsLoaded[tabId];
+                console.error('タブの読み込みに失敗: ' + tabId, err);
+            }});
+        }}
+        return tabFragmentsLoaded[tabId];
+    }}
+
+    // 為替・送料・手数料が初期値から変わっていれば、読み込んだタブの損益分岐点も現在の値で再計算
+    const RECALC_INPUT_IDS = ['exchangeRate', 'shippingCost', 'feeRate'];
+    document.addEventListener('tabfragmentload', () => {{
+        if (typeof recalculate !== 'function') return;
+        const changed = RECALC_INPUT_IDS.some(id => {{
+            const input = document.getElementById(id);
+            return input && parseFloat(input.value) !== parseFloat(input.defaultValue);
+        }});
+        if (changed) recalculate();
+    }});
+    </script>
+'''
+
+# 属性なしの<script>ブロック（前後の空白・改行を含む）
+_INLINE_SCRIPT_RE = re.compile(r'[ \t]*<script>(.*?)</script>[ \t]*\n?', re.S)
+
+# <script>内で参照している要素id
+_ELEMENT_REF_RE = re.compile(
+    r'''(?:getElementById|Plotly\.newPlot|Plotly\.react)\(\s*['"]([^'"]+)['"]'''
+    r'''|querySelector(?:All)?\(\s*['"]#([\w-]+)['"]''')
+
+# 要素のid属性
+_ID_ATTR_RE = re.compile(r'\bid="([^"]+)"')
+
+# showTab 内でタブを表示する行と、その直後のグラフ読み込み呼び出し（utils/chart_bundle.py が追加）
+_SHOW_TAB_RE = re.compile(
+    r"function showTab\((\w+)\)\s*\{.*?\n([ \t]*)document\.getElementById\(\1\)\.classList\.add\('active'\);"
+    r"(\n[ \t]*loadTabCharts\(\1\);)?",
+    re.S)
+
+
+def fragment_path(tab_id):
+    """タブのフラグメントのパス（index.htmlからの相対URL）"""
+    return f'{FRAGMENT_DIR_NAME}/{quote(tab_id)}.html'
+
+
+def placeholder_tag(tab_id):
+    """シェルに残す空のタブ"""
+    return (tab_start_tag(tab_id)[:-1]
+            + f' data-fragment="{html_lib.escape(fragment_path(tab_id))}"></div>')
+
+
+def script_refs(body):
+    """<script>の本文で参照している要素idの集合"""
+    return {a or b for a, b in _ELEMENT_REF_RE.findall(body)}
+
+
+def _tab_at(spans, pos):
+    for tab_id, (start, end) in spans.items():
+        if start <= pos < end:
+            return tab_id
+    return None
+
+
+def split_tabs(html):
+    """
+    index.htmlをシェルとタブ別フラグメントに分ける
+
+    Args:
+        html: index.htmlの文字列（全タブを含むもの）
+
+    Returns:
+        (シェルのHTML, {タブid: フラグメントのHTML}, {シェルに残したタブid: 理由})
+        シェルには遅延読み込みスクリプトと showTab からの呼び出しを追加済み
+
+    Raises:
+        ValueError: 既に分割済みのHTMLの場合
+    """
+    if f'<script id="{TAB_LOADER_ID}">' in html:
+        raise ValueError("タブの遅延読み込みスクリプトを含むHTMLです（分割済みのシェル）")
+
+    doc = TabDocument(html)
+    # 他のタブの中にあるタブは外側のタブと一緒に扱う
+    spans = {tab_id: (start, end) for tab_id, (start, end) in doc.tabs.items()
+             if not any(s < start and end <= e for s, e in doc.tabs.values())}
+
+    # 要素id -> 最初に現れる位置のタブ（getElementById が返す要素）
+    id_tabs = {}
+    for m in _ID_ATTR_RE.finditer(html):
+        id_tabs.setdefault(m.group(1), _tab_at(spans, m.start()))
+
+    scripts = []
+    for m in _INLINE_SCRIPT_RE.finditer(html):
+        # 文書にないidは読み込みのタイミングに関係しないため除く
+        tabs = {id_tabs[ref] for ref in script_refs(m.group(1)) if ref in id_tabs}
+        scripts.append((m, _tab_at(spans, m.start()), tabs))
+
+    # シェルに残すタブ（移せない<script>から参照されているもの）。残したタブ内の<script>も
+    # 読み込み時に実行されるため、参照先を順に広げる
+    eager = {}
+    moves = {}
+    changed = True
+    while changed:
+        changed = False
+        moves = {}
+        for m, owner, tabs in scripts:
+            lazy_refs = {t for t in tabs if t is not None and t not in eager}
+            if owner is not None and owner not in eager:
+                # 遅延タブ内の<script>はフラグメントと一緒に実行される
+                lazy_refs.discard(owner)
+            elif owner is None and len(tabs) == 1 and lazy_refs and 'function' not in m.group(1):
+                moves[m.start()] = next(iter(lazy_refs))
+                continue
+            for tab_id in lazy_refs:
+                eager[tab_id] = 'シェルの<script>から参照' if owner is None else f'{owner}タブの<script>から参照'
+                changed = True
+
+    fragments = {}
+    for tab_id in spans:
+        if tab_id in eager:
+            continue
+        start, end = spans[tab_id]
+        inner_start = start + len(tab_start_tag(tab_id))
+        fragments[tab_id] = [html[inner_start:end - len('</div>')]]
+        doc.replace_tab(tab_id, placeholder_tag(tab_id))
+    for m, _, _ in scripts:
+        if m.start() in moves:
+            fragments[moves[m.start()]].append('\n' + m.group().strip() + '\n')
+            doc.replace_range(m.start(), m.end(), '')
+
+    return install_tab_loader(doc.render()), {k: ''.join(v) for k, v in fragments.items()}, eager
+
+
+def install_tab_loader(html):
+    """
+    遅延読み込みスクリプトと showTab からの呼び出しを追加
+
+    showTab の「タブを表示する行」の直後でフラグメントを読み込み、
+    グラフの読み込み（loadTabCharts）はフラグメントの挿入後に行うように書き換える
+
+    Args:
+        html: シェルのHTML
+
+    Returns:
+        追加後のHTML文字列
+    """
+    body_end = html.rfind('</body>')
+    if body_end == -1:
+        print("⚠️ </body>が見つからないため、タブ読み込みスクリプトを追加できません")
+    else:
+        html = html[:body_end] + TAB_LOADER_SCRIPT + html[body_end:]
+
+    m = _SHOW_TAB_RE.search(html)
+    if m is None:
+        print("⚠️ showTab関数が見つからないため、タブ読み込みの呼び出しを追加できません")
+        return html
+    arg, indent = m.group(1), m.group(2)
+    call = (f'loadTabFragment({arg}).then(() => loadTabCharts({arg}));' if m.group(3)
+            else f'loadTabFragment({arg});')
+    head = html[:m.end()]
+    if m.group(3):
+        head = head[:-len(m.group(3))]
+    return head + f'\n{indent}{call}' + html[m.end():]
+
+
+def _write_if_changed(path, data):
+    """内容が変わった場合だけ書き込む（書き込んだらTrue）"""
+    if os.path.exists(path):
+        with open(path, 'rb') as f:
+            if f.read() == data:
+                return False
+    with open(path, 'wb') as f:
+        f.write(data)
+    return True
+
+
+def lazy_site_files(index_path):
+    """
+    index.htmlから出力するファイル（シェル・タブ別フラグメント・グラフデータ）を組み立てる
+
+    Args:
+        index_path: 元のindex.html（全タブを含むもの）
+
+    Returns:
+        ({出力先からの相対パス: 内容（bytes）}, {'shell': シェルの文字数, 'source': 元の文字数,
+          'fragments': タブ数, 'eager': {シェルに残したタブid: 理由}})
+        グラフデータ（charts/）はindex.htmlの隣にあれば含める
+    """
+    from utils.chart_bundle import CHART_DIR_NAME
+
+    with open(index_path, 'r', encoding='utf-8') as f:
+        html = f.read()
+    shell, fragments, eager = split_tabs(html)
+
+    files = {'index.html': shell.encode('utf-8')}
+    for tab_id, fragment in fragments.items():
+        files[fragment_path(tab_id)] = fragment.encode('utf-8')
+
+    chart_dir = os.path.join(os.path.dirname(os.path.abspath(index_path)), CHART_DIR_NAME)
+    if os.path.isdir(chart_dir):
+        for name in sorted(os.listdir(chart_dir)):
+            with open(os.path.join(chart_dir, name), 'rb') as f:
+                files[f'{CHART_DIR_NAME}/{name}'] = f.read()
+
+    return files, {'shell': len(shell), 'source': len(html), 'fragments': len(fragments), 'eager': eager}
+
+
+def write_site_files(files, out_dir, clean=()):
+    """
+    ファイルを出力先に書き出す（内容の変わらないファイルは書き換えない）
+
+    Args:
+        files: {出力先からの相対パス: 内容（bytes）}
+        out_dir: 出力先ディレクトリ
+        clean: この接頭辞で始まる相対パスのファイルのうち、filesにないものを削除する（例: 'tabs/'）
+
+    Returns:
+        内容が変わったファイル数
+    """
+    updated = 0
+    for path, data in files.items():
+        full_path = os.path.join(out_dir, *path.split('/'))
+        os.makedirs(os.path.dirname(full_path), exist_ok=True)
+        updated += _write_if_changed(full_path, data)
+
+    for root, _, names in os.walk(out_dir, topdown=False):
+        for name in names:
+            path = os.path.relpath(os.path.join(root, name), out_dir).replace(os.sep, '/')
+            if path not in files and path.startswith(tuple(clean)):
+                os.remove(os.path.join(root, name))
+        rel_dir = os.path.relpath(root, out_dir).replace(os.sep, '/') + '/'
+        if rel_dir.startswith(tuple(clean)) and not os.listdir(root):
+            os.rmdir(root)
+    return updated
+
+
+def write_lazy_site(index_path, out_dir, publish=False):
+    """
+    index.htmlからシェル・タブ別フラグメントを出力先に書き出す
+
+    出力先には index.html（シェル）、tabs/<タブID>.html、charts/（index.htmlの隣にあればコピー）を作る。
+    内容の変わらないファイルは書き換えず、現在のタブにないフラグメントは削除する
+
+    Args:
+        index_path: 元のindex.html（全タブを含むもの）
+        out_dir: 出力先ディレクトリ（index.htmlと同じディレクトリは不可）
+        publish: Trueなら公開用の処理（utils.site_publish.publish_site）を適用してから書き出す
+
+    Returns:
+        {'shell': シェルの文字数, 'source': 元の文字数, 'fragments': 書き出したタブ数,
+         'updated': 内容が変わったファイル数, 'eager': {シェルに残したタブid: 理由}}
+        publish=Trueの場合は 'manifest'（公開用ファイルの一覧）も含む
+    """
+    from utils.chart_bundle import CHART_DIR_NAME
+
+    out_dir = os.path.abspath(out_dir)
+    if out_dir == os.path.dirname(os.path.abspath(index_path)):
+        raise ValueError("出力先は元のindex.htmlと別のディレクトリを指定してください")
+
+    from utils.site_publish import PUBLISH_OUTPUTS, publish_site
+
+    files, result = lazy_site_files(index_path)
+    if publish:
+        files, result['manifest'] = publish_site(files)
+    # 前回の出力のうち今回作らなかったもの（公開用の処理をやめた場合のassets/なども含む）は削除
+    clean = [f'{FRAGMENT_DIR_NAME}/', f'{CHART_DIR_NAME}/'] + PUBLISH_OUTPUTS
+    result['updated'] = write_site_files(files, out_dir, clean)
+    return result
+
+
+if __name__ == '__main__':
+    import tempfile
+
+    print("✅ タブ遅延読み込みテスト")
+
+    page = '''<html><head><style>.tab-content { display: none; }</style></head><body>
+<div id="overview" class="tab-content active"><div id="ov_chart"></div></div>
+<div id="A" class="tab-content"><div id="a_chart"></div><p>A</p></div>
+<div id="B" class="tab-content"><div id="b_list"></div>
+<script>
+document.getElementById('b_list').textContent = 'B';
+</script>
+</div>
+<div id="C" class="tab-content"><input id="c_input"></div>
+<div id="D" class="tab-content"><div id="d_chart"></div></div>
+    <script>
+    function showTab(tabId) {
+        document.querySelectorAll('.tab-content').forEach(el => el.classList.remove('active'));
+        document.getElementById(tabId).classList.add('active');
+        loadTabCharts(tabId);
+    }
+    function readC() { return document.getElementById('c_input').value; }
+    </script>
+    <script>
+    Plotly.newPlot('a_chart', [], {});
+    Plotly.newPlot('a_removed', [], {});
+    </script>
+    <script>
+    Plotly.newPlot('ov_chart', [], {});
+    </script>
+    <script>
+    document.getElementById('c_input').value = '1';
+    Plotly.newPlot('d_chart', [], {});
+    </script>
+</body></html>'''
+
+    shell, fragments, eager = split_tabs(page)
+    assert set(fragments) == {'A', 'B'}
+    assert eager == {'C': 'シェルの<script>から参照', 'D': 'シェルの<script>から参照'}
+    assert '<div id="A" class="tab-content" data-fragment="tabs/A.html"></div>' in shell
+    assert '<div id="ov_chart">' in shell and 'id="c_input"' in shell and 'id="d_chart"' in shell
+    assert fragments['A'] == ('<div id="a_chart"></div><p>A</p>\n<script>\n    Plotly.newPlot(\'a_chart\', [], {});\n'
+                              "    Plotly.newPlot('a_removed', [], {});\n    </script>\n")
+    assert "textContent = 'B'" in fragments['B'] and 'b_list' not in shell
+    assert "Plotly.newPlot('a_chart'" not in shell
+    assert "Plotly.newPlot('d_chart'" in shell  # 複数タブにまたがる<script>は残す
+    assert "Plotly.newPlot('ov_chart'" in shell
+    assert "classList.add('active');\n        loadTabFragment(tabId).then(() => loadTabCharts(tabId));\n    }" in shell
+    assert shell.count(TAB_LOADER_ID) == 1
+    assert "addEventListener('tabfragmentload'" in shell and 'recalculate()' in shell
+    print("  ✓ split_tabs（表示中のタブ・シェルから参照されるタブは残す、1タブだけの<script>は移動）")
+
+    # 全タブを戻すと元のタブの中身と一致する
+    doc = TabDocument(page)
+    for tab_id, fragment in fragments.items():
+        assert fragment.startswith(doc.tab_html(tab_id)[len(tab_start_tag(tab_id)):-len('</div>')])
+
+    try:
+        split_tabs(shell)
+        raise AssertionError("分割済みのシェルはエラーにする")
+    except ValueError:
+        pass
+
+    no_charts = page.replace('\n        loadTabCharts(tabId);', '')
+    assert "classList.add('active');\n        loadTabFragment(tabId);\n    }" in split_tabs(no_charts)[0]
+    print("  ✓ install_tab_loader（グラフ読み込みはフラグメント挿入後）")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        src = os.path.join(tmp, 'src')
+        out = os.path.join(tmp, 'site')
+        os.makedirs(os.path.join(src, 'charts'))
+        with open(os.path.join(src, 'index.html'), 'w', encoding='utf-8') as f:
+            f.write(page)
+        with open(os.path.join(src, 'charts', 'A.json'), 'w', encoding='utf-8') as f:
+            f.write('[]')
+        os.makedirs(os.path.join(out, FRAGMENT_DIR_NAME))
+        with open(os.path.join(out, FRAGMENT_DIR_NAME, 'OLD.html'), 'w', encoding='utf-8') as f:
+            f.write('old')
+
+        result = write_lazy_site(os.path.join(src, 'index.html'), out)
+        assert result['fragments'] == 2 and result['updated'] == 4
+        assert sorted(os.listdir(os.path.join(out, FRAGMENT_DIR_NAME))) == ['A.html', 'B.html']
+        assert os.path.exists(os.path.join(out, 'charts', 'A.json'))
+        assert write_lazy_site(os.path.join(src, 'index.html'), out)['updated'] == 0
+        try:
+            write_lazy_site(os.path.join(src, 'index.html'), src)
+            raise AssertionError("元のディレクトリへの出力はエラーにする")
+        except ValueError:
+            pass
+    print("  ✓ write_lazy_site（変更のないファイルは書き換えない・古いフラグメントは削除）")
+
+    print("\n✅ すべてのテスト成功")
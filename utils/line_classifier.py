@@ -0,0 +1,197 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+ライン分類エンジン（Aho-Corasick法）
+ブランドのライン定義（dict: ライン名 -> キーワードリスト）から
+オートマトンを1回だけ構築し、タイトルを1回の走査で分類する
+
+従来の「dict順 → キーワード順に `kw in title_upper`」と同じ結果を返す
+（複数ラインにマッチした場合はdictで先に定義されたラインを優先）
+
+一括分類の結果は utils.classification_cache に保存され、
+ライン定義が変わらない限り同じタイトルは再分類しない
+"""
+import numpy as np
+import pandas as pd
+
+from utils.classification_cache import cached_classify, classifier_version
+
+
+_NO_MATCH = float('inf')
+
+# 分類ロジックのバージョン（判定方法を変えたら上げる）
+ALGORITHM_VERSION = 1
+
+
+class KeywordLineClassifier:
+    """
+    キーワード辞書によるライン分類器
+
+    Args:
+        line_dict: {ライン名: [キーワード, ...]}（優先順位順）
+        default: どのラインにもマッチしない場合の値（例: "その他SEIKO"）
+    """
+
+    def __init__(self, line_dict, default):
+        self.line_names = list(line_dict.keys())
+        self.default = default
+        self.version = classifier_version(ALGORITHM_VERSION, list(line_dict.items()), default)
+        self._build(line_dict)
+
+    def _build(self, line_dict):
+        """オートマトンを構築"""
+        goto = [{}]
+        best = [_NO_MATCH]
+
+        # 1. トライ木を構築（ノードごとにマッチするラインの最優先順位を保持）
+        for priority, keywords in enumerate(line_dict.values()):
+            for kw in keywords:
+                node = 0
+                for ch in kw:
+                    nxt = goto[node].get(ch)
+                    if nxt is None:
+                        nxt = len(goto)
+                        goto[node][ch] = nxt
+                        goto.append({})
+                        best.append(_NO_MATCH)
+                    node = nxt
+                if priority < best[node]:
+                    best[node] = priority
+
+        # 2. 失敗リンクをBFSで構築し、出力（最優先順位）を伝播
+        fail = [0] * len(goto)
+        queue = list(goto[0].values())
+        head = 0
+        while head < len(queue):
+            node = queue[head]
+            head += 1
+            for ch, child in goto[node].items():
+                f = fail[node]
+                while f and ch not in goto[f]:
+                    f = fail[f]
+                fail[child] = goto[f].get(ch, 0)
+                if best[fail[child]] < best[child]:
+                    best[child] = best[fail[child]]
+                queue.append(child)
+
+        self._goto = goto
+        self._fail = fail
+        self._best = best
+
+    def _match_priority(self, text):
+        """テキスト中で最も優先順位の高いラインのインデックス（なければinf）"""
+        goto = self._goto
+        fail = self._fail
+        best = self._best
+
+        found = best[0]  # 空文字キーワードは常にマッチ
+        state = 0
+        for ch in text:
+            while state and ch not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(ch, 0)
+            if best[state] < found:
+                found = best[state]
+                if found == 0:
+                    break
+        return found
+
+    def classify(self, title_upper):
+        """
+        大文字化済みタイトルを1件分類
+
+        Args:
+            title_upper: 大文字化されたタイトル
+
+        Returns:
+            ライン名（マッチしない場合はdefault）
+        """
+        priority = self._match_priority(title_upper)
+        if priority == _NO_MATCH:
+            return self.default
+        return self.line_names[priority]
+
+    def classify_series(self, titles_upper, use_cache=True):
+        """
+        大文字化済みタイトルのSeriesを一括分類
+        同一タイトルは1回だけ走査する（欠損値はdefault）
+
+        Args:
+            titles_upper: 大文字化されたタイトルのSeries
+            use_cache: Trueなら分類キャッシュを使い、未分類のタイトルだけ走査
+
+        Returns:
+            ライン名のSeries（indexは入力と同じ）
+        """
+        valid = titles_upper.notna()
+        labels = np.full(len(titles_upper), self.default, dtype=object)
+        texts = titles_upper[valid]
+
+        if use_cache:
+            labels[valid.to_numpy()] = cached_classify(
+                texts, 'line', self.version,
+                lambda series: [self.classify(t) for t in series]
+            )
+        else:
+            codes, uniques = pd.factorize(texts)
+            unique_labels = np.array([self.classify(t) for t in uniques], dtype=object)
+            labels[valid.to_numpy()] = unique_labels[codes]
+
+        return pd.Series(labels, index=titles_upper.index)
+
+    def classify_titles(self, titles, use_cache=True):
+        """
+        生タイトルのSeriesを一括分類（str(title).upper() と同じ正規化）
+
+        Args:
+            titles: タイトルのSeries
+            use_cache: Trueなら分類キャッシュを使う
+
+        Returns:
+            ライン名のSeries
+        """
+        return self.classify_series(titles.map(str).str.upper(), use_cache=use_cache)
+
+
+if __name__ == '__main__':
+    print("✅ ライン分類エンジンテスト")
+
+    lines = {
+        'Datejust': ['DATEJUST', 'DATE JUST'],
+        'Submariner': ['SUBMARINER', 'SUB'],
+        'GMT-Master': ['GMT-MASTER', 'GMT'],
+        'Day-Date': ['DAY-DATE', 'DAY DATE'],
+    }
+    classifier = KeywordLineClassifier(lines, default='その他ROLEX')
+
+    def naive(title_upper):
+        for line_name, keywords in lines.items():
+            for kw in keywords:
+                if kw in title_upper:
+                    return line_name
+        return 'その他ROLEX'
+
+    samples = [
+        'ROLEX SUBMARINER 16610',
+        'ROLEX GMT MASTER II DATEJUST',
+        'ROLEX DAY DATE 18238',
+        'ROLEX OYSTER PERPETUAL',
+        'ROLEX SUBDIAL GMT',
+        '',
+    ]
+    for s in samples:
+        assert classifier.classify(s) == naive(s), s
+    print("  ✓ classify（従来ロジックと一致）")
+
+    series = pd.Series(samples + [samples[0], None], index=range(10, 18))
+    result = classifier.classify_series(series)
+    assert list(result.index) == list(series.index)
+    assert result.iloc[-2] == 'Submariner'
+    assert result.iloc[-1] == 'その他ROLEX'
+    print("  ✓ classify_series")
+
+    result = classifier.classify_titles(pd.Series(['Rolex Datejust 16233', 'Rolex Explorer']))
+    assert list(result) == ['Datejust', 'その他ROLEX']
+    print("  ✓ classify_titles")
+
+    print("\n✅ すべてのテスト成功")
@@ -0,0 +1,414 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+型番抽出エンジン
+ブランドごとの型番パターンを優先順位付きで事前コンパイルし、
+タイトルのSeriesを str.extract でまとめて抽出する
+
+- パターンは上から順に評価し、最初にマッチしたものを採用
+- 各パターンは「最初のマッチ」に除外ルール（先頭文字・数値範囲）を適用し、
+  除外された場合は次のパターンに進む（従来の re.search 連鎖と同じ挙動）
+- 1件ずつの extract と Series一括の extract_series は同じ結果を返す
+- 一括抽出の結果は utils.classification_cache に保存され、
+  パターンが変わらない限り同じタイトルは再抽出しない
+"""
+import re
+
+import pandas as pd
+
+from utils.classification_cache import cached_classify, classifier_version
+
+
+class ModelNumberRule:
+    """
+    型番パターン1つ分のルール
+
+    Args:
+        pattern: 正規表現（型番部分をキャプチャグループ1つで囲む）
+        flags: reモジュールのフラグ（例: re.IGNORECASE）
+        exclude_prefixes: この先頭文字で始まるマッチは除外（例: ('39', '68')）
+        exclude_range: この数値範囲（両端含む）のマッチは除外（例: (1970, 2025)）
+        exclude_values: このいずれかと一致するマッチは除外（例: ('WRISTWATCH', 'WATCH')）
+        range_digits: exclude_range を先頭N文字の数値で判定する（Noneならマッチ全体）
+    """
+
+    def __init__(self, pattern, flags=0, exclude_prefixes=None, exclude_range=None,
+                 exclude_values=None, range_digits=None):
+        self.regex = re.compile(pattern, flags)
+        if self.regex.groups != 1:
+            raise ValueError(f"キャプチャグループは1つにしてください: {pattern}")
+        self.exclude_prefixes = tuple(exclude_prefixes) if exclude_prefixes else None
+        self.exclude_range = exclude_range
+        self.exclude_values = frozenset(exclude_values) if exclude_values else None
+        self.range_digits = range_digits
+
+    def signature(self):
+        """抽出結果を左右する設定（分類キャッシュのバージョン計算用）"""
+        signature = [self.regex.pattern, self.regex.flags, self.exclude_prefixes, self.exclude_range]
+        # 追加した設定は指定時のみ含める（既存ルールのバージョンを変えない）
+        if self.exclude_values:
+            signature.append(sorted(self.exclude_values))
+        if self.range_digits is not None:
+            signature.append(self.range_digits)
+        return signature
+
+    def _range_value(self, model):
+        return int(model[:self.range_digits] if self.range_digits is not None else model)
+
+    def is_excluded(self, model):
+        """マッチした型番が除外対象か"""
+        if self.exclude_prefixes and model.startswith(self.exclude_prefixes):
+            return True
+        if self.exclude_values and model in self.exclude_values:
+            return True
+        if self.exclude_range is not None:
+            low, high = self.exclude_range
+            if low <= self._range_value(model) <= high:
+                return True
+        return False
+
+    def excluded_mask(self, models):
+        """除外対象かどうかのマスク（modelsは欠損値を含まないSeries）"""
+        mask = pd.Series(False, index=models.index)
+        if self.exclude_prefixes:
+            mask |= models.map(lambda m: m.startswith(self.exclude_prefixes)).astype(bool)
+        if self.exclude_values:
+            mask |= models.isin(list(self.exclude_values))
+        if self.exclude_range is not None:
+            low, high = self.exclude_range
+            values = models.map(self._range_value)
+            mask |= (values >= low) & (values <= high)
+        return mask
+
+
+class ModelNumberExtractor:
+    """
+    1ブランド分の型番抽出器
+
+    Args:
+        rules: ModelNumberRule または正規表現文字列のリスト（優先順位順）
+        upper: Trueならタイトルを str(title).upper() で正規化（Falseなら str(title)）
+        default: 抽出できなかった場合の値（None または "N/A" など）
+    """
+
+    def __init__(self, rules, upper=True, default=None):
+        self.rules = [r if isinstance(r, ModelNumberRule) else ModelNumberRule(r) for r in rules]
+        self.upper = upper
+        self.default = default
+        self.version = classifier_version([r.signature() for r in self.rules], upper, default)
+
+    def _normalize(self, title):
+        text = str(title)
+        return text.upper() if self.upper else text
+
+    def extract(self, title):
+        """
+        タイトル1件から型番を抽出
+
+        Args:
+            title: タイトル
+
+        Returns:
+            型番（抽出失敗時はdefault）
+        """
+        text = self._normalize(title)
+        for rule in self.rules:
+            match = rule.regex.search(text)
+            if match and not rule.is_excluded(match.group(1)):
+                return match.group(1)
+        return self.default
+
+    def _extract_texts(self, texts):
+        """正規化済みタイトル（object型Series）から型番を抽出"""
+        values = pd.Series([self.default] * len(texts), index=texts.index, dtype=object)
+        pending = pd.Series(True, index=texts.index)
+
+        for rule in self.rules:
+            if not pending.any():
+                break
+            target = texts[pending]
+            matched = target.str.extract(rule.regex, expand=False).dropna()
+            if len(matched) == 0:
+                continue
+            matched = matched[~rule.excluded_mask(matched)]
+            values.loc[matched.index] = matched
+            pending.loc[matched.index] = False
+
+        return values.tolist()
+
+    def extract_series(self, titles, use_cache=True):
+        """
+        タイトルのSeriesから型番を一括抽出
+
+        Args:
+            titles: タイトルのSeries
+            use_cache: Trueなら分類キャッシュを使い、未抽出のタイトルだけ処理
+
+        Returns:
+            型番のSeries（indexは入力と同じ、抽出失敗はdefault）
+        """
+        # \b と \d をPythonのreと同じUnicode判定にするため、object型のまま抽出する
+        texts = titles.map(str).astype(object)
+        if self.upper:
+            texts = texts.str.upper().astype(object)
+
+        if use_cache:
+            values = cached_classify(texts, 'model_number', self.version, self._extract_texts)
+            return pd.Series(list(values), index=titles.index)
+        return pd.Series(self._extract_texts(texts), index=titles.index)
+
+
+class ModelNumberRegistry:
+    """
+    ブランド → 型番抽出器 の対応表
+
+    Args:
+        extractors: {ブランド名: ModelNumberExtractor}
+        fallback: 登録外ブランドに使う抽出器（Noneならdefaultを返す）
+        default: fallbackがない場合の値
+    """
+
+    def __init__(self, extractors, fallback=None, default=None):
+        self.extractors = dict(extractors)
+        self.fallback = fallback
+        self.default = default
+
+    def get(self, brand):
+        """ブランドの抽出器を返す（なければfallback）"""
+        return self.extractors.get(brand, self.fallback)
+
+    def extract(self, title, brand):
+        """タイトル1件から型番を抽出"""
+        extractor = self.get(brand)
+        if extractor is None:
+            return self.default
+        return extractor.extract(title)
+
+    def extract_series(self, titles, brand):
+        """タイトルのSeriesから型番を一括抽出"""
+        extractor = self.get(brand)
+        if extractor is None:
+            return pd.Series([self.default] * len(titles), index=titles.index)
+        return extractor.extract_series(titles)
+
+
+# ============================================================
+# ROLEX（rebuild_rolex_v3_complete.py）
+# 優先順位: 6桁 > 5桁 > 4桁（新しいモデルを優先）
+# ============================================================
+ROLEX_V3_EXTRACTOR = ModelNumberExtractor([
+    # 6桁数字（最新モデル）116528, 126303など ※ボックス型番（39xxx, 68xxx）を除外
+    ModelNumberRule(r'\b(\d{6})\b', exclude_prefixes=('39', '68')),
+    # 5桁数字（主要モデル）16233, 16610など ※ボックス型番（39xxx）を除外
+    ModelNumberRule(r'\b(\d{5})\b', exclude_prefixes=('39',)),
+    # 4桁数字（ヴィンテージ）5512, 6917など ※年号（1970-2025）を除外
+    ModelNumberRule(r'\b(\d{4})\b', exclude_range=(1970, 2025)),
+])
+
+
+# ============================================================
+# ブランド別詳細分析Excel（export_brand_analysis_excel.py）
+# ============================================================
+EXCEL_MODEL_REGISTRY = ModelNumberRegistry({
+    'SEIKO': ModelNumberExtractor([
+        r'\b([567][A-Z]{3}[0-9]{3,4}[A-Z]?)\b',
+        r'\b(SBD[CX]\d{3})\b',
+        r'\b(SRP[A-Z]?\d{3})\b',
+        r'\b(SKX\d{3})\b',
+        r'\b(SNZG\d{2})\b',
+    ]),
+    'CASIO': ModelNumberExtractor([
+        r'\b([A-Z]{2,3}-[A-Z0-9]{3,5}(?:-\d+)?[A-Z]?)\b',
+        r'\b(G-[A-Z0-9]{4,6})\b',
+        r'\b(DW-[A-Z0-9]{4,6})\b',
+        r'\b(GA-[A-Z0-9]{4,6})\b',
+    ]),
+    'OMEGA': ModelNumberExtractor([
+        r'\b(\d{3}\.\d{2}\.\d{2}\.\d{2}\.\d{2}\.\d{3})\b',
+        r'\b(\d{4}\.\d{2}\.\d{2})\b',
+    ]),
+    'ROLEX': ModelNumberExtractor([
+        r'\b(\d{5,6})\b',
+    ]),
+    'TAG HEUER': ModelNumberExtractor([
+        r'\b([A-Z]{2,3}\d{4})\b',
+        r'\b([A-Z]{3}\.\d{3}\.[A-Z]\d{1,2})\b',
+    ]),
+})
+
+
+# ============================================================
+# ブランド詳細分析JSON（generate_brand_detail_json.py）
+# 大文字化せず、大文字小文字を区別しないで検索
+# ============================================================
+def _detail_json_extractor(pattern):
+    return ModelNumberExtractor([ModelNumberRule(pattern, re.IGNORECASE)], upper=False)
+
+
+DETAIL_JSON_MODEL_REGISTRY = ModelNumberRegistry({
+    'SEIKO': _detail_json_extractor(r'(SPB\d{3}|SBDC\d{3}|SARB\d{3}|SNK\d{3}|SRPD?\d{2,3}|SSC\d{3}|SUR\d{3}|SNXS?\d{2,3}|SNA\d{3}|SKX\d{3}|SBDX\d{3}|SARX\d{3}|SBGX?\d{3}|SRP\d{3}|SNZG?\d{2}|SNKE?\d{2}|SBBN\d{3})'),
+    'CASIO': _detail_json_extractor(r'(G[A-Z]?[WMS]?-?\d{3,5}[A-Z]*|DW-?\d{4}[A-Z]*|GW[A-Z]?-?\d{4,5}[A-Z]*|GA[A-Z]?-?\d{3,4}[A-Z]*|MTP-?\d{4}[A-Z]*|EF[A-Z]?-?\d{3}[A-Z]*|PRG-?\d{3}[A-Z]*|OCW-?\d{2,4}[A-Z]*)'),
+    'OMEGA': _detail_json_extractor(r'([\d\.]+/[\d\.]+|Ref\.?\s*[\d\.]+)'),
+    'CITIZEN': _detail_json_extractor(r'(BN\d{4}|BJ\d{4}|AT\d{4}|CB\d{4}|BL\d{4}|AW\d{4}|NH\d{4}|NJ\d{4})'),
+    'Orient': _detail_json_extractor(r'(FAC\d{5}|RA-[A-Z]{2}\d{4}|FER\d{5}|SAA\d{5})'),
+    'TAG HEUER': _detail_json_extractor(r'(WAR\d{3,4}|WAZ\d{4}|CAR\d{3,4}|WBD\d{4}|CBN\d{4})'),
+    'GUCCI': _detail_json_extractor(r'(YA\d{3,6})'),
+    'ROLEX': _detail_json_extractor(r'(\d{4,6})'),
+    'Hamilton': _detail_json_extractor(r'(H\d{8})'),
+    'Longines': _detail_json_extractor(r'(L[\d\.]+)'),
+    'Cartier': _detail_json_extractor(r'(W\d{7}|WSTA\d{4})'),
+    'RADO': _detail_json_extractor(r'(R\d{8}|01\.\d{3}\.\d{4})'),
+}, fallback=_detail_json_extractor(r'([A-Z]{2,4}[\-]?\d{3,6}[A-Z]*)'))
+
+
+# ============================================================
+# CITIZEN戦略クラス（strategies/citizen.py）
+# ============================================================
+CITIZEN_EXTRACTOR = ModelNumberExtractor([
+    # アルファベット+数字+ハイフン+数字
+    r'\b([A-Z]{2,3}\d{4}-\d{2}[A-Z]{0,2})\b',
+    # 4桁-5桁（ヴィンテージ用）
+    r'\b(\d{4}-\d{5,6})\b',
+], default="N/A")
+
+
+
+# ============================================================
+# ブランド戦略クラス（strategies/*.py、パターンは各 rebuild_*_v3_complete.py と同じ）
+# 戦略クラスは大文字化済みタイトルを渡し、抽出失敗は "N/A"
+# ============================================================
+SEIKO_EXTRACTOR = ModelNumberExtractor([
+    # 4桁-4桁（5740-8000、7731-5120等）
+    r'\b(\d{4}-\d{4})\b',
+    # アルファベット+数字（SBGA211、SRPD51、SNK809等）
+    r'\b([A-Z]{2,4}\d{3,5}[A-Z]{0,2})\b',
+], default="N/A")
+
+CASIO_EXTRACTOR = ModelNumberExtractor([
+    # アルファベット+ハイフン+数字（DW-5600、GA-2100等）
+    r'\b([A-Z]{2,4}-[A-Z]?\d{3,5}[A-Z]{0,3})\b',
+], default="N/A")
+
+ORIENT_EXTRACTOR = ModelNumberExtractor([
+    # 英字2桁+数字2桁+英数字（FAC00009、RA-AA0001等）
+    r'([A-Z]{2}\d{2}[A-Z0-9-]{3,})',
+], default="N/A")
+
+OMEGA_EXTRACTOR = ModelNumberExtractor([
+    # 3桁.2桁.2桁.2桁.2桁.3桁（121.92.41.50.01.001）
+    r'\b(\d{3}\.\d{2}\.\d{2}\.\d{2}\.\d{2}\.\d{3})\b',
+    # 4桁.2桁（3510.12）
+    r'\b(\d{4}\.\d{2})\b',
+    # 3桁.4桁.1桁（195.0076.1）
+    r'\b(\d{3}\.\d{4}\.\d)\b',
+    # 3桁.4桁（166.0117）
+    r'\b(\d{3}\.\d{4})\b',
+], default="N/A")
+
+ROLEX_EXTRACTOR = ModelNumberExtractor(ROLEX_V3_EXTRACTOR.rules, default="N/A")
+
+TAG_HEUER_EXTRACTOR = ModelNumberExtractor([
+    # 最新W系（WAZ1010、WBN2111.BA0627）
+    r'\b(W[A-Z]{2}\d{4}(?:\.[A-Z]{2}\d{4})?)\b',
+    # Carrera系（CAR2111、CAZ1011）
+    r'\b(CA[RZVH]\d{4})\b',
+    # CBE/CBA等最新（CBE2110、CBN2011）
+    r'\b(CB[EAN]\d{4})\b',
+    # CG系（CG1123-0）
+    r'\b(CG\d{4}-\d)\b',
+    # C系汎用（CN1111、CW2111）
+    r'\b(C[NWSAVK]\d{4})\b',
+    # CV/CB系（CV2014、CB1111）
+    r'\b(C[VB]\d{4})\b',
+    # 古いW系（WE1210、WG1212-K0）
+    r'\b(W[EKGN]\d{4}(?:-[A-Z]\d)?)\b',
+    # S系古い型番（S90.813）
+    r'\b(S\d{2}\.\d{3}[A-Z]?)\b',
+    # 3桁.3桁（962.213）
+    r'\b(\d{3}\.\d{3}[A-Z]?)\b',
+], default="N/A")
+
+GUCCI_EXTRACTOR = ModelNumberExtractor([
+    # 4桁L/M（9000L、1500L）
+    r'\b(\d{4}[LM])\b',
+    # YA番号（YA1264123）
+    r'(YA\d{6,7})',
+    # 126.X（126.4）
+    r'(126\.\d)',
+], default="N/A")
+
+HAMILTON_EXTRACTOR = ModelNumberExtractor([
+    # H + 5-10桁数字（H24555331等）
+    r'\b(H\d{5,10})\b',
+    # 数字のみ 6-8桁（706050等） ※先頭4桁が年号（1900-2025）のものを除外
+    ModelNumberRule(r'\b(\d{6,8})\b', exclude_range=(1900, 2025), range_digits=4),
+], default="N/A")
+
+RADO_EXTRACTOR = ModelNumberExtractor([
+    # 5桁.4桁.1桁（68396.0068.3）
+    r'\b(\d{5}\.\d{4}\.\d)\b',
+    # 2桁-3桁.4桁.1桁（67-396.0067.3）
+    r'\b(\d{2}-\d{3}\.\d{4}\.\d)\b',
+    # 3桁.4桁.1桁+英字（153.3606.2N）
+    r'\b(\d{3}\.\d{4}\.\d[A-Z]?)\b',
+    # 5桁/数字（11675/1）
+    r'\b(\d{5}/\d+)\b',
+    # R+8桁（R14061106）
+    r'\b(R\d{8})\b',
+    # 8桁+英字（20440794N） ※19xx/20xxで始まるもの（年号）を除外
+    ModelNumberRule(r'\b(\d{8}[A-Z]?)\b', exclude_prefixes=('19', '20')),
+    # 5桁のみ（11006） ※年号を除外
+    ModelNumberRule(r'\b(\d{5})\b', exclude_prefixes=('19', '20')),
+    # 3桁.4桁（332.7818）
+    r'\b(\d{3}\.\d{4})\b',
+], default="N/A")
+
+
+if __name__ == '__main__':
+    print("✅ 型番抽出エンジンテスト")
+
+    titles = pd.Series([
+        'Rolex Submariner 116610LN',
+        'ROLEX BOX 39139 68.00.01 5513',
+        'Rolex Datejust 16233 1985',
+        'Rolex 1675 GMT',
+        'ロレックス116610',
+        None,
+    ], index=range(10, 16))
+
+    expected = [None, '5513', '16233', '1675', None, None]
+    assert [ROLEX_V3_EXTRACTOR.extract(t) for t in titles] == expected
+    result = ROLEX_V3_EXTRACTOR.extract_series(titles)
+    assert list(result.index) == list(titles.index)
+    assert [None if pd.isna(v) else v for v in result] == expected
+    print("  ✓ ROLEX（ボックス型番・年号の除外）")
+
+    assert EXCEL_MODEL_REGISTRY.extract('Seiko 5 SNK809 automatic', 'SEIKO') is None
+    assert EXCEL_MODEL_REGISTRY.extract('Seiko SKX007 diver', 'SEIKO') == 'SKX007'
+    assert EXCEL_MODEL_REGISTRY.extract('anything 12345', 'GUCCI') is None
+    assert DETAIL_JSON_MODEL_REGISTRY.extract('gucci ya126.4 watch', 'GUCCI') == 'ya126'
+    assert DETAIL_JSON_MODEL_REGISTRY.extract('Fossil FS-4656 chrono', 'FOSSIL') == 'FS-4656'
+    print("  ✓ ブランド別レジストリ")
+
+    titles = pd.Series(['CITIZEN BN0150-28E PROMASTER', 'CITIZEN 4820-567890 VINTAGE', 'CITIZEN QUARTZ'])
+    assert list(CITIZEN_EXTRACTOR.extract_series(titles)) == ['BN0150-28E', '4820-567890', 'N/A']
+    print("  ✓ CITIZEN（抽出失敗時はN/A）")
+
+    assert HAMILTON_EXTRACTOR.extract('HAMILTON KHAKI 19851234') == 'N/A'
+    assert HAMILTON_EXTRACTOR.extract('HAMILTON VENTURA 706050') == '706050'
+    assert RADO_EXTRACTOR.extract('RADO DIASTAR 20440794N 11006') == '11006'
+    assert TAG_HEUER_EXTRACTOR.extract('TAG HEUER CV2014 WAZ1010') == 'WAZ1010'
+    assert ROLEX_EXTRACTOR.extract('ROLEX BOX 39139') == 'N/A'
+    print("  ✓ ブランド戦略クラス用（除外ルール・パターンの優先順位）")
+
+    extractor = ModelNumberExtractor([
+        ModelNumberRule(r'\b(W[A-Z0-9]{5,10})\b', exclude_values=('WRISTWATCH',)),
+        ModelNumberRule(r'\b(\d{6,8})\b', exclude_range=(1900, 2025), range_digits=4),
+    ])
+    titles = pd.Series(['CARTIER WRISTWATCH W2601 2019', 'CARTIER WRISTWATCH 19991234', 'CARTIER WSTA0029 TANK'])
+    expected = [None, None, 'WSTA0029']
+    assert [extractor.extract(t) for t in titles] == expected
+    assert [None if pd.isna(v) else v for v in extractor.extract_series(titles, use_cache=False)] == expected
+    print("  ✓ 除外値・先頭N桁の年号除外")
+
+    print("\n✅ すべてのテスト成功")
@@ -0,0 +1,375 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+販売月ごとのパーティション保存
+時計データを販売月（YYYY-MM）ごとのファイルに分けて保存し、
+月ごとの集計（utils.delta_stats のマージ可能な集計）を事前計算しておく
+
+- 保存先は .cache/partitions/<CSVパスのハッシュ>/
+  - month=YYYY-MM.parquet（pyarrowが無い・変換できない場合は .pkl）: その月の行
+  - month=YYYY-MM.summary.json: その月の集計 {集計名: DeltaStats.to_dict()}
+  - manifest.json: 月ごとの件数・販売数、元CSVのサイズとmtime
+- 月別推移・期間指定の分析は、必要な月の集計/ファイルだけを読む
+- 追加時は行のある月だけを書き直す（新しい月はファイルを足すだけで、過去の月は触らない）
+- 販売日が欠損・不正な行は month=none に保存（期間指定の読み込み・月別集計には含めない）
+- 保存時のCSVと一致しない場合（手動編集・全件マージ後など）は全件から作り直す
+"""
+import hashlib
+import io
+import json
+import os
+import pickle
+import shutil
+
+import pandas as pd
+
+from utils.data_loader import CACHE_DIR, HAS_PYARROW, build_typed_frame, load_watch_data
+from utils.dedup_index import csv_signature
+from utils.delta_stats import DeltaStats
+
+
+# パーティションの保存先
+PARTITION_DIR = os.path.join(CACHE_DIR, 'partitions')
+
+# 保存形式のバージョン（パーティション・集計の作り方を変えたら上げる）
+PARTITION_VERSION = 1
+
+# 販売日が欠損・不正な行のパーティション名
+NO_MONTH = 'none'
+
+# 月ごとに保持する集計 {名前: キー列}
+SUMMARY_TABLES = {
+    'condition': ['商品状態'],
+    'brand_condition': ['ブランド', '商品状態'],
+    'movement_condition': ['駆動方式', '商品状態'],
+}
+
+
+def month_labels(dates):
+    """
+    販売日を販売月の文字列に変換
+
+    Args:
+        dates: 販売日のSeries（datetimeまたは日付文字列）
+
+    Returns:
+        'YYYY-MM' のSeries（dt.to_period('M') の文字列表現と同じ。欠損・不正は NO_MONTH）
+    """
+    return pd.to_datetime(dates, errors='coerce').dt.strftime('%Y-%m').fillna(NO_MONTH)
+
+
+class MonthPartitionStore:
+    """
+    CSV1つ分の販売月パーティション
+
+    Args:
+        csv_path: 時計データCSVのパス
+        tables: 月ごとに保持する集計 {名前: キー列}
+        root: 保存先
+
+    Attributes:
+        partitions: {販売月: {'rows': 件数, 'sales': 販売数, 'format': 'parquet'|'pickle'}}
+    """
+
+    def __init__(self, csv_path, tables=SUMMARY_TABLES, root=PARTITION_DIR):
+        self.csv_path = str(csv_path)
+        self.tables = {name: list(keys) for name, keys in tables.items()}
+        key = hashlib.sha1(os.path.abspath(self.csv_path).encode('utf-8')).hexdigest()[:16]
+        self.root = os.path.join(root, key)
+        self.partitions = {}
+        self.columns = []
+        self._summaries = {}
+
+    @property
+    def _manifest_path(self):
+        return os.path.join(self.root, 'manifest.json')
+
+    def _data_path(self, month, fmt):
+        return os.path.join(self.root, f'month={month}.' + ('parquet' if fmt == 'parquet' else 'pkl'))
+
+    def _summary_path(self, month):
+        return os.path.join(self.root, f'month={month}.summary.json')
+
+    @property
+    def rows(self):
+        return sum(p['rows'] for p in self.partitions.values())
+
+    def open(self):
+        """
+        保存済みのパーティションを読み込む（CSVと一致しない・存在しない場合は全件から作成）
+
+        Returns:
+            self
+        """
+        if not self._load():
+            self.rebuild()
+        return self
+
+    def _load(self):
+        try:
+            with open(self._manifest_path, 'r', encoding='utf-8') as f:
+                manifest = json.load(f)
+        except (OSError, ValueError):
+            return False
+
+        if (manifest.get('version') != PARTITION_VERSION or manifest.get('csv') != csv_signature(self.csv_path)
+                or manifest.get('tables') != self.tables):
+            return False
+
+        self.partitions = manifest['partitions']
+        self.columns = manifest['columns']
+        self._summaries = {}
+        print(f"✓ 販売月パーティションを読み込み: {len(self.partitions)}か月分（{self.rows:,}件）")
+        return True
+
+    def rebuild(self):
+        """CSV全件からパーティションと月ごとの集計を作り直す"""
+        print("🔧 販売月パーティションを全件から作成中...")
+        df = load_watch_data(self.csv_path)
+        shutil.rmtree(self.root, ignore_errors=True)
+        os.makedirs(self.root, exist_ok=True)
+
+        self.partitions = {}
+        self.columns = list(df.columns)
+        self._summaries = {}
+        for month, part in df.groupby(month_labels(df['販売日']), sort=True):
+            self._write_month(month, part.reset_index(drop=True), self._aggregate(part))
+        self._save_manifest()
+        print(f"✓ 販売月パーティションを作成: {len(self.partitions)}か月分（{self.rows:,}件）")
+
+    def _aggregate(self, df):
+        return {name: DeltaStats.from_frame(df, keys) for name, keys in self.tables.items()}
+
+    def _write_month(self, month, df, summary):
+        """1か月分の行と集計を保存"""
+        previous = self.partitions.get(month)
+        fmt = 'pickle'
+        if HAS_PYARROW:
+            try:
+                df.to_parquet(self._data_path(month, 'parquet'), index=False)
+                fmt = 'parquet'
+            except Exception:
+                # 型が混在した列などでArrow変換できない場合はpickleにフォールバック
+                fmt = 'pickle'
+        if fmt == 'pickle':
+            with open(self._data_path(month, 'pickle'), 'wb') as f:
+                pickle.dump(df, f, protocol=pickle.HIGHEST_PROTOCOL)
+        if previous is not None and previous['format'] != fmt:
+            os.remove(self._data_path(month, previous['format']))
+
+        with open(self._summary_path(month), 'w', encoding='utf-8') as f:
+            json.dump({name: stats.to_dict() for name, stats in summary.items()}, f, ensure_ascii=False)
+
+        self.partitions[month] = {'rows': len(df), 'sales': int(df['販売数'].sum()), 'format': fmt}
+        self._summaries[month] = summary
+
+    def _save_manifest(self):
+        manifest = {
+            'version': PARTITION_VERSION,
+            'csv': csv_signature(self.csv_path),
+            'tables': self.tables,
+            'columns': self.columns,
+            'partitions': dict(sorted(self.partitions.items())),
+        }
+        with open(self._manifest_path, 'w', encoding='utf-8') as f:
+            json.dump(manifest, f, ensure_ascii=False, indent=2)
+
+    def append(self, df_new):
+        """
+        CSVに追記した行をパーティションに追加（行のある月だけ書き直し、集計は足し込む）
+
+        CSVへの追記（utils.data_loader.append_rows）の後に呼ぶ。
+        追記後のCSVのサイズ・mtimeを記録するので、次回の open() で作り直しにならない
+
+        Args:
+            df_new: 追記した行（属性生成済み。CSVと同じ列）
+
+        Returns:
+            書き直した販売月のリスト
+        """
+        if len(df_new) == 0:
+            return []
+
+        # CSV経由で読み込んだ場合と同じ型にする
+        text = df_new.reindex(columns=[c for c in self.columns if c != 'タイトル_upper']).to_csv(index=False)
+        added = build_typed_frame(pd.read_csv(io.StringIO(text)))[self.columns]
+
+        touched = []
+        for month, part in added.groupby(month_labels(added['販売日']), sort=True):
+            summary = self._aggregate(part)
+            if month in self.partitions:
+                part = pd.concat([self._read_month(month), part], ignore_index=True)
+                previous = self.summaries(month)
+                for name, stats in summary.items():
+                    previous[name].merge(stats)
+                summary = previous
+            self._write_month(month, part.reset_index(drop=True), summary)
+            touched.append(month)
+        self._save_manifest()
+        return touched
+
+    def months(self, start=None, end=None):
+        """
+        保存されている販売月（昇順。NO_MONTH は含めない）
+
+        Args:
+            start: 開始月 'YYYY-MM'（この月を含む。Noneなら最初から）
+            end: 終了月 'YYYY-MM'（この月を含む。Noneなら最後まで）
+        """
+        return [m for m in sorted(self.partitions)
+                if m != NO_MONTH and (start is None or m >= start) and (end is None or m <= end)]
+
+    def _read_month(self, month):
+        fmt = self.partitions[month]['format']
+        if fmt == 'parquet':
+            return pd.read_parquet(self._data_path(month, fmt))
+        with open(self._data_path(month, fmt), 'rb') as f:
+            return pickle.load(f)
+
+    def read(self, months=None, start=None, end=None, columns=None):
+        """
+        指定した月の行だけを読み込む
+
+        Args:
+            months: 販売月のリスト（指定した場合は start/end より優先）
+            start: 開始月 'YYYY-MM'
+            end: 終了月 'YYYY-MM'
+            columns: 読み込む列（Noneなら全列）
+
+        Returns:
+            DataFrame（月の昇順に連結。月・期間を指定しない場合は販売日が欠損の行も含む）
+        """
+        if months is None:
+            months = self.months(start, end)
+            if start is None and end is None and NO_MONTH in self.partitions:
+                months.append(NO_MONTH)
+        frames = [self._read_month(m) for m in months if m in self.partitions]
+        if not frames:
+            return pd.DataFrame(columns=columns if columns is not None else self.columns)
+        df = pd.concat(frames, ignore_index=True)
+        return df[list(columns)] if columns is not None else df
+
+    def summaries(self, month):
+        """
+        1か月分の集計
+
+        Returns:
+            {集計名: DeltaStats}
+        """
+        if month not in self._summaries:
+            with open(self._summary_path(month), 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            self._summaries[month] = {name: DeltaStats.from_dict(d) for name, d in data.items()}
+        return self._summaries[month]
+
+    def stats(self, table, start=None, end=None):
+        """
+        期間内の月の集計をマージ（行を読み込まずに期間全体の統計を得る）
+
+        Args:
+            table: 集計名（例: 'brand_condition'）
+            start: 開始月 'YYYY-MM'
+            end: 終了月 'YYYY-MM'
+
+        Returns:
+            DeltaStats
+        """
+        merged = DeltaStats(self.tables[table])
+        for month in self.months(start, end):
+            merged.merge(self.summaries(month)[table])
+        return merged
+
+    def monthly(self, table, match=None, start=None, end=None):
+        """
+        月×グループごとの件数・販売数
+
+        Args:
+            table: 集計名（例: 'movement_condition'）
+            match: キー列の値で絞り込む {列名: 値}（例: {'商品状態': '完品'}）
+            start: 開始月 'YYYY-MM'
+            end: 終了月 'YYYY-MM'
+
+        Returns:
+            DataFrame（列: 販売月・キー列・items・sales。販売月、キーの順に昇順）
+        """
+        keys = self.tables[table]
+        match = match or {}
+        positions = {keys.index(col): value for col, value in match.items()}
+        rows = []
+        for month in self.months(start, end):
+            for key, agg in self.summaries(month)[table].groups.items():
+                if all(key[p] == value for p, value in positions.items()):
+                    rows.append((month, *key, agg.items, agg.sales))
+        result = pd.DataFrame(rows, columns=['販売月', *keys, 'items', 'sales'])
+        result = result.sort_values(['販売月', *keys], kind='stable').reset_index(drop=True)
+        return result.astype({'items': 'int64', 'sales': 'int64'})
+
+
+if __name__ == '__main__':
+    import tempfile
+
+    import numpy as np
+
+    import utils.data_loader as data_loader
+    from utils.data_loader import append_rows
+
+    # 一時CSVの型付きキャッシュは一時ディレクトリに作る（リポジトリの .cache/ に残さない）
+    cache_dir = tempfile.TemporaryDirectory()
+    data_loader.CACHE_DIR = cache_dir.name
+
+    # 簡易テスト（月ごとの集計・期間指定の読み込みが、全件からの集計と一致すること）
+    rng = np.random.default_rng(0)
+    n = 3000
+    dates = ['2025-11-30', '2025-12-01', '2025-12-31', '2026-01-15', 'not a date']
+    df = pd.DataFrame({
+        'タイトル': [f'WATCH {i}' for i in range(n)],
+        'ブランド': rng.choice(['SEIKO', 'CASIO'], n),
+        '価格': rng.gamma(2.0, 150.0, n).round(2),
+        '販売数': rng.integers(1, 4, n),
+        '販売日': rng.choice(dates, n),
+        '商品状態': rng.choice(['完品', 'パーツ'], n),
+        '駆動方式': rng.choice(['自動巻き', 'クォーツ'], n),
+    })
+
+    def expected_monthly(frame):
+        frame = load_watch_data(csv_path) if frame is None else frame
+        frame = frame[frame['商品状態'] == '完品']
+        return frame.groupby([frame['販売日'].dt.to_period('M').astype(str), '駆動方式'])['販売数'].sum()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        csv_path = os.path.join(tmp, 'data.csv')
+        df.iloc[:2000].to_csv(csv_path, index=False)
+
+        store = MonthPartitionStore(csv_path, root=tmp).open()
+        assert store.months() == ['2025-11', '2025-12', '2026-01'] and NO_MONTH in store.partitions
+        assert store.rows == 2000
+
+        monthly = store.monthly('movement_condition', match={'商品状態': '完品'})
+        assert monthly.set_index(['販売月', '駆動方式'])['sales'].equals(expected_monthly(None).rename('sales'))
+
+        # 期間指定の読み込み
+        december = store.read(start='2025-12', end='2025-12')
+        assert (december['販売日'].dt.strftime('%Y-%m') == '2025-12').all()
+        assert len(store.read()) == 2000 and len(store.read(columns=['価格']).columns) == 1
+
+        # 追加（新しい月は既存の月を書き直さない）
+        before = os.path.getmtime(store._data_path('2025-11', store.partitions['2025-11']['format']))
+        new = df.iloc[2000:].assign(販売日=rng.choice(['2025-12-05', '2026-02-01'], n - 2000))
+        append_rows(csv_path, new)
+        assert store.append(new) == ['2025-12', '2026-02']
+        assert os.path.getmtime(store._data_path('2025-11', store.partitions['2025-11']['format'])) == before
+
+        reopened = MonthPartitionStore(csv_path, root=tmp).open()
+        full = load_watch_data(csv_path)
+        assert reopened.rows == len(full)
+        monthly = reopened.monthly('movement_condition', match={'商品状態': '完品'})
+        assert monthly.set_index(['販売月', '駆動方式'])['sales'].equals(expected_monthly(full).rename('sales'))
+        merged = reopened.stats('brand_condition').summary()
+        assert (merged['items'].sum() == full['販売日'].notna().sum())
+
+        # CSVが変わった場合は作り直す
+        df.iloc[:100].to_csv(csv_path, index=False)
+        assert MonthPartitionStore(csv_path, root=tmp).open().rows == 100
+
+    cache_dir.cleanup()
+    print("✅ month_partitions テスト完了")
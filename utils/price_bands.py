@@ -0,0 +1,265 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+価格帯ヒストグラム
+価格帯の区切り（PriceBands）を定義しておき、全価格を1回の
+np.searchsorted + np.bincount で価格帯に振り分ける
+
+従来の「価格帯ごとに全価格を走査（len([p for p in prices if ...]) や
+df[(df['価格'] >= lo) & (df['価格'] < hi)]）」を置き換える。
+グループ（ライン・駆動方式など）を指定すると、全グループ×全価格帯を
+同じ1回の bincount で集計する。複数の区切り（粗い区切り・50ドル刻み・
+任意の区切り）を指定した場合もグループの因数分解は1回だけ行う
+"""
+import numpy as np
+import pandas as pd
+
+
+class PriceBands:
+    """
+    価格帯の区切り
+
+    Args:
+        edges: 区切りの値（昇順、両端を含む。上限なしは float('inf')、下限なしは float('-inf')）
+        labels: 価格帯のラベル（len(edges) - 1 個）
+        right: Trueなら右端を含む (lo, hi]（pd.cutの既定と同じ）、Falseなら左端を含む [lo, hi)
+
+    範囲外・欠損値の価格はどの価格帯にも数えない
+    """
+
+    def __init__(self, edges, labels, right=False):
+        edges = np.asarray(edges, dtype=float)
+        if len(edges) < 2 or np.any(np.diff(edges) <= 0):
+            raise ValueError(f"価格帯の区切りは2つ以上の昇順の値が必要です: {list(edges)}")
+        if len(labels) != len(edges) - 1:
+            raise ValueError(f"ラベル数({len(labels)})が価格帯の数({len(edges) - 1})と一致しません")
+        self.edges = edges
+        self.labels = list(labels)
+        self.right = right
+
+    def __len__(self):
+        return len(self.labels)
+
+    def index(self, prices):
+        """
+        各価格の価格帯番号
+
+        Args:
+            prices: 価格の配列またはSeries
+
+        Returns:
+            価格帯番号のint配列（範囲外・欠損値は -1）
+        """
+        prices = np.asarray(prices, dtype=float)
+        # right=True: (lo, hi] -> side='left'、right=False: [lo, hi) -> side='right'
+        idx = np.searchsorted(self.edges, prices, side='left' if self.right else 'right') - 1
+        idx[(idx < 0) | (idx >= len(self)) | np.isnan(prices)] = -1
+        return idx
+
+    def counts(self, prices, weights=None):
+        """
+        価格帯ごとの件数（weightsを指定すると合計）
+
+        Args:
+            prices: 価格の配列またはSeries
+            weights: 合計する値（例: 販売数）。Noneなら件数
+
+        Returns:
+            価格帯ごとの値の配列（weightsが整数なら整数配列）
+        """
+        return band_counts(prices, self, weights=weights)
+
+    def distribution(self, prices, weights=None):
+        """
+        価格帯ごとの件数を {ラベル: 件数} で返す
+
+        Args:
+            prices: 価格の配列またはSeries
+            weights: 合計する値（例: 販売数）。Noneなら件数
+
+        Returns:
+            {ラベル: 件数}（価格帯の順）
+        """
+        return dict(zip(self.labels, self.counts(prices, weights).tolist()))
+
+    def cut(self, prices):
+        """
+        各価格の価格帯ラベル（pd.cutと同じ形式）
+
+        Args:
+            prices: 価格の配列またはSeries
+
+        Returns:
+            順序付きカテゴリ型のSeries（範囲外・欠損値はNaN）
+        """
+        categories = pd.CategoricalDtype(self.labels, ordered=True)
+        values = pd.Categorical.from_codes(self.index(prices), dtype=categories)
+        index = prices.index if isinstance(prices, pd.Series) else None
+        return pd.Series(values, index=index)
+
+
+def uniform_bands(step, upper, right=False, label=None, overflow_label=None, overflow_edge=float('inf')):
+    """
+    0から一定幅の価格帯を作成（upper以上は1つの価格帯にまとめる）
+
+    Args:
+        step: 価格帯の幅（例: 50）
+        upper: まとめる価格の下限（例: 1000）
+        right: 右端を含むか（PriceBandsと同じ）
+        label: (lo, hi) からラベルを作る関数（既定: '$lo-hi'）
+        overflow_label: upper以上の価格帯のラベル（既定: '$upper+'）
+        overflow_edge: upper以上の価格帯の上限（既定: 上限なし）
+
+    Returns:
+        PriceBands
+    """
+    label = label or (lambda lo, hi: f'${lo}-{hi}')
+    edges = list(range(0, upper + 1, step)) + [overflow_edge]
+    labels = [label(lo, lo + step) for lo in range(0, upper, step)]
+    labels.append(overflow_label or f'${upper}+')
+    return PriceBands(edges, labels, right=right)
+
+
+# 粗い区切り（深掘り分析のライン・駆動方式別）
+COARSE_BANDS = PriceBands([0, 100, 200, 300, 500, 1000, 10000],
+                          ['$0-100', '$100-200', '$200-300', '$300-500', '$500-1000', '$1000+'])
+
+# 50ドル刻み（Excel出力: pd.cut(bins=[0, 50, ..., 1000, inf]) と同じ右端を含む区切り）
+DOLLAR50_BANDS = uniform_bands(50, 1000, right=True)
+
+# 50ドル刻み（駆動方式・パーツタブ: '$0-49' 形式、$1000+ は $10000 未満）
+DOLLAR50_TAB_BANDS = uniform_bands(50, 1000, label=lambda lo, hi: f'${lo}-{hi - 1}',
+                                   overflow_edge=10000)
+
+# ブランドタブ（template_brand_tab形式）の価格帯別分布
+BRAND_TAB_BANDS = PriceBands([float('-inf'), 100, 150, 200, 300, 500, 1000, 2000, float('inf')],
+                             ['~$100', '$100-150', '$150-200', '$200-300', '$300-500',
+                              '$500-1K', '$1K-2K', '$2K~'])
+
+
+def band_counts(prices, bands, groups=None, n_groups=None, weights=None):
+    """
+    価格帯ごとの件数を1回のbincountで集計
+
+    Args:
+        prices: 価格の配列
+        bands: PriceBands
+        groups: 各価格のグループ番号（0 ~ n_groups-1、-1は集計しない）。Noneならグループなし
+        n_groups: グループ数（groupsを指定した場合は必須）
+        weights: 合計する値（例: 販売数）。Noneなら件数
+
+    Returns:
+        グループなし: 価格帯ごとの配列 (len(bands),)
+        グループあり: (n_groups, len(bands)) の配列
+    """
+    idx = bands.index(prices)
+    n_bins = len(bands)
+    valid = idx >= 0
+    if groups is None:
+        flat, size = idx, n_bins
+    else:
+        groups = np.asarray(groups, dtype=np.int64)
+        valid &= groups >= 0
+        flat, size = groups * n_bins + idx, n_groups * n_bins
+
+    w = None
+    if weights is not None:
+        weights = np.asarray(weights)
+        w = weights[valid].astype(float)
+    result = np.bincount(flat[valid], weights=w, minlength=size)
+    if weights is not None and np.issubdtype(weights.dtype, np.integer):
+        result = np.rint(result).astype(np.int64)
+
+    return result if groups is None else result.reshape(n_groups, n_bins)
+
+
+def band_tables(df, bandings, by=None, value='価格', weights=None):
+    """
+    複数の価格帯区切りで、グループごとの価格帯分布をまとめて集計
+
+    Args:
+        df: 集計対象のデータフレーム
+        bandings: {名前: PriceBands}（例: {'coarse': COARSE_BANDS, '50': DOLLAR50_BANDS}）
+        by: グループ化する列名（文字列またはリスト）。Noneなら全体で1行
+        value: 価格の列（既定: 価格）
+        weights: 合計する列（例: '販売数'）。Noneなら件数
+
+    Returns:
+        {名前: DataFrame}（行: グループ（キーの昇順、キーが欠損の行は除外）、列: 価格帯ラベル）
+    """
+    prices = df[value].to_numpy(dtype=float)
+    w = df[weights].to_numpy() if weights is not None else None
+
+    if by is None:
+        groups, index = np.zeros(len(df), dtype=np.int64), pd.RangeIndex(1)
+    else:
+        keys = [by] if isinstance(by, str) else list(by)
+        grouped = df.groupby(keys, sort=True, observed=True, dropna=True)
+        # キーが欠損の行は ngroup() がNaNになるため -1 にする
+        groups = grouped.ngroup().fillna(-1).to_numpy(dtype=np.int64)
+        index = grouped.size().index
+
+    tables = {}
+    for name, bands in bandings.items():
+        counts = band_counts(prices, bands, groups=groups, n_groups=len(index), weights=w)
+        tables[name] = pd.DataFrame(counts, index=index, columns=bands.labels)
+    return tables
+
+
+def band_table(df, bands, by=None, value='価格', weights=None):
+    """
+    1つの価格帯区切りで、グループごとの価格帯分布を集計（band_tablesの1区切り版）
+
+    Returns:
+        DataFrame（行: グループ、列: 価格帯ラベル）
+    """
+    return band_tables(df, {'bands': bands}, by=by, value=value, weights=weights)['bands']
+
+
+if __name__ == '__main__':
+    # 簡易テスト（pd.cut・従来のループ集計と一致すること）
+    rng = np.random.default_rng(0)
+    n = 20000
+    prices = np.concatenate([rng.gamma(2.0, 200.0, n).round(2), [0, 50, 100, 1000, 10000, 20000, -5, np.nan]])
+    sales = rng.integers(1, 4, len(prices))
+
+    # 右端を含む区切り（pd.cut と同じ）
+    expected = pd.cut(pd.Series(prices), bins=DOLLAR50_BANDS.edges, labels=DOLLAR50_BANDS.labels)
+    assert DOLLAR50_BANDS.cut(pd.Series(prices)).equals(expected)
+    assert DOLLAR50_BANDS.counts(prices).tolist() == expected.value_counts(sort=False).tolist()
+
+    # 左端を含む区切り（従来のループ集計と同じ）
+    edges = COARSE_BANDS.edges
+    loop = [len([p for p in prices if edges[i] <= p < edges[i + 1]]) for i in range(len(edges) - 1)]
+    assert list(COARSE_BANDS.distribution(prices).values()) == loop
+
+    # 下限・上限なし（従来のsearchsortedと同じ）
+    inner = [100, 150, 200, 300, 500, 1000, 2000]
+    valid = prices[~np.isnan(prices)]
+    legacy = np.bincount(np.searchsorted(inner, valid, side='right'), minlength=8)
+    assert BRAND_TAB_BANDS.counts(prices).tolist() == legacy.tolist()
+
+    # 重み付き（販売数の合計）
+    weighted = DOLLAR50_BANDS.counts(prices, weights=sales)
+    assert weighted.dtype == np.int64
+    assert weighted.tolist() == pd.Series(sales).groupby(expected, observed=False).sum().tolist()
+
+    # グループ×複数の区切り
+    df = pd.DataFrame({'価格': prices, '販売数': sales,
+                       'ライン': rng.choice(['A', 'B', 'C', None], len(prices))})
+    tables = band_tables(df, {'coarse': COARSE_BANDS, '50': DOLLAR50_TAB_BANDS}, by='ライン', weights='販売数')
+    assert list(tables['coarse'].index) == ['A', 'B', 'C']
+    for line in ['A', 'B', 'C']:
+        sub = df[df['ライン'] == line]
+        assert tables['coarse'].loc[line].tolist() == COARSE_BANDS.counts(sub['価格'], sub['販売数']).tolist()
+        assert tables['50'].loc[line].tolist() == DOLLAR50_TAB_BANDS.counts(sub['価格'], sub['販売数']).tolist()
+    assert band_table(df, COARSE_BANDS).iloc[0].tolist() == COARSE_BANDS.counts(prices).tolist()
+    assert DOLLAR50_TAB_BANDS.labels[0] == '$0-49' and DOLLAR50_TAB_BANDS.labels[-1] == '$1000+'
+
+    try:
+        PriceBands([0, 100], ['a', 'b'])
+        raise AssertionError("ラベル数の不一致を検出できていません")
+    except ValueError:
+        pass
+
+    print("✅ price_bands テスト完了")
@@ -0,0 +1,401 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+マージ可能な分位点スケッチ
+価格を対数スケールのバケット（相対誤差 alpha 以内）に数えておき、
+中央値・p25・p75 などを元データなしで求める（DDSketch方式）
+
+- 同じ alpha のスケッチはバケットの件数を足すだけでマージできる
+  （日次追加分・月別パーティション・ブランド横断の集計に使う）
+- 最小値・最大値は正確に保持し、分位点はその範囲に収める
+- 0以下の値は「ゼロバケット」にまとめる
+
+元データの行がある集計（median() / quantile() / group_stats()）の計算方法は
+QUANTILE_MODE（環境変数 WATCH_QUANTILE_MODE）で切り替える
+- 'exact' : 全件をソートして正確に計算（既定。従来の pandas の median/quantile と同じ）
+- 'sketch': スケッチで推定（保存・マージしたスケッチと同じ値になる）
+行を持たない追加分・月別パーティション・ロールアップの集計（utils.delta_stats）は常にスケッチを使う
+
+検証: python3 -m utils.quantile_sketch --validate [CSVパス]
+"""
+import math
+import os
+
+import numpy as np
+
+
+# 既定の相対誤差（1%）
+DEFAULT_ALPHA = 0.01
+
+# ゼロバケットとみなす値の上限
+MIN_POSITIVE = 1e-9
+
+# グループ別に一括作成する際のバケット番号の範囲（価格の桁数に対して十分広い）
+_KEY_OFFSET = 1 << 12
+
+# 中央値・分位点の計算方法
+QUANTILE_MODES = ('sketch', 'exact')
+QUANTILE_MODE = os.environ.get('WATCH_QUANTILE_MODE', 'exact')
+
+
+def resolve_mode(mode=None):
+    """
+    分位点の計算方法を決定
+
+    Args:
+        mode: 'sketch' / 'exact'（Noneなら QUANTILE_MODE）
+
+    Returns:
+        'sketch' または 'exact'
+    """
+    mode = mode or QUANTILE_MODE
+    if mode not in QUANTILE_MODES:
+        raise ValueError(f"分位点の計算方法は {QUANTILE_MODES} のいずれかです: {mode}")
+    return mode
+
+
+class QuantileSketch:
+    """
+    分位点スケッチ
+
+    Args:
+        alpha: 相対誤差（0.01なら推定値は真の値の±1%以内）
+    """
+
+    def __init__(self, alpha=DEFAULT_ALPHA):
+        if not 0 < alpha < 1:
+            raise ValueError(f"alphaは0より大きく1未満である必要があります: {alpha}")
+        self.alpha = alpha
+        self.gamma = (1 + alpha) / (1 - alpha)
+        self._log_gamma = math.log(self.gamma)
+        self.bins = {}
+        self.zero_count = 0
+        self.count = 0
+        self.min = math.inf
+        self.max = -math.inf
+
+    def keys_for(self, values):
+        """値の配列をバケット番号の配列に変換（0以下・欠損値は呼び出し側で除くこと）"""
+        return np.ceil(np.log(values) / self._log_gamma).astype(np.int64)
+
+    def value_for(self, key):
+        """バケット番号の代表値"""
+        return 2 * self.gamma ** key / (self.gamma + 1)
+
+    def add(self, values):
+        """
+        値をまとめて追加
+
+        Args:
+            values: 数値の配列またはSeries（欠損値は無視）
+
+        Returns:
+            self
+        """
+        values = np.asarray(values, dtype=float)
+        values = values[~np.isnan(values)]
+        if len(values) == 0:
+            return self
+
+        positive = values[values > MIN_POSITIVE]
+        keys, counts = np.unique(self.keys_for(positive), return_counts=True)
+        self._add_bins(keys, counts)
+        self.zero_count += int(len(values) - len(positive))
+        self.count += int(len(values))
+        self.min = min(self.min, float(values.min()))
+        self.max = max(self.max, float(values.max()))
+        return self
+
+    def _add_bins(self, keys, counts):
+        bins = self.bins
+        for key, count in zip(keys.tolist(), counts.tolist()):
+            bins[key] = bins.get(key, 0) + count
+
+    def merge(self, other):
+        """
+        別のスケッチを取り込む（同じalphaのみ）
+
+        Args:
+            other: QuantileSketch
+
+        Returns:
+            self
+        """
+        if other.alpha != self.alpha:
+            raise ValueError(f"alphaが異なるスケッチはマージできません: {self.alpha} != {other.alpha}")
+        for key, count in other.bins.items():
+            self.bins[key] = self.bins.get(key, 0) + count
+        self.zero_count += other.zero_count
+        self.count += other.count
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+        return self
+
+    def quantile(self, q):
+        """
+        分位点を推定（pandasの既定と同じく、前後の順位の値を線形補間）
+
+        Args:
+            q: 0〜1の分位（0.5で中央値）
+
+        Returns:
+            推定値（空のスケッチはNaN）
+        """
+        if self.count == 0:
+            return math.nan
+        if q <= 0:
+            return self.min
+        if q >= 1:
+            return self.max
+
+        rank = q * (self.count - 1)
+        lower = math.floor(rank)
+        value = self._value_at(lower)
+        if rank > lower:
+            value += (self._value_at(lower + 1) - value) * (rank - lower)
+        return value
+
+    def _value_at(self, rank):
+        """小さい方から rank 番目（0始まり）の値の推定値（両端は正確な最小値・最大値）"""
+        if rank <= 0:
+            return self.min
+        if rank >= self.count - 1:
+            return self.max
+        if rank < self.zero_count:
+            return min(max(0.0, self.min), self.max)
+        seen = self.zero_count
+        for key in sorted(self.bins):
+            seen += self.bins[key]
+            if seen > rank:
+                return min(max(self.value_for(key), self.min), self.max)
+        return self.max
+
+    def quantiles(self, qs):
+        """複数の分位点を推定（{q: 値}）"""
+        return {q: self.quantile(q) for q in qs}
+
+    def median(self):
+        """中央値を推定"""
+        return self.quantile(0.5)
+
+    def to_dict(self):
+        """JSON保存用のdict"""
+        keys = sorted(self.bins)
+        return {
+            'alpha': self.alpha,
+            'count': self.count,
+            'zero_count': self.zero_count,
+            'min': self.min if self.count else None,
+            'max': self.max if self.count else None,
+            'keys': keys,
+            'counts': [self.bins[k] for k in keys],
+        }
+
+    @classmethod
+    def from_dict(cls, data):
+        """to_dict()の結果から復元"""
+        sketch = cls(alpha=data['alpha'])
+        sketch.bins = dict(zip(data['keys'], data['counts']))
+        sketch.zero_count = data['zero_count']
+        sketch.count = data['count']
+        if sketch.count:
+            sketch.min = data['min']
+            sketch.max = data['max']
+        return sketch
+
+
+def merge_sketches(sketches, alpha=DEFAULT_ALPHA):
+    """
+    複数のスケッチをマージした新しいスケッチ（月別パーティション・ブランド横断の集計用）
+
+    Args:
+        sketches: QuantileSketchの列（元のスケッチは変更しない）
+        alpha: 空の場合に作るスケッチの相対誤差
+
+    Returns:
+        QuantileSketch
+    """
+    merged = None
+    for sketch in sketches:
+        if merged is None:
+            merged = QuantileSketch(sketch.alpha)
+        merged.merge(sketch)
+    return merged if merged is not None else QuantileSketch(alpha)
+
+
+def quantile(values, q, mode=None, alpha=DEFAULT_ALPHA):
+    """
+    値の分位点（pd.Series.quantile の置き換え。欠損値は無視）
+
+    Args:
+        values: 数値の配列またはSeries
+        q: 0〜1の分位
+        mode: 'sketch' / 'exact'（Noneなら QUANTILE_MODE）
+        alpha: スケッチの相対誤差
+
+    Returns:
+        分位点（値がなければNaN）
+    """
+    values = np.asarray(values, dtype=float)
+    if resolve_mode(mode) == 'exact':
+        values = values[~np.isnan(values)]
+        return float(np.quantile(values, q)) if len(values) else math.nan
+    return QuantileSketch(alpha).add(values).quantile(q)
+
+
+def median(values, mode=None, alpha=DEFAULT_ALPHA):
+    """値の中央値（pd.Series.median の置き換え。欠損値は無視、値がなければNaN）"""
+    if resolve_mode(mode) == 'exact':
+        values = np.asarray(values, dtype=float)
+        values = values[~np.isnan(values)]
+        return float(np.median(values)) if len(values) else math.nan
+    return quantile(values, 0.5, mode=mode, alpha=alpha)
+
+
+def build_sketches(values, codes, n_groups, alpha=DEFAULT_ALPHA):
+    """
+    グループごとのスケッチを一括作成（全値のバケット番号を1回で計算）
+
+    Args:
+        values: 数値の配列
+        codes: 各値のグループ番号（0 ~ n_groups-1、-1は除外）
+        n_groups: グループ数
+        alpha: 相対誤差
+
+    Returns:
+        QuantileSketchのリスト（グループ番号順）
+    """
+    values = np.asarray(values, dtype=float)
+    codes = np.asarray(codes, dtype=np.int64)
+    keep = (codes >= 0) & ~np.isnan(values)
+    values, codes = values[keep], codes[keep]
+
+    sketches = [QuantileSketch(alpha) for _ in range(n_groups)]
+    if len(values) == 0:
+        return sketches
+
+    # 件数・最小・最大・ゼロバケット
+    counts = np.bincount(codes, minlength=n_groups)
+    order = np.argsort(codes, kind='stable')
+    starts = np.searchsorted(codes[order], np.arange(n_groups))
+    nonempty = counts > 0
+    mins = np.full(n_groups, np.inf)
+    maxs = np.full(n_groups, -np.inf)
+    mins[nonempty] = np.minimum.reduceat(values[order], starts[nonempty])
+    maxs[nonempty] = np.maximum.reduceat(values[order], starts[nonempty])
+    positive = values > MIN_POSITIVE
+    zeros = np.bincount(codes[~positive], minlength=n_groups)
+
+    # (グループ, バケット) の組ごとの件数
+    keys = np.clip(sketches[0].keys_for(values[positive]), -_KEY_OFFSET + 1, _KEY_OFFSET - 1)
+    combined = codes[positive] * (2 * _KEY_OFFSET) + (keys + _KEY_OFFSET)
+    pairs, pair_counts = np.unique(combined, return_counts=True)
+    pair_groups = pairs // (2 * _KEY_OFFSET)
+    pair_keys = pairs % (2 * _KEY_OFFSET) - _KEY_OFFSET
+    bounds = np.searchsorted(pair_groups, np.arange(n_groups + 1))
+
+    for g in np.flatnonzero(nonempty):
+        sketch = sketches[g]
+        lo, hi = bounds[g], bounds[g + 1]
+        sketch.bins = dict(zip(pair_keys[lo:hi].tolist(), pair_counts[lo:hi].tolist()))
+        sketch.count = int(counts[g])
+        sketch.zero_count = int(zeros[g])
+        sketch.min = float(mins[g])
+        sketch.max = float(maxs[g])
+    return sketches
+
+
+def validate(csv_path=None, key_sets=(('ブランド',), ('ブランド', '駆動方式'), ('ブランド', '商品状態'))):
+    """
+    実データでスケッチの推定値と正確な値を比較して表示
+
+    Args:
+        csv_path: 時計データCSVのパス（Noneなら既定のCSV）
+        key_sets: 比較するグループのキーの組
+
+    Returns:
+        全グループでの最大相対誤差
+    """
+    from utils.data_loader import DEFAULT_CSV_PATH, load_watch_data
+    from utils.group_stats import compare_quantile_modes
+
+    df = load_watch_data(csv_path or DEFAULT_CSV_PATH)
+    print(f"📐 分位点スケッチ検証（alpha={DEFAULT_ALPHA}、{len(df):,}件）")
+    worst = 0.0
+    for keys in key_sets:
+        errors = compare_quantile_modes(df, list(keys))
+        values = errors.drop(columns='items')
+        max_error = float(values.max().max()) if len(values) else 0.0
+        worst = max(worst, max_error)
+        print(f"  - {' × '.join(keys)}: {len(errors)}グループ、最大相対誤差 {max_error * 100:.2f}%"
+              f"（中央値 {float(values['median'].max() if len(values) else 0) * 100:.2f}%）")
+    status = '✅' if worst <= DEFAULT_ALPHA + 1e-9 else '⚠️'
+    print(f"{status} 最大相対誤差: {worst * 100:.2f}%（許容 {DEFAULT_ALPHA * 100:.0f}%）")
+    return worst
+
+
+if __name__ == '__main__':
+    import sys
+
+    if '--validate' in sys.argv[1:]:
+        paths = [arg for arg in sys.argv[1:] if not arg.startswith('--')]
+        worst = validate(paths[0] if paths else None)
+        sys.exit(0 if worst <= DEFAULT_ALPHA + 1e-9 else 1)
+
+    # 簡易テスト
+    rng = np.random.default_rng(0)
+    prices = rng.gamma(2.0, 200.0, 50000).round(2)
+
+    sketch = QuantileSketch().add(prices)
+    for q in (0.25, 0.5, 0.75, 0.9):
+        exact = np.quantile(prices, q)
+        assert abs(sketch.quantile(q) - exact) <= exact * 0.02, (q, sketch.quantile(q), exact)
+    assert sketch.quantile(0) == prices.min() and sketch.quantile(1) == prices.max()
+
+    # マージ（分割して作っても1つで作っても同じ）
+    a = QuantileSketch().add(prices[:20000])
+    b = QuantileSketch().add(prices[20000:])
+    merged = a.merge(b)
+    assert merged.bins == sketch.bins and merged.count == sketch.count
+    assert merged.median() == sketch.median()
+
+    parts = [QuantileSketch().add(chunk) for chunk in np.array_split(prices, 5)]
+    assert merge_sketches(parts).bins == sketch.bins and parts[0].count == 10000
+    assert merge_sketches([]).count == 0
+
+    # 保存・復元
+    restored = QuantileSketch.from_dict(merged.to_dict())
+    assert restored.bins == merged.bins and restored.median() == merged.median()
+    assert np.isnan(QuantileSketch().median())
+
+    # ゼロ・欠損値
+    z = QuantileSketch().add([0, 0, 0, 10, np.nan])
+    assert z.count == 4 and z.zero_count == 3 and z.median() == 0
+
+    # 少数の値（両端は正確な値、間は補間）
+    assert QuantileSketch().add([100, 200]).median() == 150
+    small = np.array([120.0, 80.0, 305.5, 99.0, 150.0])
+    for q in (0.25, 0.5, 0.75):
+        assert abs(QuantileSketch().add(small).quantile(q) - np.quantile(small, q)) <= np.quantile(small, q) * 0.01
+
+    # 計算方法の切り替え
+    assert median(small, mode='exact') == np.median(small)
+    assert abs(median(small, mode='sketch') - np.median(small)) <= np.median(small) * 0.01
+    assert np.isnan(median([], mode='exact')) and np.isnan(median([np.nan], mode='sketch'))
+
+    # グループ別一括作成
+    codes = rng.integers(-1, 5, len(prices))
+    group_sketches = build_sketches(prices, codes, 6)
+    for g in range(6):
+        expected = QuantileSketch().add(prices[codes == g])
+        assert group_sketches[g].bins == expected.bins
+        assert group_sketches[g].count == expected.count
+        assert group_sketches[g].median() == expected.median() or (g == 5 and expected.count == 0)
+
+    try:
+        QuantileSketch(0.01).merge(QuantileSketch(0.02))
+        raise AssertionError("alphaの不一致を検出できていません")
+    except ValueError:
+        pass
+
+    print("✅ quantile_sketch テスト完了")
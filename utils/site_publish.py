@@ -0,0 +1,370 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+公開用サイトの仕上げ（CSS・共通JSの外部ファイル化、コンテンツハッシュ付きファイル名、事前圧縮）
+utils/lazy_tabs.py が組み立てたファイル（シェル・タブ別フラグメント・グラフデータ）に適用する
+
+- シェルの<style>をまとめて1つのスタイルシート（assets/styles.<ハッシュ>.css）にし、
+  同じ内容のルールは最後の1つだけ残す（後のルールが優先される順序は変わらない）
+- 共通のJS（showTab・plotlyLayout・plotlyConfig などを定義する<script>と、グラフ・タブの
+  遅延読み込みスクリプト）を1つのファイル（assets/app.<ハッシュ>.js）にまとめる
+- タブ別フラグメントもハッシュ付きのファイル名（tabs/<タブID>.<ハッシュ>.html）にする
+  （ハッシュ付きのファイルは内容が変わると名前も変わるため、長期間キャッシュしてよい）
+- HTML・CSS・JS・JSONの .gz と .br（brotliがインストールされている場合）を書き出す
+  （圧縮しても小さくならないファイルは作らない）
+- ファイル一覧（元の名前 -> ハッシュ付きの名前、サイズ、SHA-256）を asset-manifest.json に書き出す
+"""
+import gzip
+import hashlib
+import json
+import re
+
+from utils.lazy_tabs import FRAGMENT_DIR_NAME, TAB_LOADER_ID
+
+try:
+    import brotli
+    HAS_BROTLI = True
+except ImportError:
+    HAS_BROTLI = False
+
+
+# ハッシュ付きファイルの保存先ディレクトリ
+ASSET_DIR_NAME = 'assets'
+
+# ファイル一覧
+MANIFEST_NAME = 'asset-manifest.json'
+
+# ファイル一覧の形式のバージョン
+MANIFEST_VERSION = 1
+
+# 圧縮版を作る拡張子
+COMPRESSIBLE_EXTENSIONS = ('.html', '.css', '.js', '.json')
+
+# 公開処理で作るファイル（再生成時に古いものを削除する対象。utils.lazy_tabs.write_site_files の clean）
+PUBLISH_OUTPUTS = [f'{ASSET_DIR_NAME}/', 'index.html.', MANIFEST_NAME]
+
+# ファイル名に付けるハッシュの桁数
+HASH_LENGTH = 10
+
+# 共通JSとしてまとめる<script>（id属性）と、showTab などを定義する属性なしの<script>
+_SHARED_SCRIPT_IDS = ('chart-loader', TAB_LOADER_ID)
+_PAGE_SCRIPT_MARKER = 'function showTab('
+
+# 属性なし（または type="text/css"）の<style>ブロック（前後の空白・改行を含む）
+_STYLE_RE = re.compile(r'[ \t]*<style(?:\s+type="text/css")?>(.*?)</style>[ \t]*\n?', re.S)
+
+# <script>ブロック（前後の空白・改行を含む）
+_SCRIPT_RE = re.compile(r'[ \t]*<script([^>]*)>(.*?)</script>[ \t]*\n?', re.S)
+
+
+def hashed_path(path, data):
+    """
+    内容のハッシュを付けたファイルパス（例: assets/styles.css -> assets/styles.1a2b3c4d5e.css）
+
+    Args:
+        path: 元のファイルパス
+        data: ファイルの内容（bytes）
+    """
+    stem, dot, ext = path.rpartition('.')
+    digest = hashlib.sha256(data).hexdigest()[:HASH_LENGTH]
+    return f'{stem}.{digest}.{ext}' if dot else f'{path}.{digest}'
+
+
+def css_statements(css):
+    """
+    CSSのトップレベルの文（セレクタ {...}・@media {...}・@import ...;）とコメントの位置
+
+    文字列内の括弧・セミコロン・コメント記号は区切りとみなさない
+
+    Args:
+        css: CSSの文字列
+
+    Returns:
+        [(開始位置, 終了位置, コメントかどうか)] のリスト（開始位置は前の空白を除いた位置）
+    """
+    spans = []
+    depth = 0
+    quote = None
+    start = None
+    i = 0
+    while i < len(css):
+        ch = css[i]
+        if quote:
+            if ch == '\\':
+                i += 1
+            elif ch == quote:
+                quote = None
+        elif css.startswith('/*', i):
+            end = css.find('*/', i + 2)
+            end = len(css) if end == -1 else end + 2
+            if depth == 0 and start is None:
+                spans.append((i, end, True))
+            i = end
+            continue
+        elif ch.isspace():
+            pass
+        else:
+            if start is None:
+                start = i
+            if ch in '"\'':
+                quote = ch
+            elif ch == '{':
+                depth += 1
+            elif ch == '}':
+                depth -= 1
+                if depth == 0:
+                    spans.append((start, i + 1, False))
+                    start = None
+            elif ch == ';' and depth == 0:
+                spans.append((start, i + 1, False))
+                start = None
+        i += 1
+    if start is not None:
+        spans.append((start, len(css), False))
+    return spans
+
+
+def split_css_rules(css):
+    """
+    CSSをトップレベルのルール（セレクタ {...}・@media {...}・@import ...; など）に分ける
+
+    Args:
+        css: CSSの文字列
+
+    Returns:
+        ルールの文字列のリスト（コメントを除く。ルール内のコメントは残す）
+    """
+    return [css[start:end] for start, end, comment in css_statements(css) if not comment]
+
+
+def dedupe_css(css):
+    """
+    同じ内容のルール（空白の違いは無視）を最後の1つだけ残す
+
+    同じルールが複数回ある場合、効くのは最後のものなので、最後の位置に残せば結果は変わらない
+
+    Args:
+        css: CSSの文字列
+
+    Returns:
+        重複を除いたCSSの文字列（1行に1ルール）
+    """
+    rules = split_css_rules(css)
+    keys = [' '.join(rule.split()) for rule in rules]
+    last = {key: i for i, key in enumerate(keys)}
+    return '\n'.join(rule for i, (rule, key) in enumerate(zip(rules, keys)) if last[key] == i) + '\n'
+
+
+def extract_styles(html):
+    """
+    <style>ブロックをすべて取り出し、重複を除いた1つのCSSにまとめる
+
+    Args:
+        html: シェルのHTML
+
+    Returns:
+        (<style>を除いたHTML（最初の<style>の位置に %%STYLESHEET%% を残す）, CSS)
+        <style>がない場合は (html, '')
+    """
+    blocks = list(_STYLE_RE.finditer(html))
+    if not blocks:
+        return html, ''
+    parts = []
+    cursor = 0
+    for i, m in enumerate(blocks):
+        parts.append(html[cursor:m.start()])
+        if i == 0:
+            parts.append(m.group()[:len(m.group()) - len(m.group().lstrip())] + '%%STYLESHEET%%\n')
+        cursor = m.end()
+    parts.append(html[cursor:])
+    return ''.join(parts), dedupe_css('\n'.join(m.group(1) for m in blocks))
+
+
+def _is_shared_script(attrs, body):
+    if not attrs.strip():
+        return _PAGE_SCRIPT_MARKER in body
+    return any(attrs.strip() == f'id="{script_id}"' for script_id in _SHARED_SCRIPT_IDS)
+
+
+def extract_shared_scripts(html):
+    """
+    共通のJS（showTab などを定義する<script>・グラフ/タブの遅延読み込みスクリプト）を取り出す
+
+    まとめたJSは最初に見つかった<script>の位置で読み込む（遅延読み込みスクリプトは関数定義と
+    DOMContentLoaded の登録だけなので、前に移しても動作は変わらない）
+
+    Args:
+        html: シェルのHTML
+
+    Returns:
+        (共通JSを除いたHTML（最初の位置に %%APP_SCRIPT%% を残す）, JS)
+        該当する<script>がない場合は (html, '')
+    """
+    blocks = [m for m in _SCRIPT_RE.finditer(html) if _is_shared_script(m.group(1), m.group(2))]
+    if not blocks:
+        return html, ''
+    parts = []
+    cursor = 0
+    for i, m in enumerate(blocks):
+        parts.append(html[cursor:m.start()])
+        if i == 0:
+            parts.append(m.group()[:len(m.group()) - len(m.group().lstrip())] + '%%APP_SCRIPT%%\n')
+        cursor = m.end()
+    parts.append(html[cursor:])
+    return ''.join(parts), '\n'.join(m.group(2).strip('\n') + '\n' for m in blocks)
+
+
+def compressed_variants(path, data):
+    """
+    圧縮版（.gz・.br）を作る（圧縮しても小さくならない場合は作らない）
+
+    Args:
+        path: ファイルパス
+        data: ファイルの内容（bytes）
+
+    Returns:
+        {圧縮版のパス: 内容}
+    """
+    variants = {}
+    if not path.endswith(COMPRESSIBLE_EXTENSIONS):
+        return variants
+    # mtime=0で圧縮結果を毎回同じにする（内容が同じなら書き換えない）
+    gz = gzip.compress(data, compresslevel=9, mtime=0)
+    if len(gz) < len(data):
+        variants[path + '.gz'] = gz
+    if HAS_BROTLI:
+        br = brotli.compress(data, quality=11)
+        if len(br) < len(data):
+            variants[path + '.br'] = br
+    return variants
+
+
+def publish_site(files):
+    """
+    公開用の処理を適用する
+
+    Args:
+        files: {出力先からの相対パス: 内容（bytes）}（utils.lazy_tabs.lazy_site_files() の結果。
+               'index.html' が必要）
+
+    Returns:
+        (公開用のファイル {相対パス: 内容}, ファイル一覧（asset-manifest.json の内容）)
+    """
+    html = files['index.html'].decode('utf-8')
+    renamed = {}
+
+    html, css = extract_styles(html)
+    html, js = extract_shared_scripts(html)
+    assets = {}
+    if css:
+        path = hashed_path(f'{ASSET_DIR_NAME}/styles.css', css.encode('utf-8'))
+        assets[path] = css.encode('utf-8')
+        renamed[f'{ASSET_DIR_NAME}/styles.css'] = path
+        html = html.replace('%%STYLESHEET%%', f'<link rel="stylesheet" href="{path}">', 1)
+    if js:
+        path = hashed_path(f'{ASSET_DIR_NAME}/app.js', js.encode('utf-8'))
+        assets[path] = js.encode('utf-8')
+        renamed[f'{ASSET_DIR_NAME}/app.js'] = path
+        html = html.replace('%%APP_SCRIPT%%', f'<script src="{path}"></script>', 1)
+
+    published = {}
+    for path, data in files.items():
+        if path.startswith(f'{FRAGMENT_DIR_NAME}/') and path.endswith('.html'):
+            hashed = hashed_path(path, data)
+            renamed[path] = hashed
+            html = html.replace(f'data-fragment="{path}"', f'data-fragment="{hashed}"')
+            published[hashed] = data
+        elif path != 'index.html':
+            published[path] = data
+    published.update(assets)
+    published['index.html'] = html.encode('utf-8')
+
+    manifest = {
+        'version': MANIFEST_VERSION,
+        'entry': 'index.html',
+        'assets': dict(sorted(renamed.items())),
+        'files': {},
+    }
+    for path in sorted(published):
+        data = published[path]
+        variants = compressed_variants(path, data) if not path.endswith(('.gz', '.br')) else {}
+        manifest['files'][path] = {
+            'size': len(data),
+            'sha256': hashlib.sha256(data).hexdigest(),
+            'immutable': path in renamed.values(),
+            **{suffix.rpartition('.')[2]: len(v) for suffix, v in variants.items()},
+        }
+        published.update(variants)
+
+    # 元のファイル（charts/*.json.gz など）と同じ名前の圧縮版は上で作り直したもので置き換わる
+    published[MANIFEST_NAME] = (json.dumps(manifest, ensure_ascii=False, indent=2) + '\n').encode('utf-8')
+    return published, manifest
+
+
+if __name__ == '__main__':
+    print("✅ 公開用処理テスト")
+
+    css = '''
+    /* 共通 */
+    .card { color: red; }
+    #A .card { color: blue; }
+    @media (max-width: 600px) { .card { padding: 0; } }
+    .q::after { content: "}"; }
+    .card {  color:  red; }
+    '''
+    rules = split_css_rules(css)
+    assert rules[0] == '.card { color: red; }' and rules[3] == '.q::after { content: "}"; }', rules
+    assert dedupe_css(css) == ('#A .card { color: blue; }\n@media (max-width: 600px) { .card { padding: 0; } }\n'
+                               '.q::after { content: "}"; }\n.card {  color:  red; }\n')
+    print("  ✓ dedupe_css（同じルールは最後の1つだけ残す）")
+
+    shell = '''<html><head>
+    <style>
+    .tab-content { display: none; }
+    </style>
+</head><body>
+<div id="A" class="tab-content" data-fragment="tabs/A.html"></div>
+    <style>#A .card { color: blue; }</style>
+    <style>#A .card { color: blue; }</style>
+    <script>
+    const plotlyLayout = {};
+    function showTab(tabId) {}
+    </script>
+    <script>
+    Plotly.newPlot('x', [], plotlyLayout);
+    </script>
+    <script id="chart-loader">
+    function loadTabCharts(tabId) {}
+    </script>
+    <script id="tab-loader">
+    function loadTabFragment(tabId) {}
+    </script>
+</body></html>'''
+    files = {
+        'index.html': shell.encode('utf-8'),
+        'tabs/A.html': ('<p>A</p>' * 100).encode('utf-8'),
+        'charts/A.json': b'[]',
+    }
+    published, manifest = publish_site(files)
+    index = published['index.html'].decode('utf-8')
+    css_path = manifest['assets']['assets/styles.css']
+    js_path = manifest['assets']['assets/app.js']
+    fragment = manifest['assets']['tabs/A.html']
+    assert re.fullmatch(r'assets/styles\.[0-9a-f]{10}\.css', css_path)
+    assert '<style' not in index and index.count(f'<link rel="stylesheet" href="{css_path}">') == 1
+    assert published[css_path] == b'.tab-content { display: none; }\n#A .card { color: blue; }\n'
+    assert f'<script src="{js_path}"></script>' in index and 'function showTab' not in index
+    assert index.index(js_path) < index.index("Plotly.newPlot('x'")
+    assert 'loadTabCharts' in published[js_path].decode('utf-8') and 'id="chart-loader"' not in index
+    assert f'data-fragment="{fragment}"' in index and fragment in published and 'tabs/A.html' not in published
+    assert fragment + '.gz' in published and 'charts/A.json.gz' not in published  # 小さくならないものは作らない
+    assert gzip.decompress(published['index.html.gz']) == published['index.html']
+    assert manifest['files'][fragment]['immutable'] and not manifest['files']['index.html']['immutable']
+    assert MANIFEST_NAME in published
+    print("  ✓ publish_site（スタイルシート・共通JS・ハッシュ付きファイル名・圧縮版）")
+
+    assert publish_site(files)[0] == published
+    assert publish_site({'index.html': b'<p>x</p>'})[1]['assets'] == {}
+    print(f"  ✓ 同じ入力なら同じ出力（brotli: {'あり' if HAS_BROTLI else 'なし（.br は作らない）'}）")
+
+    print("\n✅ すべてのテスト成功")
@@ -10,6 +10,8 @@
 import json
 import os
 
+from utils.chart_bundle import ChartBundle
+
 # JSONを読み込み
 with open('/Users/naokijodan/Desktop/時計分析_完全版.json', 'r', encoding='utf-8') as f:
     full_data = json.load(f)
@@ -579,7 +581,16 @@ def generate_recommendations_tab():
     return html
 
 # JavaScriptセクション
-def generate_javascript():
+def generate_javascript(charts):
+    """
+    タブ切替スクリプトを生成し、グラフデータをchartsに登録
+
+    Args:
+        charts: グラフデータの登録先（ChartBundle）
+
+    Returns:
+        <script>ブロックの文字列（グラフは charts/<タブID>.json からタブ表示時に描画）
+    """
     full = full_data
     deep = deepdive_data
 
@@ -612,75 +623,57 @@ def generate_javascript():
     citizen_line_names = list(citizen_lines.keys())
     citizen_line_counts = [citizen_lines[l]['count'] for l in citizen_line_names]
 
-    js = f'''
+    # Brand chart
+    charts.add('overview', 'brand_chart', [{
+        'x': brand_names,
+        'y': brand_counts,
+        'type': 'bar',
+        'marker': {'color': '#667eea'}
+    }], {
+        'title': 'ブランド別販売数Top20',
+        'xaxis': {'title': 'ブランド'},
+        'yaxis': {'title': '販売数'}
+    }, config={})
+
+    # Movement chart
+    charts.add('overview', 'movement_chart', [{
+        'labels': movement_names,
+        'values': movement_counts,
+        'type': 'pie',
+        'marker': {'colors': ['#667eea', '#764ba2', '#f093fb', '#4facfe', '#43e97b', '#fa709a']}
+    }], {
+        'title': '駆動方式別分布'
+    }, config={})
+
+    # SEIKO / CASIO / CITIZEN lines chart
+    for tab_id, brand, names, counts, color in [
+        ('seiko_lines', 'SEIKO', seiko_line_names, seiko_line_counts, '#4169e1'),
+        ('casio_lines', 'CASIO', casio_line_names, casio_line_counts, '#32cd32'),
+        ('citizen_lines', 'CITIZEN', citizen_line_names, citizen_line_counts, '#ff8c00'),
+    ]:
+        charts.add(tab_id, f'{tab_id}_chart', [{
+            'x': names,
+            'y': counts,
+            'type': 'bar',
+            'marker': {'color': color}
+        }], {
+            'title': f'{brand}ライン別販売数',
+            'xaxis': {'title': 'ライン'},
+            'yaxis': {'title': '販売数'}
+        }, config={})
+
+    js = '''
         <script>
-            function showTab(tabName) {{
+            function showTab(tabName) {
                 // Hide all tabs
                 document.querySelectorAll('.tab-content').forEach(tab => tab.classList.remove('active'));
                 document.querySelectorAll('.tab').forEach(btn => btn.classList.remove('active'));
 
                 // Show selected tab
                 document.getElementById(tabName).classList.add('active');
+                loadTabCharts(tabName);
                 event.target.classList.add('active');
-            }}
-
-            // Brand chart
-            Plotly.newPlot('brand_chart', [{{
-                x: {brand_names},
-                y: {brand_counts},
-                type: 'bar',
-                marker: {{color: '#667eea'}}
-            }}], {{
-                title: 'ブランド別販売数Top20',
-                xaxis: {{title: 'ブランド'}},
-                yaxis: {{title: '販売数'}}
-            }});
-
-            // Movement chart
-            Plotly.newPlot('movement_chart', [{{
-                labels: {movement_names},
-                values: {movement_counts},
-                type: 'pie',
-                marker: {{colors: ['#667eea', '#764ba2', '#f093fb', '#4facfe', '#43e97b', '#fa709a']}}
-            }}], {{
-                title: '駆動方式別分布'
-            }});
-
-            // SEIKO lines chart
-            Plotly.newPlot('seiko_lines_chart', [{{
-                x: {seiko_line_names},
-                y: {seiko_line_counts},
-                type: 'bar',
-                marker: {{color: '#4169e1'}}
-            }}], {{
-                title: 'SEIKOライン別販売数',
-                xaxis: {{title: 'ライン'}},
-                yaxis: {{title: '販売数'}}
-            }});
-
-            // CASIO lines chart
-            Plotly.newPlot('casio_lines_chart', [{{
-                x: {casio_line_names},
-                y: {casio_line_counts},
-                type: 'bar',
-                marker: {{color: '#32cd32'}}
-            }}], {{
-                title: 'CASIOライン別販売数',
-                xaxis: {{title: 'ライン'}},
-                yaxis: {{title: '販売数'}}
-            }});
-
-            // CITIZEN lines chart
-            Plotly.newPlot('citizen_lines_chart', [{{
-                x: {citizen_line_names},
-                y: {citizen_line_counts},
-                type: 'bar',
-                marker: {{color: '#ff8c00'}}
-            }}], {{
-                title: 'CITIZENライン別販売数',
-                xaxis: {{title: 'ライン'}},
-                yaxis: {{title: '販売数'}}
-            }});
+            }
         </script>
     '''
     return js
@@ -704,14 +697,16 @@ html_content += '''
         </div>
     </div>
 '''
-html_content += generate_javascript()
+charts = ChartBundle()
+html_content += generate_javascript(charts)
 html_content += '''
 </body>
 </html>
 '''
 
-# 保存
+# 保存（グラフデータは index.html の隣の charts/ に書き出し、遅延読み込みスクリプトを追加）
 output_path = '/Users/naokijodan/Desktop/watch-market-analysis/index.html'
+html_content = charts.save(output_path, html_content)
 with open(output_path, 'w', encoding='utf-8') as f:
     f.write(html_content)
 